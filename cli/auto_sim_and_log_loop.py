@@ -18,6 +18,16 @@ parser.add_argument("--debug", action="store_true", help="Enable debug logging")
 parser.add_argument(
     "--verbose", action="store_true", help="Enable verbose logging"
 )
+parser.add_argument(
+    "--full-odds",
+    action="store_true",
+    help="Request every market for every event each cycle (ignore the quota planner)",
+)
+parser.add_argument(
+    "--daemon",
+    action="store_true",
+    help="Run odds, snapshot, dispatch, logging and reconcile in-process with state kept in memory",
+)
 args = parser.parse_args()
 
 config.DEBUG_MODE = args.debug
@@ -32,8 +42,11 @@ from pathlib import Path
 
 from datetime import datetime, timedelta
 from core.utils import now_eastern
-from core.odds_fetcher import fetch_all_market_odds, save_market_odds_to_file
+from core.odds_quota import RequestPlanner
 from core.snapshot_core import load_latest_snapshot
+from core.snapshot_incremental import SnapshotBuildCache
+from core.dispatch_orchestrator import dispatch_snapshots
+from core.loop_daemon import LoopState, build_scheduler, refresh_odds
 
 EDGE_THRESHOLD = 0.05
 MIN_EV = 0.05
@@ -43,6 +56,10 @@ last_sim_time = 0
 last_log_time = 0
 last_snapshot_time = 0
 
+# Quota-aware planner and the previous cycle's odds it carries forward
+ODDS_PLANNER = None if args.full_odds else RequestPlanner()
+LOOP_STATE = LoopState(ODDS_PLANNER)
+
 # Track the closing odds monitor subprocess so we can restart if it exits
 closing_monitor_proc = None
 active_processes: list[dict] = []  # Track background subprocesses
@@ -124,8 +141,6 @@ def poll_active_processes() -> None:
             name = entry["name"]
             if name.startswith("LogBets"):
                 timeout = 10 * 60
-            elif name.startswith("dispatch"):
-                timeout = 5 * 60
             elif name.startswith("FullSlateSim"):
                 timeout = 45 * 60
 
@@ -244,21 +259,7 @@ def get_today_str() -> str:
 def fetch_and_cache_odds_snapshot() -> str | None:
     """Fetch market odds once per loop and save to a timestamped file."""
 
-    logger.info(
-        "\n📡 [%s] Fetching market odds for today and tomorrow...", now_eastern()
-    )
-    odds = fetch_all_market_odds(lookahead_days=2)
-    if not odds or not isinstance(odds, dict) or len(odds) == 0:
-        logger.error(
-            "❌ Fetched odds snapshot is empty or invalid — skipping loop cycle."
-        )
-        return None
-    logger.debug("📊 Fetched game_ids: %s", list(odds.keys()))
-    timestamp = now_eastern().strftime("%Y%m%dT%H%M")
-    tag = f"market_odds_{timestamp}"
-    odds_path = save_market_odds_to_file(odds, tag)
-    logger.info("✅ [%s] Saved shared odds snapshot: %s", now_eastern(), odds_path)
-    return odds_path
+    return refresh_odds(LOOP_STATE)
 
 
 def run_simulation():
@@ -334,6 +335,7 @@ def run_unified_snapshot_and_dispatch(odds_path: str):
             odds_path,
             "--date",
             date_arg,
+            "--incremental",
         ]
     )
 
@@ -345,21 +347,52 @@ def run_unified_snapshot_and_dispatch(odds_path: str):
         )
         return
 
-    for script in [
-        "dispatch_live_snapshot.py",
-        "dispatch_fv_drop_snapshot.py",
-        "dispatch_best_book_snapshot.py",
-        "dispatch_personal_snapshot.py",
-        "dispatch_sim_only_snapshot.py",
-    ]:
-        cmd = [PYTHON, f"core/{script}", "--output-discord"]
-
-        launch_process(script, cmd)
+    # Role-based and CLV dispatchers share one snapshot load in this process
+    results = dispatch_snapshots(["--output-discord"])
+    failed = {name: status for name, status in results.items() if status != "ok"}
+    if failed:
+        logger.warning("⚠️ [%s] Dispatchers did not complete cleanly: %s", now_eastern(), failed)
+
+
+def run_daemon() -> None:
+    """Run the stage graph in-process and supervise the closing monitor."""
+    LOOP_STATE.build_cache = SnapshotBuildCache()
+    scheduler = build_scheduler(
+        LOOP_STATE,
+        odds_interval=LOG_INTERVAL,
+        sim_interval=SIM_INTERVAL,
+        min_ev=MIN_EV,
+        edge_threshold=EDGE_THRESHOLD,
+    )
+    logger.info(
+        "🔄 [%s] Starting auto loop in daemon mode... "
+        "(Odds: 5 min | Sim: 30 min | Snapshot → Log → Dispatch on new data)",
+        now_eastern(),
+    )
+    scheduler.start()
+    last_report = time.time()
+    while True:
+        poll_active_processes()
+        ensure_closing_monitor_running()
+        if time.time() - last_report > LOG_INTERVAL:
+            last_report = time.time()
+            for name, m in scheduler.metrics().items():
+                logger.info(
+                    "📈 %s: %d runs, %d failed, %d timed out, %d skipped, last %s",
+                    name,
+                    m["runs"],
+                    m["failures"],
+                    m["timeouts"],
+                    m["skipped"],
+                    "running" if m["running"] else (
+                        f"{m['last_duration']:.1f}s" if m["last_duration"] is not None else "n/a"
+                    ),
+                )
+        time.sleep(10)
 
-    # Dispatch CLV snapshot after other role-based snapshots
-    clv_cmd = [PYTHON, "core/dispatch_clv_snapshot.py", "--output-discord"]
-    launch_process("dispatch_clv_snapshot.py", clv_cmd)
 
+if args.daemon:
+    run_daemon()
 
 logger.info(
     "🔄 [%s] Starting auto loop... "
@@ -377,16 +410,6 @@ initial_odds = fetch_and_cache_odds_snapshot()
 if initial_odds:
     run_unified_snapshot_and_dispatch(initial_odds)
     last_snapshot_time = time.time()
-    while any(
-        p["name"].startswith("dispatch")
-        or "unified_snapshot_generator" in p["name"]
-        for p in active_processes
-    ):
-        poll_active_processes()
-        logger.info(
-            "⏳ Waiting for snapshot/dispatch scripts to complete..."
-        )
-        time.sleep(3)
     last_log_time = last_snapshot_time
     last_sim_time = last_snapshot_time
     run_logger(initial_odds)
@@ -438,16 +461,6 @@ while True:
         if odds_file:
             run_unified_snapshot_and_dispatch(odds_file)
             last_snapshot_time = now
-            while any(
-                p["name"].startswith("dispatch")
-                or "unified_snapshot_generator" in p["name"]
-                for p in active_processes
-            ):
-                poll_active_processes()
-                logger.info(
-                    "⏳ Waiting for snapshot/dispatch scripts to complete..."
-                )
-                time.sleep(3)
             run_logger(odds_file)
             logger.info(
                 "🧼 [%s] Reconciling tracker after log pass", now_eastern()
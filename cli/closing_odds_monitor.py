@@ -50,6 +50,7 @@ from core.odds_fetcher import (
     fetch_market_odds_from_api,
     american_to_prob,
 )
+from core.events_index import get_events_index
 from core.consensus_pricer import get_paired_label
 from core.market_pricer import to_american_odds
 from core.utils import TEAM_NAME_TO_ABBR, TEAM_ABBR_TO_NAME, TEAM_ABBR
@@ -303,6 +304,14 @@ def attach_consensus_probs(consensus_odds):
             market[l2]["consensus_odds"] = round(to_american_odds(prob2), 2)
 
 
+def _fetch_events_index():
+    """Return the events index entries, raising so ``retry_api_call`` retries a failed fetch."""
+    entries = get_events_index().entries()
+    if entries is None:
+        raise RuntimeError("events request failed")
+    return entries
+
+
 def monitor_loop(poll_interval=600, target_date=None, force_game_id=None):
     """Continuously fetch closing odds for games on ``target_date``.
 
@@ -346,60 +355,31 @@ def monitor_loop(poll_interval=600, target_date=None, force_game_id=None):
         else:
             existing = {}
 
+        # Shared with fetch_consensus_for_single_game, so captures for several
+        # games in one window cost a single /events call.
         try:
-            resp = retry_api_call(
-                lambda: requests.get(
-                    "https://api.the-odds-api.com/v4/sports/baseball_mlb/events",
-                    params={"apiKey": os.getenv("ODDS_API_KEY")},
-                    timeout=10,
-                )
-            )
+            events_by_id = retry_api_call(_fetch_events_index)
         except Exception as e:
             logger.error("❌ Error fetching events: %s", e)
             time.sleep(poll_interval)
             continue
-        if resp.status_code != 200:
-            logger.error("❌ Error fetching events: %s", resp.text)
-            time.sleep(poll_interval)
-            continue
-        events = resp.json()
-
-        for event in events:
-            start_time = event.get("commence_time", "")
-            if not start_time:
-                continue
 
+        for gid, info in events_by_id.items():
             try:
-                game_time_utc = datetime.fromisoformat(
-                    start_time.replace("Z", "+00:00")
-                )
-                game_time = to_eastern(game_time_utc)
+                game_time = info["start"]
 
                 game_date = game_time.strftime("%Y-%m-%d")
                 if game_date != today:
                     if debug_mode:
                         logger.debug(
                             "⏩ Skipping %s@%s because game date %s != today %s",
-                            event['away_team'],
-                            event['home_team'],
+                            info["away"],
+                            info["home"],
                             game_date,
                             today,
                         )
                     continue
 
-                away_team_full = event["away_team"]
-                home_team_full = event["home_team"]
-
-                away_abbr = TEAM_ABBR.get(away_team_full, away_team_full.split()[-1])
-                home_abbr = TEAM_ABBR.get(home_team_full, home_team_full.split()[-1])
-
-                raw_id = extract_game_id_from_event(
-                    away_team_full,
-                    home_team_full,
-                    game_time,
-                )
-                gid = canonical_game_id(raw_id)
-
                 time_to_game = (game_time - now_est).total_seconds()
                 if debug_mode:
                     logger.debug("DEBUG: %s | time_to_game=%.2fs", gid, time_to_game)
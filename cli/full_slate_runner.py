@@ -36,6 +36,7 @@ Options:
   --days-ahead=INT         Look ahead days when listing games (default: 1)
   --export-folder=PATH     Override JSON export root folder
   --safe                   Skip games that fail to simulate instead of exiting
+  --use-scenarios          Serve pre-simulated lineup scenarios when they match
   --help                   Show this help message and exit
 
 Examples:
@@ -61,6 +62,7 @@ def parse_args():
     days_ahead = 1
     export_folder = None
     safe_mode = False
+    use_scenarios = False
 
     for arg in args:
         if arg == "--debug":
@@ -86,6 +88,8 @@ def parse_args():
             export_folder = arg.split("=", 1)[1]
         elif arg == "--safe":
             safe_mode = True
+        elif arg == "--use-scenarios":
+            use_scenarios = True
         else:
             date_arg = arg
 
@@ -101,6 +105,7 @@ def parse_args():
         days_ahead,
         export_folder,
         safe_mode,
+        use_scenarios,
     )
 
 # ----------------------------
@@ -116,6 +121,7 @@ def main():
         days_ahead,
         export_folder,
         safe_mode,
+        use_scenarios,
     ) = parse_args()
     logger.info("\n📅 Running full slate distribution for %s...\n", date_str)
 
@@ -151,6 +157,7 @@ def main():
                 edge_threshold=edge_threshold,
                 export_json=export_json,
                 n_simulations=10000,
+                use_scenarios=use_scenarios,
             )
             if export_json and debug:
                 logger.debug("💾 Exported simulation JSON to %s", export_json)
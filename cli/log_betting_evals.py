@@ -28,6 +28,7 @@ from core.market_snapshot_tracker import (
     load_latest_snapshot_tracker,
 )
 from core.snapshot_core import build_key
+from core.snapshot_store import TrackerView, get_snapshot_store
 from core.skip_reasons import SkipReason
 from core.utils import (
     safe_load_dict,
@@ -148,12 +149,9 @@ BASE_CSV_COLUMNS = [
 LOGGER_CONFIG = ""
 
 
-# Load tracker from the most recent snapshot
-MARKET_EVAL_TRACKER, SNAPSHOT_PATH_USED = load_latest_snapshot_tracker()
-if SNAPSHOT_PATH_USED:
-    print(f"📄 Snapshot File Used     : {SNAPSHOT_PATH_USED}")
-else:
-    print("📄 Snapshot File Used     : [Not found]")
+# Tracker over the most recent snapshot, parsed on first access
+MARKET_EVAL_TRACKER = TrackerView(lambda: get_snapshot_store().refresh().by_raw_side)
+SNAPSHOT_PATH_USED = None
 MARKET_EVAL_TRACKER_BEFORE_UPDATE = {}
 
 
@@ -318,8 +316,6 @@ from core.market_movement_tracker import (
 from core.book_whitelist import ALLOWED_BOOKS
 from core.format_utils import format_market_odds_and_roles
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
 
 
 # === Bookmaker Key to Discord Role Mapping (using real Discord Role IDs) ===
@@ -1478,7 +1474,7 @@ def write_to_csv(
         )
         print(f"    • Movement               : {movement.get('mkt_movement')}")
 
-        if isinstance(MARKET_EVAL_TRACKER_BEFORE_UPDATE, dict):
+        if isinstance(MARKET_EVAL_TRACKER_BEFORE_UPDATE, (dict, TrackerView)):
             print(
                 f"    • Tracker Source         : Snapshot-Based Tracker (Length: {len(MARKET_EVAL_TRACKER_BEFORE_UPDATE)})"
             )
@@ -2451,15 +2447,22 @@ def run_batch_logging(
     fallback_odds_path=None,
     force_log=False,
     no_save_skips=False,
+    snapshot_rows=None,
+    snapshot_path=None,
 ):
-    """Evaluate queued snapshot rows and log qualifying bets."""
+    """Evaluate queued snapshot rows and log qualifying bets.
+
+    ``snapshot_rows``/``snapshot_path`` let a caller that just wrote the
+    snapshot hand it over instead of having it re-read from disk; logged
+    flags are set on those rows in place.
+    """
     from collections import defaultdict
     import os, json
     from dotenv import load_dotenv
 
     load_dotenv()
 
-    global LOGGER_CONFIG, MARKET_EVAL_TRACKER_BEFORE_UPDATE
+    global LOGGER_CONFIG, MARKET_EVAL_TRACKER_BEFORE_UPDATE, SNAPSHOT_PATH_USED
     min_odds, max_odds = MIN_NEGATIVE_ODDS, MAX_POSITIVE_ODDS
     min_ev_pct = round(min_ev * 100, 2)
     LOGGER_CONFIG = (
@@ -2473,8 +2476,10 @@ def run_batch_logging(
     # Load snapshot rows
     # ------------------------------------------------------------------
     from core.snapshot_core import load_market_snapshot, find_latest_market_snapshot_path
-    snapshot_path = find_latest_market_snapshot_path()
-    snapshot_rows = load_market_snapshot(snapshot_path)
+    from core.snapshot_db import record_snapshot
+    if snapshot_rows is None:
+        snapshot_path = find_latest_market_snapshot_path()
+        snapshot_rows = load_market_snapshot(snapshot_path)
 
     if not snapshot_rows:
         logger.warning("⚠️ No snapshot rows found — aborting batch log")
@@ -2504,14 +2509,11 @@ def run_batch_logging(
     else:
         market_evals_df = pd.DataFrame()
 
-    # Load trackers
-    MARKET_EVAL_TRACKER.clear()
-    latest_tracker, _ = load_latest_snapshot_tracker()
-    MARKET_EVAL_TRACKER.update(latest_tracker)
-
-    MARKET_EVAL_TRACKER_BEFORE_UPDATE = {}
-    latest_tracker, tracker_snapshot = load_latest_snapshot_tracker()
-    MARKET_EVAL_TRACKER_BEFORE_UPDATE.update(latest_tracker)
+    # Load trackers: both views share one parse of the latest snapshot
+    MARKET_EVAL_TRACKER_BEFORE_UPDATE, tracker_snapshot = load_latest_snapshot_tracker()
+    MARKET_EVAL_TRACKER.rebase(MARKET_EVAL_TRACKER_BEFORE_UPDATE.base)
+    SNAPSHOT_PATH_USED = tracker_snapshot
+    print(f"📄 Snapshot File Used     : {tracker_snapshot or '[Not found]'}")
     if tracker_snapshot:
         print(
             f"📄 Loaded {len(MARKET_EVAL_TRACKER_BEFORE_UPDATE)} tracker rows from snapshot: {tracker_snapshot}"
@@ -2623,6 +2625,7 @@ def run_batch_logging(
             with open(tmp, "w") as f:
                 json.dump(snapshot_rows, f, indent=2)
             os.replace(tmp, snapshot_path)
+        record_snapshot(snapshot_rows, snapshot_path)
 
 
 def process_theme_logged_bets(
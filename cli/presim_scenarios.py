@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Pre-simulate lineup/starter what-if scenarios for a slate.
+
+Usage::
+
+    python cli/presim_scenarios.py [DATE] [--sims=2000] [--max-scenarios=5] [--no-weather]
+
+Prices for each scenario are written to ``backtest/scenarios/<date>/``. Once
+lineups are confirmed, ``run_distribution_simulator.py --use-scenarios`` (or
+``full_slate_runner.py --use-scenarios``) serves the matching scenario instead
+of running a fresh simulation.
+"""
+import sys
+import os
+from core.bootstrap import *  # noqa
+from core.config import DEBUG_MODE, VERBOSE_MODE
+from datetime import date
+
+from core.logger import get_logger
+logger = get_logger(__name__)
+
+from assets.probable_pitchers import fetch_probable_pitchers
+from assets.stats_loader import normalize_name
+from cli.run_distribution_simulator import build_sim_environment
+from core.calibration import load_calibration
+from core.data_loader import load_all_stats
+from core.game_asset_builder import build_game_assets, load_projected_lineups_from_csv
+from core.pricing_engine import MLBPricingEngine
+from core.scenario_sim import build_scenarios, run_scenarios, save_scenarios
+from core.utils import canonical_game_id, get_teams_from_game_id
+
+DEFAULT_SIMS = 2000
+DEFAULT_MAX_SCENARIOS = 5
+BENCH_DEPTH = 12
+
+
+def parse_args():
+    date_arg = None
+    n_sims = DEFAULT_SIMS
+    max_scenarios = DEFAULT_MAX_SCENARIOS
+    no_weather = False
+    for arg in sys.argv[1:]:
+        if arg == "--no-weather":
+            no_weather = True
+        elif arg.startswith("--sims="):
+            try:
+                n_sims = int(arg.split("=", 1)[1])
+            except ValueError:
+                pass
+        elif arg.startswith("--max-scenarios="):
+            try:
+                max_scenarios = int(arg.split("=", 1)[1])
+            except ValueError:
+                pass
+        else:
+            date_arg = arg
+    return date_arg or date.today().strftime("%Y-%m-%d"), n_sims, max_scenarios, no_weather
+
+
+def build_bench(game_id, projected, batter_stats):
+    """Return ``{"home": [...], "away": [...]}`` bench bats beyond the top 9."""
+    away, home = get_teams_from_game_id(game_id)
+    bench = {}
+    for side, team in (("home", home), ("away", away)):
+        extras = []
+        for b in projected.get(team, [])[9:]:
+            name = normalize_name(b.get("name", ""))
+            stats = batter_stats.get(name) or {}
+            extras.append(
+                {
+                    "name": name,
+                    "handedness": b.get("handedness", "R"),
+                    "k_rate": stats.get("k_rate", 0.22),
+                    "bb_rate": stats.get("bb_rate", 0.08),
+                    "iso": stats.get("iso", 0.150),
+                    "avg": stats.get("avg", 0.250),
+                    "woba": stats.get("woba", b.get("woba", 0.320)),
+                }
+            )
+        bench[side] = extras
+    return bench
+
+
+def main():
+    date_str, n_sims, max_scenarios, no_weather = parse_args()
+    logger.info("\n🧪 Pre-simulating scenarios for %s (%s sims each)...\n", date_str, n_sims)
+
+    matchups = fetch_probable_pitchers()
+    game_ids = sorted(canonical_game_id(gid) for gid in matchups if gid.startswith(date_str))
+    if not game_ids:
+        logger.error("❌ No games found for %s", date_str)
+        sys.exit(1)
+
+    batter_stats, pitcher_stats = load_all_stats()
+    projected = load_projected_lineups_from_csv(top_n=BENCH_DEPTH)
+    pricing_engine = MLBPricingEngine(load_calibration())
+
+    for gid in game_ids:
+        assets = build_game_assets(gid, batter_stats, pitcher_stats)
+        if assets is None:
+            logger.warning("⚠️ Skipping %s — asset build failed", gid)
+            continue
+        _, _, env = build_sim_environment(gid, no_weather=no_weather)
+        scenarios = build_scenarios(
+            assets, bench=build_bench(gid, projected, batter_stats), max_scenarios=max_scenarios
+        )
+        results = run_scenarios(gid, assets, env, scenarios, n_sims, pricing_engine)
+        path = save_scenarios(gid, results)
+        logger.info("💾 %s scenarios for %s → %s", len(results), gid, path)
+
+
+if __name__ == "__main__":
+    main()
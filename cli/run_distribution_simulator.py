@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # cli/run_distribution_simulator.py
 # Fully revised script: simulates run distributions, builds derivative segments,
-# provides CLI with --debug, --no-weather, --edge-threshold, --export-json, and --list
+# provides CLI with --debug, --no-weather, --edge-threshold, --export-json, --perf-log, --use-scenarios, and --list
 # Source base: run_distribution_simulator.py citeturn0file0
 
 from core.config import DEBUG_MODE, VERBOSE_MODE
@@ -12,15 +12,15 @@ from core.bootstrap import *  # noqa
 import json
 import numpy as np
 import tempfile
-import matplotlib.pyplot as plt
 from collections import Counter
 from datetime import datetime
 
 from core.logger import get_logger
 logger = get_logger(__name__)
 
-from core.game_simulator import simulate_game
-from core.pricing_engine import MLBPricingEngine
+from core.game_simulator import count_plate_appearances, simulate_game
+from core.pricing_engine import BENCHMARK_TOTALS, MARKET_LINES, MLBPricingEngine
+from core.calibration import load_calibration
 
 SNAPSHOT_PATH = os.path.join("backtest", "last_table_snapshot.json")
 from core.game_asset_builder import build_game_assets
@@ -45,10 +45,19 @@ from core.utils import (
     TEAM_NAME_TO_ABBR,
     normalize_label_for_odds,
     safe_load_json,
-    safe_load_dict,
     game_id_to_dt,
 )
 from core.scaling_utils import scale_distribution
+from core.odds_reader import load_market_odds
+from core.perf import PerfRecorder, append_perf_log
+from core.parametric_pricer import (
+    fit_segment_model,
+    joint_pmf,
+    price_total,
+    price_spread,
+    price_team_total,
+    price_moneyline,
+)
 
 
 N_SIMULATIONS = 10000
@@ -57,15 +66,20 @@ N_SIMULATIONS = 10000
 _MARKET_ODDS_CACHE: dict[str, dict | None] = {}
 
 
-def _load_market_odds(date_str: str) -> dict | None:
-    """Load market odds JSON for ``date_str`` once and cache the result."""
+def _load_market_odds(date_str: str, game_ids=None) -> dict | None:
+    """Return market odds for ``date_str``, reading its file once per process.
+
+    The whole slate is parsed on first use, so a full-slate run reads the
+    file once rather than once per game. With ``game_ids`` only those
+    entries are returned.
+    """
     if date_str not in _MARKET_ODDS_CACHE:
         path = os.path.join("data", "market_odds", f"{date_str}.json")
-        if os.path.exists(path):
-            _MARKET_ODDS_CACHE[date_str] = safe_load_dict(path)
-        else:
-            _MARKET_ODDS_CACHE[date_str] = None
-    return _MARKET_ODDS_CACHE[date_str]
+        _MARKET_ODDS_CACHE[date_str] = load_market_odds(path) if os.path.exists(path) else None
+    odds = _MARKET_ODDS_CACHE[date_str]
+    if odds is None or game_ids is None:
+        return odds
+    return {gid: odds[gid] for gid in game_ids if gid in odds}
 
 
 def percent_in_range(scores, low=2, high=9):
@@ -121,8 +135,9 @@ def extract_universal_markets(game_id, full_game_market, derivative_segments, ru
         entries.append(build_entry("h2h", team, obj["prob"], obj["odds"]))  # team already abbreviated
 
     # === Spreads (Runlines)
+    spread_lines = MARKET_LINES["full_game"]["spread_lines"]
     for team_abbr in [away, home]:
-        for line in [-2.5, -1.5, -0.5, 0.5, 1.5, 2.5]:
+        for line in sorted([-l for l in spread_lines] + spread_lines):
             label = normalize_label_for_odds(team_abbr, "spreads", line)
             lookup_key = f"{team_abbr} {'+' if line > 0 else ''}{line}"
             spread_data = full_game_market.get("runline", {}).get(lookup_key, {})
@@ -132,7 +147,7 @@ def extract_universal_markets(game_id, full_game_market, derivative_segments, ru
 
     # === Totals
     if run_distribution is not None:
-        for line in [x / 2 for x in range(13, 26)]:  # 6.5 to 12.5
+        for line in MARKET_LINES["full_game"]["total_lines"]:
             for side in ["Over", "Under"]:
                 label = f"{side} {line}"
                 prob = calculate_tail_probability(run_distribution, line, direction=side.lower())
@@ -196,45 +211,56 @@ def extract_universal_markets(game_id, full_game_market, derivative_segments, ru
     return entries
 
 
-def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_threshold=None, export_json=None, n_simulations=10000):
-    from core.market_pricer import to_american_odds
+def build_sim_environment(game_id, no_weather=False):
+    """Return ``(park_name, weather_profile, env)`` for ``game_id``."""
+    park_name = get_park_name(game_id)
+    park_factors = get_park_factors(park_name)
+    cache_path = f"data/weather_cache/{park_name.replace(' ', '_')}.json"
+    if not no_weather:
+        try:
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, "r", encoding="utf-8") as f:
+                        weather_profile = json.load(f)
+                    if not isinstance(weather_profile, dict):
+                        raise ValueError("Unexpected JSON structure")
+                except Exception as e:
+                    print(f"[WARN] Failed to load cached weather: {e}")
+                    weather_profile = get_noaa_weather(park_name)
+            else:
+                weather_profile = get_noaa_weather(park_name)
 
-    benchmark_totals = {
-        "full_game": {
-            "mean_total": 9.00,
-            "std_total": 4.30,
-            "mean_diff": 0.00,
-            "std_diff": 4.30
-        },
-        "f1": {
-            "mean_total": 1.05,
-            "std_total": 1.55,
-            "mean_diff": 0.00,
-            "std_diff": 1.55
-        },
-        "f3": {
-            "mean_total": 3.30,
-            "std_total": 2.70,
-            "mean_diff": 0.00,
-            "std_diff": 2.70
-        },
-        "f5": {
-            "mean_total": 5.40,
-            "std_total": 3.35,
-            "mean_diff": 0.00,
-            "std_diff": 3.35
-        },
-        "f7": {
-            "mean_total": 7.25,
-            "std_total": 3.85,
-            "mean_diff": 0.00,
-            "std_diff": 3.85
-        }
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(weather_profile, f, indent=2)
+        except Exception:
+            weather_profile = {"wind_direction": "none", "wind_speed": 0, "temperature": 70, "humidity": 50}
+    else:
+        weather_profile = {"wind_direction": "none", "wind_speed": 0, "temperature": 70, "humidity": 50}
+
+    weather_hr_mult = get_weather_hr_mult(weather_profile)
+    weather_multipliers = compute_weather_multipliers(weather_profile)
+
+    env = {
+        "park_hr_mult": park_factors["hr_mult"],
+        "single_mult": park_factors["single_mult"],
+        "weather_hr_mult": weather_hr_mult,
+        "adi_mult": weather_multipliers["adi_mult"],
+        "umpire": {"K": 1.0, "BB": 1.0}
     }
+    return park_name, weather_profile, env
+
+
+def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_threshold=None, export_json=None, n_simulations=10000, parametric_segments=False, perf_log=False, use_scenarios=False):
+    from core.market_pricer import to_american_odds
+
+    benchmark_totals = BENCHMARK_TOTALS
 
 
     game_id = canonical_game_id(game_id)
     print(f"\n🔁 Simulating {n_simulations} games for {game_id} (Line: {line})...\n")
+    perf = PerfRecorder("simulate_distribution", game_id=game_id, n_simulations=n_simulations)
+    perf.start("assets")
 
     parts = parse_game_id(game_id)
     away_abbr = parts["away"]
@@ -243,7 +269,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     if game_date > datetime.today().strftime("%Y-%m-%d"):
         print(f"[📅] Simulating a future game — projected lineups may be used.")
 
-    odds_data = _load_market_odds(game_date)
+    odds_data = _load_market_odds(game_date, {game_id, base_game_id(game_id)})
     start_time_iso = None
     if isinstance(odds_data, dict):
         entry = odds_data.get(game_id) or odds_data.get(base_game_id(game_id))
@@ -270,6 +296,17 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     home_bullpen = assets.get("bullpens", {}).get("home", [])
     away_bullpen = assets.get("bullpens", {}).get("away", [])
 
+    date_tag = "-".join(game_id.split("-")[:3])
+    target_path = export_json or os.path.join("backtest", "sims", date_tag, f"{game_id}.json")
+    if use_scenarios:
+        # Confirmed lineups matching a pre-simulated scenario skip the full run
+        from core.scenario_sim import serve_scenario
+
+        served = serve_scenario(game_id, lineups, pitcher_data, target_path, start_time_iso=start_time_iso)
+        if served:
+            print(f"\n💾 Served pre-simulated scenario → {served}")
+            return
+
     print("\n🔍 Pitcher Enrichment Check")
     for side in ["home", "away"]:
         p = pitcher_data[side]
@@ -311,44 +348,12 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
                 print(f"    - {name:20} | ⚠️  Fallbacks used: {', '.join(fallback_keys)}")
             else:
                 print(f"    - {name:20} | ✅ OK")
+    perf.stop("assets")
 
 
     # Environment
-    park_name = get_park_name(game_id)
-    park_factors = get_park_factors(park_name)
-    cache_path = f"data/weather_cache/{park_name.replace(' ', '_')}.json"
-    if not no_weather:
-        try:
-            if os.path.exists(cache_path):
-                try:
-                    with open(cache_path, "r", encoding="utf-8") as f:
-                        weather_profile = json.load(f)
-                    if not isinstance(weather_profile, dict):
-                        raise ValueError("Unexpected JSON structure")
-                except Exception as e:
-                    print(f"[WARN] Failed to load cached weather: {e}")
-                    weather_profile = get_noaa_weather(park_name)
-            else:
-                weather_profile = get_noaa_weather(park_name)
-
-            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(weather_profile, f, indent=2)
-        except Exception:
-            weather_profile = {"wind_direction": "none", "wind_speed": 0, "temperature": 70, "humidity": 50}
-    else:
-        weather_profile = {"wind_direction": "none", "wind_speed": 0, "temperature": 70, "humidity": 50}
-
-    weather_hr_mult = get_weather_hr_mult(weather_profile)
-    weather_multipliers = compute_weather_multipliers(weather_profile)
-
-    env = {
-        "park_hr_mult": park_factors["hr_mult"],
-        "single_mult": park_factors["single_mult"],
-        "weather_hr_mult": weather_hr_mult,
-        "adi_mult": weather_multipliers["adi_mult"],
-        "umpire": {"K": 1.0, "BB": 1.0}
-    }
+    with perf.phase("weather"):
+        park_name, weather_profile, env = build_sim_environment(game_id, no_weather=no_weather)
 
     print("\n📦 Simulation Environment Config:")
     print(f"  Park: {park_name}")
@@ -358,12 +363,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     print(f"  Starters: {away_abbr} → {pitcher_data['away']['name']} | {home_abbr} → {pitcher_data['home']['name']}")
 
     # Load calibration
-    try:
-        with open("logs/calibration_offset.json", "r", encoding="utf-8") as f:
-            calibration = json.load(f)
-    except Exception as e:
-        print(f"\u26A0\uFE0F Failed to load calibration_offset.json: {e}")
-        calibration = {}
+    calibration = load_calibration()
 
     if not calibration:
         print(
@@ -372,7 +372,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
     pricing_engine = MLBPricingEngine(calibration)
 
-    print(f"\n🔧 Calibration Loaded:")
+    print(f"\n🔧 Calibration Loaded (version: {pricing_engine.calibration_version or 'unversioned'}):")
     print(f"   - Run Scaling:     x{pricing_engine.run_scaling_factor:.4f}")
     print(f"   - StdDev Scaling:  x{pricing_engine.stddev_scaling_factor:.4f}")
     print(f"   - RunDiff Scaling: x{pricing_engine.run_diff_scaling_factor:.4f}")
@@ -385,27 +385,30 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
     # Run simulations
     raw_home_scores, raw_away_scores, all_results = [], [], []
-    for i in range(n_simulations):
-        result = simulate_game(
-            home_lineup=lineups["home"],
-            away_lineup=lineups["away"],
-            home_pitcher=pitcher_data["home"],
-            away_pitcher=pitcher_data["away"],
-            env=env,
-            home_bullpen=home_bullpen,
-            away_bullpen=away_bullpen,
-            use_noise=True
-        )
-        raw_home_scores.append(result["home_score"])
-        raw_away_scores.append(result["away_score"])
-        all_results.append(result)
-
-        if i < 5:
-            print(f"\n🧪 Simulation #{i + 1}")
-            print(f"  ➤ Score: {away_abbr} {result['away_score']} — {home_abbr} {result['home_score']}")
-            print(f"  ➤ Innings played: {len(result['innings'])}")
-            print(f"  ➤ Away relievers used: {', '.join(result.get('used_away_relievers', [])) or 'None'}")
-            print(f"  ➤ Home relievers used: {', '.join(result.get('used_home_relievers', [])) or 'None'}")
+    with perf.phase("simulation"):
+        for i in range(n_simulations):
+            result = simulate_game(
+                home_lineup=lineups["home"],
+                away_lineup=lineups["away"],
+                home_pitcher=pitcher_data["home"],
+                away_pitcher=pitcher_data["away"],
+                env=env,
+                home_bullpen=home_bullpen,
+                away_bullpen=away_bullpen,
+                use_noise=True
+            )
+            raw_home_scores.append(result["home_score"])
+            raw_away_scores.append(result["away_score"])
+            all_results.append(result)
+
+            if i < 5:
+                print(f"\n🧪 Simulation #{i + 1}")
+                print(f"  ➤ Score: {away_abbr} {result['away_score']} — {home_abbr} {result['home_score']}")
+                print(f"  ➤ Innings played: {len(result['innings'])}")
+                print(f"  ➤ Away relievers used: {', '.join(result.get('used_away_relievers', [])) or 'None'}")
+                print(f"  ➤ Home relievers used: {', '.join(result.get('used_home_relievers', [])) or 'None'}")
+    perf.count("sims", len(all_results))
+    perf.count("plate_appearances", sum(count_plate_appearances(r) for r in all_results))
 
     # 🔁 Track reliever usage
     reliever_usage = {"home": {}, "away": {}}
@@ -429,6 +432,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
             print(f"    - {name:20} → {pct:.1f}% of sims")
 
     # Extract raw segment scores before calibration
+    perf.start("scaling")
     segment_raw = {}
     for cap, key in [(1, "f1"), (3, "f3"), (5, "f5"), (7, "f7")]:
         home_seg = [sum(inn["home_runs"] for inn in r["innings"] if inn["inning"] <= cap) for r in all_results]
@@ -468,14 +472,9 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
             "std": float(np.std(data["diff"])),
         }
 
-    scaled_totals = scale_distribution(
-        raw_totals,
-        target_mean=benchmark_totals["full_game"]["mean_total"],
-        target_sd=benchmark_totals["full_game"]["std_total"],
-    )
-    scaled_diffs = scale_distribution(
-        raw_diffs,
-        target_sd=benchmark_totals["full_game"]["std_total"],
+    # Shared with core.scenario_sim so pre-simulated prices match a fresh run
+    scaled_totals, scaled_diffs, home_scores, away_scores = pricing_engine.scale_full_game(
+        raw_home_scores, raw_away_scores, benchmark=benchmark_totals["full_game"]
     )
     scaled_distributions = {
         "totals": {
@@ -501,12 +500,6 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
         f"Raw SD: {np.std(raw_distributions['run_diffs']['values']):.2f} → Scaled SD: {np.std(scaled_distributions['run_diffs']['values']):.2f}"
     )
 
-    home_scores = [(t + d) / 2 for t, d in zip(scaled_totals, scaled_diffs)]
-    away_scores = [(t - d) / 2 for t, d in zip(scaled_totals, scaled_diffs)]
-    home_scores = pricing_engine.apply_team_total_scaling(home_scores, is_home=True)
-    away_scores = pricing_engine.apply_team_total_scaling(away_scores, is_home=False)
-    home_scores = [round(x, 1) for x in home_scores]
-    away_scores = [round(x, 1) for x in away_scores]
 
     # Print basic summary
     print(f"\n🎯 Scaled Output:")
@@ -536,10 +529,13 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
         },
     }
 
+    perf.stop("scaling")
+
     # === Build Full-Game Market with Alt Lines ===
+    perf.start("market_build")
     runline_dict = {}
-    spread_lines = [-2.5, -1.5, -0.5, 0.5, 1.5, 2.5]
-    for line in spread_lines:
+    full_game_lines = MARKET_LINES["full_game"]
+    for line in full_game_lines["spread_lines"]:
         # Home -line (covering spread)
         prob_home_minus = calculate_tail_probability(run_diff_pmf, line, direction="over")
         prob_away_plus = 1 - prob_home_minus
@@ -569,7 +565,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
 
     total_dict = {}
-    for line in [x / 2 for x in range(13, 26)]:  # 6.5 to 12.5
+    for line in full_game_lines["total_lines"]:
         over = calculate_tail_probability(run_pmf_rounded, line, direction="over")
         under = 1 - over
         if line % 1 == 0:
@@ -605,7 +601,7 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     full_home_scores = home_scores
     full_away_scores = away_scores
 
-    for line in [1.5, 2.5, 3.5, 4.5, 5.5, 6.5]:
+    for line in full_game_lines["team_total_lines"]:
         for team_abbr, scores in [(home_abbr, full_home_scores), (away_abbr, full_away_scores)]:
             pmf = summarize_pmf(np.round(scores).astype(int))
             p_over = calculate_tail_probability(pmf, line, direction="over")
@@ -641,33 +637,12 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
     # === Derivative Segments with Alt Lines ===
     derivative_segments = {}
+    segment_models = {}
     segment_configs = {
-        "F1": {
-            "label": "1st Inning",
-            "innings": 1,
-            "total_lines": [0.5]
-        },
-        "F3": {
-            "label": "First 3 Innings",
-            "innings": 3,
-            "total_lines": [2.5, 3.5, 4.5],
-            "spread_lines": [0.5, 1.5, 2.5],
-            "team_total_lines": [0.5, 1.5, 2.5, 3.5]
-        },
-        "F5": {
-            "label": "First 5 Innings",
-            "innings": 5,
-            "total_lines": [3.5, 4.5, 5.5, 6.5],
-            "spread_lines": [0.5, 1.5, 2.5],
-            "team_total_lines": [1.5, 2.5, 3.5, 4.5, 5.5]
-        },
-        "F7": {
-            "label": "First 7 Innings",
-            "innings": 7,
-            "total_lines": [5.5, 6.5, 7.5, 8.5],
-            "spread_lines": [0.5, 1.5, 2.5],
-            "team_total_lines": [2.5, 3.5, 4.5, 5.5, 6.5]
-        }
+        "F1": {"label": "1st Inning", "innings": 1, **MARKET_LINES["f1"]},
+        "F3": {"label": "First 3 Innings", "innings": 3, **MARKET_LINES["f3"]},
+        "F5": {"label": "First 5 Innings", "innings": 5, **MARKET_LINES["f5"]},
+        "F7": {"label": "First 7 Innings", "innings": 7, **MARKET_LINES["f7"]},
     }
 
 
@@ -729,24 +704,43 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
             f"Raw SD: {np.std(raw_distributions[f'run_diffs_{seg_key_name}']["values"]):.2f} → Scaled SD: {np.std(scaled_distributions[f'run_diffs_{seg_key_name}']["values"]):.2f}"
         )
 
+        # Optional parametric model replaces empirical tail counts
+        seg_joint = None
+        if parametric_segments:
+            seg_model = fit_segment_model(
+                segment_raw[seg_id]["home"],
+                segment_raw[seg_id]["away"],
+                **pricing_engine.segment_targets(seg_id),
+            )
+            segment_models[seg_key_name] = seg_model
+            seg_joint = joint_pmf(seg_model)
+            print(f"📐 Parametric model {seg_key_name}: {seg_model}")
+
         totals = {}
         for line in config.get("total_lines", []):
-            over_prob = calculate_tail_probability(pmf_total_seg, line, direction="over")
-            under_prob = 1 - over_prob
+            if seg_joint is not None:
+                over_prob = price_total(seg_joint, line, "Over")
+                under_prob = price_total(seg_joint, line, "Under")
+            else:
+                over_prob = calculate_tail_probability(pmf_total_seg, line, direction="over")
+                under_prob = 1 - over_prob
             totals[f"Over {line}"] = {"prob": round(over_prob, 4), "fair_odds": to_american_odds(over_prob)}
             totals[f"Under {line}"] = {"prob": round(under_prob, 4), "fair_odds": to_american_odds(under_prob)}
         seg["markets"]["totals"] = totals
 
         if seg_key == "F1":
             # Special case: "Score in 1st inning"
-            p = calculate_tail_probability(pmf_total_seg, 0.5, direction="over")
+            if seg_joint is not None:
+                p = price_total(seg_joint, 0.5, "Over")
+            else:
+                p = calculate_tail_probability(pmf_total_seg, 0.5, direction="over")
             seg["markets"]["totals"] = {
                 "Over 0.5": {"prob": p, "fair_odds": to_american_odds(p)},
                 "Under 0.5": {"prob": 1 - p, "fair_odds": to_american_odds(1 - p)}
             }
         else:
             # Moneyline
-            ml = stats["moneyline"]
+            ml = price_moneyline(seg_joint) if seg_joint is not None else stats["moneyline"]
             seg["markets"]["moneyline"] = {
                 home_abbr: {"prob": ml["home"], "fair_odds": to_american_odds(ml["home"])},
                 away_abbr: {"prob": ml["away"], "fair_odds": to_american_odds(ml["away"])}
@@ -756,8 +750,12 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
             spreads = {}
             for line in config.get("spread_lines", []):
                 # Home -line
-                prob_home_minus = calculate_tail_probability(pmf_diff_seg, line, direction="over")
-                prob_away_plus = 1 - prob_home_minus
+                if seg_joint is not None:
+                    prob_home_minus = price_spread(seg_joint, -line, is_home=True)
+                    prob_away_plus = price_spread(seg_joint, line, is_home=False)
+                else:
+                    prob_home_minus = calculate_tail_probability(pmf_diff_seg, line, direction="over")
+                    prob_away_plus = 1 - prob_home_minus
 
                 spreads[f"{home_abbr} -{line}"] = {
                     "prob": round(prob_home_minus, 4),
@@ -769,8 +767,12 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
                 }
 
                 # Away -line
-                prob_away_minus = calculate_tail_probability(pmf_diff_seg, -line, direction="under")
-                prob_home_plus = 1 - prob_away_minus
+                if seg_joint is not None:
+                    prob_away_minus = price_spread(seg_joint, -line, is_home=False)
+                    prob_home_plus = price_spread(seg_joint, line, is_home=True)
+                else:
+                    prob_away_minus = calculate_tail_probability(pmf_diff_seg, -line, direction="under")
+                    prob_home_plus = 1 - prob_away_minus
 
                 spreads[f"{away_abbr} -{line}"] = {
                     "prob": round(prob_away_minus, 4),
@@ -793,9 +795,14 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
             for line in config.get("team_total_lines", []):
                 for team_abbr, scores in [(home_abbr, home_scores), (away_abbr, away_scores)]:
-                    pmf = summarize_pmf(np.round(scores).astype(int))
-                    p_over = calculate_tail_probability(pmf, line, direction="over")
-                    p_under = 1 - p_over
+                    if seg_joint is not None:
+                        is_home = team_abbr == home_abbr
+                        p_over = price_team_total(seg_joint, line, "Over", is_home=is_home)
+                        p_under = price_team_total(seg_joint, line, "Under", is_home=is_home)
+                    else:
+                        pmf = summarize_pmf(np.round(scores).astype(int))
+                        p_over = calculate_tail_probability(pmf, line, direction="over")
+                        p_under = 1 - p_over
                     over_label = normalize_label_for_odds(f"{team_abbr} Over", "team_totals", line)
                     under_label = normalize_label_for_odds(f"{team_abbr} Under", "team_totals", line)
                     team_totals[over_label] = {
@@ -811,12 +818,13 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
 
 
         derivative_segments[label] = seg
+    perf.stop("market_build")
 
     # === Output JSON ===
-    date_tag = "-".join(game_id.split("-")[:3])
-    target_path = export_json or os.path.join("backtest", "sims", date_tag, f"{game_id}.json")
 
-    # 📊 Segment-level summaries
+    # 📊 Segment-level summaries (team-total scaling, timed with the rest of it)
+    perf.start("scaling")
+
     def inning_summary(inning_cap, label, benchmark=None):
         home = [sum(inn["home_runs"] for inn in r["innings"] if inn["inning"] <= inning_cap) for r in all_results]
         away = [sum(inn["away_runs"] for inn in r["innings"] if inn["inning"] <= inning_cap) for r in all_results]
@@ -831,13 +839,16 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     summary_f5, home_f5, away_f5 = inning_summary(5, "First 5 Innings", benchmark=benchmark_totals["f5"])
     summary_f7, home_f7, away_f7 = inning_summary(7, "First 7 Innings", benchmark=benchmark_totals["f7"])
 
+    perf.stop("scaling")
+
     # ✅ Extract markets into memory first
-    markets_debug = extract_universal_markets(
-        game_id,
-        full_game_market,
-        derivative_segments,
-        run_distribution=run_pmf_rounded
-    )
+    with perf.phase("market_extract"):
+        markets_debug = extract_universal_markets(
+            game_id,
+            full_game_market,
+            derivative_segments,
+            run_distribution=run_pmf_rounded
+        )
 
     print(f"\n🧪 Market Entries Extracted: {len(markets_debug)}")
 
@@ -860,13 +871,26 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
             "f7": summary_f7
         }
     }
+    if segment_models:
+        # Lets downstream consumers price segment lines outside the fixed grids
+        output["segment_models"] = segment_models
+
+    # Export time and bytes written are only known after the dump, so they
+    # appear in the perf log stream rather than in this metadata block.
+    sims_per_sec = perf.rate("sims", "simulation")
+    output["perf"] = {
+        **perf.as_dict(),
+        "sims_per_sec": round(sims_per_sec, 2) if sims_per_sec else None,
+    }
 
     # ✅ Save output atomically
-    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(target_path), delete=False, suffix=".tmp") as tmpf:
-        json.dump(output, tmpf, indent=2)
-        temp_path = tmpf.name
-    os.replace(temp_path, target_path)
+    with perf.phase("export"):
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(target_path), delete=False, suffix=".tmp") as tmpf:
+            json.dump(output, tmpf, indent=2)
+            temp_path = tmpf.name
+        os.replace(temp_path, target_path)
+    perf.count("bytes_written", os.path.getsize(target_path))
 
     # Write simplified snapshot for downstream comparison
     snapshot_dict = {
@@ -882,6 +906,9 @@ def simulate_distribution(game_id, line, debug=False, no_weather=False, edge_thr
     print_fatigue_summary(pitcher_data["away"], f"{pitcher_data['away']['name']} (Away Starter)")
 
     print(f"\n💾 Saved simulation output → {target_path}")
+    print(perf.summary())
+    if perf_log:
+        append_perf_log({**perf.as_dict(), "sims_per_sec": output["perf"]["sims_per_sec"]})
 
 
 
@@ -936,6 +963,9 @@ def resolve_game_id_from_args():
     args = sys.argv[1:]
     debug = "--debug" in args
     no_weather = "--no-weather" in args
+    parametric_segments = "--parametric-segments" in args
+    perf_log = "--perf-log" in args
+    use_scenarios = "--use-scenarios" in args
     export_json = None
     export_folder = "backtest/sims"  # default folder path
     edge_threshold = None
@@ -964,16 +994,16 @@ def resolve_game_id_from_args():
     # ✅ Full slate mode (by date)
     if "--mode" in args and "full_slate" in args:
         if len(cleaned) >= 1 and re.match(r"^\d{4}-\d{2}-\d{2}$", cleaned[0]):
-            return cleaned[0], debug, no_weather, 9.5, edge_threshold, export_json, export_folder
+            return cleaned[0], debug, no_weather, 9.5, edge_threshold, export_json, export_folder, parametric_segments, perf_log, use_scenarios
         else:
             today = str(datetime.date.today())
-            return today, debug, no_weather, 9.5, edge_threshold, export_json, export_folder
+            return today, debug, no_weather, 9.5, edge_threshold, export_json, export_folder, parametric_segments, perf_log, use_scenarios
 
     # ✅ Distribution mode (expects game ID + optional line)
     gid = cleaned[0] if cleaned else None
     line = float(cleaned[1]) if len(cleaned) > 1 else 9.5
 
-    return gid, debug, no_weather, line, edge_threshold, export_json, export_folder
+    return gid, debug, no_weather, line, edge_threshold, export_json, export_folder, parametric_segments, perf_log, use_scenarios
 
 
 
@@ -1005,7 +1035,7 @@ def compute_partial_derivatives(all_results, innings_range):
 # MAIN ENTRYPOINT
 # ----------------------------
 if __name__ == "__main__":
-    gid, debug, no_weather, line, edge_threshold, export_json, export_folder = resolve_game_id_from_args()
+    gid, debug, no_weather, line, edge_threshold, export_json, export_folder, parametric_segments, perf_log, use_scenarios = resolve_game_id_from_args()
 
     simulate_distribution(
         game_id=gid,
@@ -1013,5 +1043,8 @@ if __name__ == "__main__":
         debug=debug,
         no_weather=no_weather,
         edge_threshold=edge_threshold,
-        export_json=export_json
+        export_json=export_json,
+        parametric_segments=parametric_segments,
+        perf_log=perf_log,
+        use_scenarios=use_scenarios,
     )
\ No newline at end of file
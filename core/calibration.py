@@ -0,0 +1,277 @@
+"""Fit pricing calibration factors from stored simulation arrays.
+
+Every factor read by :class:`core.pricing_engine.MLBPricingEngine` is fitted in
+one pass from the ``raw_distributions`` arrays written by
+``cli/run_distribution_simulator.py`` and a CSV of final game scores. The
+result is written as a versioned calibration file.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from core.logger import get_logger
+from core.pricing_engine import MLBPricingEngine
+from core.utils import canonical_game_id
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "CALIBRATION_PATH",
+    "CALIBRATION_ARCHIVE_DIR",
+    "SEGMENT_KEYS",
+    "load_calibration",
+    "load_sim_arrays",
+    "load_game_outcomes",
+    "fit_calibration",
+    "save_calibration",
+]
+
+CALIBRATION_PATH = os.path.join("logs", "calibration_offset.json")
+CALIBRATION_ARCHIVE_DIR = os.path.join("logs", "calibration")
+SIM_ROOT = os.path.join("backtest", "sims")
+
+# Segment id → suffix used in ``raw_distributions`` keys
+SEGMENT_KEYS = {
+    "f1": "1st_1_innings",
+    "f3": "1st_3_innings",
+    "f5": "1st_5_innings",
+    "f7": "1st_7_innings",
+}
+
+_EPS = 1e-9
+
+
+def load_calibration(path: str = CALIBRATION_PATH) -> dict:
+    """Return the calibration dict stored at ``path`` or ``{}`` on failure."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception as e:
+        logger.warning("⚠️ Failed to load calibration from %s: %s", path, e)
+        return {}
+
+
+def load_sim_arrays(sim_root: str = SIM_ROOT, dates: list[str] | None = None) -> dict:
+    """Return ``{game_id: {"totals": arr, "diffs": arr, "f5_totals": ...}}``.
+
+    Only the raw (pre-scaling) sample arrays are kept. Games without a
+    ``raw_distributions`` block are skipped.
+    """
+    arrays: dict[str, dict] = {}
+    if not os.path.isdir(sim_root):
+        logger.warning("❌ Sim directory not found: %s", sim_root)
+        return arrays
+
+    folders = dates or sorted(os.listdir(sim_root))
+    for date_str in folders:
+        folder = os.path.join(sim_root, date_str)
+        if not os.path.isdir(folder):
+            continue
+        for fname in os.listdir(folder):
+            if not fname.endswith(".json"):
+                continue
+            path = os.path.join(folder, fname)
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    raw = json.load(fh).get("raw_distributions") or {}
+            except Exception as e:
+                logger.warning("❌ Failed to load %s: %s", path, e)
+                continue
+            totals = (raw.get("totals") or {}).get("values")
+            diffs = (raw.get("run_diffs") or {}).get("values")
+            if not totals or not diffs:
+                continue
+            entry = {
+                "totals": np.asarray(totals, dtype=float),
+                "diffs": np.asarray(diffs, dtype=float),
+            }
+            for seg_id, suffix in SEGMENT_KEYS.items():
+                seg_totals = (raw.get(f"totals_{suffix}") or {}).get("values")
+                seg_diffs = (raw.get(f"run_diffs_{suffix}") or {}).get("values")
+                if seg_totals and seg_diffs:
+                    entry[f"{seg_id}_totals"] = np.asarray(seg_totals, dtype=float)
+                    entry[f"{seg_id}_diffs"] = np.asarray(seg_diffs, dtype=float)
+            arrays[canonical_game_id(fname[:-5])] = entry
+    return arrays
+
+
+def load_game_outcomes(path: str) -> dict:
+    """Return ``{game_id: {"home": h, "away": a, "f5_home": ...}}`` from ``path``.
+
+    The CSV must provide ``game_id``, ``home_score`` and ``away_score``.
+    Optional ``home_f1``/``away_f1`` … ``home_f7``/``away_f7`` columns supply
+    segment scores.
+    """
+    outcomes: dict[str, dict] = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                entry = {
+                    "home": float(row["home_score"]),
+                    "away": float(row["away_score"]),
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+            for seg_id in SEGMENT_KEYS:
+                try:
+                    entry[f"{seg_id}_home"] = float(row[f"home_{seg_id}"])
+                    entry[f"{seg_id}_away"] = float(row[f"away_{seg_id}"])
+                except (KeyError, TypeError, ValueError):
+                    pass
+            outcomes[canonical_game_id(row.get("game_id", ""))] = entry
+    return outcomes
+
+
+def _moments(samples: list[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Return per-game ``(mean, std)`` vectors for a list of sample arrays."""
+    lengths = {len(s) for s in samples}
+    if len(lengths) == 1:
+        # Equal sim counts → one (games × sims) matrix
+        mat = np.vstack(samples)
+        return mat.mean(axis=1), mat.std(axis=1)
+    return (
+        np.array([s.mean() for s in samples]),
+        np.array([s.std() for s in samples]),
+    )
+
+
+def _fit_mean_factor(actual: np.ndarray, sim_mean: np.ndarray) -> float:
+    """Least-squares factor ``k`` minimizing ``sum((actual - k * sim_mean) ** 2)``."""
+    denom = float(np.dot(sim_mean, sim_mean))
+    return float(np.dot(actual, sim_mean) / denom) if denom > 0 else 1.0
+
+
+def _fit_spread_factor(actual: np.ndarray, center: np.ndarray, sd: np.ndarray) -> float:
+    """Return the factor that gives standardized residuals unit variance."""
+    mask = sd > _EPS
+    if not mask.any():
+        return 1.0
+    z = (actual[mask] - center[mask]) / sd[mask]
+    return float(np.sqrt(np.mean(z**2)))
+
+
+def _fit_logit(p_sim: np.ndarray, won: np.ndarray, iters: int = 25) -> tuple[float, float]:
+    """Fit ``logit(p) = a + b * logit(p_sim)`` by Newton/IRLS on outcomes."""
+    p = np.clip(p_sim, 1e-4, 1 - 1e-4)
+    X = np.column_stack([np.ones_like(p), np.log(p / (1 - p))])
+    beta = np.array([0.0, 1.0])
+    for _ in range(iters):
+        eta = X @ beta
+        mu = 1.0 / (1.0 + np.exp(-eta))
+        w = mu * (1 - mu)
+        hess = X.T @ (X * w[:, None]) + 1e-6 * np.eye(2)
+        step = np.linalg.solve(hess, X.T @ (won - mu))
+        beta = beta + step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+    return float(beta[0]), float(beta[1])
+
+
+def fit_calibration(sim_arrays: dict, outcomes: dict, prior: dict | None = None) -> dict:
+    """Return a calibration dict fitted from ``sim_arrays`` and ``outcomes``.
+
+    Keys missing from the data (e.g. segments without segment scores) keep
+    their values from ``prior``.
+    """
+    prior = prior or {}
+    games = sorted(g for g in sim_arrays if g in outcomes)
+    if not games:
+        raise ValueError("No games with both sim arrays and outcomes")
+
+    sims = [sim_arrays[g] for g in games]
+    home_act = np.array([outcomes[g]["home"] for g in games])
+    away_act = np.array([outcomes[g]["away"] for g in games])
+    total_act = home_act + away_act
+    diff_act = home_act - away_act
+
+    tot_mean, tot_sd = _moments([s["totals"] for s in sims])
+    diff_mean, diff_sd = _moments([s["diffs"] for s in sims])
+
+    run_scale = _fit_mean_factor(total_act, tot_mean)
+    # MLBPricingEngine scales spread first, then multiplies by run_scale
+    std_scale = _fit_spread_factor(total_act, run_scale * tot_mean, run_scale * tot_sd)
+    diff_scale = _fit_spread_factor(diff_act, diff_mean, diff_sd)
+
+    # Team factors are applied to scores already rescaled to the benchmark,
+    # so fit them on the output of scale_full_game without team scaling
+    unscaled = MLBPricingEngine({})
+    home_scaled, away_scaled = [], []
+    for s in sims:
+        _, _, home, away = unscaled.scale_full_game((s["totals"] + s["diffs"]) / 2, (s["totals"] - s["diffs"]) / 2)
+        home_scaled.append(np.asarray(home))
+        away_scaled.append(np.asarray(away))
+    home_mean, home_sd = _moments(home_scaled)
+    away_mean, away_sd = _moments(away_scaled)
+    home_mf = _fit_mean_factor(home_act, home_mean)
+    away_mf = _fit_mean_factor(away_act, away_mean)
+    team_total_scaling = {
+        "home_mean_factor": round(home_mf, 4),
+        "home_std_factor": round(_fit_spread_factor(home_act, home_mf * home_mean, home_mf * home_sd), 4),
+        "away_mean_factor": round(away_mf, 4),
+        "away_std_factor": round(_fit_spread_factor(away_act, away_mf * away_mean, away_mf * away_sd), 4),
+    }
+
+    p_home = np.array([float(np.mean(s["diffs"] > 0)) for s in sims])
+    decided = diff_act != 0
+    a, b = _fit_logit(p_home[decided], (diff_act[decided] > 0).astype(float))
+
+    segment_scaling = dict(prior.get("segment_scaling", {}))
+    for seg_id in SEGMENT_KEYS:
+        seg_games = [
+            i
+            for i, g in enumerate(games)
+            if f"{seg_id}_home" in outcomes[g] and f"{seg_id}_totals" in sims[i]
+        ]
+        if not seg_games:
+            continue
+        seg_home = np.array([outcomes[games[i]][f"{seg_id}_home"] for i in seg_games])
+        seg_away = np.array([outcomes[games[i]][f"{seg_id}_away"] for i in seg_games])
+        # apply_segment_scaling uses a single target mean/sd for every game
+        segment_scaling[seg_id] = {
+            "run_mean": round(float(np.mean(seg_home + seg_away)), 4),
+            "run_sd": round(float(np.std(seg_home + seg_away)), 4),
+            "diff_sd": round(float(np.std(seg_home - seg_away)), 4),
+        }
+
+    return {
+        "version": int(prior.get("version", 0) or 0) + 1,
+        "fitted_at": datetime.now().isoformat(timespec="seconds"),
+        "n_games": len(games),
+        "run_scaling_factor": round(run_scale, 4),
+        "stddev_scaling_factor": round(std_scale, 4),
+        "run_diff_scaling_factor": round(diff_scale, 4),
+        "team_total_scaling": team_total_scaling,
+        "logit_win_pct_calibration": {"a": round(a, 4), "b": round(b, 4)},
+        "segment_scaling": segment_scaling,
+    }
+
+
+def save_calibration(
+    calibration: dict,
+    path: str = CALIBRATION_PATH,
+    archive_dir: str | None = CALIBRATION_ARCHIVE_DIR,
+) -> str:
+    """Atomically write ``calibration`` to ``path`` and archive a versioned copy."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(path) or ".", delete=False, suffix=".tmp"
+    ) as tmpf:
+        json.dump(calibration, tmpf, indent=2)
+        temp_path = tmpf.name
+    os.replace(temp_path, path)
+
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        archive_path = os.path.join(
+            archive_dir, f"calibration_v{calibration.get('version', 0)}.json"
+        )
+        with open(archive_path, "w", encoding="utf-8") as f:
+            json.dump(calibration, f, indent=2)
+    return path
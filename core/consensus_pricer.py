@@ -1,6 +1,9 @@
 # consensus_pricer.py (final patch — paired_key fix for spreads)
 
 from core.config import DEBUG_MODE, VERBOSE_MODE
+import numpy as np
+
+from core.devig import book_weights as resolve_book_weights, devig, method_for_market, weighted_consensus
 from core.market_pricer import implied_prob, to_american_odds
 from core.utils import (
     normalize_label,
@@ -23,6 +26,71 @@ SIM_ONLY = {
 }
 
 
+class ConsensusIndex:
+    """Per-game lookups and cached consensus results for one odds dict.
+
+    Built once per game, it maps normalized labels to their keys in each
+    market (first key wins, as the old linear scans did), memoizes team
+    pairings and caches every ``(market, label, books, method)`` result so
+    repeated lookups are O(1).
+    """
+
+    def __init__(self, game_id, game_odds):
+        self.game_id = game_id
+        self.game = game_odds if isinstance(game_odds, dict) else {}
+        self._keys = {}
+        self._pairs = {}
+        self._teams = None
+        self._results = {}
+
+    def key(self, market_key, normalized_label):
+        """Return the key in ``market_key`` whose normalized form matches."""
+        keys = self._keys.get(market_key)
+        if keys is None:
+            market = self.game.get(market_key, {})
+            keys = {}
+            if isinstance(market, dict):
+                for k in market:
+                    keys.setdefault(normalize_label(k), k)
+            self._keys[market_key] = keys
+        return keys.get(normalized_label)
+
+    def opponent(self, team_name):
+        if self._teams is None:
+            self._teams = get_teams_from_game_id(self.game_id)
+        away, home = self._teams
+        team_abbr = TEAM_NAME_TO_ABBR.get(team_name, team_name)
+        return home if team_abbr.upper() == away.upper() else away
+
+    def paired_label(self, label, market_key):
+        cache_key = (label, market_key)
+        if cache_key not in self._pairs:
+            self._pairs[cache_key] = get_paired_label(label, market_key, self.game_id)
+        return self._pairs[cache_key]
+
+    def consensus(
+        self,
+        market_key,
+        label,
+        consensus_books=DEFAULT_CONSENSUS_BOOKS,
+        debug=False,
+        throttle_logs=True,
+        method=None,
+        book_weights=None,
+    ):
+        method = method or method_for_market(market_key)
+        weights_key = tuple(sorted(book_weights.items())) if book_weights else None
+        cache_key = (market_key, label, tuple(consensus_books), method, weights_key)
+        cached = self._results.get(cache_key)
+        if cached is None or debug:
+            cached = _calculate_consensus_prob(
+                self, market_key, label, consensus_books, debug, throttle_logs, method, book_weights
+            )
+            self._results[cache_key] = cached
+        result, pricing_method = cached
+        return dict(result), pricing_method
+
+
 def calculate_consensus_prob(
     game_id,
     market_odds,
@@ -31,7 +99,44 @@ def calculate_consensus_prob(
     consensus_books=DEFAULT_CONSENSUS_BOOKS,
     debug=False,
     throttle_logs=True,
+    index=None,
+    method=None,
+    book_weights=None,
+):
+    """Return ``(result, pricing_method)`` for ``label`` in ``market_key``.
+
+    Pass a :class:`ConsensusIndex` built for the game as ``index`` when
+    pricing many labels; otherwise a throwaway index is built per call.
+    ``method`` names a :mod:`core.devig` method (default: the one configured
+    for the market family) and ``book_weights`` overrides the per-book
+    weights used to average the devigged probabilities.
+    """
+    game = market_odds.get(game_id, {})
+    if index is None or index.game_id != game_id or index.game is not game:
+        index = ConsensusIndex(game_id, game)
+    return index.consensus(
+        market_key,
+        label,
+        consensus_books=consensus_books,
+        debug=debug,
+        throttle_logs=throttle_logs,
+        method=method,
+        book_weights=book_weights,
+    )
+
+
+def _calculate_consensus_prob(
+    index,
+    market_key,
+    label,
+    consensus_books,
+    debug,
+    throttle_logs,
+    devig_method,
+    book_weights,
 ):
+    game_id = index.game_id
+
     def sim_only(reason):
         if debug:
             print(f"🟡 Devig failed for {label} in {market_key} → {reason}; using sim_only")
@@ -73,12 +178,12 @@ def calculate_consensus_prob(
         label_point = float(label_split[1])
 
     for mkt_key in base_market_keys:
-        market = market_odds.get(game_id, {}).get(mkt_key, {})
+        market = index.game.get(mkt_key, {})
         if not isinstance(market, dict):
             continue
 
         # Robust lookup for label key
-        label_key = next((k for k in market if normalize_label(k) == label), None)
+        label_key = index.key(mkt_key, label)
 
         # TEAM TOTALS → Over/Under devig logic
         if "team_totals" in mkt_key:
@@ -92,7 +197,7 @@ def calculate_consensus_prob(
                 point = float(point)
                 paired_side = "Under" if side == "Over" else "Over"
                 paired_label = f"{team} {paired_side} {point:.1f}"
-                paired_key = next((k for k in market if normalize_label(k) == normalize_label(paired_label)), None)
+                paired_key = index.key(mkt_key, normalize_label(paired_label))
                 if not paired_key:
                     return sim_only("missing paired label")
                 books_label = market[label_key].get("per_book", {})
@@ -109,7 +214,7 @@ def calculate_consensus_prob(
             if not label.startswith("Over") and not label.startswith("Under"):
                 return sim_only("unsupported label in totals")
             paired_label = f"{'Under' if label.startswith('Over') else 'Over'} {label_point}"
-            paired_key = next((k for k in market if normalize_label(k) == normalize_label(paired_label)), None)
+            paired_key = index.key(mkt_key, normalize_label(paired_label))
             if not paired_key:
                 return sim_only("missing paired label")
             books_label = market[label_key].get("per_book", {})
@@ -119,8 +224,8 @@ def calculate_consensus_prob(
         elif mkt_key.startswith("h2h"):
             if not label_key:
                 return sim_only("missing label")
-            paired_label = get_paired_label(label, mkt_key, game_id)
-            paired_key = next((k for k in market if normalize_label(k) == normalize_label(paired_label)), None)
+            paired_label = index.paired_label(label, mkt_key)
+            paired_key = index.key(mkt_key, normalize_label(paired_label))
             if not paired_key:
                 return sim_only("missing paired label")
             books_label = market[label_key].get("per_book", {})
@@ -134,11 +239,11 @@ def calculate_consensus_prob(
 
                 # PK spreads → route to h2h market
                 if line in {"0", "0.0"}:
-                    h2h_market = market_odds.get(game_id, {}).get("h2h", {})
+                    h2h_market = index.game.get("h2h", {})
                     h2h_label = team
-                    label_key = next((k for k in h2h_market if normalize_label(k) == normalize_label(h2h_label)), None)
-                    paired_label = get_paired_label(h2h_label, "h2h", game_id)
-                    paired_key = next((k for k in h2h_market if normalize_label(k) == normalize_label(paired_label)), None)
+                    label_key = index.key("h2h", normalize_label(h2h_label))
+                    paired_label = index.paired_label(h2h_label, "h2h")
+                    paired_key = index.key("h2h", normalize_label(paired_label))
                     if not label_key or not paired_key:
                         return sim_only("PK line fallback failed")
                     books_label = h2h_market[label_key].get("per_book", {})
@@ -149,7 +254,7 @@ def calculate_consensus_prob(
                         # try next market key if label missing
                         continue
                     team_full = TEAM_ABBR_TO_NAME.get(team, team)
-                    opp_abbr = get_opponent_abbr_by_game_id(team_full, game_id)
+                    opp_abbr = index.opponent(team_full)
 
                     if line.startswith("+"):
                         paired_label = f"{opp_abbr} -{line[1:]}"
@@ -158,7 +263,7 @@ def calculate_consensus_prob(
                     else:
                         return sim_only("invalid spread line")
 
-                    paired_key = next((k for k in market if normalize_label(k) == normalize_label(paired_label)), None)
+                    paired_key = index.key(mkt_key, normalize_label(paired_label))
                     source_market = market  # default to current market
 
                     if not paired_key:
@@ -167,8 +272,8 @@ def calculate_consensus_prob(
                             if mkt_key.startswith("spreads")
                             else mkt_key.replace("alternate_spreads", "spreads")
                         )
-                        alt_market = market_odds.get(game_id, {}).get(alt_mkt_key, {})
-                        paired_key = next((k for k in alt_market if normalize_label(k) == normalize_label(paired_label)), None)
+                        alt_market = index.game.get(alt_mkt_key, {})
+                        paired_key = index.key(alt_mkt_key, normalize_label(paired_label))
                         source_market = alt_market
 
                         if paired_key:
@@ -205,9 +310,9 @@ def calculate_consensus_prob(
                 if mkt_key.startswith("spreads")
                 else mkt_key.replace("alternate_spreads", "spreads")
             )
-            alt_market = market_odds.get(game_id, {}).get(alt_mkt_key, {})
-            alt_label_key = next((k for k in alt_market if normalize_label(k) == normalize_label(label)), None)
-            alt_paired_key = next((k for k in alt_market if normalize_label(k) == normalize_label(paired_label)), None)
+            alt_market = index.game.get(alt_mkt_key, {})
+            alt_label_key = index.key(alt_mkt_key, normalize_label(label))
+            alt_paired_key = index.key(alt_mkt_key, normalize_label(paired_label))
             if alt_label_key and alt_paired_key:
                 alt_books_label = alt_market[alt_label_key].get("per_book", {})
                 alt_books_pair = alt_market[alt_paired_key].get("per_book", {})
@@ -243,24 +348,32 @@ def calculate_consensus_prob(
                     _DEVIG_WARNING_LOGGED.add(game_id)
         method = "devig_1book" if len(shared_books) == 1 else "devig"
 
-        book_probs = {}
+        pairs = {}
         for book in shared_books:
             try:
                 p1 = implied_prob(books_label[book])
                 p2 = implied_prob(books_pair[book])
-                total = p1 + p2
-                if total == 0:
-                    continue
-                prob = round(p1 / total, 6)
-                book_probs[book] = prob
             except:
                 continue
+            if p1 + p2 != 0:
+                pairs[book] = (p1, p2)
+
+        book_probs = {}
+        if pairs:
+            # Devig every shared book in one vectorized call
+            fair = devig(np.array(list(pairs.values())), devig_method)[:, 0]
+            book_probs = {book: round(float(p), 6) for book, p in zip(pairs, fair)}
 
         if not book_probs:
 
             return sim_only("no devigged values")
 
-        avg_prob = round(sum(book_probs.values()) / len(book_probs), 6)
+        weights = resolve_book_weights(book_probs, book_weights)
+        weighted_avg, dispersion = weighted_consensus(list(book_probs.values()), weights)
+        if (weights == 1).all():
+            avg_prob = round(sum(book_probs.values()) / len(book_probs), 6)
+        else:
+            avg_prob = round(weighted_avg, 6)
         fair_odds = to_american_odds(avg_prob)
 
         return {
@@ -269,6 +382,8 @@ def calculate_consensus_prob(
             "bookwise_probs": book_probs,
             "books_used": list(book_probs.keys()),
             "pricing_method": method,
+            "devig_method": devig_method,
+            "dispersion": round(dispersion, 6),
         }, method
 
     return sim_only("exhausted market keys")
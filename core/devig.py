@@ -0,0 +1,236 @@
+"""Vectorized vig removal for two-way and multi-way markets.
+
+Every method takes implied probabilities shaped ``(books, outcomes)`` and
+returns fair probabilities of the same shape whose rows sum to one, so a
+whole market can be devigged across all books in one call. Methods are
+looked up by name in :data:`DEVIG_METHODS` (extend it with
+:func:`register_devig_method`) and chosen per market family through
+:func:`method_for_market`. :func:`devig_market` devigs every paired label of
+a market at once and reports a book-weighted consensus with its dispersion.
+"""
+
+import os
+
+import numpy as np
+
+from core.market_pricer import implied_prob
+
+__all__ = [
+    "BOOK_WEIGHTS",
+    "DEFAULT_DEVIG_METHOD",
+    "DEVIG_METHODS",
+    "METHOD_BY_FAMILY",
+    "WEIGHT_BOOKS",
+    "book_weights",
+    "devig",
+    "devig_additive",
+    "devig_logit",
+    "devig_market",
+    "devig_multiplicative",
+    "devig_power",
+    "devig_shin",
+    "market_family",
+    "method_for_market",
+    "register_devig_method",
+    "weighted_consensus",
+]
+
+_BISECT_STEPS = 60
+
+
+def _as_matrix(probs) -> np.ndarray:
+    arr = np.asarray(probs, dtype=float)
+    return arr.reshape(1, -1) if arr.ndim == 1 else arr
+
+
+def devig_multiplicative(probs) -> np.ndarray:
+    """Scale each book's implied probabilities proportionally to sum to one."""
+    p = _as_matrix(probs)
+    return p / p.sum(axis=1, keepdims=True)
+
+
+def devig_additive(probs) -> np.ndarray:
+    """Remove an equal share of the overround from every outcome."""
+    p = _as_matrix(probs)
+    fair = np.clip(p - (p.sum(axis=1, keepdims=True) - 1) / p.shape[1], 0, None)
+    return fair / fair.sum(axis=1, keepdims=True)
+
+
+def devig_power(probs) -> np.ndarray:
+    """Solve ``sum(p ** k) == 1`` per book; shades longshots more than favorites."""
+    p = np.clip(_as_matrix(probs), 1e-12, 1 - 1e-12)
+    lo = np.full(p.shape[0], 1e-3)
+    hi = np.full(p.shape[0], 100.0)
+    # sum(p ** k) decreases in k, so bisect every book at once
+    for _ in range(_BISECT_STEPS):
+        k = (lo + hi) / 2
+        over = (p ** k[:, None]).sum(axis=1) > 1
+        lo = np.where(over, k, lo)
+        hi = np.where(over, hi, k)
+    fair = p ** ((lo + hi) / 2)[:, None]
+    return fair / fair.sum(axis=1, keepdims=True)
+
+
+def devig_shin(probs) -> np.ndarray:
+    """Shin's insider-trading model; books with no overround fall back to proportional."""
+    p = _as_matrix(probs)
+    total = p.sum(axis=1, keepdims=True)
+
+    def fair_for(z):
+        z = z[:, None]
+        return (np.sqrt(z**2 + 4 * (1 - z) * p**2 / total) - z) / (2 * (1 - z))
+
+    lo = np.zeros(p.shape[0])
+    hi = np.full(p.shape[0], 0.999)
+    # The fair probabilities sum to sqrt(total) at z=0 and fall as z grows
+    for _ in range(_BISECT_STEPS):
+        z = (lo + hi) / 2
+        over = fair_for(z).sum(axis=1) > 1
+        lo = np.where(over, z, lo)
+        hi = np.where(over, hi, z)
+    fair = fair_for((lo + hi) / 2)
+    fair = fair / fair.sum(axis=1, keepdims=True)
+    return np.where(total > 1, fair, p / total)
+
+
+def devig_logit(probs) -> np.ndarray:
+    """Shift every outcome by the same amount on the log-odds scale."""
+    p = np.clip(_as_matrix(probs), 1e-12, 1 - 1e-12)
+    logits = np.log(p / (1 - p))
+    lo = np.full(p.shape[0], -20.0)
+    hi = np.full(p.shape[0], 20.0)
+    # sum(sigmoid(logit - c)) decreases in c
+    for _ in range(_BISECT_STEPS):
+        c = (lo + hi) / 2
+        over = (1 / (1 + np.exp(c[:, None] - logits))).sum(axis=1) > 1
+        lo = np.where(over, c, lo)
+        hi = np.where(over, hi, c)
+    fair = 1 / (1 + np.exp((lo + hi)[:, None] / 2 - logits))
+    return fair / fair.sum(axis=1, keepdims=True)
+
+
+DEVIG_METHODS = {
+    "multiplicative": devig_multiplicative,
+    "additive": devig_additive,
+    "power": devig_power,
+    "shin": devig_shin,
+    "logit": devig_logit,
+}
+
+
+def register_devig_method(name: str, fn) -> None:
+    """Make ``fn(probs) -> fair`` available as devig method ``name``."""
+    DEVIG_METHODS[name] = fn
+
+
+def devig(probs, method: str = "multiplicative") -> np.ndarray:
+    """Return fair probabilities for ``probs`` using ``method``."""
+    try:
+        fn = DEVIG_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown devig method: {method}") from None
+    return fn(probs)
+
+
+# ---------------------------------------------------------------------------
+# Per-market configuration
+# ---------------------------------------------------------------------------
+DEFAULT_DEVIG_METHOD = os.getenv("DEVIG_METHOD", "multiplicative")
+
+
+def _parse_family_methods(spec: str) -> dict:
+    methods = {}
+    for item in spec.split(","):
+        family, _, method = item.partition("=")
+        if family.strip() and method.strip():
+            methods[family.strip()] = method.strip()
+    return methods
+
+
+# e.g. DEVIG_METHOD_BY_FAMILY="h2h=power,totals=shin"
+METHOD_BY_FAMILY = _parse_family_methods(os.getenv("DEVIG_METHOD_BY_FAMILY", ""))
+
+# Sharp books move first, so their fair prices count for more in a consensus
+BOOK_WEIGHTS = {
+    "pinnacle": 3.0,
+    "betonlineag": 1.5,
+    "lowvig": 1.5,
+}
+WEIGHT_BOOKS = os.getenv("DEVIG_WEIGHT_BOOKS", "0") == "1"
+
+
+def market_family(market_key: str) -> str:
+    """Return ``h2h``, ``spreads``, ``totals`` or ``team_totals`` for ``market_key``."""
+    key = market_key.replace("alternate_", "")
+    for family in ("team_totals", "totals", "spreads", "h2h"):
+        if key.startswith(family):
+            return family
+    return key
+
+
+def method_for_market(market_key: str) -> str:
+    return METHOD_BY_FAMILY.get(market_family(market_key), DEFAULT_DEVIG_METHOD)
+
+
+def book_weights(books, weights: dict | None = None) -> np.ndarray:
+    """Return per-book weights; unlisted books (or all, when off) weigh 1."""
+    if weights is None:
+        weights = BOOK_WEIGHTS if WEIGHT_BOOKS else {}
+    return np.array([float(weights.get(book, 1.0)) for book in books])
+
+
+def weighted_consensus(fair, weights=None) -> tuple[float, float]:
+    """Return the weighted mean of ``fair`` and its weighted standard deviation."""
+    fair = np.asarray(fair, dtype=float)
+    w = np.ones_like(fair) if weights is None else np.asarray(weights, dtype=float)
+    mean = float(np.average(fair, weights=w))
+    dispersion = float(np.sqrt(np.average((fair - mean) ** 2, weights=w)))
+    return mean, dispersion
+
+
+def devig_market(
+    book_prices: dict,
+    pairs,
+    method: str = DEFAULT_DEVIG_METHOD,
+    weights: dict | None = None,
+    books=None,
+) -> dict:
+    """Devig every ``(label_a, label_b)`` pair of a market in one call.
+
+    ``book_prices`` maps label → ``{book: american price}``. Only books
+    quoting both sides of a pair (restricted to ``books`` when given) are
+    used. Returns ``{label: {"consensus_prob", "dispersion", "bookwise_probs",
+    "devig_method"}}`` for every label with at least one usable book.
+    """
+    rows, index = [], []
+    for label_a, label_b in pairs:
+        quotes_a = book_prices.get(label_a) or {}
+        quotes_b = book_prices.get(label_b) or {}
+        shared = [b for b in (books if books is not None else quotes_a) if b in quotes_a and b in quotes_b]
+        for book in shared:
+            try:
+                p_a, p_b = implied_prob(quotes_a[book]), implied_prob(quotes_b[book])
+            except (TypeError, ValueError):
+                continue
+            if p_a + p_b > 0:
+                rows.append((p_a, p_b))
+                index.append((label_a, label_b, book))
+    if not rows:
+        return {}
+
+    fair = devig(np.array(rows), method)
+    by_label: dict[str, dict] = {}
+    for (label_a, label_b, book), (f_a, f_b) in zip(index, fair):
+        by_label.setdefault(label_a, {})[book] = round(float(f_a), 6)
+        by_label.setdefault(label_b, {})[book] = round(float(f_b), 6)
+
+    results = {}
+    for label, probs in by_label.items():
+        prob, dispersion = weighted_consensus(list(probs.values()), book_weights(probs, weights))
+        results[label] = {
+            "consensus_prob": round(prob, 6),
+            "dispersion": round(dispersion, 6),
+            "bookwise_probs": probs,
+            "devig_method": method,
+        }
+    return results
@@ -1,6 +1,4 @@
 import time
-import requests
-from requests.exceptions import RequestException
 
 # Status codes that are safe to retry. Anything else could result in the
 # message being delivered despite a non-2xx response, so we avoid retries in
@@ -27,6 +25,10 @@ def post_with_retries(
     **kwargs :
         Additional arguments passed to ``requests.post``.
     """
+    # Imported here so modules that only pull in core.utils skip requests
+    import requests
+    from requests.exceptions import RequestException
+
     for attempt in range(attempts):
         try:
             resp = requests.post(url, **kwargs)
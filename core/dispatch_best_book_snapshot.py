@@ -4,7 +4,7 @@ import os
 from core.bootstrap import *  # noqa
 
 """Dispatch best-book snapshot using the latest snapshot file."""
-from core.utils import parse_game_id, safe_load_json
+from core.utils import parse_game_id
 
 import argparse
 from dotenv import load_dotenv
@@ -15,7 +15,7 @@ load_dotenv()
 from core.snapshot_core import format_for_display, send_bet_snapshot_to_discord
 from core.book_helpers import ensure_side
 import pandas as pd
-from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.snapshot_db import latest_snapshot_rows
 from core.logger import get_logger
 from collections import Counter
 
@@ -25,11 +25,11 @@ logger = get_logger(__name__)
 logger.debug("✅ Loaded webhook: %s", os.getenv("DISCORD_BEST_BOOK_MAIN_WEBHOOK_URL"))
 
 
-def load_latest_snapshot_rows() -> list:
-    """Return snapshot rows from the most recent snapshot file."""
-    path = find_latest_market_snapshot_path("backtest")
-    rows = safe_load_json(path) if path else []
-    logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
+def load_latest_snapshot_rows(rows: list | None = None) -> list:
+    """Return filtered snapshot rows, reading the latest snapshot unless ``rows`` is given."""
+    if rows is None:
+        rows, path = latest_snapshot_rows("backtest")
+        logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
     filtered = []
     for r in rows:
         ensure_side(r)
@@ -63,7 +63,7 @@ def filter_by_date(rows: list, date_str: str | None) -> list:
     ]
 
 
-def main() -> None:
+def main(argv: list[str] | None = None, rows: list | None = None) -> None:
     parser = argparse.ArgumentParser(description="Dispatch best-book snapshot")
     parser.add_argument("--date", default=None, help="Filter by game date")
     parser.add_argument("--debug", action="store_true", help="Enable debug logging")
@@ -86,9 +86,10 @@ def main() -> None:
         default=20.0,
         help="Maximum EV% allowed to dispatch",
     )
-    args = parser.parse_args()
-    config.DEBUG_MODE = args.debug
-    config.VERBOSE_MODE = args.verbose
+    args = parser.parse_args(argv)
+    # Keep flags already enabled by an in-process caller
+    config.DEBUG_MODE = args.debug or config.DEBUG_MODE
+    config.VERBOSE_MODE = args.verbose or config.VERBOSE_MODE
     if config.DEBUG_MODE:
         print("🧪 DEBUG_MODE ENABLED — Verbose output activated")
 
@@ -98,7 +99,7 @@ def main() -> None:
     if args.min_ev > args.max_ev:
         args.max_ev = args.min_ev
 
-    rows = load_latest_snapshot_rows()
+    rows = load_latest_snapshot_rows(rows)
     if not rows:
         logger.warning("⚠️ No snapshot rows found – skipping dispatch")
         return
@@ -41,14 +41,10 @@ from core.utils import (
 )
 from core.logger import get_logger
 from core.odds_fetcher import american_to_prob
+from core.odds_reader import load_market_odds
 from core.market_pricer import calculate_clv_and_fv
 from core.book_helpers import filter_snapshot_rows, ensure_side
 
-try:
-    import dataframe_image as dfi
-except Exception:  # pragma: no cover - optional dependency
-    dfi = None
-
 load_dotenv()
 logger = get_logger(__name__)
 
@@ -172,13 +168,13 @@ def load_logged_bets(path: str) -> list:
         sys.exit(1)
 
 
-def load_odds(path: str) -> dict:
-    try:
-        with open(path) as f:
-            return json.load(f)
-    except Exception as e:
-        logger.error("❌ Failed to load odds file %s: %s", path, e)
+def load_odds(path: str, dates=None) -> dict:
+    """Load odds for ``dates`` (``YYYY-MM-DD`` prefixes) or the whole file."""
+    odds = load_market_odds(path, dates=dates)
+    if not odds and dates is None:
+        logger.error("❌ Failed to load odds file %s", path)
         sys.exit(1)
+    return odds
 
 
 def parse_start_time(gid: str, odds_game: dict | None) -> datetime | None:
@@ -382,7 +378,7 @@ def build_snapshot_rows(
 # Discord helpers (styled dataframe)
 # ---------------------------------------------------------------------------
 
-def _style_plain(df: pd.DataFrame) -> pd.io.formats.style.Styler:
+def _style_plain(df: pd.DataFrame) -> "pd.io.formats.style.Styler":
     styled = (
         df.style.set_properties(
             **{"text-align": "center", "font-family": "monospace", "font-size": "10pt"}
@@ -438,6 +434,11 @@ def send_snapshot(
     *,
     force_dispatch: bool = False,
 ) -> None:
+    try:
+        # dataframe_image pulls in nbconvert; only load it when rendering
+        import dataframe_image as dfi
+    except Exception:  # pragma: no cover - optional dependency
+        dfi = None
     if df.empty and not force_dispatch:
         logger.info("⚠️ No qualifying open bets found.")
         if dfi is not None:
@@ -509,7 +510,7 @@ def send_snapshot(
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(description="Dispatch CLV snapshot for open bets")
     parser.add_argument("--log-path", default="logs/market_evals.csv", help="Path to market_evals.csv")
     parser.add_argument("--odds-path", default=None, help="Path to odds snapshot JSON")
@@ -531,7 +532,7 @@ def main() -> None:
         action="store_true",
         help="Disable filtering of CLV snapshot rows",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     csv_rows = load_logged_bets(args.log_path)
     logger.debug("📥 Logged bets loaded: %d", len(csv_rows))
@@ -543,7 +544,9 @@ def main() -> None:
     if not odds_path or not os.path.exists(odds_path):
         logger.error("❌ Odds snapshot not found: %s", odds_path)
         sys.exit(1)
-    odds_data = load_odds(odds_path)
+    odds_data = load_odds(
+        odds_path, dates={canonical_game_id(r.get("game_id", ""))[:10] for r in csv_rows}
+    )
 
     rows, counts = build_snapshot_rows(
         csv_rows, odds_data, verbose=args.verbose, return_counts=True
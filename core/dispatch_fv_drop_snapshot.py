@@ -20,7 +20,7 @@ from core.logger import get_logger
 from core.should_log_bet import MAX_POSITIVE_ODDS, MIN_NEGATIVE_ODDS
 from core.book_helpers import filter_by_odds, ensure_side
 from core.book_whitelist import ALLOWED_BOOKS
-from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.snapshot_db import latest_snapshot_rows
 
 # Subset of books to include when posting to the main FV Drop webhook
 FV_DROP_ALLOWED_BOOKS = [
@@ -36,12 +36,14 @@ logger = get_logger(__name__)
 logger.debug("✅ Loaded webhook: %s", os.getenv("DISCORD_FV_DROP_WEBHOOK_URL"))
 
 
-def load_snapshot_rows(path: str | None = None) -> list:
-    """Return snapshot rows from ``path`` or the most recent snapshot file."""
-    if not path:
-        path = find_latest_market_snapshot_path("backtest")
-    rows = safe_load_json(path) if path else []
-    logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
+def load_snapshot_rows(path: str | None = None, rows: list | None = None) -> list:
+    """Return filtered snapshot rows from ``path``, ``rows`` or the most recent snapshot file."""
+    if path:
+        rows = safe_load_json(path)
+    elif rows is None:
+        rows, path = latest_snapshot_rows("backtest")
+    if path:
+        logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
     filtered = []
     for r in rows:
         ensure_side(r)
@@ -104,7 +106,7 @@ def is_market_prob_increasing(val: str) -> bool:
         return False
 
 
-def main() -> None:
+def main(argv: list[str] | None = None, rows: list | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Dispatch FV drop snapshot (market probability increases)"
     )
@@ -143,7 +145,7 @@ def main() -> None:
         default=0.0,
         help="Minimum consensus move required to display",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Clamp EV range to 5%-20%
     args.min_ev = max(5.0, args.min_ev)
@@ -151,7 +153,7 @@ def main() -> None:
     if args.min_ev > args.max_ev:
         args.max_ev = args.min_ev
 
-    rows = load_snapshot_rows(args.snapshot)
+    rows = load_snapshot_rows(args.snapshot, rows)
     if not rows:
         logger.warning("⚠️ No snapshot rows found – skipping dispatch")
         return
@@ -0,0 +1,119 @@
+"""Run every snapshot dispatcher in one process.
+
+The auto loop used to start one interpreter per ``core/dispatch_*_snapshot.py``
+script each cycle, and every one of them imported pandas and parsed the
+latest snapshot before applying its own role filter. :func:`dispatch_snapshots`
+reads the snapshot once, gives each dispatcher's ``main`` its own shallow
+copy of the rows and runs the dispatchers on a thread pool, so rendering and
+webhook posts overlap. The scripts still run standalone with the same
+arguments.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import importlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from core.logger import get_logger
+from core.snapshot_db import latest_snapshot_rows
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "CLV_DISPATCHER",
+    "DISPATCH_TIMEOUT",
+    "DISPATCH_WORKERS",
+    "SNAPSHOT_DISPATCHERS",
+    "dispatch_snapshots",
+]
+
+DISPATCH_WORKERS = int(os.getenv("DISPATCH_WORKERS", "3"))
+# Matches the five-minute kill timeout the loop applied to dispatch subprocesses
+DISPATCH_TIMEOUT = float(os.getenv("DISPATCH_TIMEOUT", "300"))
+
+# Dispatchers that read the latest market snapshot
+SNAPSHOT_DISPATCHERS = (
+    "core.dispatch_live_snapshot",
+    "core.dispatch_fv_drop_snapshot",
+    "core.dispatch_best_book_snapshot",
+    "core.dispatch_personal_snapshot",
+    "core.dispatch_sim_only_snapshot",
+)
+# Reads logged bets and closing odds rather than the snapshot
+CLV_DISPATCHER = "core.dispatch_clv_snapshot"
+
+
+def _run(name: str, main, argv: list, rows: list | None) -> tuple[str, float]:
+    start = time.perf_counter()
+    try:
+        if rows is None:
+            main(argv)
+        else:
+            main(argv, rows=rows)
+        status = "ok"
+    except SystemExit as e:
+        status = "ok" if e.code in (None, 0) else f"exit {e.code}"
+    except Exception:
+        logger.exception("❌ Dispatcher %s failed", name)
+        status = "error"
+    return status, time.perf_counter() - start
+
+
+def dispatch_snapshots(
+    argv=("--output-discord",),
+    directory: str = "backtest",
+    dispatchers=SNAPSHOT_DISPATCHERS,
+    include_clv: bool = True,
+    workers: int = DISPATCH_WORKERS,
+    timeout: float = DISPATCH_TIMEOUT,
+    rows: list | None = None,
+) -> dict:
+    """Run ``dispatchers`` (and the CLV dispatcher) over one snapshot load.
+
+    ``argv`` is passed to every dispatcher's ``main``. ``rows`` skips the
+    load when the caller already holds the latest snapshot. Returns
+    ``{module: status}`` where status is ``"ok"``, ``"error"``,
+    ``"exit <code>"``, ``"timeout"`` or ``"cancelled"``. Dispatchers still
+    running after ``timeout`` seconds are reported as ``"timeout"`` and left
+    to finish in the background; those still queued behind them never start
+    and are reported as ``"cancelled"``.
+    """
+    # Import up front so worker threads don't contend on the import lock
+    mains = {name: importlib.import_module(name).main for name in dispatchers}
+    if include_clv:
+        mains[CLV_DISPATCHER] = importlib.import_module(CLV_DISPATCHER).main
+
+    if rows is None:
+        rows, path = latest_snapshot_rows(directory)
+    else:
+        path = "memory"
+    logger.info(
+        "📊 Loaded %d snapshot rows from %s for %d dispatchers",
+        len(rows),
+        path,
+        len(mains),
+    )
+
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="dispatch")
+    futures = {}
+    for name, main in mains.items():
+        # Dispatchers annotate rows in place, so each gets its own copies
+        shared = None if name == CLV_DISPATCHER else [dict(r) for r in rows]
+        futures[pool.submit(_run, name, main, list(argv), shared)] = name
+    done, pending = wait(futures, timeout=timeout)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for future in done:
+        status, elapsed = future.result()
+        results[futures[future]] = status
+        logger.info("📨 %s finished in %.1fs (%s)", futures[future], elapsed, status)
+    for future in pending:
+        if future.cancelled():
+            results[futures[future]] = "cancelled"
+            logger.error("🚫 %s never started within %.0fs — cancelled", futures[future], timeout)
+        else:
+            results[futures[future]] = "timeout"
+            logger.error("💀 %s still running after %.0fs — not waiting for it", futures[future], timeout)
+    return results
@@ -4,7 +4,7 @@ import os
 from core.bootstrap import *  # noqa
 
 """Dispatch personal-book snapshot using the latest snapshot file."""
-from core.utils import parse_game_id, safe_load_json
+from core.utils import parse_game_id
 
 import argparse
 from typing import List
@@ -19,7 +19,7 @@ from core.snapshot_core import format_for_display, send_bet_snapshot_to_discord
 from core.logger import get_logger
 from core.book_whitelist import ALLOWED_BOOKS
 from core.book_helpers import ensure_side
-from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.snapshot_db import latest_snapshot_rows
 
 logger = get_logger(__name__)
 
@@ -32,11 +32,11 @@ PERSONAL_WEBHOOK_URL = os.getenv(
 )
 
 
-def load_latest_snapshot_rows() -> list:
-    """Return snapshot rows from the most recent snapshot file."""
-    path = find_latest_market_snapshot_path("backtest")
-    rows = safe_load_json(path) if path else []
-    logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
+def load_latest_snapshot_rows(rows: list | None = None) -> list:
+    """Return filtered snapshot rows, reading the latest snapshot unless ``rows`` is given."""
+    if rows is None:
+        rows, path = latest_snapshot_rows("backtest")
+        logger.info("📊 Loaded %d snapshot rows from %s", len(rows), path)
     filtered = []
     for r in rows:
         ensure_side(r)
@@ -78,7 +78,7 @@ def filter_by_books(df: pd.DataFrame, books: List[str] | None) -> pd.DataFrame:
     return df[df["Book"].isin(clean_books)]
 
 
-def main() -> None:
+def main(argv: list[str] | None = None, rows: list | None = None) -> None:
     parser = argparse.ArgumentParser(description="Dispatch personal-book snapshot")
     parser.add_argument("--date", default=None, help="Filter by game date")
     parser.add_argument("--output-discord", action="store_true")
@@ -99,7 +99,7 @@ def main() -> None:
         default=20.0,
         help="Maximum EV% allowed to dispatch",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Clamp EV range to 5%-20%
     args.min_ev = max(5.0, args.min_ev)
@@ -107,7 +107,7 @@ def main() -> None:
     if args.min_ev > args.max_ev:
         args.max_ev = args.min_ev
 
-    rows = load_latest_snapshot_rows()
+    rows = load_latest_snapshot_rows(rows)
     if not rows:
         logger.warning("⚠️ No snapshot rows found – skipping dispatch")
         return
@@ -17,6 +17,7 @@ from requests.exceptions import Timeout
 
 from core.utils import safe_load_json, post_with_retries
 from core.book_helpers import ensure_side
+from core.snapshot_db import latest_snapshot_rows
 from core.logger import get_logger
 from core.market_pricer import (
     extract_best_book,
@@ -31,11 +32,6 @@ load_dotenv()
 logger = get_logger(__name__)
 logger.debug("✅ Loaded webhook: %s", os.getenv("DISCORD_SIM_ONLY_MAIN_WEBHOOK_URL"))
 
-try:
-    import dataframe_image as dfi
-except Exception:  # pragma: no cover - optional dep
-    dfi = None
-
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -49,8 +45,12 @@ def latest_snapshot_path(folder: str = "backtest") -> str | None:
     return os.path.join(folder, files[0]) if files else None
 
 
-def load_rows(path: str) -> List[dict]:
-    rows = safe_load_json(path)
+def load_rows(path: str | None = None, rows: List[dict] | None = None) -> List[dict]:
+    """Return filtered rows from ``path``, ``rows`` or, by default, the latest snapshot."""
+    if path:
+        rows = safe_load_json(path)
+    elif rows is None:
+        rows = latest_snapshot_rows()[0]
     if rows is None:
         logger.error("❌ Failed to load snapshot %s", path)
         sys.exit(1)
@@ -85,7 +85,7 @@ def filter_by_date(rows: List[dict], date_str: str | None) -> List[dict]:
 # Styling & Discord Helpers
 # ---------------------------------------------------------------------------
 
-def _style_plain(df: pd.DataFrame) -> pd.io.formats.style.Styler:
+def _style_plain(df: pd.DataFrame) -> "pd.io.formats.style.Styler":
     """Return a simple white-background style."""
     styled = (
         df.style.set_properties(
@@ -122,6 +122,11 @@ def send_snapshot(df: pd.DataFrame, webhook_url: str, *, force_dispatch: bool =
         logger.info("No snapshot rows to send.")
         return
 
+    try:
+        # dataframe_image pulls in nbconvert; only load it when rendering
+        import dataframe_image as dfi
+    except Exception:  # pragma: no cover - optional dep
+        dfi = None
     if dfi is None:
         logger.warning("⚠️ dataframe_image not available. Sending text fallback.")
         message = df.to_string(index=False)
@@ -177,7 +182,7 @@ def send_snapshot(df: pd.DataFrame, webhook_url: str, *, force_dispatch: bool =
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: list[str] | None = None, rows: list | None = None) -> None:
     parser = argparse.ArgumentParser(description="Dispatch sim-only mainline snapshot")
     parser.add_argument("--snapshot-path", default=None, help="Path to unified snapshot JSON")
     parser.add_argument("--date", default=None, help="Filter by game date")
@@ -195,19 +200,19 @@ def main() -> None:
         default=None,
         help="Limit total rows dispatched",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     args.min_ev = max(10.0, args.min_ev)
     args.max_ev = min(20.0, args.max_ev)
     if args.min_ev > args.max_ev:
         args.max_ev = args.min_ev
 
-    path = args.snapshot_path or latest_snapshot_path()
-    if not path or not os.path.exists(path):
+    path = args.snapshot_path
+    if path and not os.path.exists(path):
         logger.error("❌ Snapshot not found: %s", path)
         sys.exit(1)
 
-    rows = load_rows(path)
+    rows = load_rows(path, rows)
 
 
     rows = filter_by_date(rows, args.date)
@@ -0,0 +1,247 @@
+"""Shared TTL cache of Odds API events keyed by canonical game ID.
+
+Every odds caller needs the ``/events`` list to translate game IDs into Odds
+API event IDs. :class:`EventsIndex` fetches that list at most once per TTL,
+parses each event's commence time a single time and persists the raw list to
+disk so separate processes (the sim loop, the closing odds monitor) share one
+call per window. The file is re-read whenever its mtime changes, so a list
+fetched by another process is picked up before this one calls the API.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from core.logger import get_logger
+from core.utils import (
+    canonical_game_id,
+    extract_game_id_from_event,
+    file_lock,
+    game_id_to_dt,
+    now_eastern,
+    parse_game_id,
+    to_eastern,
+)
+
+logger = get_logger(__name__)
+
+__all__ = ["EVENTS_CACHE_PATH", "EVENTS_TTL_SECONDS", "EventsIndex", "get_events_index"]
+
+EVENTS_CACHE_PATH = os.path.join("data", "cache", "odds_events.json")
+EVENTS_TTL_SECONDS = int(os.getenv("ODDS_EVENTS_TTL", "600"))
+
+
+def _default_fetch(lookahead_days):
+    from core.odds_fetcher import fetch_events_list
+
+    return fetch_events_list(lookahead_days)
+
+
+class EventsIndex:
+    """TTL-cached map of canonical game ID → Odds API event details.
+
+    ``fetch_fn(lookahead_days)`` must return the raw events list, ``None``
+    for a failed (non-200) response, or raise ``RequestException``.
+    """
+
+    def __init__(self, fetch_fn=None, ttl: float = EVENTS_TTL_SECONDS, cache_path: str | None = EVENTS_CACHE_PATH):
+        self.fetch_fn = fetch_fn or _default_fetch
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self._lock = threading.Lock()
+        # lookahead_days → (fetched_at, events, by_id, by_key)
+        self._cache: dict[int, tuple] = {}
+        # mtime of the cache file as last read or written by this index
+        self._disk_mtime: float | None = None
+
+    # ------------------------------------------------------------------
+    # Cache plumbing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _build(events: list) -> tuple[dict, dict]:
+        by_id, by_key = {}, defaultdict(list)
+        for event in events:
+            try:
+                start = to_eastern(
+                    datetime.fromisoformat(event["commence_time"].replace("Z", "+00:00")).replace(
+                        tzinfo=ZoneInfo("UTC")
+                    )
+                )
+                gid = canonical_game_id(
+                    extract_game_id_from_event(event["away_team"], event["home_team"], start)
+                )
+                parts = parse_game_id(gid)
+            except Exception as e:
+                logger.debug("💥 Exception while indexing event: %s", e)
+                continue
+            by_id[gid] = {
+                "event_id": event.get("id"),
+                "start": start,
+                "home": event["home_team"],
+                "away": event["away_team"],
+                "event": event,
+            }
+            by_key[(parts["date"], parts["away"], parts["home"])].append(gid)
+        return by_id, dict(by_key)
+
+    def _file_mtime(self) -> float | None:
+        try:
+            return os.stat(self.cache_path).st_mtime if self.cache_path else None
+        except OSError:
+            return None
+
+    def _load_disk(self) -> None:
+        """Merge in lists from the cache file if it changed since last seen."""
+        mtime = self._file_mtime()
+        if mtime is None or mtime == self._disk_mtime:
+            return
+        self._disk_mtime = mtime
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+            for days, blob in stored.items():
+                fetched_at = blob.get("fetched_at", 0)
+                current = self._cache.get(int(days))
+                if current is not None and current[0] >= fetched_at:
+                    continue
+                events = blob.get("events") or []
+                self._cache[int(days)] = (fetched_at, events, *self._build(events))
+        except Exception as e:
+            logger.warning("⚠️ Failed to load events cache %s: %s", self.cache_path, e)
+
+    def _save_disk(self) -> None:
+        """Write every cached list, keeping newer lists other processes saved."""
+        if not self.cache_path:
+            return
+        try:
+            folder = os.path.dirname(self.cache_path) or "."
+            os.makedirs(folder, exist_ok=True)
+            with file_lock(self.cache_path):
+                self._load_disk()
+                payload = {
+                    str(days): {"fetched_at": fetched_at, "events": events}
+                    for days, (fetched_at, events, _, _) in self._cache.items()
+                }
+                with tempfile.NamedTemporaryFile("w", dir=folder, delete=False, suffix=".tmp") as tmpf:
+                    json.dump(payload, tmpf)
+                    temp_path = tmpf.name
+                os.replace(temp_path, self.cache_path)
+                self._disk_mtime = self._file_mtime()
+        except Exception as e:
+            logger.warning("⚠️ Failed to persist events cache: %s", e)
+
+    @staticmethod
+    def _narrow(entry: tuple, lookahead_days: int) -> tuple:
+        """Return ``entry`` limited to games starting within ``lookahead_days``."""
+        today = now_eastern().replace(hour=0, minute=0, second=0, microsecond=0)
+        end = today + timedelta(days=lookahead_days)
+        fetched_at, _, by_id, by_key = entry
+        kept = {gid: info for gid, info in by_id.items() if info["start"] < end}
+        if len(kept) == len(by_id):
+            return entry
+        keys = {key: [gid for gid in gids if gid in kept] for key, gids in by_key.items()}
+        return (
+            fetched_at,
+            [info["event"] for info in kept.values()],
+            kept,
+            {key: gids for key, gids in keys.items() if gids},
+        )
+
+    def _fresh(self, lookahead_days: int):
+        """Return a cached entry covering ``lookahead_days`` within the TTL.
+
+        An entry fetched with a wider lookahead is narrowed to the requested
+        window.
+        """
+        now = time.time()
+        for days in sorted(self._cache):
+            entry = self._cache[days]
+            if days >= lookahead_days and now - entry[0] < self.ttl:
+                return entry if days == lookahead_days else self._narrow(entry, lookahead_days)
+        return None
+
+    def _entry(self, lookahead_days: int, force: bool = False):
+        with self._lock:
+            entry = None if force else self._fresh(lookahead_days)
+            if entry is not None:
+                return entry
+            # Another process may have refreshed the list since we last looked
+            self._load_disk()
+            if not force:
+                entry = self._fresh(lookahead_days)
+                if entry is not None:
+                    return entry
+            events = self.fetch_fn(lookahead_days)
+            if events is None:
+                return None
+            entry = (time.time(), events, *self._build(events))
+            self._cache[lookahead_days] = entry
+            self._save_disk()
+            logger.debug("🗂️ Refreshed events index (%s events, daysFrom=%s)", len(events), lookahead_days)
+            return entry
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def events(self, lookahead_days: int = 2, force: bool = False) -> list | None:
+        """Return the raw events list or ``None`` when the API call failed."""
+        entry = self._entry(lookahead_days, force)
+        return entry[1] if entry else None
+
+    def entries(self, lookahead_days: int = 2, force: bool = False) -> dict | None:
+        """Return ``{game_id: {"event_id", "start", "home", "away", "event"}}``."""
+        entry = self._entry(lookahead_days, force)
+        return entry[2] if entry else None
+
+    def candidates(self, game_id: str, lookahead_days: int = 2, window_minutes: float = 10) -> list:
+        """Return API game IDs matching ``game_id``.
+
+        An exact ID match wins; otherwise events with the same date and teams
+        whose start is within ``window_minutes`` (any start when ``game_id``
+        has no time) are returned.
+        """
+        entry = self._entry(lookahead_days)
+        if entry is None:
+            return []
+        by_id, by_key = entry[2], entry[3]
+        game_id = canonical_game_id(game_id)
+        if game_id in by_id:
+            return [game_id]
+        parts = parse_game_id(game_id)
+        pool = by_key.get((parts["date"], parts["away"], parts["home"]), [])
+        if "-T" not in game_id:
+            return list(pool)
+        target = game_id_to_dt(game_id)
+        return [
+            gid
+            for gid in pool
+            if abs((by_id[gid]["start"] - target).total_seconds()) / 60 <= window_minutes
+        ]
+
+    def lookup(self, game_id: str, lookahead_days: int = 2) -> tuple[str | None, dict | None]:
+        """Return ``(api_game_id, entry)`` for a unique match or ``(None, None)``."""
+        matches = self.candidates(game_id, lookahead_days)
+        if len(matches) != 1:
+            return None, None
+        return matches[0], self._entry(lookahead_days)[2][matches[0]]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+
+_INDEX: EventsIndex | None = None
+
+
+def get_events_index() -> EventsIndex:
+    """Return the process-wide :class:`EventsIndex`."""
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = EventsIndex()
+    return _INDEX
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 """Helpers for constructing and matching ``game_id`` strings."""
 
+from bisect import bisect_left
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import List, Optional
@@ -10,7 +11,7 @@ def _get_eastern_tz():
     from core.utils import EASTERN_TZ  # imported lazily to avoid circular deps
     return EASTERN_TZ
 
-__all__ = ["build_game_id", "normalize_game_id", "fuzzy_match_game_id"]
+__all__ = ["build_game_id", "normalize_game_id", "fuzzy_match_game_id", "GameIdResolver"]
 
 
 def build_game_id(away: str, home: str, start_time_utc: datetime) -> str:
@@ -55,4 +56,152 @@ def fuzzy_match_game_id(target: str, candidates: List[str], window: int = 5) ->
         if delta <= window and (best_delta is None or delta < best_delta):
             best = cand
             best_delta = delta
-    return best
\ No newline at end of file
+    return best
+
+
+def _time_token_minutes(token: str) -> Optional[int]:
+    """Return minutes after midnight for a ``T1305[-DH1]`` time token."""
+    if not token.startswith("T"):
+        return None
+    digits = "".join(c for c in token.split("-")[0][1:] if c.isdigit())[:4]
+    if len(digits) != 4:
+        return None
+    try:
+        dt = datetime.strptime(digits, "%H%M")
+    except Exception:
+        return None
+    return dt.hour * 60 + dt.minute
+
+
+def _nearest(minutes: List[int], target: int) -> List[int]:
+    """Return the one or two entries of sorted ``minutes`` closest to ``target``."""
+    i = bisect_left(minutes, target)
+    return minutes[max(i - 1, 0): i + 1]
+
+
+class GameIdResolver:
+    """Resolve game IDs against the keys of one odds dataset.
+
+    :func:`core.utils.lookup_fallback_odds` and :func:`fuzzy_match_game_id`
+    scan and re-parse every key on each call. The resolver parses the keys
+    once, indexes them by ``(date, away, home)`` and by base matchup with
+    sorted start minutes, and memoizes each answer, so a lookup is a dict
+    hit plus a bisect. Results match the scanning functions exactly. Build a
+    new resolver when the odds mapping changes.
+    """
+
+    __slots__ = ("odds", "_by_parts", "_by_base", "_lookups", "_fuzzy")
+
+    def __init__(self, odds: dict):
+        from core.utils import parse_game_id  # imported lazily to avoid circular deps
+
+        self.odds = odds if isinstance(odds, dict) else {}
+        # (date, away, home) -> [count, untimed keys, {minute: [keys]}, sorted minutes]
+        self._by_parts: dict = {}
+        # base matchup -> [first key, first untimed key, {minute: (position, first key)}, sorted minutes]
+        self._by_base: dict = {}
+        self._lookups: dict = {}
+        self._fuzzy: dict = {}
+        for position, key in enumerate(self.odds):
+            parts = parse_game_id(key)
+            entry = self._by_parts.setdefault(
+                (parts["date"], parts["away"], parts["home"]), [0, [], {}, None]
+            )
+            entry[0] += 1
+            minute = _time_token_minutes(parts["time"])
+            if minute is None:
+                entry[1].append(key)
+            else:
+                entry[2].setdefault(minute, []).append(key)
+
+            base = self._by_base.setdefault(normalize_game_id(key), [key, None, {}, None])
+            minute = _suffix_minutes(key)
+            if minute is None:
+                if base[1] is None:
+                    base[1] = key
+            else:
+                base[2].setdefault(minute, (position, key))
+        for entry in self._by_parts.values():
+            entry[3] = sorted(entry[2])
+        for base in self._by_base.values():
+            base[3] = sorted(base[2])
+
+    def __len__(self) -> int:
+        return len(self.odds)
+
+    def match(self, game_id: str, max_delta: Optional[int] = 10) -> tuple[Optional[str], Optional[int], int]:
+        """Return ``(key, delta_minutes, candidate_count)`` for ``game_id``.
+
+        Uses the same rules as :func:`core.utils.lookup_fallback_odds`: an
+        exact key wins, otherwise the candidate with the same date and teams
+        whose ``-T`` time is closest (ties go to the smallest key). A match
+        beyond ``max_delta`` is only returned when it is the sole candidate.
+        """
+        cache_key = (game_id, max_delta)
+        cached = self._lookups.get(cache_key)
+        if cached is not None:
+            return cached
+        result = self._match(game_id, max_delta)
+        self._lookups[cache_key] = result
+        return result
+
+    def _match(self, game_id: str, max_delta: Optional[int]) -> tuple:
+        if game_id in self.odds:
+            return game_id, 0, 1
+        from core.utils import parse_game_id
+
+        req = parse_game_id(game_id)
+        entry = self._by_parts.get((req["date"], req["away"], req["home"]))
+        if entry is None:
+            return None, None, 0
+        count, untimed, by_minute, minutes = entry
+        req_minutes = _time_token_minutes(req["time"])
+        if req_minutes is None or not minutes:
+            every = untimed + [k for keys in by_minute.values() for k in keys]
+            return min(every), None, count
+        best_delta, best_key = min(
+            (abs(m - req_minutes), min(by_minute[m])) for m in _nearest(minutes, req_minutes)
+        )
+        if max_delta is not None and best_delta > max_delta and count > 1:
+            return None, best_delta, count
+        return best_key, best_delta, count
+
+    def lookup(self, game_id: str, max_delta: Optional[int] = 10) -> tuple[Optional[dict], Optional[str]]:
+        """Return ``(row, matched_key)`` like :func:`core.utils.lookup_fallback_odds`."""
+        key, delta, count = self.match(game_id, max_delta)
+        if key is None:
+            return None, None
+        if max_delta is not None and delta is not None and delta > max_delta:
+            from core.logger import get_logger
+
+            get_logger(__name__).warning(
+                "⚠️ Fallback odds delta %s exceeds max %s for %s; using %s because it was the only match",
+                delta,
+                max_delta,
+                game_id,
+                key,
+            )
+        return self.odds.get(key), key
+
+    def fuzzy_match(self, target: str, window: int = 5) -> Optional[str]:
+        """Return the same key as ``fuzzy_match_game_id(target, list(odds), window)``."""
+        cache_key = (target, window)
+        if cache_key in self._fuzzy:
+            return self._fuzzy[cache_key]
+        base = self._by_base.get(normalize_game_id(target))
+        target_min = _suffix_minutes(target)
+        result = None
+        if base is not None:
+            first, untimed, by_minute, minutes = base
+            if target_min is None:
+                result = first
+            elif untimed is not None:
+                result = untimed
+            else:
+                # Equal deltas go to the key seen first, as in the linear scan
+                nearest = [(abs(m - target_min), *by_minute[m]) for m in _nearest(minutes, target_min)]
+                nearest = [n for n in nearest if n[0] <= window]
+                if nearest:
+                    result = min(nearest)[2]
+        self._fuzzy[cache_key] = result
+        return result
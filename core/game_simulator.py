@@ -5,6 +5,9 @@ from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Innings an opener pitches before the listed starter takes over
+OPENER_INNINGS = 1
+
 def should_replace_pitcher(pitcher_state, pitch_limit=90, tto_limit=3):
     return (
         pitcher_state.get("pitch_count", 0) > pitch_limit or
@@ -21,8 +24,16 @@ def simulate_game(
     away_bullpen=None,
     debug=False,
     return_inning_scores=False,
-    use_noise=True
+    use_noise=True,
+    home_opener=None,
+    away_opener=None,
 ):
+    """Simulate one game and return the score, innings and pitcher usage.
+
+    ``home_opener``/``away_opener`` pitch the first ``OPENER_INNINGS``
+    innings for that side, after which its listed starter takes over with
+    a fresh pitch count and works the bulk of the game.
+    """
     home_score = 0
     away_score = 0
     innings_data = []
@@ -32,8 +43,8 @@ def simulate_game(
     home_pitcher_state = {"batters_faced": 0, "pitch_count": 0, "tto_count": 1}
     away_pitcher_state = {"batters_faced": 0, "pitch_count": 0, "tto_count": 1}
 
-    current_home_pitcher = home_pitcher
-    current_away_pitcher = away_pitcher
+    current_home_pitcher = home_opener or home_pitcher
+    current_away_pitcher = away_opener or away_pitcher
     used_home_relievers = []
     used_away_relievers = []
 
@@ -45,7 +56,10 @@ def simulate_game(
         if debug:
             print(f"\n➡️ Inning {inning} begins")
 
-        if should_replace_pitcher(home_pitcher_state):
+        if home_opener is not None and inning == OPENER_INNINGS + 1:
+            current_home_pitcher = home_pitcher
+            home_pitcher_state = {"batters_faced": 0, "pitch_count": 0, "tto_count": 1}
+        elif should_replace_pitcher(home_pitcher_state):
             if home_bullpen:
                 relievers = simulate_reliever_chain(home_bullpen, num_needed=1)
                 if relievers:
@@ -70,7 +84,10 @@ def simulate_game(
         home_pitcher_state = away_half.get("pitcher_state", home_pitcher_state)
 
         if not (inning == 9 and home_score > away_score):
-            if should_replace_pitcher(away_pitcher_state):
+            if away_opener is not None and inning == OPENER_INNINGS + 1:
+                current_away_pitcher = away_pitcher
+                away_pitcher_state = {"batters_faced": 0, "pitch_count": 0, "tto_count": 1}
+            elif should_replace_pitcher(away_pitcher_state):
                 if away_bullpen:
                     relievers = simulate_reliever_chain(away_bullpen, num_needed=1)
                     if relievers:
@@ -156,6 +173,20 @@ def simulate_game(
     return result
 
 
+def count_plate_appearances(result):
+    """Return the plate appearances in a ``simulate_game`` result.
+
+    Only events with a batter count; ghost and other non-PA runs do not.
+    """
+    return sum(
+        1
+        for inning in result["innings"]
+        for key in ("top_half_events", "bottom_half_events")
+        for event in inning[key]
+        if event.get("batter") is not None
+    )
+
+
 
 def build_sample_lineup(num_batters=9):
     """
@@ -0,0 +1,325 @@
+"""Memoized label and name normalization.
+
+Odds labels and player names are normalized tens of thousands of times per
+snapshot build and consensus pass, almost always on a small set of distinct
+strings. The helpers here use precompiled patterns, a character trie of team
+names instead of scanning every team with ``startswith`` and bounded LRU
+caches keyed on the raw input. :func:`label_cache_stats` reports hit rates.
+
+The public functions are re-exported from :mod:`core.utils`.
+"""
+
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+__all__ = [
+    "LABEL_CACHE_SIZE",
+    "TeamTrie",
+    "build_full_label",
+    "build_point_str",
+    "clear_label_caches",
+    "label_cache_stats",
+    "normalize_label",
+    "normalize_label_for_odds",
+    "normalize_line_label",
+    "normalize_name",
+    "normalize_to_abbreviation",
+]
+
+LABEL_CACHE_SIZE = int(os.getenv("LABEL_CACHE_SIZE", "65536"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_OVER_UNDER_RE = re.compile(r"^(Over|Under)([0-9\.]+)$", re.IGNORECASE)
+_NAME_STRIP = str.maketrans({".": "", "’": "", "‘": "", "-": " ", "_": " "})
+_NAME_SUFFIXES = {"jr", "ii", "iii"}
+_NAME_PARTICLES = {"de", "del", "la", "van", "von", "da", "du"}
+
+
+class TeamTrie:
+    """Character trie returning the longest team name prefixing a string."""
+
+    __slots__ = ("_root",)
+    _END = "\0"
+
+    def __init__(self, mapping: dict | None = None):
+        self._root: dict = {}
+        for name, value in (mapping or {}).items():
+            self.insert(name, value)
+
+    def insert(self, name: str, value) -> None:
+        node = self._root
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node[self._END] = (name, value)
+
+    def match(self, text: str):
+        """Return ``(name, value)`` for the longest prefix of ``text`` or ``None``."""
+        node, found = self._root, None
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            if self._END in node:
+                found = node[self._END]
+        return found
+
+
+_TEAMS: dict | None = None
+
+
+def _teams() -> dict:
+    """Build team lookups on first use (``core.utils`` owns the tables)."""
+    global _TEAMS
+    if _TEAMS is None:
+        from core.utils import TEAM_ABBR, TEAM_ABBR_TO_NAME
+
+        _TEAMS = {
+            "by_name": TeamTrie(TEAM_ABBR),
+            "by_full_name": TeamTrie({name: abbr for abbr, name in TEAM_ABBR_TO_NAME.items()}),
+            "abbrs": {abbr.upper() for abbr in TEAM_ABBR.values()},
+        }
+    return _TEAMS
+
+
+# ---------------------------------------------------------------------------
+# Odds labels
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def _normalize_label(label: str) -> str:
+    label = _WHITESPACE_RE.sub(" ", label.strip().replace("−", "-"))
+
+    # Handle totals: "Over 8.5", "Under9", "Over8.0"
+    lowered = label.lower()
+    if lowered.startswith("over") or lowered.startswith("under"):
+        tokens = label.split()
+        if len(tokens) == 2:
+            side, val = tokens
+            try:
+                return f"{side.title()} {float(val):.1f}"
+            except ValueError:
+                return label
+        m = _OVER_UNDER_RE.match(label)
+        if m:
+            return f"{m.group(1).title()} {float(m.group(2)):.1f}"
+        return label.title()
+
+    teams = _teams()
+    # Normalize spreads: "Milwaukee Brewers +1.5" → "MIL +1.5"
+    hit = teams["by_name"].match(label)
+    if hit:
+        team_name, abbr = hit
+        return f"{abbr.upper()} {label[len(team_name):].strip()}"
+
+    # Catch fallback: if already abbreviated form, standardize case
+    parts = label.split()
+    if len(parts) == 2 and parts[0].upper() in teams["abbrs"]:
+        return f"{parts[0].upper()} {parts[1]}"
+
+    return label
+
+
+def normalize_label(label):
+    """Return ``label`` with canonical spacing, totals format and team abbreviation."""
+    if not isinstance(label, str):
+        return label
+    return _normalize_label(label)
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def normalize_to_abbreviation(label: str) -> str:
+    """
+    Normalize full team name label to abbreviation.
+    - 'Washington Nationals -1.5' → 'WSH -1.5'
+    - Leaves 'Over 8.5' or 'Under 4.5' untouched
+    """
+    label = label.strip().replace("+", " +").replace("-", " -").replace("  ", " ")
+
+    if label.startswith(("Over", "Under")):
+        return label
+
+    hit = _teams()["by_full_name"].match(label)
+    if hit:
+        full_name, abbr = hit
+        rest = label[len(full_name):]
+        if not rest or rest[0] == " ":
+            rest = rest.strip()
+            return f"{abbr} {rest}".strip() if rest else abbr
+
+    return label  # fallback
+
+
+def normalize_line_label(label: str):
+    """Extract prefix and numeric line value from a label string."""
+    if not isinstance(label, str):
+        return None, None
+
+    cleaned = label.strip().replace("+", " +").replace("-", " -")
+    parts = cleaned.split()
+    if not parts:
+        return None, None
+
+    if parts[0].lower() in {"over", "under"}:
+        prefix = parts[0].capitalize()
+        try:
+            value = float(parts[1])
+        except (IndexError, ValueError):
+            value = None
+        return prefix, value
+
+    prefix = normalize_to_abbreviation(parts[0])
+    try:
+        value = float(parts[-1])
+    except (ValueError, IndexError):
+        value = None
+    return prefix.upper(), value
+
+
+def build_point_str(point, market_key=None):
+    """Return formatted point string for a given market."""
+    try:
+        value = float(point)
+    except (TypeError, ValueError):
+        return ""
+
+    if market_key and "spreads" in market_key:
+        return f"{value:+.1f}".replace("+0.0", "0.0").replace("-0.0", "0.0")
+
+    return f"{value:.1f}"
+
+
+def build_full_label(normalized_label, market_key, point):
+    """Construct a standardized betting label."""
+    mkey = market_key.lower()
+    point_str = build_point_str(point, mkey)
+
+    if point_str:
+        if "team_totals" in mkey:
+            parts = normalized_label.split()
+            if len(parts) >= 2:
+                team, side = parts[0], parts[1]
+                return f"{team} {side} {point_str}"
+            return f"{normalized_label} {point_str}".strip()
+        if "totals" in mkey:
+            side = normalized_label.split()[0]
+            return f"{side} {point_str}"
+        if "spreads" in mkey:
+            base = normalized_label.split()[0].strip()
+            return f"{base} {point_str}"
+
+    return normalized_label.strip()
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def _normalize_label_for_odds(label: str, market_key: str, point) -> str:
+    base = normalize_label(label)
+
+    if point is None:
+        _, inferred = normalize_line_label(base)
+        point = inferred
+
+    mkey = market_key.lower()
+    if mkey.startswith("spreads") or mkey.startswith("h2h"):
+        base = normalize_to_abbreviation(base)
+
+    return build_full_label(base, mkey, point)
+
+
+def normalize_label_for_odds(label: str, market_key: str, point=None) -> str:
+    """Return standardized label for odds lookups.
+
+    Parameters
+    ----------
+    label : str
+        Raw label string (may include team name or Over/Under).
+    market_key : str
+        Canonical market key such as ``spreads`` or ``totals_1st_5_innings``.
+    point : float | None, optional
+        Explicit numeric line value. If ``None``, the value will be extracted
+        from ``label`` when possible.
+
+    Returns
+    -------
+    str
+        Normalized label with consistent spacing, team abbreviations and
+        decimal precision.
+    """
+
+    if label is None:
+        return ""
+    try:
+        return _normalize_label_for_odds(label, market_key, point)
+    except TypeError:
+        # Unhashable point (e.g. a list from malformed JSON)
+        return _normalize_label_for_odds.__wrapped__(label, market_key, point)
+
+
+# ---------------------------------------------------------------------------
+# Player names
+# ---------------------------------------------------------------------------
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def _normalize_name(name: str) -> str:
+    name = name.strip().lower()
+
+    # ✅ Remove accents with Unicode normalization
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("utf-8")
+    name = name.translate(_NAME_STRIP)
+
+    if "," in name:
+        parts = name.split(",", 1)
+        name = f"{parts[1].strip()} {parts[0].strip()}"
+
+    tokens = name.split()
+    if tokens and tokens[-1] in _NAME_SUFFIXES:
+        tokens = tokens[:-1]
+
+    if len(tokens) > 2 and tokens[1] in _NAME_PARTICLES:
+        return tokens[0] + " " + " ".join(tokens[1:])
+    elif len(tokens) >= 2:
+        return tokens[0] + " " + tokens[-1]
+    else:
+        return name
+
+
+def normalize_name(name):
+    """
+    Normalize a player name by:
+    - Lowercasing, stripping whitespace, removing punctuation and accents.
+    - Converts "Last, First" → "first last".
+    """
+    if not isinstance(name, str):
+        return ""
+    return _normalize_name(name)
+
+
+# ---------------------------------------------------------------------------
+# Cache statistics
+# ---------------------------------------------------------------------------
+_CACHED = {
+    "normalize_label": _normalize_label,
+    "normalize_to_abbreviation": normalize_to_abbreviation,
+    "normalize_label_for_odds": _normalize_label_for_odds,
+    "normalize_name": _normalize_name,
+}
+
+
+def label_cache_stats() -> dict:
+    """Return ``{function: {"hits", "misses", "hit_rate", "size", "maxsize"}}``."""
+    stats = {}
+    for name, fn in _CACHED.items():
+        info = fn.cache_info()
+        calls = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / calls, 4) if calls else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def clear_label_caches() -> None:
+    for fn in _CACHED.values():
+        fn.cache_clear()
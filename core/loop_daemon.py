@@ -0,0 +1,289 @@
+"""Daemon mode for the auto sim/log loop.
+
+The classic loop hands everything between steps through files. It saves the
+odds to ``data/market_odds`` and then starts ``unified_snapshot_generator``,
+which re-reads them along with the previous snapshot. ``log_betting_evals``
+then re-reads that snapshot, and ``reconcile_theme_exposure`` re-reads
+``market_evals.csv``. Every one of those processes also pays for importing
+pandas and rebuilding the trackers.
+
+:func:`build_scheduler` wires odds fetch and sims → snapshot → log →
+reconcile/dispatch as in-process stages of a
+:class:`~core.stage_scheduler.StageScheduler`. Each stage fires as soon as
+its inputs change. :class:`LoopState` keeps the latest odds, the snapshot
+rows and the incremental build cache warm between stages and cycles. The
+snapshot store and tracker views are process-wide singletons, so they stay
+warm too. The odds file, snapshot JSON/database and build cache are still
+written every cycle, but only as checkpoints for restarts, the closing
+monitor and the standalone scripts.
+
+Simulations and the closing odds monitor remain subprocesses. They are
+CPU-bound or long-running and would starve the other stages of the GIL.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from datetime import timedelta
+from functools import partial
+
+from core.logger import get_logger
+from core.odds_delta import get_odds_delta_tracker
+from core.odds_fetcher import fetch_all_market_odds, save_market_odds_to_file
+from core.odds_history import get_odds_history
+from core.snapshot_incremental import SnapshotBuildCache
+from core.stage_scheduler import Stage, StageScheduler
+from core.utils import now_eastern
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "LoopState",
+    "SlateSimulations",
+    "STAGE_TIMEOUTS",
+    "build_scheduler",
+    "refresh_odds",
+    "run_cycle",
+]
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+PYTHON = sys.executable
+
+ODDS_INTERVAL = 60 * 5  # Every 5 minutes
+SIM_INTERVAL = 60 * 30  # Every 30 minutes
+
+# Seconds before a stage is reported as overdue; sims are killed at theirs
+STAGE_TIMEOUTS = {
+    "odds": 2 * 60,
+    "sims": 45 * 60,
+    "snapshot": 5 * 60,
+    "log": 10 * 60,
+    "reconcile": 60,
+    "dispatch": 5 * 60,
+}
+
+
+class LoopState:
+    """Data shared by the loop stages, kept in memory between cycles."""
+
+    __slots__ = (
+        "planner",
+        "odds",
+        "odds_path",
+        "rows",
+        "snapshot_path",
+        "build_cache",
+    )
+
+    def __init__(self, planner=None, build_cache: SnapshotBuildCache | None = None):
+        self.planner = planner
+        self.odds: dict | None = None
+        self.odds_path: str | None = None
+        self.rows: list = []
+        self.snapshot_path: str | None = None
+        self.build_cache = build_cache
+
+
+def refresh_odds(state: LoopState) -> str | None:
+    """Fetch market odds into ``state`` and checkpoint them to a timestamped file."""
+    logger.info(
+        "\n📡 [%s] Fetching market odds for today and tomorrow...", now_eastern()
+    )
+    odds = fetch_all_market_odds(lookahead_days=2, planner=state.planner, previous=state.odds)
+    if not odds or not isinstance(odds, dict) or len(odds) == 0:
+        logger.error(
+            "❌ Fetched odds snapshot is empty or invalid — skipping loop cycle."
+        )
+        return None
+    logger.debug("📊 Fetched game_ids: %s", list(odds.keys()))
+    get_odds_delta_tracker().update(odds)
+    try:
+        get_odds_history().record(odds)
+    except Exception as e:
+        logger.warning("⚠️ Failed to record odds history: %s", e)
+    state.odds = odds
+    timestamp = now_eastern().strftime("%Y%m%dT%H%M")
+    state.odds_path = save_market_odds_to_file(odds, f"market_odds_{timestamp}")
+    logger.info("✅ [%s] Saved shared odds snapshot: %s", now_eastern(), state.odds_path)
+    return state.odds_path
+
+
+def odds_stage(state: LoopState) -> bool:
+    return refresh_odds(state) is not None
+
+
+def _odds_for_dates(odds: dict, dates: list) -> dict:
+    """Return a private copy of the ``dates`` games in ``odds``.
+
+    The pricer annotates the odds it is given, so the snapshot stage gets
+    its own copy, as it did when it re-read the odds file.
+    """
+    selected = {gid: v for gid, v in odds.items() if str(gid).startswith(tuple(dates))}
+    return pickle.loads(pickle.dumps(selected, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _snapshot_dates() -> list:
+    now = now_eastern()
+    return [now.strftime("%Y-%m-%d"), (now + timedelta(days=1)).strftime("%Y-%m-%d")]
+
+
+def snapshot_stage(state: LoopState, dates: list | None = None) -> bool:
+    """Rebuild the snapshot from the odds and sims on hand."""
+    # Imported on first use so the loop itself starts quickly
+    from core.unified_snapshot_generator import generate_snapshot
+
+    if not state.odds:
+        logger.info("⏭ No odds fetched yet — skipping snapshot")
+        return False
+    dates = dates or _snapshot_dates()
+    rows, path = generate_snapshot(
+        dates,
+        _odds_for_dates(state.odds, dates),
+        build_cache=state.build_cache,
+        odds_delta=get_odds_delta_tracker().last,
+    )
+    if not path:
+        logger.error("❌ [%s] Unified snapshot generation failed; skipping dispatch.", now_eastern())
+        return False
+    state.rows, state.snapshot_path = rows, path
+    return True
+
+
+def log_stage(state: LoopState, min_ev: float = 0.05) -> bool:
+    """Log qualifying bets from the in-memory snapshot rows."""
+    from cli.log_betting_evals import run_batch_logging
+
+    # The batch logger evaluates every queued row of the snapshot, whatever
+    # the date, so one pass covers today and tomorrow
+    run_batch_logging(
+        eval_folder=None,
+        market_odds=state.odds,
+        min_ev=min_ev,
+        debug=True,
+        output_dir="logs",
+        snapshot_rows=state.rows,
+        snapshot_path=state.snapshot_path,
+    )
+    return True
+
+
+def reconcile_stage(state: LoopState) -> bool:
+    from scripts.reconcile_theme_exposure import reconcile
+
+    logger.info("🧼 [%s] Reconciling tracker after log pass", now_eastern())
+    reconcile()
+    return True
+
+
+def dispatch_stage(state: LoopState) -> bool:
+    """Post the snapshot, with this cycle's logged flags, to Discord."""
+    from core.dispatch_orchestrator import dispatch_snapshots
+
+    results = dispatch_snapshots(["--output-discord"], rows=state.rows)
+    failed = {name: status for name, status in results.items() if status != "ok"}
+    if failed:
+        logger.warning("⚠️ [%s] Dispatchers did not complete cleanly: %s", now_eastern(), failed)
+    return True
+
+
+class SlateSimulations:
+    """Stage that runs ``cli.full_slate_runner`` for today and tomorrow.
+
+    The simulations stay in subprocesses; the stage waits for them so the
+    snapshot is rebuilt as soon as they land. :meth:`cancel` kills them.
+    """
+
+    __slots__ = ("edge_threshold", "export_folder", "_procs", "_lock")
+
+    def __init__(self, edge_threshold: float = 0.05, export_folder: str = "backtest/sims"):
+        self.edge_threshold = edge_threshold
+        self.export_folder = export_folder
+        self._procs: list = []
+        self._lock = threading.Lock()
+
+    def __call__(self, state: LoopState) -> bool:
+        procs = []
+        with self._lock:
+            for date_str in _snapshot_dates():
+                logger.info(
+                    "\n🎯 [%s] Launching full slate simulation for %s...",
+                    now_eastern(),
+                    date_str,
+                )
+                cmd = [
+                    PYTHON,
+                    "-m",
+                    "cli.full_slate_runner",
+                    "--date",
+                    date_str,
+                    f"--export-folder={self.export_folder}",
+                    f"--edge-threshold={self.edge_threshold}",
+                ]
+                procs.append(
+                    subprocess.Popen(cmd, cwd=ROOT_DIR, env={**os.environ, "PYTHONPATH": ROOT_DIR})
+                )
+            self._procs = procs
+        codes = [proc.wait() for proc in procs]
+        with self._lock:
+            self._procs = []
+        if any(code != 0 for code in codes):
+            logger.error("❌ [%s] Full slate simulation exit codes: %s", now_eastern(), codes)
+        return any(code == 0 for code in codes)
+
+    def cancel(self) -> None:
+        with self._lock:
+            for proc in self._procs:
+                if proc.poll() is None:
+                    proc.kill()
+                    logger.error("💀 [%s] Force-terminated full slate sim (PID %d)", now_eastern(), proc.pid)
+
+
+def build_scheduler(
+    state: LoopState,
+    odds_interval: float = ODDS_INTERVAL,
+    sim_interval: float = SIM_INTERVAL,
+    min_ev: float = 0.05,
+    edge_threshold: float = 0.05,
+    timeouts: dict | None = None,
+) -> StageScheduler:
+    """Return the odds/sims → snapshot → log → dispatch stage graph for ``state``."""
+    timeouts = {**STAGE_TIMEOUTS, **(timeouts or {})}
+    sims = SlateSimulations(edge_threshold)
+    stages = [
+        Stage("odds", partial(odds_stage, state), interval=odds_interval, timeout=timeouts["odds"]),
+        Stage("sims", partial(sims, state), interval=sim_interval, timeout=timeouts["sims"], cancel=sims.cancel),
+        Stage("snapshot", partial(snapshot_stage, state), deps=("odds", "sims"), timeout=timeouts["snapshot"]),
+        Stage("log", partial(log_stage, state, min_ev=min_ev), deps=("snapshot",), timeout=timeouts["log"]),
+        Stage("reconcile", partial(reconcile_stage, state), deps=("log",), timeout=timeouts["reconcile"]),
+        Stage("dispatch", partial(dispatch_stage, state), deps=("log",), timeout=timeouts["dispatch"]),
+    ]
+    # Sims start on their interval rather than at launch, as in the classic loop
+    stages[1].next_due = time.monotonic() + sim_interval
+    return StageScheduler(stages)
+
+
+def run_cycle(state: LoopState, dates: list | None = None, min_ev: float = 0.05) -> dict:
+    """Run odds → snapshot → log → reconcile → dispatch once, in order.
+
+    Returns ``{stage: seconds}`` for the stages that ran; a stage with
+    nothing new to hand on ends the cycle early.
+    """
+    steps = (
+        ("odds", partial(odds_stage, state)),
+        ("snapshot", partial(snapshot_stage, state, dates)),
+        ("log", partial(log_stage, state, min_ev=min_ev)),
+        ("reconcile", partial(reconcile_stage, state)),
+        ("dispatch", partial(dispatch_stage, state)),
+    )
+    timings: dict = {}
+    for name, step in steps:
+        start = time.perf_counter()
+        published = step()
+        timings[name] = time.perf_counter() - start
+        if not published:
+            break
+    return timings
@@ -21,9 +21,9 @@ def to_american_odds(prob):
     else:
         return round(-100 / (decimal - 1), 2)
 
-from scipy.special import logit, expit
-
 def apply_logit_calibration(p_sim, a, b):
+    from scipy.special import logit, expit
+
     if p_sim <= 0.0:
         return 0.0001  # prevent math error
     elif p_sim >= 1.0:
@@ -3,27 +3,22 @@ import json
 from datetime import datetime
 from typing import Dict, Tuple
 
-from core.utils import safe_load_json
 from core.lock_utils import with_locked_file
-from core.snapshot_core import build_key
-from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.snapshot_store import TrackerView, get_snapshot_store
 
 DEFAULT_DIR = "backtest"
 
 
-def load_latest_snapshot_tracker(directory: str = DEFAULT_DIR) -> Tuple[Dict[str, dict], str | None]:
-    """Return tracker dict built from the most recent snapshot file."""
-    path = find_latest_market_snapshot_path(directory)
-    if not path or not os.path.exists(path):
-        return {}, None
+def load_latest_snapshot_tracker(directory: str = DEFAULT_DIR) -> Tuple[TrackerView, str | None]:
+    """Return a copy-on-write tracker over the most recent snapshot file.
 
-    data = safe_load_json(path) or []
-    tracker: Dict[str, dict] = {}
-    rows = data if isinstance(data, list) else data.values() if isinstance(data, dict) else []
-    for row in rows:
-        key = build_key(row.get("game_id"), row.get("market"), row.get("side"))
-        tracker[key] = row
-    return tracker, path
+    The snapshot is parsed once per process (and again only when a newer
+    file appears); every call gets its own view, so updates to one tracker
+    never leak into another.
+    """
+    store = get_snapshot_store(directory)
+    tracker = store.tracker(raw_keys=True)
+    return tracker, store.path
 
 
 def write_market_snapshot(tracker: Dict[str, dict], directory: str = DEFAULT_DIR) -> str:
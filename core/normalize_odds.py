@@ -1,12 +1,12 @@
 from core.config import DEBUG_MODE, VERBOSE_MODE
-from core.market_pricer import implied_prob, to_american_odds, best_price
+from core.market_pricer import to_american_odds, best_price
 from core.book_whitelist import ALLOWED_BOOKS
+from core.devig import devig_market, method_for_market
 from core.utils import (
     normalize_label,
     merge_offers_with_alternates,
     get_teams_from_game_id,
 )
-import numpy as np
 
 # Books we prefer to use when creating consensus prices
 DEFAULT_CONSENSUS_BOOKS = [
@@ -41,6 +41,7 @@ def normalize_odds(game_id: str, offers: dict) -> dict:
 
         label_prices = {}
         paired_novig = {}
+        devigged = {}
 
         for book, lines in market.items():
             for label, entry in lines.items():
@@ -51,41 +52,35 @@ def normalize_odds(game_id: str, offers: dict) -> dict:
                 sources.setdefault(f"{market_key}_source", {}).setdefault(label, {})[book] = price
 
         if "totals" in market_key:
-            overs = [l for l in label_prices if l.startswith("Over")]
-            for over in overs:
-                try:
-                    point = over.split()[-1]
-                    under = f"Under {point}"
-
-                    books = [
-                        b for b in CONSENSUS_BOOKS
-                        if b in sources[f"{market_key}_source"].get(over, {})
-                        and b in sources[f"{market_key}_source"].get(under, {})
-                    ]
-
-                    for b in books:
-                        p1 = implied_prob(sources[f"{market_key}_source"][over][b])
-                        p2 = implied_prob(sources[f"{market_key}_source"][under][b])
-                        total = p1 + p2
-                        if total == 0:
-                            continue
-                        paired_novig.setdefault(over, []).append(round(p1 / total, 6))
-                        paired_novig.setdefault(under, []).append(round(p2 / total, 6))
-                except Exception as e:
-                    print(f"❌ Devig error ({over} vs {under}): {e}")
-                    continue
+            pairs = [
+                (over, f"Under {over.split()[-1]}")
+                for over in label_prices
+                if over.startswith("Over")
+            ]
+            # Devig every Over/Under pair across all consensus books at once
+            devigged = devig_market(
+                sources.get(f"{market_key}_source", {}),
+                pairs,
+                method=method_for_market(market_key),
+                books=CONSENSUS_BOOKS,
+            )
+            paired_novig = {
+                label: list(result["bookwise_probs"].values())
+                for label, result in devigged.items()
+            }
 
         for label in label_prices:
             price = best_price(label_prices[label], label)
             if label in paired_novig and len(paired_novig[label]) >= 2:
-                prob = round(np.mean(paired_novig[label]), 6)
+                prob = devigged[label]["consensus_prob"]
                 odds = to_american_odds(prob)
                 consensus.setdefault(market_key, {})[label] = {
                     "price": price,
                     "consensus_prob": prob,
                     "consensus_odds": odds,
                     "pricing_method": "devig",
-                    "raw_devig_probs": paired_novig[label]
+                    "raw_devig_probs": paired_novig[label],
+                    "dispersion": devigged[label]["dispersion"],
                 }
             else:
                 consensus.setdefault(market_key, {})[label] = {
@@ -0,0 +1,155 @@
+"""Cell-level diffs between consecutive odds refreshes.
+
+Most prices are unchanged between five-minute cycles. :class:`OddsDeltaTracker`
+keeps the previous refresh as an :class:`core.odds_table.OddsTable` and
+reports which ``(game_id, market, label, book)`` cells moved, appeared or
+disappeared. Consensus pricing uses :func:`reusable_markets` to carry
+unchanged markets forward, and the daemon hands the latest delta to
+:meth:`core.snapshot_incremental.SnapshotBuildCache.plan`, which then skips
+re-hashing the odds of games whose quotes did not move.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import uuid
+
+from core.logger import get_logger
+from core.odds_table import OddsTable
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "OddsDelta",
+    "OddsDeltaTracker",
+    "diff_tables",
+    "get_odds_delta_tracker",
+    "market_cells",
+    "reusable_markets",
+]
+
+
+class OddsDelta:
+    """Changed cells mapped to ``(old_price, new_price)``.
+
+    ``old_price`` is ``None`` for new quotes and ``new_price`` is ``None`` for
+    quotes that were pulled. ``full`` marks a delta with no previous refresh
+    to compare against, where every game must be treated as changed.
+    ``since`` and ``refresh`` identify the refreshes it was computed between
+    (set by :class:`OddsDeltaTracker`).
+    """
+
+    __slots__ = ("changed", "full", "since", "refresh")
+
+    def __init__(self, changed: dict | None = None, full: bool = False):
+        self.changed = changed or {}
+        self.full = full
+        self.since: str | None = None
+        self.refresh: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.changed)
+
+    def __bool__(self) -> bool:
+        return self.full or bool(self.changed)
+
+    @property
+    def games(self) -> set:
+        return {key[0] for key in self.changed}
+
+    @property
+    def markets(self) -> set:
+        """Return the changed ``(game_id, market)`` pairs."""
+        return {key[:2] for key in self.changed}
+
+    def game_changed(self, game_id: str) -> bool:
+        return self.full or game_id in self.games
+
+
+def _cells(table: OddsTable) -> dict:
+    return {(g, m, l, b): p for g, m, l, b, p, _ in table.rows()}
+
+
+def diff_tables(previous: OddsTable | None, current: OddsTable) -> OddsDelta:
+    """Return the cells whose price differs between ``previous`` and ``current``."""
+    if previous is None:
+        return OddsDelta({key: (None, p) for key, p in _cells(current).items()}, full=True)
+    before, after = _cells(previous), _cells(current)
+    changed = {key: (before.get(key), p) for key, p in after.items() if before.get(key) != p}
+    changed.update({key: (p, None) for key, p in before.items() if key not in after})
+    return OddsDelta(changed)
+
+
+def market_cells(game: dict) -> dict:
+    """Return ``{market: {(label, book): price}}`` from a game's ``per_book`` quotes."""
+    cells = {}
+    for market, labels in (game or {}).items():
+        if not isinstance(labels, dict) or market.endswith("_source"):
+            continue
+        cells[market] = {
+            (label, book): price
+            for label, entry in labels.items()
+            if isinstance(entry, dict)
+            for book, price in (entry.get("per_book") or {}).items()
+        }
+    return cells
+
+
+def _dependencies(market: str, markets) -> set:
+    """Markets whose quotes can feed consensus pricing for ``market``."""
+    family = market.replace("alternate_", "")
+    deps = {m for m in markets if m.replace("alternate_", "") == family}
+    if "spreads" in market:
+        # Pick'em spreads are priced off the moneyline
+        deps.add("h2h")
+    return deps | {market}
+
+
+def reusable_markets(current: dict, previous: dict | None) -> set:
+    """Return markets of ``current`` whose consensus inputs match ``previous``.
+
+    A market is reusable only when its own ``per_book`` quotes and those of
+    every market its consensus can fall back to (the alternate twin and, for
+    spreads, the moneyline) are unchanged.
+    """
+    if not isinstance(previous, dict):
+        return set()
+    now, before = market_cells(current), market_cells(previous)
+    markets = set(now) | set(before)
+
+    def same(market):
+        # A market missing on one side counts as empty
+        return now.get(market, {}) == before.get(market, {})
+
+    return {m for m in now if all(same(d) for d in _dependencies(m, markets))}
+
+
+class OddsDeltaTracker:
+    """Remember the last refresh in memory and diff each new one against it."""
+
+    def __init__(self):
+        self.table: OddsTable | None = None
+        self.last: OddsDelta | None = None
+
+    def update(self, odds_data: dict) -> OddsDelta:
+        table = OddsTable.from_nested(odds_data)
+        delta = diff_tables(self.table, table)
+        delta.since = self.last.refresh if self.last is not None else None
+        delta.refresh = uuid.uuid4().hex
+        self.table, self.last = table, delta
+        logger.info(
+            "🔁 Odds delta: %s cells changed across %s games%s",
+            len(delta),
+            len(delta.games),
+            " (first refresh)" if delta.full else "",
+        )
+        return delta
+
+
+_TRACKER: OddsDeltaTracker | None = None
+
+
+def get_odds_delta_tracker() -> OddsDeltaTracker:
+    """Return the process-wide :class:`OddsDeltaTracker`."""
+    global _TRACKER
+    if _TRACKER is None:
+        _TRACKER = OddsDeltaTracker()
+    return _TRACKER
@@ -4,9 +4,13 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 from core.config import DEBUG_MODE, VERBOSE_MODE
 
 import json
-import shutil
+import tempfile
+import threading
 import requests
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from datetime import datetime, timedelta  # ✅ ADD THIS LINE
 from pathlib import Path
@@ -32,6 +36,10 @@ from core.utils import (
     to_eastern,
     now_eastern,
 )
+from core.events_index import get_events_index
+from core.odds_quota import get_quota_tracker, merge_previous_odds
+from core.odds_table import parse_bookmakers
+from core.odds_delta import reusable_markets
 
 load_dotenv()
 
@@ -56,8 +64,19 @@ MARKET_KEYS = [
     "team_totals", "alternate_team_totals"
 ]
 
-EVENTS_URL = f"https://api.the-odds-api.com/v4/sports/{SPORT}/events"
-EVENT_ODDS_URL = f"https://api.the-odds-api.com/v4/sports/{SPORT}/events/{{event_id}}/odds"
+# Override the base URL to point the fetchers at a local mock server
+ODDS_API_BASE_URL = os.getenv("ODDS_API_BASE_URL", "https://api.the-odds-api.com").rstrip("/")
+EVENTS_URL = f"{ODDS_API_BASE_URL}/v4/sports/{SPORT}/events"
+EVENT_ODDS_URL = f"{ODDS_API_BASE_URL}/v4/sports/{SPORT}/events/{{event_id}}/odds"
+
+# HTTP client tuning for per-event odds requests
+REQUEST_TIMEOUT = float(os.getenv("ODDS_API_TIMEOUT", "10"))
+MAX_CONCURRENT_REQUESTS = int(os.getenv("ODDS_API_CONCURRENCY", "8"))
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
 
 
 TEAM_ABBR = {
@@ -97,6 +116,226 @@ def prob_to_american(prob):
     except:
         return None
 
+def get_http_session() -> requests.Session:
+    """Return the shared keep-alive session used for all Odds API calls.
+
+    Connection pooling is sized to :data:`MAX_CONCURRENT_REQUESTS` and
+    transient failures (connection errors, 429 and 5xx responses) are retried
+    with exponential backoff.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            retry = Retry(
+                total=MAX_RETRIES,
+                backoff_factor=RETRY_BACKOFF,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=MAX_CONCURRENT_REQUESTS,
+                pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+    return _SESSION
+
+
+def _api_get(url: str, params: dict) -> requests.Response:
+    resp = get_http_session().get(url, params=params, timeout=REQUEST_TIMEOUT)
+    get_quota_tracker().record(resp)
+    return resp
+
+
+def _fetch_events(lookahead_days: int) -> requests.Response:
+    return _api_get(EVENTS_URL, {"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days})
+
+
+def fetch_events_list(lookahead_days: int = 2):
+    """Return the raw ``/events`` list or ``None`` on a non-200 response.
+
+    Callers should normally go through :func:`core.events_index.get_events_index`,
+    which caches this list.
+    """
+    resp = _fetch_events(lookahead_days)
+    if resp.status_code != 200:
+        logger.debug(f"❌ Failed to fetch events: {resp.text}")
+        return None
+    return resp.json()
+
+
+def _event_odds_params(markets=None) -> dict:
+    return {
+        "apiKey": ODDS_API_KEY,
+        "regions": "us",
+        "markets": ",".join(markets or MARKET_KEYS),
+        "bookmakers": ",".join(BOOKMAKERS),
+        "oddsFormat": "american",
+    }
+
+
+def _fetch_event_odds(event_id: str, markets=None):
+    """Return the decoded odds payload for ``event_id`` or ``None``."""
+    try:
+        resp = _api_get(EVENT_ODDS_URL.format(event_id=event_id), _event_odds_params(markets))
+    except requests.exceptions.RequestException as e:
+        logger.error("❌ Error fetching odds for %s: %s", event_id, e)
+        return None
+    if resp.status_code != 200:
+        logger.debug(f"⚠️ Failed to fetch odds for {event_id}: {resp.text}")
+        return None
+    try:
+        return resp.json()
+    except ValueError:
+        logger.debug(f"⚠️ Invalid JSON in odds response for {event_id}")
+        return None
+
+
+def fetch_event_odds_batch(event_ids, max_workers: int | None = None, markets_by_event: dict | None = None) -> dict:
+    """Return ``{event_id: payload}`` fetched concurrently over one session.
+
+    At most ``max_workers`` (default :data:`MAX_CONCURRENT_REQUESTS`)
+    requests are in flight, so a slate takes roughly as long as its slowest
+    event. ``markets_by_event`` limits the market keys requested per event.
+    Failed events map to ``None``.
+    """
+    event_ids = list(dict.fromkeys(event_ids))
+    if not event_ids:
+        return {}
+    markets_by_event = markets_by_event or {}
+    workers = max(1, min(max_workers or MAX_CONCURRENT_REQUESTS, len(event_ids)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        payloads = pool.map(lambda eid: _fetch_event_odds(eid, markets_by_event.get(eid)), event_ids)
+        return dict(zip(event_ids, payloads))
+
+
+# Returned by ``_process_event_odds`` when a game should be left out entirely
+_SKIP = object()
+
+
+def _process_event_odds(game_id, offers_raw, start_time, filter_bookmakers=None, previous=None):
+    """Normalize one event payload into the per-game odds dict.
+
+    Consensus results for markets whose quotes match ``previous`` (the same
+    game from the prior refresh) are carried forward instead of recomputed.
+    Returns the normalized dict, ``None`` when the event had no usable odds
+    or ``_SKIP`` when the payload itself was unusable.
+    """
+    if DEBUG_MODE:
+        debug_path = f"debug_odds_raw/{game_id}.json"
+        os.makedirs(os.path.dirname(debug_path), exist_ok=True)
+        with open(debug_path, "w") as f:
+            json.dump(offers_raw, f, indent=2)
+        logger.debug(f"📄 Saved raw odds snapshot to {debug_path}")
+
+    if not offers_raw or not isinstance(offers_raw, dict):
+        logger.debug(f"⚠️ Odds API returned unexpected format for {game_id}: {type(offers_raw)}")
+        return _SKIP
+
+    bookmakers_data = offers_raw.get("bookmakers", [])
+    if not bookmakers_data or not isinstance(bookmakers_data, list):
+        logger.debug(f"⚠️ No bookmakers array in odds data for {game_id}")
+        return _SKIP
+
+    if filter_bookmakers:
+        before = len(bookmakers_data)
+        bookmakers_data = [bm for bm in bookmakers_data if bm.get("key") in filter_bookmakers]
+        logger.debug(
+            f"📦 Odds markets received from {before} bookmakers, filtered to {len(bookmakers_data)} for {game_id}"
+        )
+    else:
+        logger.debug(f"📦 Odds markets received from {len(bookmakers_data)} bookmakers for {game_id}")
+
+    # Single pass into flat rows; the nested dict is a view over them
+    table = parse_bookmakers(game_id, bookmakers_data)
+    logger.debug(f"🔎 Offers collected for {game_id}: {list(dict.fromkeys(table.market))}")
+
+    if not len(table):
+        logger.debug(f"❌ No valid odds found for {game_id} — skipping normalization.")
+        return None
+
+    normalized = table.nested_view(game_id)
+
+    if not normalized:
+        logger.debug(
+            f"📭 Normalized odds for {game_id} is empty — possible filtering or no valid odds. Skipping."
+        )
+        return None
+
+    normalized["start_time"] = start_time.isoformat()
+
+    # Calculate consensus probabilities using unified logic
+    from core.consensus_pricer import ConsensusIndex, calculate_consensus_prob
+    index = ConsensusIndex(game_id, normalized)
+    reuse = reusable_markets(normalized, previous)
+    for mkt_key, market in normalized.items():
+        if not isinstance(market, dict) or mkt_key.endswith("_source") or mkt_key == "start_time":
+            continue
+        for label in market:
+            prior = previous[mkt_key].get(label) if mkt_key in reuse else None
+            if isinstance(prior, dict):
+                market[label].update({k: v for k, v in prior.items() if k not in ("price", "per_book")})
+                continue
+            result, _ = calculate_consensus_prob(
+                game_id=game_id,
+                market_odds={game_id: normalized},
+                market_key=mkt_key,
+                label=label,
+                index=index,
+            )
+            normalized[mkt_key][label].update(result)
+            if "books_used" in result:
+                normalized[mkt_key][label]["books_used"] = result["books_used"]
+
+    # Ensure all expected market keys exist for downstream tools
+    for key in MARKET_KEYS:
+        normalized.setdefault(key, {})
+
+    logger.debug(
+        f"📱 ✅ Normalized odds for {game_id} — {len(normalized)} markets stored, {len(reuse)} carried forward"
+    )
+    return normalized
+
+
+def _collect_odds(matched, filter_bookmakers=None, markets_by_game=None, previous=None) -> dict:
+    """Fetch and normalize odds for ``matched`` ``(game_id, event_info)`` pairs."""
+    previous = previous if isinstance(previous, dict) else {}
+    markets_by_event = {
+        info["event"]["id"]: markets_by_game[gid]
+        for gid, info in matched
+        if markets_by_game and gid in markets_by_game
+    }
+    payloads = fetch_event_odds_batch(
+        [info["event"]["id"] for _, info in matched], markets_by_event=markets_by_event
+    )
+    odds_data = {}
+    for game_id, info in matched:
+        offers_raw = payloads.get(info["event"]["id"])
+        if offers_raw is None:
+            continue
+        try:
+            normalized = _process_event_odds(
+                game_id, offers_raw, info["start"], filter_bookmakers, previous=previous.get(game_id)
+            )
+        except Exception as e:
+            logger.debug(f"💥 Exception while processing {game_id}: {e}")
+            continue
+        if normalized is not _SKIP:
+            odds_data[game_id] = normalized
+    return odds_data
+
+
+def _has_market_entries(odds_data: dict) -> bool:
+    return any(
+        data and any(data.get(key) for key in MARKET_KEYS) for data in odds_data.values()
+    )
+
+
 def fetch_consensus_for_single_game(game_id, lookahead_days=2):
     """Return de-vigged consensus odds for a single game.
 
@@ -110,58 +349,23 @@ def fetch_consensus_for_single_game(game_id, lookahead_days=2):
     game_id = canonical_game_id(game_id)
     logger.debug(f"🔎 Fetching consensus odds for {game_id}")
 
-    # Step 1: Pull events
+    # Step 1: Pull events (shared, TTL-cached index)
+    index = get_events_index()
     try:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-            timeout=10,
-        )
-    except TypeError:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-        )
+        entries = index.entries(lookahead_days)
     except requests.exceptions.RequestException as e:
         logger.error("❌ Error fetching events: %s", e)
         return {}
-    if resp.status_code != 200:
+    if entries is None:
         logger.debug(f"❌ Failed to fetch events.")
         return None
 
-    events = resp.json()
-
     # Step 2: Find event_id matching game_id (including time)
-
-    input_parts = parse_game_id(game_id)
-    input_base = f"{input_parts['date']}-{input_parts['away']}@{input_parts['home']}"
-
     event_id = None
-    matched_event = None
-    for event in events:
-        away_team = event["away_team"]
-        home_team = event["home_team"]
-        start_time_utc = datetime.fromisoformat(
-            event["commence_time"].replace("Z", "+00:00")
-        ).replace(tzinfo=ZoneInfo("UTC"))
-        start_time = to_eastern(start_time_utc)
-
-        event_gid = canonical_game_id(
-            extract_game_id_from_event(away_team, home_team, start_time)
-        )
-
-        if event_gid == game_id:
-            matched_event = event
-            game_id = event_gid
-            break
-
-        if "-T" not in game_id and event_gid.startswith(input_base):
-            matched_event = event
-            game_id = event_gid
-            break
-
-    if matched_event:
-        event_id = matched_event["id"]
+    matches = index.candidates(game_id, lookahead_days)
+    if matches:
+        game_id = matches[0]
+        event_id = entries[game_id]["event_id"]
 
     if not event_id:
         logger.debug(f"⚠️ No event found for {game_id}")
@@ -169,28 +373,7 @@ def fetch_consensus_for_single_game(game_id, lookahead_days=2):
 
     # Step 3: Fetch odds for event
     try:
-        odds_resp = requests.get(
-            EVENT_ODDS_URL.format(event_id=event_id),
-            params={
-                "apiKey": ODDS_API_KEY,
-                "regions": "us",
-                "markets": ",".join(MARKET_KEYS),
-                "bookmakers": ",".join(BOOKMAKERS),
-                "oddsFormat": "american",
-            },
-            timeout=10,
-        )
-    except TypeError:
-        odds_resp = requests.get(
-            EVENT_ODDS_URL.format(event_id=event_id),
-            params={
-                "apiKey": ODDS_API_KEY,
-                "regions": "us",
-                "markets": ",".join(MARKET_KEYS),
-                "bookmakers": ",".join(BOOKMAKERS),
-                "oddsFormat": "american",
-            },
-        )
+        odds_resp = _api_get(EVENT_ODDS_URL.format(event_id=event_id), _event_odds_params())
     except requests.exceptions.RequestException as e:
         logger.error("❌ Error fetching odds for %s: %s", event_id, e)
         return {}
@@ -228,7 +411,7 @@ def fetch_consensus_for_single_game(game_id, lookahead_days=2):
     return normalized
 
 
-def fetch_market_odds_from_api(game_ids, filter_bookmakers=None, lookahead_days=2):
+def fetch_market_odds_from_api(game_ids, filter_bookmakers=None, lookahead_days=2, previous=None):
     """Fetch market odds for the provided game IDs.
 
     Parameters
@@ -240,63 +423,26 @@ def fetch_market_odds_from_api(game_ids, filter_bookmakers=None, lookahead_days=
     lookahead_days : int, default 2
         Number of days ahead to request from the Odds API. The default of ``2``
         ensures today's and tomorrow's games are returned.
+    previous : dict | None
+        Odds from the prior refresh; consensus for unchanged markets is reused.
     """
 
     input_game_ids = [canonical_game_id(gid) for gid in game_ids]
     logger.debug(f"🎯 Incoming game_ids from sim folder: {sorted(input_game_ids)}")
-    logger.debug(f"[DEBUG] Using ODDS_API_KEY prefix: {ODDS_API_KEY[:4]}*****")
+    logger.debug(f"[DEBUG] Using ODDS_API_KEY prefix: {str(ODDS_API_KEY)[:4]}*****")
 
+    index = get_events_index()
     try:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-            timeout=10,
-        )
-    except TypeError:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-        )
+        events_by_id = index.entries(lookahead_days)
     except requests.exceptions.RequestException as e:
         logger.error("❌ Error fetching events: %s", e)
         return {}
-    if resp.status_code != 200:
-        logger.debug(f"❌ Failed to fetch events: {resp.text}")
+    if events_by_id is None:
         return None
 
-    events = resp.json()
-    logger.debug(f"[DEBUG] Received {len(events)} events from Odds API")
-
-    # Build lookup tables for matching
-    events_by_id = {}
-    events_by_key = defaultdict(list)
-    for event in events:
-        try:
-            home_team = event["home_team"]
-            away_team = event["away_team"]
-            start_time_utc = datetime.fromisoformat(
-                event["commence_time"].replace("Z", "+00:00")
-            ).replace(tzinfo=ZoneInfo("UTC"))
-            start_time = to_eastern(start_time_utc)
-
-            api_gid = canonical_game_id(
-                extract_game_id_from_event(away_team, home_team, start_time)
-            )
-
-            events_by_id[api_gid] = {
-                "event": event,
-                "start": start_time,
-                "home": home_team,
-                "away": away_team,
-            }
-
-            parts = parse_game_id(api_gid)
-            key = (parts["date"], parts["away"], parts["home"])
-            events_by_key[key].append(api_gid)
-        except Exception as e:
-            logger.debug(f"💥 Exception while indexing event: {e}")
+    logger.debug(f"[DEBUG] Indexed {len(events_by_id)} events from Odds API")
 
-    odds_data = {}
+    matched = []
 
     for sim_id in input_game_ids:
         game_id = sim_id
@@ -304,20 +450,7 @@ def fetch_market_odds_from_api(game_ids, filter_bookmakers=None, lookahead_days=
 
         if event_info is None:
             parts = parse_game_id(game_id)
-            key = (parts["date"], parts["away"], parts["home"])
-            candidates = events_by_key.get(key, [])
-
-            sim_dt = game_id_to_dt(game_id)
-            matches = []
-            if candidates:
-                for cid in candidates:
-                    c_info = events_by_id[cid]
-                    if sim_dt is None:
-                        matches.append(cid)
-                    else:
-                        delta = abs((c_info["start"] - sim_dt).total_seconds()) / 60
-                        if delta <= 10:
-                            matches.append(cid)
+            matches = index.candidates(game_id, lookahead_days)
 
             if len(matches) == 1:
                 event_info = events_by_id[matches[0]]
@@ -341,393 +474,63 @@ def fetch_market_odds_from_api(game_ids, filter_bookmakers=None, lookahead_days=
                 logger.warning("❌ No odds found for %s — skipped.", sim_id)
                 continue
 
-        start_time = event_info["start"]
-        home_team = event_info["home"]
-        away_team = event_info["away"]
-        event = event_info["event"]
-
         logger.debug(
             "\n✅ Matched event: %s @ %s → %s | Start: %s",
-            away_team,
-            home_team,
+            event_info["away"],
+            event_info["home"],
             game_id,
-            start_time.isoformat(),
+            event_info["start"].isoformat(),
         )
+        matched.append((game_id, event_info))
 
-        event_id = event["id"]
-        try:
-            odds_resp = requests.get(
-                EVENT_ODDS_URL.format(event_id=event_id),
-                params={
-                    "apiKey": ODDS_API_KEY,
-                    "regions": "us",
-                    "markets": ",".join(MARKET_KEYS),
-                    "bookmakers": ",".join(BOOKMAKERS),
-                    "oddsFormat": "american",
-                },
-                timeout=10,
-            )
-        except TypeError:
-            odds_resp = requests.get(
-                EVENT_ODDS_URL.format(event_id=event_id),
-                params={
-                    "apiKey": ODDS_API_KEY,
-                    "regions": "us",
-                    "markets": ",".join(MARKET_KEYS),
-                    "bookmakers": ",".join(BOOKMAKERS),
-                    "oddsFormat": "american",
-                },
-            )
-        except requests.exceptions.RequestException as e:
-            logger.error("❌ Error fetching odds for %s: %s", game_id, e)
-            continue
-
-            if odds_resp.status_code != 200:
-                logger.debug(f"⚠️ Failed to fetch odds for {game_id}: {odds_resp.text}")
-                continue
-
-            offers_raw = odds_resp.json()
-            debug_path = f"debug_odds_raw/{game_id}.json"
-            os.makedirs(os.path.dirname(debug_path), exist_ok=True)
-            with open(debug_path, "w") as f:
-                json.dump(offers_raw, f, indent=2)
-            logger.debug(f"📄 Saved raw odds snapshot to {debug_path}")
-
-            if not offers_raw or not isinstance(offers_raw, dict):
-                logger.debug(f"⚠️ Odds API returned unexpected format for {game_id}: {type(offers_raw)}")
-                continue
-
-            bookmakers_data = offers_raw.get("bookmakers", [])
-            if not bookmakers_data or not isinstance(bookmakers_data, list):
-                logger.debug(f"⚠️ No bookmakers array in odds data for {game_id}")
-                continue
-
-            if filter_bookmakers:
-                before = len(bookmakers_data)
-                bookmakers_data = [bm for bm in bookmakers_data if bm.get("key") in filter_bookmakers]
-                logger.debug(
-                    f"📦 Odds markets received from {before} bookmakers, filtered to {len(bookmakers_data)} for {game_id}"
-                )
-            else:
-                logger.debug(f"📦 Odds markets received from {len(bookmakers_data)} bookmakers for {game_id}")
-
-            offers = {}
-
-            for bm in bookmakers_data:
-                book_key = bm.get("key", "unknown")
-                markets = bm.get("markets", [])
-                if not isinstance(markets, list):
-                    continue
-
-                for market in markets:
-                    market_type = market.get("key")
-                    outcomes = market.get("outcomes", [])
-
-                    logger.debug(f"   ➤ {market_type} | {len(outcomes)} outcomes")
-
-                    if not market_type or not outcomes:
-                        continue
-
-                    for outcome in outcomes:
-                        label = outcome.get("name")
-                        price = outcome.get("price")
-                        point = outcome.get("point")
-                        team = outcome.get("description")  # For team_totals
-
-                        if label is None or price is None:
-                            continue
-
-                        # Build unified full label
-                        if "team_totals" in market_type and team:
-                            team_abbr = TEAM_NAME_TO_ABBR.get(team.strip(), team.strip())
-                            label_input = f"{team_abbr} {label}".strip()
-                        else:
-                            label_input = label
-
-                        full_label = normalize_label_for_odds(label_input, market_type, point)
-
-                        offers.setdefault(market_type, {}).setdefault(book_key, {})[full_label] = {
-                            "price": price,
-                            "point": point
-                        }
+    odds_data = _collect_odds(matched, filter_bookmakers, previous=previous)
 
-            logger.debug(f"🔎 Offers collected for {game_id}: {list(offers.keys())}")
-
-            if not offers:
-                logger.debug(f"❌ No valid odds found for {game_id} — skipping normalization.")
-                odds_data[game_id] = None
-                continue
-
-            normalized = normalize_odds(game_id, offers)
-
-            if not normalized:
-                logger.debug(
-                    f"📭 Normalized odds for {game_id} is empty — possible filtering or no valid odds. Skipping."
-                )
-                odds_data[game_id] = None
-                continue
-
-            normalized["start_time"] = start_time.isoformat()
-
-            # Add per_book odds (used later for true consensus devigging)
-            per_book_odds = extract_per_book_odds(bookmakers_data, debug=True)
-            for mkt_key, labels in per_book_odds.items():
-                for label, book_prices in labels.items():
-                    if label in normalized.get(mkt_key, {}):
-                        normalized[mkt_key][label]["per_book"] = book_prices
-
-            # Calculate consensus probabilities using unified logic
-            from core.consensus_pricer import calculate_consensus_prob
-            for mkt_key, market in normalized.items():
-                if not isinstance(market, dict) or mkt_key.endswith("_source") or mkt_key == "start_time":
-                    continue
-                for label in market:
-                    result, _ = calculate_consensus_prob(
-                        game_id=game_id,
-                        market_odds={game_id: normalized},
-                        market_key=mkt_key,
-                        label=label,
-                    )
-                    normalized[mkt_key][label].update(result)
-                    if "books_used" in result:
-                        normalized[mkt_key][label]["books_used"] = result["books_used"]
-
-            # Ensure all expected market keys exist for downstream tools
-            for key in MARKET_KEYS:
-                normalized.setdefault(key, {})
-
-            odds_data[game_id] = normalized
-
-            logger.debug(
-                f"📱 ✅ Normalized odds for {game_id} — {len(normalized)} markets stored"
-            )
-
-        except Exception as e:
-            logger.debug(f"💥 Exception while processing {game_id if 'game_id' in locals() else 'event'}: {e}")
-
-    has_markets = False
-    for data in odds_data.values():
-        if not data:
-            continue
-        for key in MARKET_KEYS:
-            if data.get(key):
-                has_markets = True
-                break
-        if has_markets:
-            break
-
-    if not has_markets:
+    if not _has_market_entries(odds_data):
         logger.error("❌ Odds API returned no games with market entries")
         return None
 
     return odds_data
 
 
-def fetch_all_market_odds(lookahead_days=2):
-    """Fetch market odds for all games returned by the Odds API."""
+def fetch_all_market_odds(lookahead_days=2, planner=None, previous=None):
+    """Fetch market odds for all games returned by the Odds API.
+
+    With a :class:`core.odds_quota.RequestPlanner`, only the events and
+    market groups it schedules for this cycle are requested. Anything skipped
+    is carried forward from ``previous`` (the prior cycle's odds), which is
+    also used to reuse consensus pricing for markets whose quotes did not move.
+    """
 
     logger.debug(f"🌐 Fetching all market odds for daysFrom={lookahead_days}")
 
     try:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-            timeout=10,
-        )
-    except TypeError:
-        resp = requests.get(
-            EVENTS_URL,
-            params={"apiKey": ODDS_API_KEY, "daysFrom": lookahead_days},
-        )
+        events_by_id = get_events_index().entries(lookahead_days)
     except requests.exceptions.RequestException as e:
         logger.error("❌ Error fetching events: %s", e)
         return {}
-    if resp.status_code != 200:
-        logger.debug(f"❌ Failed to fetch events: {resp.text}")
+    if events_by_id is None:
         return None
 
-    events = resp.json()
-    logger.debug(f"[DEBUG] Received {len(events)} events from Odds API")
+    logger.debug(f"[DEBUG] Indexed {len(events_by_id)} events from Odds API")
 
-    odds_data = {}
-
-    for event in events:
-        try:
-            home_team = event["home_team"]
-            away_team = event["away_team"]
-            start_time_utc = datetime.fromisoformat(
-                event["commence_time"].replace("Z", "+00:00")
-            ).replace(tzinfo=ZoneInfo("UTC"))
-            start_time = to_eastern(start_time_utc)
-
-            game_id = canonical_game_id(
-                extract_game_id_from_event(away_team, home_team, start_time)
-            )
-
-            # 🕒 Debug the start times and game_id
-            logger.debug(
-                "📅 Game %s starts at %s ET (UTC: %s)",
-                game_id,
-                start_time.isoformat(),
-                start_time_utc.isoformat(),
-            )
-
-            logger.debug(
-                f"\n🌐 Processing event: {away_team} @ {home_team} → {game_id} | Start: {start_time.isoformat()}"
-            )
-
-            event_id = event["id"]
-            try:
-                odds_resp = requests.get(
-                    EVENT_ODDS_URL.format(event_id=event_id),
-                    params={
-                        "apiKey": ODDS_API_KEY,
-                        "regions": "us",
-                        "markets": ",".join(MARKET_KEYS),
-                        "bookmakers": ",".join(BOOKMAKERS),
-                        "oddsFormat": "american",
-                    },
-                    timeout=10,
-                )
-            except TypeError:
-                odds_resp = requests.get(
-                    EVENT_ODDS_URL.format(event_id=event_id),
-                    params={
-                        "apiKey": ODDS_API_KEY,
-                        "regions": "us",
-                        "markets": ",".join(MARKET_KEYS),
-                        "bookmakers": ",".join(BOOKMAKERS),
-                        "oddsFormat": "american",
-                    },
-                )
-            except requests.exceptions.RequestException as e:
-                logger.error("❌ Error fetching odds for %s: %s", game_id, e)
-                continue
-
-            if odds_resp.status_code != 200:
-                logger.debug(f"⚠️ Failed to fetch odds for {game_id}: {odds_resp.text}")
-                continue
-
-            offers_raw = odds_resp.json()
-            debug_path = f"debug_odds_raw/{game_id}.json"
-            os.makedirs(os.path.dirname(debug_path), exist_ok=True)
-            with open(debug_path, "w") as f:
-                json.dump(offers_raw, f, indent=2)
-            logger.debug(f"📄 Saved raw odds snapshot to {debug_path}")
-
-            if not offers_raw or not isinstance(offers_raw, dict):
-                logger.debug(
-                    f"⚠️ Odds API returned unexpected format for {game_id}: {type(offers_raw)}"
-                )
-                continue
-
-            bookmakers_data = offers_raw.get("bookmakers", [])
-            if not bookmakers_data or not isinstance(bookmakers_data, list):
-                logger.debug(f"⚠️ No bookmakers array in odds data for {game_id}")
-                continue
-
-            offers = {}
-
-            for bm in bookmakers_data:
-                book_key = bm.get("key", "unknown")
-                markets = bm.get("markets", [])
-                if not isinstance(markets, list):
-                    continue
-
-                for market in markets:
-                    market_type = market.get("key")
-                    outcomes = market.get("outcomes", [])
-
-                    if not market_type or not outcomes:
-                        continue
-
-                    for outcome in outcomes:
-                        label = outcome.get("name")
-                        price = outcome.get("price")
-                        point = outcome.get("point")
-                        team = outcome.get("description")
-
-                        if label is None or price is None:
-                            continue
-
-                        if "team_totals" in market_type and team:
-                            team_abbr = TEAM_NAME_TO_ABBR.get(team.strip(), team.strip())
-                            label_input = f"{team_abbr} {label}".strip()
-                        else:
-                            label_input = label
-
-                        full_label = normalize_label_for_odds(label_input, market_type, point)
-
-                        offers.setdefault(market_type, {}).setdefault(book_key, {})[
-                            full_label
-                        ] = {
-                            "price": price,
-                            "point": point,
-                        }
-
-            if not offers:
-                logger.debug(f"❌ No valid odds found for {game_id} — skipping normalization.")
-                odds_data[game_id] = None
-                continue
-
-            normalized = normalize_odds(game_id, offers)
-
-            if not normalized:
-                logger.debug(
-                    f"📭 Normalized odds for {game_id} is empty — possible filtering or no valid odds. Skipping."
-                )
-                odds_data[game_id] = None
-                continue
-
-            normalized["start_time"] = start_time.isoformat()
-
-            per_book_odds = extract_per_book_odds(bookmakers_data, debug=True)
-            for mkt_key, labels in per_book_odds.items():
-                for label, book_prices in labels.items():
-                    if label in normalized.get(mkt_key, {}):
-                        normalized[mkt_key][label]["per_book"] = book_prices
-
-            from core.consensus_pricer import calculate_consensus_prob
-            for mkt_key, market in normalized.items():
-                if not isinstance(market, dict) or mkt_key.endswith("_source") or mkt_key == "start_time":
-                    continue
-                for label in market:
-                    result, _ = calculate_consensus_prob(
-                        game_id=game_id,
-                        market_odds={game_id: normalized},
-                        market_key=mkt_key,
-                        label=label,
-                    )
-                    normalized[mkt_key][label].update(result)
-                    if "books_used" in result:
-                        normalized[mkt_key][label]["books_used"] = result["books_used"]
-
-            for key in MARKET_KEYS:
-                normalized.setdefault(key, {})
-
-            odds_data[game_id] = normalized
-
-            logger.debug(
-                f"📱 ✅ Normalized odds for {game_id} — {len(normalized)} markets stored"
-            )
+    matched = list(events_by_id.items())
+    markets_by_game = None
+    if planner is not None:
+        markets_by_game = planner.plan(events_by_id)
+        matched = [(gid, info) for gid, info in matched if gid in markets_by_game]
+        logger.info("🧮 Quota planner scheduled %s/%s events this cycle", len(matched), len(events_by_id))
+    for game_id, info in matched:
+        logger.debug(
+            f"\n🌐 Processing event: {info['away']} @ {info['home']} → {game_id} | Start: {info['start'].isoformat()}"
+        )
 
-        except Exception as e:
-            logger.debug(
-                f"💥 Exception while processing {game_id if 'game_id' in locals() else 'event'}: {e}"
-            )
+    odds_data = _collect_odds(matched, markets_by_game=markets_by_game, previous=previous)
+    if planner is not None:
+        # Only games whose odds arrived count as refreshed
+        planner.mark_fetched({gid: markets_by_game[gid] for gid, data in odds_data.items() if data})
+        odds_data = merge_previous_odds(odds_data, previous, events_by_id, requested=markets_by_game)
 
-    has_markets = False
-    for data in odds_data.values():
-        if not data:
-            continue
-        for key in MARKET_KEYS:
-            if data.get(key):
-                has_markets = True
-                break
-        if has_markets:
-            break
-
-    if not has_markets:
+    if not _has_market_entries(odds_data):
         logger.error("❌ Odds API returned no games with market entries")
         return None
 
@@ -813,21 +616,13 @@ def save_market_odds_to_file(odds_data, date_tag):
         return None
 
     path = f"data/market_odds/{date_tag}.json"
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(odds_data, f, indent=2)
-    try:
-        with open(path) as f:
-            json.load(f)
-    except Exception:
-        logger.exception("❌ Market odds JSON validation failed for %s", path)
-        bad_path = path + ".bad.json"
-        try:
-            shutil.move(path, bad_path)
-            logger.error("🚨 Corrupted odds file moved to %s", bad_path)
-        except Exception as mv_err:
-            logger.error("❌ Failed to move corrupt odds file: %s", mv_err)
-        return bad_path
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    # Write to a temp file and rename so readers never see a partial file
+    with tempfile.NamedTemporaryFile("w", dir=folder, delete=False, suffix=".tmp") as tmpf:
+        json.dump(odds_data, tmpf, separators=(",", ":"))
+        temp_path = tmpf.name
+    os.replace(temp_path, path)
 
     logger.debug(f"✅ Saved market odds to {path}")
     return path
@@ -0,0 +1,155 @@
+"""Append-only SQLite store of odds ticks for line-movement analysis.
+
+Each refresh is flattened into ``(ts, game_id, market, label, book, price,
+point)`` rows, but only cells whose price differs from the last stored tick
+are appended, so an unchanged slate costs nothing and the history stays a
+small fraction of the full JSON snapshots. A pulled quote is stored as a
+tick with a ``NULL`` price. Range queries such as "price path since open"
+hit a covering index on ``(game_id, market, label, book, ts)``.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import os
+import sqlite3
+import threading
+
+from core.logger import get_logger
+from core.odds_table import OddsTable
+from core.utils import now_eastern
+
+logger = get_logger(__name__)
+
+__all__ = ["ODDS_HISTORY_PATH", "OddsHistory", "get_odds_history"]
+
+ODDS_HISTORY_PATH = os.path.join("data", "odds_history", "ticks.sqlite")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticks (
+    ts TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    market TEXT NOT NULL,
+    label TEXT NOT NULL,
+    book TEXT NOT NULL,
+    price REAL,
+    point REAL
+);
+CREATE INDEX IF NOT EXISTS idx_ticks_cell ON ticks (game_id, market, label, book, ts);
+CREATE INDEX IF NOT EXISTS idx_ticks_ts ON ticks (ts);
+"""
+
+
+class OddsHistory:
+    """Price ticks persisted to SQLite, one row per changed cell."""
+
+    def __init__(self, path: str = ODDS_HISTORY_PATH):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # (game_id, market, label, book) → last stored price
+        self._last: dict[tuple, float | None] | None = None
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _load_last(self) -> dict:
+        if self._last is None:
+            rows = self._conn.execute(
+                """
+                SELECT game_id, market, label, book, price FROM ticks t
+                WHERE ts = (
+                    SELECT MAX(ts) FROM ticks
+                    WHERE game_id = t.game_id AND market = t.market
+                      AND label = t.label AND book = t.book
+                )
+                """
+            )
+            self._last = {tuple(row[:4]): row[4] for row in rows}
+        return self._last
+
+    def record(self, odds, ts: str | None = None) -> int:
+        """Append ticks for cells that changed; return the number written.
+
+        ``odds`` is either ``{game_id: nested odds}`` or an
+        :class:`~core.odds_table.OddsTable`. Quotes that vanished from a game
+        present in ``odds`` are recorded as pulled (``NULL`` price).
+        """
+        table = odds if isinstance(odds, OddsTable) else OddsTable.from_nested(odds)
+        ts = ts or now_eastern().isoformat(timespec="seconds")
+        with self._lock:
+            last = self._load_last()
+            seen, rows = set(), []
+            for gid, market, label, book, price, point in table.rows():
+                key = (gid, market, label, book)
+                seen.add(key)
+                if key not in last or last[key] != price:
+                    rows.append((ts, *key, price, point))
+            games = set(table.game_ids())
+            for key, price in last.items():
+                if key[0] in games and key not in seen and price is not None:
+                    rows.append((ts, *key, None, None))
+            if rows:
+                with self._conn:
+                    self._conn.executemany("INSERT INTO ticks VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                for row in rows:
+                    last[tuple(row[1:5])] = row[5]
+        logger.debug("🗃️ Recorded %s odds ticks at %s", len(rows), ts)
+        return len(rows)
+
+    def price_path(self, game_id, market, label, book=None, since=None, until=None) -> list[dict]:
+        """Return ticks for one label ordered by time, optionally for one book."""
+        sql = "SELECT ts, book, price, point FROM ticks WHERE game_id = ? AND market = ? AND label = ?"
+        params = [game_id, market, label]
+        for clause, value in (("book = ?", book), ("ts >= ?", since), ("ts <= ?", until)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        rows = self._conn.execute(sql + " ORDER BY ts, book", params)
+        return [{"ts": ts, "book": b, "price": price, "point": point} for ts, b, price, point in rows]
+
+    def opening(self, game_id, market, label) -> dict:
+        """Return ``{book: first recorded price}`` for one label."""
+        opening = {}
+        for tick in self.price_path(game_id, market, label):
+            if tick["price"] is not None:
+                opening.setdefault(tick["book"], tick["price"])
+        return opening
+
+    def latest(self, game_id, market=None, as_of=None) -> dict:
+        """Return ``{(market, label, book): price}`` as of ``as_of`` (default: now)."""
+        sql = "SELECT market, label, book, price, ts FROM ticks WHERE game_id = ?"
+        params = [game_id]
+        if market is not None:
+            sql += " AND market = ?"
+            params.append(market)
+        if as_of is not None:
+            sql += " AND ts <= ?"
+            params.append(as_of)
+        latest = {}
+        for mkt, label, book, price, _ in self._conn.execute(sql + " ORDER BY ts", params):
+            latest[(mkt, label, book)] = price
+        return {key: price for key, price in latest.items() if price is not None}
+
+    def movement(self, game_id, market, label, since=None) -> dict:
+        """Return ``{book: (first_price, last_price)}`` over the queried range."""
+        moves = {}
+        for tick in self.price_path(game_id, market, label, since=since):
+            if tick["price"] is None:
+                continue
+            first, _ = moves.get(tick["book"], (tick["price"], None))
+            moves[tick["book"]] = (first, tick["price"])
+        return moves
+
+
+_HISTORY: OddsHistory | None = None
+
+
+def get_odds_history() -> OddsHistory:
+    """Return the process-wide :class:`OddsHistory`."""
+    global _HISTORY
+    if _HISTORY is None:
+        _HISTORY = OddsHistory()
+    return _HISTORY
@@ -2,7 +2,7 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from core.market_pricer import best_price
-from core.consensus_pricer import calculate_consensus_prob
+from core.consensus_pricer import ConsensusIndex, calculate_consensus_prob
 from core.utils import (
     normalize_label,
     normalize_label_for_odds,
@@ -86,6 +86,7 @@ def normalize_market_odds(odds: dict) -> dict:
             entry["price"] = best_price(list(prices.values()), label)
 
     if game_id:
+        index = ConsensusIndex(game_id, normalized)
         for mkt_key, market in normalized.items():
             for label in list(market.keys()):
                 result, _ = calculate_consensus_prob(
@@ -93,6 +94,7 @@ def normalize_market_odds(odds: dict) -> dict:
                     market_odds={game_id: normalized},
                     market_key=mkt_key,
                     label=label,
+                    index=index,
                 )
                 market[label].update(result)
 
@@ -0,0 +1,313 @@
+"""Quota accounting and per-cycle request planning for the Odds API.
+
+:class:`QuotaTracker` reads the ``x-requests-*`` headers returned with every
+Odds API response and persists the counters along with per-day usage.
+:class:`RequestPlanner` uses them to decide, each cycle, which events to
+refresh and which market groups to request: mainlines only for games far
+from first pitch, the full derivative set close to it, and nothing once the
+day's budget is spent. A planned group only counts as refreshed once
+:meth:`RequestPlanner.mark_fetched` records that its odds arrived.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from core.logger import get_logger
+from core.utils import file_lock, now_eastern
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "QUOTA_STATE_PATH",
+    "DAILY_BUDGET",
+    "MARKET_GROUPS",
+    "PLAN_TIERS",
+    "QuotaTracker",
+    "RequestPlanner",
+    "get_quota_tracker",
+    "merge_previous_odds",
+]
+
+QUOTA_STATE_PATH = os.path.join("data", "cache", "odds_quota.json")
+DAILY_BUDGET = int(os.getenv("ODDS_API_DAILY_BUDGET", "1500"))
+
+MARKET_GROUPS = {
+    "mainlines": ["h2h", "spreads", "totals"],
+    "alternates": ["alternate_spreads", "alternate_totals"],
+    "team_totals": ["team_totals", "alternate_team_totals"],
+    "derivatives": [
+        f"{prefix}_1st_{n}_innings"
+        for prefix in ("h2h", "spreads", "alternate_spreads", "totals", "alternate_totals")
+        for n in (1, 3, 5, 7)
+    ],
+}
+
+# (max hours to first pitch, market groups, minimum minutes between refreshes)
+PLAN_TIERS = [
+    (3, ["mainlines", "alternates", "team_totals", "derivatives"], 0),
+    (12, ["mainlines", "alternates", "team_totals"], 30),
+    (float("inf"), ["mainlines"], 60),
+]
+
+
+class QuotaTracker:
+    """Persisted Odds API usage counters."""
+
+    def __init__(self, path: str | None = QUOTA_STATE_PATH, daily_budget: int = DAILY_BUDGET):
+        self.path = path
+        self.daily_budget = daily_budget
+        self._lock = threading.Lock()
+        self._forgotten: set[str] = set()
+        self.state = self._load()
+
+    def _load(self) -> dict:
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    data.setdefault("daily", {})
+                    data.setdefault("last_refreshed", {})
+                    return data
+            except Exception as e:
+                logger.warning("⚠️ Failed to load quota state %s: %s", self.path, e)
+        return {"remaining": None, "used": None, "daily": {}, "last_refreshed": {}}
+
+    def _merge_disk(self) -> None:
+        """Fold counters written by other processes into ``self.state``.
+
+        Usage counters only grow, so the larger value wins (the smaller for
+        ``remaining``); refresh times keep the newest per game and group.
+        Games dropped via :meth:`forget` are not revived from disk.
+        """
+        disk = self._load()
+        state = self.state
+        for date, value in disk["daily"].items():
+            state["daily"][date] = max(state["daily"].get(date, 0), value)
+        if disk.get("used") is not None:
+            state["used"] = max(state.get("used") or 0, disk["used"])
+        if disk.get("remaining") is not None:
+            mine = state.get("remaining")
+            state["remaining"] = disk["remaining"] if mine is None else min(mine, disk["remaining"])
+        if disk.get("updated_at") and disk["updated_at"] > (state.get("updated_at") or ""):
+            state["updated_at"] = disk["updated_at"]
+        for gid, groups in disk["last_refreshed"].items():
+            if gid in self._forgotten or not isinstance(groups, dict):
+                continue
+            mine = state["last_refreshed"].setdefault(gid, {})
+            for group, when in groups.items():
+                if not mine.get(group) or when > mine[group]:
+                    mine[group] = when
+        self._forgotten.clear()
+
+    def save(self) -> None:
+        """Merge with the state on disk and write it back atomically.
+
+        Several processes (the loop daemon, ad-hoc fetches) share one state
+        file, so the file is re-read under a lock before being replaced.
+        """
+        if not self.path:
+            return
+        try:
+            folder = os.path.dirname(self.path) or "."
+            os.makedirs(folder, exist_ok=True)
+            with file_lock(self.path):
+                self._merge_disk()
+                with tempfile.NamedTemporaryFile("w", dir=folder, delete=False, suffix=".tmp") as tmpf:
+                    json.dump(self.state, tmpf, indent=2)
+                    temp_path = tmpf.name
+                os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.warning("⚠️ Failed to persist quota state: %s", e)
+
+    @staticmethod
+    def _today() -> str:
+        return now_eastern().strftime("%Y-%m-%d")
+
+    def record(self, response) -> None:
+        """Update counters from the ``x-requests-*`` headers of ``response``."""
+        headers = getattr(response, "headers", None) or {}
+
+        def _num(key):
+            try:
+                return float(headers.get(key))
+            except (TypeError, ValueError):
+                return None
+
+        remaining = _num("x-requests-remaining")
+        used = _num("x-requests-used")
+        cost = _num("x-requests-last")
+        if remaining is None and used is None and cost is None:
+            return
+        with self._lock:
+            # Count on top of what other processes have spent today
+            if self.path:
+                self._merge_disk()
+            if remaining is not None:
+                self.state["remaining"] = remaining
+            if used is not None:
+                self.state["used"] = used
+            if cost:
+                today = self._today()
+                self.state["daily"][today] = self.state["daily"].get(today, 0) + cost
+            self.state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            self.save()
+
+    def used_today(self) -> float:
+        return self.state["daily"].get(self._today(), 0)
+
+    def budget_left(self) -> float:
+        """Return credits left today, capped by the account's remaining quota."""
+        left = self.daily_budget - self.used_today()
+        remaining = self.state.get("remaining")
+        if remaining is not None:
+            left = min(left, remaining)
+        return max(left, 0)
+
+    def mark_refreshed(self, game_id: str, group: str, when: datetime) -> None:
+        with self._lock:
+            self.state["last_refreshed"].setdefault(game_id, {})[group] = when.isoformat()
+
+    def forget(self, game_ids) -> None:
+        """Drop refresh times for ``game_ids``, here and on the next save."""
+        with self._lock:
+            for gid in game_ids:
+                self.state["last_refreshed"].pop(gid, None)
+                self._forgotten.add(gid)
+
+    def last_refreshed(self, game_id: str, group: str) -> datetime | None:
+        value = self.state["last_refreshed"].get(game_id, {}).get(group)
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+
+
+class RequestPlanner:
+    """Choose the events and market keys to request in one refresh cycle."""
+
+    def __init__(self, tracker: "QuotaTracker | None" = None, tiers=PLAN_TIERS, groups=MARKET_GROUPS):
+        self.tracker = tracker or get_quota_tracker()
+        self.tiers = tiers
+        self.groups = groups
+
+    def _tier(self, hours: float):
+        return next((t for t in self.tiers if hours <= t[0]), self.tiers[-1])
+
+    def plan(self, events: dict, now: datetime | None = None) -> dict:
+        """Return ``{game_id: [market keys]}`` for events worth refreshing now.
+
+        ``events`` maps game IDs to dicts with an Eastern ``start`` datetime
+        (as produced by :class:`core.events_index.EventsIndex`). Games closest
+        to first pitch are planned first; once the day's budget runs out,
+        later games fall back to mainlines and then to nothing. Nothing is
+        marked as refreshed here; see :meth:`mark_fetched`.
+        """
+        now = now or now_eastern()
+        budget = self.tracker.budget_left()
+        # Forget refresh times for games no longer listed
+        refreshed = self.tracker.state["last_refreshed"]
+        self.tracker.forget([g for g in refreshed if g not in events])
+        upcoming = sorted(
+            ((info["start"], gid) for gid, info in events.items() if info.get("start") and info["start"] > now),
+        )
+
+        plan = {}
+        for start, gid in upcoming:
+            hours = (start - now).total_seconds() / 3600
+            _, tier_groups, min_minutes = self._tier(hours)
+            due = []
+            for group in tier_groups:
+                last = self.tracker.last_refreshed(gid, group)
+                if last is None or (now - last).total_seconds() >= min_minutes * 60:
+                    due.append(group)
+            markets = [m for g in due for m in self.groups[g]]
+            # Each market requested costs one credit per region
+            if len(markets) > budget:
+                mains = self.groups["mainlines"] if "mainlines" in due else []
+                due, markets = (["mainlines"], mains) if mains and len(mains) <= budget else ([], [])
+            if not markets:
+                continue
+            budget -= len(markets)
+            plan[gid] = markets
+
+        self.tracker.save()
+        if VERBOSE_MODE:
+            logger.info(
+                "🧮 Planned %s events (%s credits); %s left today",
+                len(plan),
+                sum(len(m) for m in plan.values()),
+                budget,
+            )
+        return plan
+
+    def mark_fetched(self, fetched: dict, now: datetime | None = None) -> None:
+        """Record the planned groups in ``fetched`` as refreshed.
+
+        ``fetched`` maps game IDs to the market keys requested for them and
+        should only hold events whose odds payload arrived, so a failed
+        request is planned again next cycle.
+        """
+        now = now or now_eastern()
+        for gid, markets in fetched.items():
+            requested = set(markets)
+            for group, keys in self.groups.items():
+                if keys and requested.issuperset(keys):
+                    self.tracker.mark_refreshed(gid, group, now)
+        self.tracker.save()
+
+
+def merge_previous_odds(
+    current: dict,
+    previous: dict | None,
+    events: dict,
+    requested: dict | None = None,
+    now: datetime | None = None,
+) -> dict:
+    """Fill games and markets skipped this cycle from ``previous``.
+
+    Only games still listed in ``events`` (the current events index) and
+    not yet started are carried forward. A game present in ``current`` with
+    no odds (``None``) failed this cycle and is not replaced by old odds.
+    ``requested`` maps game IDs to the market keys requested this cycle;
+    those markets are never refilled, so a market the books pulled stays
+    empty instead of reviving last cycle's prices.
+    """
+    if not isinstance(previous, dict):
+        return current
+    now = now or now_eastern()
+    merged = dict(current)
+    for gid, prev_game in previous.items():
+        if not isinstance(prev_game, dict):
+            continue
+        start = (events.get(gid) or {}).get("start")
+        if start is None or start <= now:
+            continue
+        if gid not in merged:
+            merged[gid] = prev_game
+            continue
+        game = merged[gid]
+        if not isinstance(game, dict):
+            continue
+        fetched = set((requested or {}).get(gid) or ())
+        for key, value in prev_game.items():
+            if key in fetched or key.removesuffix("_source") in fetched:
+                continue
+            if not game.get(key):
+                game[key] = value
+    return merged
+
+
+_TRACKER: QuotaTracker | None = None
+
+
+def get_quota_tracker() -> QuotaTracker:
+    """Return the process-wide :class:`QuotaTracker`."""
+    global _TRACKER
+    if _TRACKER is None:
+        _TRACKER = QuotaTracker()
+    return _TRACKER
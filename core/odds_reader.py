@@ -0,0 +1,111 @@
+"""Streaming reader for ``data/market_odds`` files.
+
+Market odds files map game IDs to per-game odds and run to several
+megabytes for a full slate, while most callers want one game or one date.
+:func:`iter_market_odds` walks the file with ``ijson`` and only builds
+Python objects for the games that pass the ``games=``/``dates=`` filters;
+everything else is skipped at the token level. Without ``ijson`` it falls
+back to ``json.load`` and filters afterwards.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import json
+import os
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = ["MARKET_ODDS_DIR", "iter_market_odds", "latest_odds_file", "load_market_odds"]
+
+MARKET_ODDS_DIR = os.path.join("data", "market_odds")
+
+_OPEN = {"start_map", "start_array"}
+_CLOSE = {"end_map", "end_array"}
+
+
+def _key_filter(games=None, dates=None):
+    games = set(games) if games is not None else None
+    dates = tuple(dates) if dates is not None else None
+
+    def wanted(key: str) -> bool:
+        if games is not None and key in games:
+            return True
+        if dates is not None and key.startswith(dates):
+            return True
+        return games is None and dates is None
+
+    return wanted
+
+
+def _stream(fh, wanted):
+    events = ijson.basic_parse(fh, use_float=True)
+    first = next(events, (None, None))[0]
+    if first != "start_map":
+        raise ValueError("expected a JSON object at the top level")
+    for event, value in events:
+        if event == "end_map":
+            return
+        # event is the top-level map_key; the value follows
+        key = value
+        keep = wanted(key)
+        builder = ijson.ObjectBuilder() if keep else None
+        depth = 0
+        for event, value in events:
+            if keep:
+                builder.event(event, value)
+            if event in _OPEN:
+                depth += 1
+            elif event in _CLOSE:
+                depth -= 1
+            if depth == 0:
+                break
+        if keep:
+            yield key, builder.value
+
+
+def iter_market_odds(path: str, games=None, dates=None):
+    """Yield ``(game_id, odds)`` pairs from a market odds file.
+
+    ``games`` keeps exact game IDs and ``dates`` keeps IDs starting with any
+    of the given ``YYYY-MM-DD`` prefixes; with neither, every entry is
+    yielded. Unreadable files are logged and yield nothing.
+    """
+    wanted = _key_filter(games, dates)
+    if not path or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    try:
+        if ijson is not None:
+            with open(path, "rb") as fh:
+                yield from _stream(fh, wanted)
+            return
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object at the top level")
+        for key, value in data.items():
+            if wanted(key):
+                yield key, value
+    except Exception as e:
+        logger.warning("⚠️ Failed to stream market odds from %s: %s", path, e)
+
+
+def load_market_odds(path: str, games=None, dates=None) -> dict:
+    """Return ``{game_id: odds}`` for the entries selected by the filters."""
+    return dict(iter_market_odds(path, games=games, dates=dates))
+
+
+def latest_odds_file(folder: str = MARKET_ODDS_DIR) -> str | None:
+    """Return the newest ``market_odds_*.json`` in ``folder``."""
+    if not os.path.isdir(folder):
+        return None
+    files = sorted(
+        (f for f in os.listdir(folder) if f.startswith("market_odds_") and f.endswith(".json")),
+        reverse=True,
+    )
+    return os.path.join(folder, files[0]) if files else None
@@ -0,0 +1,155 @@
+"""Flat columnar representation of bookmaker odds.
+
+Raw Odds API event payloads are parsed in a single pass into rows of
+``(game_id, market, label, book, price, point)`` with labels normalized
+through the cached helpers in :mod:`core.label_normalizer`. The nested
+per-game dict consumed by the rest of the pipeline (best price per label,
+``per_book`` prices and ``<market>_source`` maps) is built as a view over
+those rows by :meth:`OddsTable.nested_view`.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+
+from core.market_pricer import best_price
+from core.utils import (
+    TEAM_NAME_TO_ABBR,
+    fallback_source,
+    normalize_label,
+    normalize_label_for_odds,
+)
+
+__all__ = ["ODDS_COLUMNS", "OddsTable", "parse_bookmakers"]
+
+ODDS_COLUMNS = ("game_id", "market", "label", "book", "price", "point")
+
+
+class OddsTable:
+    """Column-oriented odds rows with one row per (game, market, label, book)."""
+
+    __slots__ = ("game_id", "market", "label", "book", "price", "point", "_pos")
+
+    def __init__(self):
+        for col in ODDS_COLUMNS:
+            setattr(self, col, [])
+        # (game_id, market, label, book) → row index; later quotes overwrite
+        self._pos: dict[tuple, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    def add(self, game_id, market, label, book, price, point=None) -> None:
+        key = (game_id, market, label, book)
+        idx = self._pos.get(key)
+        if idx is not None:
+            self.price[idx] = price
+            self.point[idx] = point
+            return
+        self._pos[key] = len(self.price)
+        self.game_id.append(game_id)
+        self.market.append(market)
+        self.label.append(label)
+        self.book.append(book)
+        self.price.append(price)
+        self.point.append(point)
+
+    def extend(self, other: "OddsTable") -> "OddsTable":
+        for row in other.rows():
+            self.add(*row)
+        return self
+
+    def rows(self):
+        return zip(self.game_id, self.market, self.label, self.book, self.price, self.point)
+
+    def game_ids(self) -> list:
+        return list(dict.fromkeys(self.game_id))
+
+    def to_frame(self):
+        """Return the rows as a :class:`pandas.DataFrame`."""
+        import pandas as pd
+
+        return pd.DataFrame({col: getattr(self, col) for col in ODDS_COLUMNS})
+
+    def nested_view(self, game_id: str) -> dict:
+        """Return the nested per-game odds dict for ``game_id``.
+
+        Matches the structure historically produced by ``normalize_odds``
+        plus ``extract_per_book_odds``::
+
+            {market: {label: {"price": best, "per_book": {book: price}}},
+             "<market>_source": {label: {book: price}}}
+        """
+        # market → label → {book: price}, preserving first-seen order
+        grouped: dict[str, dict[str, dict]] = {}
+        for gid, market, label, book, price, _ in self.rows():
+            if gid != game_id:
+                continue
+            grouped.setdefault(market, {}).setdefault(label, {})[book] = price
+
+        consensus, sources = {}, {}
+        for market, labels in grouped.items():
+            source_key = f"{market}_source"
+            market_sources = sources.setdefault(source_key, {})
+            market_out = consensus.setdefault(market, {})
+            for label, book_prices in labels.items():
+                market_sources[label] = dict(book_prices)
+                canonical = normalize_label(label).strip()
+                price = best_price(list(book_prices.values()), label)
+                if not market_sources.get(canonical):
+                    market_sources[canonical] = fallback_source(canonical, price)
+                market_out[canonical] = {"price": price}
+            for label, book_prices in labels.items():
+                if label in market_out:
+                    market_out[label]["per_book"] = dict(book_prices)
+        return {**consensus, **sources}
+
+    @classmethod
+    def from_nested(cls, odds_data: dict) -> "OddsTable":
+        """Flatten ``{game_id: nested odds}`` back into a table via ``per_book``."""
+        table = cls()
+        for gid, game in (odds_data or {}).items():
+            if not isinstance(game, dict):
+                continue
+            for market, labels in game.items():
+                if not isinstance(labels, dict) or market.endswith("_source"):
+                    continue
+                for label, entry in labels.items():
+                    if not isinstance(entry, dict):
+                        continue
+                    for book, price in (entry.get("per_book") or {}).items():
+                        table.add(gid, market, label, book, price)
+        return table
+
+
+def _full_label(label_input: str, market: str, point) -> str:
+    # Second pass mirrors the historic re-normalization in normalize_odds;
+    # both calls are served from the label cache after the first event
+    first = normalize_label_for_odds(label_input, market, point)
+    return normalize_label_for_odds(first, market, point)
+
+
+def parse_bookmakers(game_id: str, bookmakers_data, table: OddsTable | None = None) -> OddsTable:
+    """Append every priced outcome in ``bookmakers_data`` to ``table``."""
+    table = table if table is not None else OddsTable()
+    for bm in bookmakers_data or []:
+        book_key = bm.get("key", "unknown")
+        markets = bm.get("markets", [])
+        if not isinstance(markets, list):
+            continue
+        for market in markets:
+            market_type = market.get("key")
+            outcomes = market.get("outcomes", [])
+            if not market_type or not outcomes:
+                continue
+            is_team_total = "team_totals" in market_type
+            for outcome in outcomes:
+                label = outcome.get("name")
+                price = outcome.get("price")
+                if label is None or price is None:
+                    continue
+                point = outcome.get("point")
+                team = outcome.get("description")
+                if is_team_total and team:
+                    team_abbr = TEAM_NAME_TO_ABBR.get(team.strip(), team.strip())
+                    label = f"{team_abbr} {label}".strip()
+                table.add(game_id, market_type, _full_label(label, market_type, point), book_key, price, point)
+    return table
@@ -0,0 +1,250 @@
+"""Parametric pricing of derivative segments.
+
+A segment's joint score distribution is summarised by a compact model fitted
+from the simulated home/away run arrays::
+
+    home = A + C,  away = B + C,  C ~ Poisson(cov)
+
+``A`` and ``B`` are negative binomial (or Poisson when a team's runs are not
+over-dispersed) so each team keeps its simulated mean and variance while ``C``
+carries the home/away correlation. Any total, spread, team total or moneyline
+can then be priced analytically from the joint PMF, including lines that were
+not part of the simulator's fixed grids.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import math
+
+import numpy as np
+
+from core.utils import get_teams_from_game_id, normalize_label
+
+__all__ = [
+    "fit_segment_model",
+    "joint_pmf",
+    "price_total",
+    "price_spread",
+    "price_team_total",
+    "price_moneyline",
+    "price_segment_label",
+    "extra_segment_entries",
+]
+
+# Upper bound on runs per team represented in the joint PMF
+MAX_RUNS = 30
+
+
+def _moment(values) -> tuple[float, float]:
+    arr = np.asarray(values, dtype=float)
+    return float(arr.mean()), float(arr.var())
+
+
+def fit_segment_model(
+    home_runs,
+    away_runs,
+    target_mean: float | None = None,
+    target_sd: float | None = None,
+    target_diff_sd: float | None = None,
+) -> dict:
+    """Return model parameters fitted to simulated segment scores.
+
+    ``target_*`` mirror the ``segment_scaling`` calibration used by
+    ``apply_segment_scaling``: when provided, the total mean, total SD and
+    run-differential SD of the model are set to those targets while the
+    home/away split and variance ratio come from the sims.
+    """
+    h = np.asarray(home_runs, dtype=float)
+    a = np.asarray(away_runs, dtype=float)
+    mu_h, var_h = _moment(h)
+    mu_a, var_a = _moment(a)
+    cov = float(np.mean((h - mu_h) * (a - mu_a))) if len(h) else 0.0
+
+    if target_mean is not None and mu_h + mu_a > 0:
+        shift = (target_mean - (mu_h + mu_a)) / 2
+        mu_h, mu_a = max(mu_h + shift, 1e-6), max(mu_a + shift, 1e-6)
+
+    if target_sd is not None or target_diff_sd is not None:
+        var_t = target_sd**2 if target_sd is not None else var_h + var_a + 2 * cov
+        var_d = target_diff_sd**2 if target_diff_sd is not None else var_h + var_a - 2 * cov
+        cov = (var_t - var_d) / 4
+        share = var_h / (var_h + var_a) if var_h + var_a > 0 else 0.5
+        var_sum = (var_t + var_d) / 2
+        var_h, var_a = var_sum * share, var_sum * (1 - share)
+
+    # The common shock cannot exceed either team's mean or variance
+    cov = max(0.0, min(cov, mu_h, mu_a, var_h, var_a))
+    return {
+        "home_mean": round(mu_h, 6),
+        "home_var": round(var_h, 6),
+        "away_mean": round(mu_a, 6),
+        "away_var": round(var_a, 6),
+        "cov": round(cov, 6),
+    }
+
+
+def _marginal_pmf(mean: float, var: float, max_runs: int) -> np.ndarray:
+    """Return a negative binomial PMF (Poisson if not over-dispersed)."""
+    # scipy.stats takes ~0.6s to import; only pay for it when pricing
+    from scipy.stats import nbinom, poisson
+
+    ks = np.arange(max_runs + 1)
+    if mean <= 0:
+        pmf = np.zeros(max_runs + 1)
+        pmf[0] = 1.0
+        return pmf
+    if var <= mean * (1 + 1e-6):
+        return poisson.pmf(ks, mean)
+    n = mean**2 / (var - mean)
+    return nbinom.pmf(ks, n, n / (n + mean))
+
+
+def joint_pmf(model: dict, max_runs: int = MAX_RUNS) -> np.ndarray:
+    """Return the ``(home, away)`` joint PMF matrix for ``model``."""
+    cov = model.get("cov", 0.0)
+    p_home = _marginal_pmf(model["home_mean"] - cov, model["home_var"] - cov, max_runs)
+    p_away = _marginal_pmf(model["away_mean"] - cov, model["away_var"] - cov, max_runs)
+    if cov <= 0:
+        joint = np.outer(p_home, p_away)
+    else:
+        from scipy.stats import poisson
+
+        p_shock = poisson.pmf(np.arange(max_runs + 1), cov)
+        joint = np.zeros((max_runs + 1, max_runs + 1))
+        for c, pc in enumerate(p_shock):
+            if pc < 1e-12:
+                break
+            joint[c:, c:] += pc * np.outer(p_home[: max_runs + 1 - c], p_away[: max_runs + 1 - c])
+    total = joint.sum()
+    return joint / total if total > 0 else joint
+
+
+def _grids(joint: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    h, a = np.indices(joint.shape)
+    return h + a, h - a
+
+
+def _win_prob(p_win: float, p_push: float) -> float:
+    denom = max(1.0 - p_push, 1e-8)
+    return p_win / denom
+
+
+def price_total(joint: np.ndarray, line: float, side: str = "Over") -> float:
+    """Return the push-adjusted probability for ``side`` of total ``line``."""
+    totals, _ = _grids(joint)
+    p_over = float(joint[totals > line].sum())
+    p_push = float(joint[totals == line].sum())
+    p_under = 1.0 - p_over - p_push
+    return _win_prob(p_over if side == "Over" else p_under, p_push)
+
+
+def price_spread(joint: np.ndarray, line: float, is_home: bool = True) -> float:
+    """Return the push-adjusted probability a team covers ``line``.
+
+    ``line`` uses sportsbook sign convention, e.g. ``-1.5`` for a favourite.
+    """
+    _, diffs = _grids(joint)
+    margin = diffs if is_home else -diffs
+    p_cover = float(joint[margin + line > 0].sum())
+    p_push = float(joint[margin + line == 0].sum())
+    return _win_prob(p_cover, p_push)
+
+
+def price_team_total(joint: np.ndarray, line: float, side: str = "Over", is_home: bool = True) -> float:
+    """Return the push-adjusted probability for a team total."""
+    runs = joint.sum(axis=1) if is_home else joint.sum(axis=0)
+    ks = np.arange(len(runs))
+    p_over = float(runs[ks > line].sum())
+    p_push = float(runs[ks == line].sum())
+    p_under = 1.0 - p_over - p_push
+    return _win_prob(p_over if side == "Over" else p_under, p_push)
+
+
+def price_moneyline(joint: np.ndarray) -> dict:
+    """Return ``{"home", "away", "push"}`` probabilities (segment ties push)."""
+    _, diffs = _grids(joint)
+    return {
+        "home": float(joint[diffs > 0].sum()),
+        "away": float(joint[diffs < 0].sum()),
+        "push": float(joint[diffs == 0].sum()),
+    }
+
+
+def price_segment_label(joint: np.ndarray, market: str, label: str, game_id: str) -> float | None:
+    """Return the model probability for an odds-style ``label`` in ``market``.
+
+    Supports ``Over 4.5``, ``NYY Over 2.5``, ``NYY -1.5`` and ``NYY`` labels.
+    Returns ``None`` for labels that cannot be parsed.
+    """
+    away, home = get_teams_from_game_id(game_id)
+    label = normalize_label(label)
+    parts = label.split()
+    mkt = market.replace("alternate_", "")
+    try:
+        if mkt.startswith("team_totals"):
+            team, side, point = parts
+            if team not in (home, away) or side not in ("Over", "Under"):
+                return None
+            return price_team_total(joint, float(point), side, is_home=team == home)
+        if mkt.startswith("totals"):
+            side, point = parts
+            if side not in ("Over", "Under"):
+                return None
+            return price_total(joint, float(point), side)
+        if mkt.startswith("spreads"):
+            team, point = parts
+            if team not in (home, away):
+                return None
+            return price_spread(joint, float(point), is_home=team == home)
+        if mkt.startswith("h2h"):
+            team = parts[0]
+            ml = price_moneyline(joint)
+            if team == home:
+                return ml["home"]
+            if team == away:
+                return ml["away"]
+    except (ValueError, TypeError):
+        return None
+    return None
+
+
+def extra_segment_entries(game_id: str, sim: dict, odds: dict) -> list:
+    """Return sim market entries for segment odds lines missing from ``sim``.
+
+    Only sims exported with ``segment_models`` contribute. Each entry matches
+    the shape produced by ``extract_universal_markets``.
+    """
+    from core.market_pricer import to_american_odds
+
+    models = sim.get("segment_models") or {}
+    if not models or not isinstance(odds, dict):
+        return []
+
+    have = {(e.get("market"), e.get("side")) for e in sim.get("markets", [])}
+    entries = []
+    joints: dict[str, np.ndarray] = {}
+    for mkt_key, block in odds.items():
+        if not isinstance(block, dict) or mkt_key.endswith("_source"):
+            continue
+        base_key = mkt_key.replace("alternate_", "")
+        suffix = next((s for s in models if base_key.endswith(s)), None)
+        if suffix is None:
+            continue
+        if suffix not in joints:
+            joints[suffix] = joint_pmf(models[suffix])
+        for label in block:
+            if (base_key, label) in have:
+                continue
+            prob = price_segment_label(joints[suffix], base_key, label, game_id)
+            if prob is None or not 0.0 < prob < 1.0 or math.isnan(prob):
+                continue
+            have.add((base_key, label))
+            entries.append(
+                {
+                    "market": base_key,
+                    "side": label,
+                    "sim_prob": round(prob, 4),
+                    "fair_odds": round(to_american_odds(prob), 2),
+                    "source": "parametric",
+                }
+            )
+    return entries
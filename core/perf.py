@@ -0,0 +1,97 @@
+"""Lightweight per-phase timing and counters for long-running pipelines.
+
+Usage::
+
+    perf = PerfRecorder("simulate_distribution", game_id=gid)
+    with perf.phase("simulation"):
+        ...
+    perf.count("sims", n)
+    meta = perf.as_dict()
+    append_perf_log(perf.as_dict())
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = ["PERF_LOG_DIR", "PerfRecorder", "append_perf_log"]
+
+PERF_LOG_DIR = os.path.join("logs", "perf")
+
+
+class PerfRecorder:
+    """Collect wall time per named phase plus arbitrary counters."""
+
+    def __init__(self, name: str, **tags):
+        self.name = name
+        self.tags = tags
+        self.phases: dict[str, float] = {}
+        self.counters: dict[str, float] = {}
+        self._open: dict[str, float] = {}
+        self._created = time.perf_counter()
+
+    def start(self, phase: str) -> None:
+        self._open[phase] = time.perf_counter()
+
+    def stop(self, phase: str) -> float:
+        """Close ``phase`` and return its elapsed seconds (0 if never started)."""
+        began = self._open.pop(phase, None)
+        if began is None:
+            return 0.0
+        elapsed = time.perf_counter() - began
+        # Repeated phases accumulate
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+        return elapsed
+
+    @contextmanager
+    def phase(self, phase: str):
+        self.start(phase)
+        try:
+            yield self
+        finally:
+            self.stop(phase)
+
+    def count(self, key: str, value: float = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def rate(self, counter: str, phase: str) -> float | None:
+        """Return ``counter`` per second of ``phase`` wall time."""
+        elapsed = self.phases.get(phase)
+        if not elapsed or counter not in self.counters:
+            return None
+        return self.counters[counter] / elapsed
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            **self.tags,
+            "total_sec": round(time.perf_counter() - self._created, 4),
+            "phases_sec": {k: round(v, 4) for k, v in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary(self) -> str:
+        parts = [f"{k}={v:.2f}s" for k, v in self.phases.items()]
+        return f"⏱️ {self.name}: " + ", ".join(parts)
+
+
+def append_perf_log(record: dict, log_dir: str = PERF_LOG_DIR) -> str | None:
+    """Append ``record`` as one JSON line to ``log_dir/<name>_<date>.jsonl``."""
+    try:
+        os.makedirs(log_dir, exist_ok=True)
+        date_tag = datetime.now().strftime("%Y-%m-%d")
+        path = os.path.join(log_dir, f"{record.get('name', 'perf')}_{date_tag}.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        return path
+    except Exception as e:
+        logger.warning("⚠️ Failed to write perf log: %s", e)
+        return None
@@ -1,8 +1,46 @@
 import numpy as np
-from scipy.special import logit, expit
+
+from core.scaling_utils import scale_distribution
+
+# League benchmarks the simulated score distributions are scaled to
+BENCHMARK_TOTALS = {
+    "full_game": {"mean_total": 9.00, "std_total": 4.30, "mean_diff": 0.00, "std_diff": 4.30},
+    "f1": {"mean_total": 1.05, "std_total": 1.55, "mean_diff": 0.00, "std_diff": 1.55},
+    "f3": {"mean_total": 3.30, "std_total": 2.70, "mean_diff": 0.00, "std_diff": 2.70},
+    "f5": {"mean_total": 5.40, "std_total": 3.35, "mean_diff": 0.00, "std_diff": 3.35},
+    "f7": {"mean_total": 7.25, "std_total": 3.85, "mean_diff": 0.00, "std_diff": 3.85},
+}
+
+# Lines priced per segment; spreads are quoted at -line and +line for each team
+MARKET_LINES = {
+    "full_game": {
+        "total_lines": [x / 2 for x in range(13, 26)],  # 6.5 to 12.5
+        "spread_lines": [0.5, 1.5, 2.5],
+        "team_total_lines": [1.5, 2.5, 3.5, 4.5, 5.5, 6.5],
+    },
+    "f1": {"total_lines": [0.5]},
+    "f3": {
+        "total_lines": [2.5, 3.5, 4.5],
+        "spread_lines": [0.5, 1.5, 2.5],
+        "team_total_lines": [0.5, 1.5, 2.5, 3.5],
+    },
+    "f5": {
+        "total_lines": [3.5, 4.5, 5.5, 6.5],
+        "spread_lines": [0.5, 1.5, 2.5],
+        "team_total_lines": [1.5, 2.5, 3.5, 4.5, 5.5],
+    },
+    "f7": {
+        "total_lines": [5.5, 6.5, 7.5, 8.5],
+        "spread_lines": [0.5, 1.5, 2.5],
+        "team_total_lines": [2.5, 3.5, 4.5, 5.5, 6.5],
+    },
+}
 
 class MLBPricingEngine:
     def __init__(self, calibration):
+        # ``version`` is set by core.calibration.fit_calibration; hand-edited files have none
+        self.calibration_version = calibration.get("version")
+
         self.run_scaling_factor = calibration.get("run_scaling_factor", 1.0)
         self.stddev_scaling_factor = calibration.get("stddev_scaling_factor", 1.0)
         self.run_diff_scaling_factor = calibration.get("run_diff_scaling_factor", 1.0)
@@ -20,6 +58,13 @@ class MLBPricingEngine:
         self.logit_a = logit_params.get("a")
         self.logit_b = logit_params.get("b")
 
+    @classmethod
+    def from_file(cls, path=None):
+        """Return an engine built from the calibration file at ``path``."""
+        from core.calibration import CALIBRATION_PATH, load_calibration
+
+        return cls(load_calibration(path or CALIBRATION_PATH))
+
     def apply_total_scaling(self, raw_totals):
         mean_total = np.mean(raw_totals)
         std_scaled = [(r - mean_total) * self.stddev_scaling_factor + mean_total for r in raw_totals]
@@ -44,6 +89,8 @@ class MLBPricingEngine:
 
     def price_moneyline(self, sim_win_pct):
         if self.logit_a is not None and self.logit_b is not None:
+            from scipy.special import logit, expit
+
             sim_win_pct = float(expit(self.logit_a + self.logit_b * logit(sim_win_pct)))
         dec_odds = 1 / sim_win_pct
         if sim_win_pct >= 0.5:
@@ -82,3 +129,34 @@ class MLBPricingEngine:
         mean_score = np.mean(scores)
         std_scaled = [(s - mean_score) * std_factor + mean_score for s in scores]
         return [s * mean_factor for s in std_scaled]
+
+    def scale_full_game(self, home_scores, away_scores, benchmark=None):
+        """Return ``(totals, diffs, home, away)`` calibrated full-game scores.
+
+        Totals are scaled to the benchmark mean/SD and run differentials to
+        its SD, then split back into team scores and passed through
+        :meth:`apply_team_total_scaling` (rounded to 0.1 runs).
+        """
+        benchmark = benchmark or BENCHMARK_TOTALS["full_game"]
+        raw_totals = [h + a for h, a in zip(home_scores, away_scores)]
+        raw_diffs = [h - a for h, a in zip(home_scores, away_scores)]
+        totals = scale_distribution(
+            raw_totals,
+            target_mean=benchmark["mean_total"],
+            target_sd=benchmark["std_total"],
+        )
+        diffs = scale_distribution(raw_diffs, target_sd=benchmark["std_total"])
+        home = [(t + d) / 2 for t, d in zip(totals, diffs)]
+        away = [(t - d) / 2 for t, d in zip(totals, diffs)]
+        home = [round(x, 1) for x in self.apply_team_total_scaling(home, is_home=True)]
+        away = [round(x, 1) for x in self.apply_team_total_scaling(away, is_home=False)]
+        return totals, diffs, home, away
+
+    def segment_targets(self, seg_id):
+        """Return the ``fit_segment_model`` targets calibrated for ``seg_id`` (e.g. ``"f5"``)."""
+        seg_cal = self.segment_scaling.get(seg_id, {})
+        return {
+            "target_mean": seg_cal.get("run_mean"),
+            "target_sd": seg_cal.get("run_sd"),
+            "target_diff_sd": seg_cal.get("diff_sd"),
+        }
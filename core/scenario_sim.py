@@ -0,0 +1,407 @@
+"""Batch pre-simulation of lineup and starter what-if scenarios.
+
+Before lineups are confirmed a game is priced from projected lineups. This
+module simulates a handful of plausible variants per game (a star resting, an
+opener instead of the listed starter) in one run over shared assets and
+stores the market prices for each variant keyed by a lineup/starter
+signature. Once the real lineup lands, ``simulate_distribution`` (run with
+``use_scenarios=True``, i.e. ``--use-scenarios``) calls :func:`serve_scenario`,
+which writes the matching variant's prices as the game's sim file instead of
+running a fresh full simulation.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import copy
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from core.calibration import SEGMENT_KEYS
+from core.game_simulator import simulate_game
+from core.logger import get_logger
+from core.market_pricer import to_american_odds
+from core.parametric_pricer import (
+    fit_segment_model,
+    joint_pmf,
+    price_moneyline,
+    price_spread,
+    price_team_total,
+    price_total,
+)
+from core.pricing_engine import MARKET_LINES, MLBPricingEngine
+from core.utils import get_teams_from_game_id
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "SCENARIO_ROOT",
+    "scenario_key",
+    "build_scenarios",
+    "simulate_scenario",
+    "run_scenarios",
+    "save_scenarios",
+    "load_scenario_prices",
+    "serve_scenario",
+]
+
+SCENARIO_ROOT = os.path.join("backtest", "scenarios")
+
+# Segment models a served scenario must carry, keyed as in ``segment_models``
+SEGMENTS = ["full_game", *SEGMENT_KEYS.values()]
+
+
+def _lineup_names(lineup: list) -> list:
+    return sorted(str(b.get("name", "")).strip().lower() for b in lineup or [])
+
+
+def scenario_key(home_lineup, away_lineup, home_pitcher, away_pitcher) -> str:
+    """Return a stable key for a lineup/starter combination."""
+    payload = json.dumps(
+        [
+            _lineup_names(home_lineup),
+            _lineup_names(away_lineup),
+            str((home_pitcher or {}).get("name", "")).strip().lower(),
+            str((away_pitcher or {}).get("name", "")).strip().lower(),
+        ]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _scenario(
+    scenario_id: str,
+    description: str,
+    lineups: dict,
+    pitchers: dict,
+    openers: dict | None = None,
+    bullpens: dict | None = None,
+) -> dict:
+    openers = openers or {}
+    # An opener is announced as the starter, so it is what the key matches
+    listed = {side: openers.get(side) or pitchers[side] for side in ("home", "away")}
+    scenario = {
+        "id": scenario_id,
+        "description": description,
+        "lineups": lineups,
+        "pitchers": pitchers,
+        "openers": openers,
+        "key": scenario_key(lineups["home"], lineups["away"], listed["home"], listed["away"]),
+    }
+    if bullpens is not None:
+        scenario["bullpens"] = bullpens
+    return scenario
+
+
+def build_scenarios(assets: dict, bench: dict | None = None, max_scenarios: int = 5) -> list:
+    """Return up to ``max_scenarios`` variants of ``assets``.
+
+    ``bench`` maps ``"home"``/``"away"`` to batter dicts that can replace a
+    resting starter; without one a league-average bat is used. Variants:
+
+    * ``base`` – projected lineups and listed starters
+    * ``rest_<side>`` – that side's best hitter (by wOBA) sits
+    * ``opener_<side>`` – that side's top reliever opens for an inning and
+      the listed starter pitches the bulk; the opener leaves the bullpen
+    """
+    bench = bench or {}
+    lineups = assets.get("lineups", {})
+    pitchers = assets.get("pitchers", {})
+    bullpens = assets.get("bullpens", {})
+
+    scenarios = [_scenario("base", "Projected lineups", lineups, pitchers)]
+
+    for side in ("home", "away"):
+        lineup = lineups.get(side) or []
+        if not lineup:
+            continue
+        star_idx = max(range(len(lineup)), key=lambda i: lineup[i].get("woba", 0.0))
+        star = lineup[star_idx]
+        in_lineup = {b.get("name") for b in lineup}
+        sub = next((b for b in bench.get(side, []) if b.get("name") not in in_lineup), None)
+        if sub is None:
+            sub = {**star, "name": f"replacement_{side}", "woba": 0.300, "iso": 0.130, "avg": 0.240}
+        new_lineup = list(lineup)
+        new_lineup[star_idx] = copy.deepcopy(sub)
+        scenarios.append(
+            _scenario(
+                f"rest_{side}",
+                f"{star.get('name')} rests → {sub.get('name')}",
+                {**lineups, side: new_lineup},
+                pitchers,
+            )
+        )
+
+    for side in ("home", "away"):
+        pen = bullpens.get(side) or []
+        if not pen or side not in pitchers:
+            continue
+        opener = pen[0]
+        scenarios.append(
+            _scenario(
+                f"opener_{side}",
+                f"{opener.get('name')} opens for {pitchers[side].get('name')}",
+                lineups,
+                pitchers,
+                openers={side: opener},
+                bullpens={**bullpens, side: pen[1:]},
+            )
+        )
+
+    return scenarios[:max_scenarios]
+
+
+def _segment_entries(game_id: str, seg_id: str, joint: np.ndarray) -> list:
+    """Price ``seg_id`` (``"full_game"`` or ``"f1"``…) on the simulator's lines."""
+    away, home = get_teams_from_game_id(game_id)
+    suffix = "" if seg_id == "full_game" else f"_{SEGMENT_KEYS[seg_id]}"
+    lines = MARKET_LINES[seg_id]
+    entries = []
+
+    def add(market, side, prob):
+        prob = float(prob)
+        if 0.0 < prob < 1.0:
+            entries.append(
+                {
+                    "market": market,
+                    "side": side,
+                    "sim_prob": round(prob, 4),
+                    "fair_odds": round(to_american_odds(prob), 2),
+                    "source": "scenario",
+                }
+            )
+
+    for line in lines["total_lines"]:
+        add(f"totals{suffix}", f"Over {line}", price_total(joint, line, "Over"))
+        add(f"totals{suffix}", f"Under {line}", price_total(joint, line, "Under"))
+    if seg_id == "f1":
+        # The first inning is only offered as a run / no-run total
+        return entries
+
+    ml = price_moneyline(joint)
+    if suffix:
+        # Segment moneylines are three-way; price the two-way push-out line
+        decided = max(ml["home"] + ml["away"], 1e-8)
+        add(f"h2h{suffix}", home, ml["home"] / decided)
+        add(f"h2h{suffix}", away, ml["away"] / decided)
+    else:
+        # Full games cannot tie; extras split in proportion to regulation wins
+        add("h2h", home, ml["home"] + ml["push"] * ml["home"] / max(ml["home"] + ml["away"], 1e-8))
+        add("h2h", away, ml["away"] + ml["push"] * ml["away"] / max(ml["home"] + ml["away"], 1e-8))
+
+    for line in lines["spread_lines"]:
+        for team, is_home in ((home, True), (away, False)):
+            add(f"spreads{suffix}", f"{team} -{line}", price_spread(joint, -line, is_home=is_home))
+            add(f"spreads{suffix}", f"{team} +{line}", price_spread(joint, line, is_home=is_home))
+    for line in lines["team_total_lines"]:
+        for team, is_home in ((home, True), (away, False)):
+            for side in ("Over", "Under"):
+                add(
+                    f"team_totals{suffix}",
+                    f"{team} {side} {line}",
+                    price_team_total(joint, line, side, is_home=is_home),
+                )
+    return entries
+
+
+def _raw_distributions(suffix: str, home: np.ndarray, away: np.ndarray) -> dict:
+    """Return ``raw_distributions`` entries shaped like a simulator export."""
+    totals = home + away
+    diffs = home - away
+    return {
+        f"totals{suffix}": {
+            "values": totals.tolist(),
+            "mean": float(totals.mean()),
+            "std": float(totals.std()),
+        },
+        f"run_diffs{suffix}": {"values": diffs.tolist(), "std": float(diffs.std())},
+    }
+
+
+def simulate_scenario(
+    game_id: str,
+    scenario: dict,
+    env: dict,
+    bullpens: dict,
+    n_simulations: int = 2000,
+    pricing_engine=None,
+) -> dict:
+    """Simulate ``scenario`` and return its fitted models and market prices.
+
+    Scores are calibrated as in ``simulate_distribution``: the full game
+    through :meth:`MLBPricingEngine.scale_full_game` and each F1/F3/F5/F7
+    segment through its segment targets. Every segment is priced on the
+    simulator's lines and the raw arrays are kept as ``raw_distributions``.
+    ``pricing_engine`` defaults to the one built from the calibration file.
+    """
+    if pricing_engine is None:
+        pricing_engine = MLBPricingEngine.from_file()
+    bullpens = scenario.get("bullpens", bullpens)
+    openers = scenario.get("openers", {})
+    caps = [int(key.split("_")[1]) for key in SEGMENT_KEYS.values()]
+    home_full = np.empty(n_simulations)
+    away_full = np.empty(n_simulations)
+    home_seg = np.empty((len(caps), n_simulations))
+    away_seg = np.empty((len(caps), n_simulations))
+    for i in range(n_simulations):
+        result = simulate_game(
+            home_lineup=scenario["lineups"]["home"],
+            away_lineup=scenario["lineups"]["away"],
+            home_pitcher=scenario["pitchers"]["home"],
+            away_pitcher=scenario["pitchers"]["away"],
+            env=env,
+            home_bullpen=bullpens.get("home"),
+            away_bullpen=bullpens.get("away"),
+            use_noise=True,
+            home_opener=openers.get("home"),
+            away_opener=openers.get("away"),
+        )
+        home_full[i] = result["home_score"]
+        away_full[i] = result["away_score"]
+        for j, cap in enumerate(caps):
+            home_seg[j, i] = sum(inn["home_runs"] for inn in result["innings"] if inn["inning"] <= cap)
+            away_seg[j, i] = sum(inn["away_runs"] for inn in result["innings"] if inn["inning"] <= cap)
+
+    _, _, home_scaled, away_scaled = pricing_engine.scale_full_game(home_full, away_full)
+    models = {"full_game": fit_segment_model(home_scaled, away_scaled)}
+    markets = _segment_entries(game_id, "full_game", joint_pmf(models["full_game"]))
+    raw_distributions = _raw_distributions("", home_full, away_full)
+    for j, (seg_id, seg_key) in enumerate(SEGMENT_KEYS.items()):
+        models[seg_key] = fit_segment_model(
+            home_seg[j], away_seg[j], **pricing_engine.segment_targets(seg_id)
+        )
+        markets.extend(_segment_entries(game_id, seg_id, joint_pmf(models[seg_key])))
+        raw_distributions.update(_raw_distributions(f"_{seg_key}", home_seg[j], away_seg[j]))
+
+    return {
+        "id": scenario["id"],
+        "key": scenario["key"],
+        "description": scenario["description"],
+        "n_simulations": n_simulations,
+        "home_starter": scenario["pitchers"]["home"].get("name"),
+        "away_starter": scenario["pitchers"]["away"].get("name"),
+        "openers": {side: p.get("name") for side, p in openers.items()},
+        "home_lineup": [b.get("name") for b in scenario["lineups"]["home"]],
+        "away_lineup": [b.get("name") for b in scenario["lineups"]["away"]],
+        "segment_models": models,
+        "markets": markets,
+        "raw_distributions": raw_distributions,
+    }
+
+
+def run_scenarios(
+    game_id: str,
+    assets: dict,
+    env: dict,
+    scenarios: list,
+    n_simulations: int = 2000,
+    pricing_engine=None,
+) -> dict:
+    """Simulate every scenario over the shared ``assets``/``env``."""
+    results = {}
+    bullpens = assets.get("bullpens", {})
+    for scenario in scenarios:
+        logger.info("🧪 %s scenario %s: %s", game_id, scenario["id"], scenario["description"])
+        results[scenario["key"]] = simulate_scenario(
+            game_id, scenario, env, bullpens, n_simulations, pricing_engine
+        )
+    return results
+
+
+def _scenario_path(game_id: str, root: str) -> str:
+    date_tag = "-".join(game_id.split("-")[:3])
+    return os.path.join(root, date_tag, f"{game_id}.json")
+
+
+def save_scenarios(game_id: str, results: dict, root: str = SCENARIO_ROOT) -> str:
+    """Atomically write scenario ``results`` for ``game_id`` and return the path."""
+    path = _scenario_path(game_id, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = {
+        "game_id": game_id,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "scenarios": results,
+    }
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(path), delete=False, suffix=".tmp"
+    ) as tmpf:
+        json.dump(payload, tmpf, indent=2)
+        temp_path = tmpf.name
+    os.replace(temp_path, path)
+    return path
+
+
+def load_scenario_prices(
+    game_id: str,
+    home_lineup,
+    away_lineup,
+    home_pitcher,
+    away_pitcher,
+    root: str = SCENARIO_ROOT,
+) -> dict | None:
+    """Return the stored scenario matching the confirmed lineups, if any."""
+    path = _scenario_path(game_id, root)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            scenarios = json.load(f).get("scenarios", {})
+    except (OSError, ValueError):
+        return None
+    key = scenario_key(home_lineup, away_lineup, home_pitcher, away_pitcher)
+    match = scenarios.get(key)
+    if match is None and VERBOSE_MODE:
+        logger.info("🔍 No pre-simulated scenario for %s (key %s)", game_id, key)
+    return match
+
+
+def serve_scenario(
+    game_id: str,
+    lineups: dict,
+    pitchers: dict,
+    target_path: str,
+    start_time_iso: str | None = None,
+    root: str = SCENARIO_ROOT,
+) -> str | None:
+    """Write the stored scenario matching ``lineups``/``pitchers`` as a sim file.
+
+    The file carries the ``markets``, ``segment_models`` and
+    ``raw_distributions`` of a regular sim export. Returns ``target_path``,
+    or ``None`` when no scenario matches or the stored one lacks a segment,
+    so the caller runs a fresh simulation instead of serving a partial file.
+    """
+    match = load_scenario_prices(
+        game_id,
+        lineups.get("home"),
+        lineups.get("away"),
+        pitchers.get("home"),
+        pitchers.get("away"),
+        root=root,
+    )
+    if match is None:
+        return None
+    missing = [s for s in SEGMENTS if s not in (match.get("segment_models") or {})]
+    if missing or not match.get("raw_distributions"):
+        logger.info(
+            "🔍 Scenario %s for %s lacks %s; simulating afresh",
+            match.get("id"),
+            game_id,
+            ", ".join(missing) or "raw_distributions",
+        )
+        return None
+    output = {
+        "start_time_iso": start_time_iso,
+        "markets": match["markets"],
+        "segment_models": match["segment_models"],
+        "raw_distributions": match["raw_distributions"],
+        "scenario": {k: match.get(k) for k in ("id", "key", "description", "n_simulations")},
+    }
+    os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(target_path) or ".", delete=False, suffix=".tmp"
+    ) as tmpf:
+        json.dump(output, tmpf, indent=2)
+        temp_path = tmpf.name
+    os.replace(temp_path, target_path)
+    logger.info("⚡ Served %s from pre-simulated scenario %s", game_id, match.get("id"))
+    return target_path
@@ -7,17 +7,11 @@ from zoneinfo import ZoneInfo
 from typing import List, Dict, Tuple
 from typing import Optional
 import io
+import threading
 
 import pandas as pd
 
-import requests
 from core.utils import post_with_retries, safe_load_json
-import glob
-
-try:
-    import dataframe_image as dfi
-except Exception:  # pragma: no cover - optional dep
-    dfi = None
 
 from core.logger import get_logger
 from core.role_assignment import (
@@ -29,6 +23,8 @@ from core.role_assignment import (
 
 logger = get_logger(__name__)
 
+_MATPLOTLIB_LOCK = threading.Lock()
+
 from core.utils import (
     convert_full_team_spread_to_odds_key,
     normalize_to_abbreviation,
@@ -39,8 +35,8 @@ from core.utils import (
     now_eastern,
     parse_game_id,
     normalize_game_id,
-    fuzzy_match_game_id,
 )
+from core.game_id_utils import GameIdResolver
 from core.odds_normalizer import canonical_game_id
 from core.time_utils import compute_hours_to_game
 from core.dispatch_clv_snapshot import parse_start_time
@@ -54,35 +50,29 @@ from core.market_pricer import (
 )
 from core.confirmation_utils import required_market_move
 from core.scaling_utils import blend_prob
-from core.consensus_pricer import calculate_consensus_prob
+from core.consensus_pricer import ConsensusIndex, calculate_consensus_prob
+from core.parametric_pricer import extra_segment_entries
 from core.market_movement_tracker import track_and_update_market_movement
 from core.snapshot_tracker_loader import find_latest_market_snapshot_path
-import copy
+from core.snapshot_store import TrackerView, build_key, get_snapshot_store
+from core.snapshot_db import latest_snapshot_rows
 
 from core.book_helpers import ensure_consensus_books
+from core.snapshot_row import DISPLAY_FIELDS, SnapshotRow, render_display
 
-# Build keys for tracker dictionaries and snapshot rows
-def build_key(game_id: str, market: str, side: str) -> str:
-    """Return ``game_id:market:side`` without additional normalization."""
-    return f"{game_id}:{market}:{side}"
+def load_snapshot_tracker(directory: str = "backtest") -> TrackerView:
+    """Return a copy-on-write tracker over the latest snapshot in ``directory``."""
+    return get_snapshot_store(directory).tracker()
 
 
-def load_snapshot_tracker(directory: str = "backtest") -> dict:
-    path = find_latest_market_snapshot_path(directory)
-    if not path or not os.path.exists(path):
-        return {}
-    data = safe_load_json(path)
-    tracker = {}
-    rows = data if isinstance(data, list) else data.values() if isinstance(data, dict) else []
-    for r in rows:
-        canon = canonical_game_id(str(r.get("game_id")))
-        key = build_key(canon, r.get("market"), r.get("side"))
-        tracker[key] = r
-    return tracker
+def _latest_side_index():
+    return get_snapshot_store().refresh().by_side
 
 
-MARKET_EVAL_TRACKER = load_snapshot_tracker()
-MARKET_EVAL_TRACKER_BEFORE_UPDATE = copy.deepcopy(MARKET_EVAL_TRACKER)
+# Both trackers share the cached snapshot index; the snapshot is parsed on
+# first access rather than at import time, and writes stay local to each view.
+MARKET_EVAL_TRACKER = TrackerView(_latest_side_index)
+MARKET_EVAL_TRACKER_BEFORE_UPDATE = TrackerView(_latest_side_index)
 
 # === Console Output Controls ===
 MOVEMENT_LOG_LIMIT = 5
@@ -90,20 +80,11 @@ movement_log_count = 0
 
 
 def load_latest_snapshot(folder: str = "backtest") -> list:
-    """Return rows from the most recent ``market_snapshot_*.json`` in ``folder``."""
-    pattern = os.path.join(folder, "market_snapshot_*.json")
-    files = glob.glob(pattern)
-    if not files:
+    """Return rows from the most recent snapshot in ``folder``."""
+    rows, source = latest_snapshot_rows(folder)
+    if not source:
         logger.warning("⚠️ No snapshot files found in %s", folder)
-        return []
-
-    latest = max(files, key=os.path.getmtime)
-    data = safe_load_json(latest)
-    if isinstance(data, list):
-        return data
-    if isinstance(data, dict):
-        return list(data.values())
-    return []
+    return rows
 
 
 def load_market_snapshot(path: str | None) -> list:
@@ -203,101 +184,16 @@ def format_display(
 
 
 def annotate_display_deltas(entry: Dict, prior: Optional[Dict]) -> None:
-    """Populate *_display fields on ``entry`` using the provided prior data."""
-
-    def fmt_odds(val: Optional[float]) -> str:
-        if val is None:
-            return "N/A"
-        try:
-            return f"{val:+}" if isinstance(val, (int, float)) else str(val)
-        except Exception:
-            return str(val)
-
-    def fmt_percent(val: Optional[float]) -> str:
-        if val is None:
-            return "N/A"
-        try:
-            return f"{val:+.1f}%"
-        except Exception:
-            return str(val)
-
-    def fmt_prob(val: Optional[float]) -> str:
-        if val is None:
-            return "N/A"
-        try:
-            return f"{val * 100:.1f}%"
-        except Exception:
-            return str(val)
-
-    def fmt_fv(val: Optional[float]) -> str:
-        if val is None:
-            return "N/A"
-        try:
-            return f"{round(val)}"
-        except Exception:
-            return str(val)
-
-    def fmt_stake(val: Optional[float]) -> str:
-        if val is None:
-            return "N/A"
-        out = f"{val:.2f}u"
-        total = entry.get("cumulative_stake")
-        try:
-            if total is not None and float(total) != float(val):
-                out = f"{val:.2f}u ({float(total):.2f}u)"
-        except Exception:
-            pass
-        return out
-
-    field_map = {
-        "market_odds": ("odds_display", fmt_odds),
-        "ev_percent": ("ev_display", fmt_percent),
-        "market_prob": ("mkt_prob_display", fmt_prob),
-        "sim_prob": ("sim_prob_display", fmt_prob),
-        "blended_fv": ("fv_display", fmt_fv),
-    }
-
-    skip_deltas_for = {"ev_percent"}
-
-    movement_fields = {
-        "sim_prob": ("sim_movement", "percent"),
-        "market_prob": ("mkt_movement", "percent"),
-        "blended_fv": ("fv_movement", "odds"),
-    }
+    """Populate *_display fields on ``entry`` using the provided prior data.
 
-    for field, (disp_key, fmt) in field_map.items():
-        curr = entry.get(field)
-        if field == "market_odds":
-            prior_val = entry.get("prev_market_odds")
-            movement = entry.get("odds_movement", "same")
-        else:
-            if field == "market_prob":
-                prior_val = entry.get("baseline_consensus_prob")
-                movement = entry.get("mkt_movement", "same")
-            else:
-                prior_val = entry.get(f"prev_{field}") or (
-                    prior.get(field) if prior else None
-                )
-                movement = entry.get(
-                    movement_fields.get(field, ("", ""))[0],
-                    "same",
-                )
-
-        if field in movement_fields or field == "market_odds":
-            if prior_val is not None and movement != "same":
-                entry[disp_key] = f"{fmt(prior_val)} → {fmt(curr)}"
-            else:
-                entry[disp_key] = fmt(curr)
-            continue
-
-        if field in skip_deltas_for:
-            entry[disp_key] = fmt(curr)
-            continue
-
-        if prior_val is not None and curr != prior_val:
-            entry[disp_key] = f"{fmt(prior_val)} → {fmt(curr)}"
-        else:
-            entry[disp_key] = fmt(curr)
+    A :class:`~core.snapshot_row.SnapshotRow` renders them from its own
+    fields when they are read instead of storing them now.
+    """
+    if isinstance(entry, SnapshotRow):
+        entry.defer_displays()
+        return
+    for disp_key in DISPLAY_FIELDS:
+        entry[disp_key] = render_display(entry, disp_key, prior)
 
 
 def _game_id_display_fields(game_id: str) -> tuple[str, str, str]:
@@ -365,7 +261,7 @@ def build_argument_parser(
     return parser
 
 
-def _style_dataframe(df: pd.DataFrame) -> pd.io.formats.style.Styler:
+def _style_dataframe(df: pd.DataFrame) -> "pd.io.formats.style.Styler":
     """Return a styled DataFrame with conditional formatting."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M ET")
 
@@ -563,6 +459,11 @@ def send_bet_snapshot_to_discord(
             except Exception:
                 stake_str = str(stake_val)
             print(f"{label} {matchup} | {market} | {side} | {stake_str} @ {book}")
+    try:
+        # dataframe_image pulls in nbconvert; only load it when rendering
+        import dataframe_image as dfi
+    except Exception:  # pragma: no cover - optional dep
+        dfi = None
     if dfi is None:
         print("⚠️ dataframe_image is not available. Sending text fallback.")
         _send_table_text(df, market_type, webhook_url, force_dispatch=force_dispatch)
@@ -635,7 +536,9 @@ def send_bet_snapshot_to_discord(
         try:
             buf.seek(0)
             buf.truncate(0)
-            dfi.export(styled, buf, table_conversion="matplotlib", max_rows=-1)
+            # pyplot state is global; dispatchers may render on several threads
+            with _MATPLOTLIB_LOCK:
+                dfi.export(styled, buf, table_conversion="matplotlib", max_rows=-1)
             print(f"🧪 Matplotlib export buffer size: {buf.tell()} bytes")
         except Exception as e2:
             print(f"⚠️ Fallback export failed: {e2}")
@@ -872,13 +775,27 @@ def format_table_with_highlights(entries: List[dict]) -> str:
     return "\n".join(lines)
 
 
-def load_simulations(sim_dir: str) -> dict:
+def list_simulations(sim_dir: str) -> dict:
+    """Return ``{game_id: path}`` for the sim files in ``sim_dir``."""
+    if not os.path.isdir(sim_dir):
+        return {}
+    return {
+        f.replace(".json", ""): os.path.join(sim_dir, f)
+        for f in os.listdir(sim_dir)
+        if f.endswith(".json")
+    }
+
+
+def load_simulations(sim_dir: str, only=None) -> dict:
+    """Load sim files from ``sim_dir``, limited to the game IDs in ``only`` if given."""
     sims = {}
     if not os.path.isdir(sim_dir):
         logger.warning("❌ Sim directory not found: %s", sim_dir)
         return sims
     for f in os.listdir(sim_dir):
         if f.endswith(".json"):
+            if only is not None and f.replace(".json", "") not in only:
+                continue
             path = os.path.join(sim_dir, f)
             try:
                 with open(path) as fh:
@@ -888,19 +805,119 @@ def load_simulations(sim_dir: str) -> dict:
     return sims
 
 
+def price_sim_entries(game_id, canonical_gid: str, sim: dict, odds: dict) -> list:
+    """Return the odds-dependent inputs for each sim market entry of a game.
+
+    Everything here depends only on the sim file and the game's odds, so the
+    result can be reused until either changes (see
+    :mod:`core.snapshot_incremental`). Time- and tracker-dependent fields
+    are computed from it by :func:`build_snapshot_rows`.
+    """
+    priced = []
+    consensus_index = ConsensusIndex(canonical_gid, odds)
+    # Price segment lines outside the sim grids from the fitted model
+    markets = sim.get("markets", []) + extra_segment_entries(canonical_gid, sim, odds)
+    for entry in markets:
+        market = entry.get("market")
+        side = entry.get("side")
+        sim_prob = entry.get("sim_prob")
+        if market is None or side is None or sim_prob is None:
+            continue
+
+        lookup_side = (
+            normalize_to_abbreviation(side.strip()) if market == "h2h" else side
+        )
+        market_entry, _, matched_key, segment, price_source = (
+            get_market_entry_with_alternate_fallback(odds, market, lookup_side)
+        )
+        if not isinstance(market_entry, dict):
+            alt = convert_full_team_spread_to_odds_key(lookup_side)
+            market_entry, _, matched_key, segment, price_source = (
+                get_market_entry_with_alternate_fallback(odds, market, alt)
+            )
+        if not isinstance(market_entry, dict):
+            logger.warning(
+                "❌ No odds for %s — market %s side %s",
+                game_id,
+                market,
+                lookup_side,
+            )
+            continue
+
+        price = market_entry.get("price")
+        if price is None:
+            logger.warning(
+                "❌ No odds for %s — market %s side %s (missing price)",
+                game_id,
+                market,
+                lookup_side,
+            )
+            continue
+
+        sportsbook_odds = market_entry.get("per_book", {})
+        best_book = extract_best_book(sportsbook_odds)
+        if best_book:
+            sportsbook_odds[best_book] = price
+            market_entry["per_book"] = sportsbook_odds
+        result, _ = calculate_consensus_prob(
+            game_id=canonical_gid,
+            market_odds={canonical_gid: odds},
+            market_key=matched_key,
+            label=lookup_side,
+            index=consensus_index,
+        )
+        consensus_prob = result.get("consensus_prob")
+        if consensus_prob is None:
+            consensus_prob = market_entry.get("consensus_prob")
+
+        # Capture which sportsbooks formed the consensus line
+        books_used = result.get("books_used")
+        if books_used is None:
+            books_used = market_entry.get("books_used", [])
+
+        priced.append(
+            {
+                "market": market,
+                "side": side,
+                "sim_prob": sim_prob,
+                "price": price,
+                "matched_key": matched_key,
+                "segment": segment,
+                "market_class": "alternate" if price_source == "alternate" else "main",
+                "per_book": sportsbook_odds,
+                "best_book": best_book,
+                "consensus_prob": consensus_prob,
+                "book_odds_list": list(result.get("bookwise_probs", {}).values()),
+                "books_used": books_used,
+                "pricing_method": market_entry.get("pricing_method", "book"),
+                "logged": bool(entry.get("logged", False)),
+                "skip_reason": entry.get("skip_reason"),
+            }
+        )
+    return priced
+
+
 def build_snapshot_rows(
-    sim_data: dict, odds_data: dict, min_ev: float, debug_log=None
+    sim_data: dict, odds_data: dict, min_ev: float, debug_log=None, priced=None
 ) -> list:
+    """Return one snapshot row per priced sim market entry.
+
+    ``priced`` optionally maps canonical game IDs to the output of
+    :func:`price_sim_entries`. Games found there skip pricing (their
+    ``sim_data`` value may be ``None``); games priced here are added to it.
+    """
     if debug_log is None:
         debug_log = []
     rows = []
+    resolver = None  # built on the first miss, shared by the rest
     for game_id, sim in sim_data.items():
         full_gid = str(game_id)
         canonical_gid = canonical_game_id(full_gid)
-        markets = sim.get("markets", [])
         odds = odds_data.get(canonical_gid)
         if odds is None:
-            fuzzy_id = fuzzy_match_game_id(canonical_gid, list(odds_data.keys()), window=3)
+            if resolver is None:
+                resolver = GameIdResolver(odds_data)
+            fuzzy_id = resolver.fuzzy_match(canonical_gid, window=3)
             if fuzzy_id:
                 odds = odds_data.get(fuzzy_id)
                 if odds is None:
@@ -970,66 +987,18 @@ def build_snapshot_rows(
                 }
             )
             continue
-        for entry in markets:
-            market = entry.get("market")
-            side = entry.get("side")
-            sim_prob = entry.get("sim_prob")
-            if market is None or side is None or sim_prob is None:
-                continue
-
-            lookup_side = (
-                normalize_to_abbreviation(side.strip()) if market == "h2h" else side
-            )
-            market_entry, _, matched_key, segment, price_source = (
-                get_market_entry_with_alternate_fallback(odds, market, lookup_side)
-            )
-            if not isinstance(market_entry, dict):
-                alt = convert_full_team_spread_to_odds_key(lookup_side)
-                market_entry, _, matched_key, segment, price_source = (
-                    get_market_entry_with_alternate_fallback(odds, market, alt)
-                )
-            if not isinstance(market_entry, dict):
-                logger.warning(
-                    "❌ No odds for %s — market %s side %s",
-                    game_id,
-                    market,
-                    lookup_side,
-                )
-                continue
-
-            price = market_entry.get("price")
-            if price is None:
-                logger.warning(
-                    "❌ No odds for %s — market %s side %s (missing price)",
-                    game_id,
-                    market,
-                    lookup_side,
-                )
-                continue
-
-            sportsbook_odds = market_entry.get("per_book", {})
-            best_book = extract_best_book(sportsbook_odds)
-            if best_book:
-                sportsbook_odds[best_book] = price
-                market_entry["per_book"] = sportsbook_odds
-            result, _ = calculate_consensus_prob(
-                game_id=canonical_gid,
-                market_odds={canonical_gid: odds},
-                market_key=matched_key,
-                label=lookup_side,
-            )
-            consensus_prob = result.get("consensus_prob")
-            if consensus_prob is None:
-                consensus_prob = market_entry.get("consensus_prob")
-            book_odds_list = list(result.get("bookwise_probs", {}).values())
-
-            # Capture which sportsbooks formed the consensus line
-            books_used = result.get("books_used")
-            if books_used is None:
-                books_used = market_entry.get("books_used", [])
-
+        entries = priced.get(canonical_gid) if priced is not None else None
+        if entries is None:
+            entries = price_sim_entries(game_id, canonical_gid, sim, odds)
+            if priced is not None:
+                priced[canonical_gid] = entries
+        for entry in entries:
+            market, side, sim_prob = entry["market"], entry["side"], entry["sim_prob"]
+            price, matched_key = entry["price"], entry["matched_key"]
+            consensus_prob = entry["consensus_prob"]
+            book_odds_list = entry["book_odds_list"]
+            market_class = entry["market_class"]
             market_clean = matched_key.replace("alternate_", "")
-            market_class = "alternate" if price_source == "alternate" else "main"
 
             tracker_key = build_key(canonical_gid, market_clean, side)
             prior_row = (
@@ -1077,7 +1046,7 @@ def build_snapshot_rows(
                 side,
                 ev_pct,
                 stake,
-                market_entry.get("pricing_method", "book"),
+                entry["pricing_method"],
             )
 
             normalized_side = normalize_label_for_odds(side, matched_key)
@@ -1093,15 +1062,15 @@ def build_snapshot_rows(
                 "ev_percent": round(ev_pct, 2),
                 "stake": stake,
                 "raw_kelly": raw_kelly,
-                "segment": segment,
+                "segment": entry["segment"],
                 "market_class": market_class,
-                "best_book": best_book,
-                "books_used": books_used,
-                "_raw_sportsbook": sportsbook_odds,
+                "best_book": entry["best_book"],
+                "books_used": entry["books_used"],
+                "_raw_sportsbook": entry["per_book"],
                 "date_simulated": datetime.now().isoformat(),
                 "hours_to_game": round(hours_to_game, 2),
-                "logged": bool(entry.get("logged", False)),
-                "skip_reason": entry.get("skip_reason"),
+                "logged": entry["logged"],
+                "skip_reason": entry["skip_reason"],
             }
             # \U0001f4cc Persisting logged bets until game start
             if row.get("logged") and row.get("hours_to_game", 0) > 0:
@@ -1460,6 +1429,9 @@ def expand_snapshot_rows_with_kelly(
     modification to the EV or market fields.  For these rows ``snapshot_stake``
     is derived from ``raw_kelly`` when ``stake`` is zero and the flag
     ``is_prospective`` is set accordingly.
+
+    Expanded rows are :class:`~core.snapshot_row.SnapshotRow` objects; the
+    per-book rows of one market side share its per-book price dict.
     """
 
     expanded: List[dict] = []
@@ -1497,6 +1469,7 @@ def expand_snapshot_rows_with_kelly(
         row["book"] = row.get("book", row.get("best_book"))
 
         if not isinstance(per_book, dict) or not per_book:
+            row = SnapshotRow.from_dict(row)
             if row.get("market_odds") is None:
                 row["skip_reason"] = "no_odds"
             movement = track_and_update_market_movement(
@@ -1513,6 +1486,7 @@ def expand_snapshot_rows_with_kelly(
             expanded.append(row)
             continue
 
+        base = SnapshotRow.from_dict(row)
         expanded_any = False
         for book, odds in per_book.items():
             if allowed_books and book not in allowed_books:
@@ -1553,7 +1527,7 @@ def expand_snapshot_rows_with_kelly(
                 continue
 
             expanded_any = True
-            expanded_row = row.copy()
+            expanded_row = base.copy()
             expanded_row["logged"] = bool(row.get("logged", False))
             expanded_row["blended_fv"] = 1 / expanded_row["blended_prob"]
             expanded_row.update(
@@ -1623,7 +1597,7 @@ def expand_snapshot_rows_with_kelly(
             expanded.append(expanded_row)
 
         if not expanded_any:
-            row_copy = row.copy()
+            row_copy = base.copy()
             row_copy["logged"] = bool(row.get("logged", False))
             if row_copy.get("logged") and row_copy.get("hours_to_game", 0) > 0:
                 row_copy["snapshot_force_include"] = True
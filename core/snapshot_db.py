@@ -0,0 +1,254 @@
+"""SQLite store of market snapshots keyed by ``(snapshot_ts, game_id, market, side, book)``.
+
+The snapshot generator used to leave one full ``market_snapshot_<ts>.json``
+per loop in ``backtest/`` and every reader found "latest" with a directory
+scan before parsing the whole file. :class:`SnapshotDB` keeps every snapshot
+in one WAL-mode database next to those files, so readers fetch the latest
+snapshot, or the latest/prior row per key, with indexed queries. Old
+snapshots are dropped by :meth:`SnapshotDB.prune`; SQLite reuses the freed
+pages for the next snapshots, so the file stays at about the retention
+window's size without vacuuming. The JSON files are still
+written for tools that take a ``--snapshot-path``, but only the newest
+``SNAPSHOT_JSON_KEEP`` are kept on disk.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import glob
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from core.logger import get_logger
+from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.utils import now_eastern, safe_load_json
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "SNAPSHOT_DB_NAME",
+    "SNAPSHOT_JSON_KEEP",
+    "SNAPSHOT_RETENTION_HOURS",
+    "SnapshotDB",
+    "get_snapshot_db",
+    "latest_snapshot_rows",
+    "prune_snapshot_files",
+    "record_snapshot",
+    "row_key",
+    "snapshot_db_path",
+    "snapshot_ts_from_path",
+]
+
+SNAPSHOT_DB_NAME = "market_snapshots.sqlite"
+SNAPSHOT_RETENTION_HOURS = float(os.getenv("SNAPSHOT_RETENTION_HOURS", "48"))
+SNAPSHOT_JSON_KEEP = int(os.getenv("SNAPSHOT_JSON_KEEP", "24"))
+
+# Matches the ``market_snapshot_<ts>.json`` naming used by the generator
+_TS_FORMAT = "%Y%m%dT%H%M"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_ts TEXT PRIMARY KEY,
+    path TEXT,
+    row_count INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshot_rows (
+    snapshot_ts TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    market TEXT NOT NULL,
+    side TEXT NOT NULL,
+    book TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    row TEXT NOT NULL,
+    PRIMARY KEY (snapshot_ts, game_id, market, side, book)
+);
+CREATE INDEX IF NOT EXISTS idx_snapshot_rows_key
+    ON snapshot_rows (game_id, market, side, book, snapshot_ts);
+"""
+
+
+def row_key(row) -> tuple:
+    """Return the ``(game_id, market, side, book)`` key a snapshot row is stored under.
+
+    The snapshot generator dedups its rows by the same key, so every row
+    it writes gets its own database row.
+    """
+    return (
+        str(row.get("game_id") or ""),
+        str(row.get("market") or ""),
+        str(row.get("side") or ""),
+        str(row.get("book") or row.get("best_book") or ""),
+    )
+
+
+class SnapshotDB:
+    """Market snapshots persisted to SQLite, one row per snapshot entry."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def write_snapshot(self, rows: list, snapshot_ts: str, path: str | None = None) -> int:
+        """Store ``rows`` as snapshot ``snapshot_ts``, replacing any earlier copy."""
+        records = [
+            (snapshot_ts, *row_key(row), seq, json.dumps(row, default=str))
+            for seq, row in enumerate(rows)
+        ]
+        updated_at = datetime.now().isoformat(timespec="microseconds")
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM snapshot_rows WHERE snapshot_ts = ?", (snapshot_ts,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshot_rows VALUES (?, ?, ?, ?, ?, ?, ?)", records
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                (snapshot_ts, path, len(records), updated_at),
+            )
+        logger.debug("🗄️ Stored snapshot %s with %d rows in %s", snapshot_ts, len(records), self.path)
+        return len(records)
+
+    def snapshot_timestamps(self) -> list[str]:
+        return [ts for (ts,) in self._conn.execute("SELECT snapshot_ts FROM snapshots ORDER BY snapshot_ts")]
+
+    def latest_snapshot(self) -> tuple[str, str] | None:
+        """Return ``(snapshot_ts, updated_at)`` of the newest snapshot."""
+        return self._conn.execute(
+            "SELECT snapshot_ts, updated_at FROM snapshots ORDER BY snapshot_ts DESC LIMIT 1"
+        ).fetchone()
+
+    def load_snapshot(self, snapshot_ts: str | None = None) -> list[dict]:
+        """Return the rows of ``snapshot_ts`` (default: latest) in written order."""
+        if snapshot_ts is None:
+            latest = self.latest_snapshot()
+            if latest is None:
+                return []
+            snapshot_ts = latest[0]
+        rows = self._conn.execute(
+            "SELECT row FROM snapshot_rows WHERE snapshot_ts = ? ORDER BY seq", (snapshot_ts,)
+        )
+        return [json.loads(row) for (row,) in rows]
+
+    def latest_rows(self, game_id: str | None = None, before: str | None = None) -> dict:
+        """Return ``{(game_id, market, side, book): row}`` from each key's newest snapshot.
+
+        ``before`` restricts the search to snapshots strictly older than it,
+        which turns this into a "prior row per key" query.
+        """
+        inner = "SELECT MAX(snapshot_ts) FROM snapshot_rows WHERE game_id = r.game_id AND market = r.market AND side = r.side AND book = r.book"
+        params: list = []
+        if before is not None:
+            inner += " AND snapshot_ts < ?"
+            params.append(before)
+        sql = f"SELECT game_id, market, side, book, row FROM snapshot_rows r WHERE snapshot_ts = ({inner})"
+        if game_id is not None:
+            sql += " AND game_id = ?"
+            params.append(game_id)
+        return {tuple(rec[:4]): json.loads(rec[4]) for rec in self._conn.execute(sql, params)}
+
+    def prior_rows(self, snapshot_ts: str | None = None, game_id: str | None = None) -> dict:
+        """Return each key's newest row from before ``snapshot_ts`` (default: latest)."""
+        if snapshot_ts is None:
+            latest = self.latest_snapshot()
+            if latest is None:
+                return {}
+            snapshot_ts = latest[0]
+        return self.latest_rows(game_id=game_id, before=snapshot_ts)
+
+    def prune(self, max_age_hours: float | None = SNAPSHOT_RETENTION_HOURS, keep: int | None = None) -> int:
+        """Drop snapshots older than ``max_age_hours`` or beyond the newest ``keep``.
+
+        The newest snapshot is never dropped. Returns the number removed.
+        """
+        stamps = self.snapshot_timestamps()
+        doomed = set(stamps[:-keep] if keep else [])
+        if max_age_hours is not None:
+            cutoff = (now_eastern() - timedelta(hours=max_age_hours)).strftime(_TS_FORMAT)
+            doomed.update(ts for ts in stamps if ts < cutoff)
+        doomed.discard(stamps[-1] if stamps else None)
+        if not doomed:
+            return 0
+        params = [(ts,) for ts in doomed]
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM snapshot_rows WHERE snapshot_ts = ?", params)
+            self._conn.executemany("DELETE FROM snapshots WHERE snapshot_ts = ?", params)
+        logger.info("🧹 Pruned %d old snapshots from %s", len(doomed), self.path)
+        return len(doomed)
+
+
+def snapshot_db_path(directory: str = "backtest") -> str:
+    return os.path.join(directory, SNAPSHOT_DB_NAME)
+
+
+def snapshot_ts_from_path(path: str) -> str:
+    """Return ``<ts>`` from ``.../market_snapshot_<ts>.json``."""
+    name = os.path.basename(path)
+    return name[len("market_snapshot_"):-len(".json")] if name.startswith("market_snapshot_") else name
+
+
+_DBS: dict[str, SnapshotDB] = {}
+
+
+def get_snapshot_db(directory: str = "backtest", create: bool = True) -> SnapshotDB | None:
+    """Return the process-wide :class:`SnapshotDB` for ``directory``.
+
+    With ``create=False`` readers get ``None`` instead of creating an empty
+    database where none has been written yet.
+    """
+    path = snapshot_db_path(directory)
+    db = _DBS.get(path)
+    if db is None:
+        if not create and not os.path.exists(path):
+            return None
+        db = _DBS[path] = SnapshotDB(path)
+    return db
+
+
+def latest_snapshot_rows(directory: str = "backtest") -> tuple[list, str | None]:
+    """Return ``(rows, source)`` for the newest snapshot in ``directory``.
+
+    Reads from the snapshot database when it holds any snapshot and falls
+    back to the newest ``market_snapshot_*.json`` otherwise.
+    """
+    db = get_snapshot_db(directory, create=False)
+    latest = db.latest_snapshot() if db is not None else None
+    if latest is not None:
+        return db.load_snapshot(latest[0]), f"{db.path}@{latest[0]}"
+    path = find_latest_market_snapshot_path(directory)
+    rows = safe_load_json(path) if path else []
+    return rows, path
+
+
+def prune_snapshot_files(directory: str = "backtest", keep: int = SNAPSHOT_JSON_KEEP) -> int:
+    """Delete all but the newest ``keep`` ``market_snapshot_*.json`` files."""
+    if keep <= 0:
+        return 0
+    files = sorted(glob.glob(os.path.join(directory, "market_snapshot_*.json")), key=os.path.getmtime)
+    removed = 0
+    for path in files[:-keep]:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError as e:
+            logger.warning("⚠️ Failed to remove old snapshot %s: %s", path, e)
+    return removed
+
+
+def record_snapshot(rows: list, path: str) -> None:
+    """Mirror the snapshot written to ``path`` into its directory's database."""
+    directory = os.path.dirname(path) or "."
+    try:
+        db = get_snapshot_db(directory)
+        db.write_snapshot(rows, snapshot_ts_from_path(path), path=path)
+        db.prune()
+    except Exception as e:
+        logger.warning("⚠️ Failed to record snapshot %s in database: %s", path, e)
@@ -0,0 +1,304 @@
+"""Column-wise snapshot enrichment.
+
+Snapshot rows are enriched with movement, Kelly stake, FV tier, confirmation
+thresholds and roles. Doing that one dict at a time made build time grow
+with every book and alt line. :func:`enrich_snapshot_frame` computes the
+same fields as whole-column operations over a DataFrame.
+:func:`enrich_snapshot_rows` wraps it for the dict rows the generator works
+with, writing the results back in place. The vector helpers mirror their
+scalar counterparts in :mod:`core.market_pricer` and
+:mod:`core.confirmation_utils` and must stay in step with them.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import numpy as np
+import pandas as pd
+
+from core.role_assignment import BEST_BOOK_ALT, BEST_BOOK_MAIN
+
+__all__ = [
+    "ENRICHED_FIELDS",
+    "enrich_snapshot_frame",
+    "enrich_snapshot_rows",
+    "kelly_stakes",
+    "required_market_moves",
+    "snapshot_roles",
+]
+
+# Fields written back to the row dicts by :func:`enrich_snapshot_rows`
+ENRICHED_FIELDS = (
+    "mkt_movement",
+    "mkt_prob_display",
+    "stake",
+    "raw_kelly",
+    "snapshot_stake",
+    "is_prospective",
+    "blended_fv",
+    "fv_tier",
+    "snapshot_role",
+    "snapshot_roles",
+    "visible_in_snapshot",
+    "consensus_move",
+    "required_move",
+    "movement_confirmed",
+    "skip_reason",
+)
+
+
+def _numeric(values) -> pd.Series:
+    """Coerce ``values`` to floats; anything ``float()`` would reject is NaN."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values, dtype=object)
+    if series.dtype.kind in "fiu":
+        return series.astype(float)
+    return pd.to_numeric(series, errors="coerce").astype(float)
+
+
+def _first_truthy(*columns: pd.Series) -> pd.Series:
+    """Element-wise ``a or b or ...`` over object columns."""
+    result = columns[-1]
+    for col in reversed(columns[:-1]):
+        # Missing values (None/NaN) are falsy, as ``None`` is in the dicts
+        truthy = col.notna() & col.astype(bool)
+        result = col.where(truthy, result)
+    return result
+
+
+def _round(values, ndigits: int) -> np.ndarray:
+    """Round like the builtin ``round``.
+
+    ``np.round`` scales before rounding and can land on the other side of a
+    near-tie, so values close to a half step are re-rounded with ``round``.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0**ndigits
+    near_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def _decimal(odds: np.ndarray) -> np.ndarray:
+    return np.where(odds < 0, 100 / np.abs(odds) + 1, odds / 100 + 1)
+
+
+def kelly_stakes(probs, odds, fractions=0.25) -> np.ndarray:
+    """Vector form of :func:`core.market_pricer.kelly_fraction` (units)."""
+    p = np.asarray(probs, dtype=float)
+    b = _decimal(np.asarray(odds, dtype=float)) - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kelly = (b * p - (1 - p)) / b
+    stake = np.maximum(0, _round(kelly * 100 * np.asarray(fractions, dtype=float), 4))
+    return np.where((p > 0) & (p < 1), stake, 0.0)
+
+
+def _per_category(values, fn) -> np.ndarray:
+    """Apply ``fn`` once per distinct string in ``values`` and broadcast back.
+
+    Markets and classes take a handful of distinct values per slate, so
+    string rules are evaluated per category rather than per row.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str))
+    return np.asarray([fn(u) for u in uniques])[codes] if len(uniques) else np.asarray([])
+
+
+def _market_factor(market: str) -> tuple:
+    """Return ``(full_game, segment_scale)`` for a market key."""
+    full_game = (
+        market.startswith(("totals", "spreads", "runline"))
+        and "1st" not in market
+        and "team_totals" not in market
+    )
+    if "1st_3" in market or "1st_7" in market or "team_totals" in market:
+        scale = 1.5
+    elif "1st_5" in market:
+        scale = 1.25
+    else:
+        scale = 1.0
+    return full_game, scale
+
+
+def required_market_moves(hours, book_counts, markets, ev_percent) -> np.ndarray:
+    """Vector form of :func:`core.confirmation_utils.required_market_move`."""
+    hours = _numeric(hours).fillna(0.0).to_numpy()
+    books = np.trunc(_numeric(book_counts).fillna(1.0).to_numpy())
+    market = pd.Series(markets, dtype=object).fillna("")
+    ev = _numeric(ev_percent).to_numpy()
+
+    threshold = 0.0045 * (1.0 + np.maximum((hours - 6.0) / 24.0, 0.0))
+    threshold = threshold * (1.0 + 0.3 * np.maximum(3 - books, 0))
+
+    factors = _per_category(market, _market_factor)
+    full_game = factors[:, 0].astype(bool) if len(factors) else np.zeros(0, dtype=bool)
+    in_band = (ev >= 10.0) & (ev <= 20.0)
+    threshold = np.where(full_game, threshold * np.where(in_band, 0.25, 0.50), threshold)
+    if len(factors):
+        threshold = threshold * factors[:, 1]
+
+    ev_scale = np.select([ev >= 12.0, (ev >= 5.0) & (ev <= 7.0)], [0.8, 1.25], 1.0)
+    return threshold * ev_scale
+
+
+def _role_for(key: str) -> str:
+    market_class, _, market_type = key.partition("|")
+    if market_type.startswith("h2h"):
+        return "h2h"
+    if "spread" in market_type:
+        return "spreads"
+    if "total" in market_type:
+        return "totals"
+    if market_class.startswith("alt"):
+        return BEST_BOOK_ALT
+    return BEST_BOOK_MAIN
+
+
+def snapshot_roles(frame: pd.DataFrame) -> pd.Series:
+    """Vector form of :func:`core.snapshot_core._assign_snapshot_role`."""
+    market_class = frame["market_class"].fillna("main").astype(str).str.lower()
+    market_type = _first_truthy(frame["market_type"], frame["market"].fillna("")).astype(str).str.lower()
+    return pd.Series(_per_category(market_class + "|" + market_type, _role_for), index=frame.index)
+
+
+def _columns(rows: list, names) -> pd.DataFrame:
+    return pd.DataFrame.from_records(rows, columns=list(names))
+
+
+_INPUTS = (
+    "baseline_consensus_prob",
+    "market_prob",
+    "consensus_prob",
+    "stake",
+    "raw_kelly",
+    "blended_prob",
+    "sim_prob",
+    "market_odds",
+    "market_class",
+    "market_type",
+    "market",
+    "blended_fv",
+    "ev_percent",
+    "book",
+    "hours_to_game",
+    "movement_confirmed",
+    "skip_reason",
+)
+
+
+def _percents(values: pd.Series) -> np.ndarray:
+    """Format probabilities as ``41.2%`` (``nan%`` where missing)."""
+    return np.char.mod("%.1f%%", _numeric(values).to_numpy() * 100)
+
+
+def enrich_snapshot_frame(frame: pd.DataFrame, personal_books=()) -> pd.DataFrame:
+    """Return ``frame`` with the snapshot enrichment columns computed.
+
+    ``frame`` holds one snapshot row per line with the columns listed in
+    ``_INPUTS`` (``book_count`` is the number of books behind the consensus).
+    """
+    out = frame.copy()
+
+    # Movement versus the baseline consensus
+    baseline = frame["baseline_consensus_prob"]
+    curr = _first_truthy(frame["market_prob"], frame["consensus_prob"])
+    diff = (_numeric(curr) - _numeric(baseline)).to_numpy()
+    movement = np.select([np.abs(diff) < 1e-6, diff > 0, diff < 0], ["same", "up", "down"], "same")
+    out["mkt_movement"] = movement
+    base_pct = _percents(baseline)
+    curr_pct = _percents(curr)
+    has_curr = curr.notna().to_numpy()
+    moved = baseline.notna().to_numpy() & has_curr & (movement != "same")
+    out["mkt_prob_display"] = np.where(
+        moved,
+        np.char.add(np.char.add(base_pct, " → "), curr_pct),
+        np.where(has_curr, curr_pct, "-"),
+    ).tolist()
+
+    # Stake for rows that were not priced per book
+    prob = _first_truthy(frame["blended_prob"], frame["sim_prob"])
+    needs_stake = frame["stake"].isna() & prob.notna() & frame["market_odds"].notna()
+    if needs_stake.any():
+        fractions = np.where(frame["market_class"] == "alternate", 0.125, 0.25)
+        filled = kelly_stakes(_numeric(prob).fillna(0.0), _numeric(frame["market_odds"]).fillna(100.0), fractions)
+        out["stake"] = frame["stake"].where(~needs_stake, pd.Series(filled, index=frame.index))
+        out["raw_kelly"] = frame["raw_kelly"].where(~needs_stake, pd.Series(filled, index=frame.index))
+    stake = _numeric(out["stake"]).fillna(0.0)
+    raw_kelly = _numeric(out["raw_kelly"]).fillna(0.0)
+    out["snapshot_stake"] = _round(stake, 2)
+    out["is_prospective"] = (_numeric(out["stake"]) == 0) & (raw_kelly > 0)
+
+    # Fair value and tier
+    fv = _numeric(frame["blended_fv"])
+    p = _numeric(prob)
+    fill_fv = fv.isna() & p.notna() & (p != 0)
+    fv = fv.where(~fill_fv, 1 / p)
+    out["blended_fv"] = frame["blended_fv"].where(~fill_fv, fv)
+    tier = np.select([fv.abs() >= 150, fv.abs() >= 120], ["A", "B"], "C")
+    out["fv_tier"] = pd.Series(tier, index=frame.index).where(fv.notna(), None)
+
+    # Roles
+    ev = _numeric(frame["ev_percent"])
+    market_prob = _numeric(frame["market_prob"])
+    base_prob = _numeric(baseline)
+    role = snapshot_roles(frame)
+    live = (ev.fillna(0.0) >= 3.0).to_numpy()
+    personal = frame["book"].isin(list(personal_books)).to_numpy()
+    fv_drop = ((market_prob - base_prob > 0) & (ev >= 5.0) & (stake >= 1.0)).to_numpy()
+    out["snapshot_role"] = role
+    # Market roles never collide with the flag roles, so no dedup is needed
+    out["snapshot_roles"] = [
+        [r] + ["live"] * l + ["personal"] * s + ["fv_drop"] * d
+        for r, l, s, d in zip(role.tolist(), live.tolist(), personal.tolist(), fv_drop.tolist())
+    ]
+    # Every row carries at least its market role
+    out["visible_in_snapshot"] = True
+
+    # Confirmation metrics
+    move = pd.Series(_round(market_prob - base_prob, 5), index=frame.index)
+    out["consensus_move"] = move.fillna(0.0)
+    required = _round(
+        required_market_moves(frame["hours_to_game"], frame["book_count"], frame["market"], frame["ev_percent"]),
+        5,
+    )
+    out["required_move"] = required
+    confirmed = out["consensus_move"].to_numpy() >= required
+    out["movement_confirmed"] = np.where(confirmed, True, frame["movement_confirmed"].fillna(False))
+
+    # Early / low-EV gating
+    low_ev = (ev.fillna(0.0) < 5.0) & (raw_kelly < 1.0) & (stake < 1.0)
+    out["skip_reason"] = frame["skip_reason"].where(~(low_ev & frame["skip_reason"].isna()), "low_ev")
+    return out
+
+
+def _book_count(row: dict) -> int:
+    try:
+        return len(row.get("books_used", [])) or 1
+    except TypeError:
+        return 1
+
+
+def enrich_snapshot_rows(rows: list, personal_books=()) -> None:
+    """Enrich snapshot row dicts in place using :func:`enrich_snapshot_frame`."""
+    if not rows:
+        return
+    frame = _columns(rows, _INPUTS)
+    frame["book_count"] = [_book_count(row) for row in rows]
+    enriched = enrich_snapshot_frame(frame, personal_books)
+
+    # Only write stake/FV/skip fields where the scalar enrichment would
+    keep = {
+        "stake": frame["stake"].isna() & enriched["stake"].notna(),
+        "raw_kelly": frame["stake"].isna() & enriched["stake"].notna(),
+        "blended_fv": enriched["blended_fv"].notna(),
+        "fv_tier": enriched["blended_fv"].notna(),
+        "skip_reason": enriched["skip_reason"].notna(),
+    }
+    columns = {}
+    for name in ENRICHED_FIELDS:
+        values = enriched[name].tolist()
+        mask = keep[name].tolist() if name in keep else None
+        columns[name] = (values, mask)
+    for i, row in enumerate(rows):
+        for name, (values, mask) in columns.items():
+            if mask is None or mask[i]:
+                value = values[i]
+                row[name] = value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,204 @@
+"""Incremental snapshot builds.
+
+Every generator run used to re-read every sim file and re-price every game
+for today and tomorrow, although between five-minute cycles most sims are
+untouched and most games' odds are identical. :class:`SnapshotBuildCache`
+remembers, per sim file, its ``(mtime, size, sha1)``, a digest of the game's
+odds and the entries :func:`core.snapshot_core.price_sim_entries` produced.
+A game whose sim and odds are both unchanged reuses those entries; only the
+time- and tracker-dependent fields (``hours_to_game``, the blend weight, EV,
+stake, movement) are recomputed for it. Everything else is re-derived.
+Given the :class:`core.odds_delta.OddsDelta` of the refresh being built, a
+game whose quotes did not move keeps its cached odds digest unhashed.
+
+The cache is a JSON file so it survives between generator processes. It is
+discarded when the devig configuration (``DEVIG_METHOD``,
+``DEVIG_METHOD_BY_FAMILY``, ``DEVIG_WEIGHT_BOOKS``) differs from the one it
+was built under, as cached entries priced under another method are stale.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from core.logger import get_logger
+from core.odds_normalizer import canonical_game_id
+
+logger = get_logger(__name__)
+
+__all__ = [
+    "SNAPSHOT_BUILD_CACHE_PATH",
+    "SnapshotBuildCache",
+    "config_fingerprint",
+    "file_digest",
+    "odds_digest",
+]
+
+SNAPSHOT_BUILD_CACHE_PATH = os.path.join("data", "cache", "snapshot_build_cache.json")
+
+# Bump when the shape of priced entries changes so stale caches are ignored
+_CACHE_VERSION = 2
+
+
+def config_fingerprint() -> str:
+    """Return a digest of the devig settings the priced entries depend on."""
+    import core.devig as devig
+
+    config = {
+        "method": devig.DEFAULT_DEVIG_METHOD,
+        "by_family": sorted(devig.METHOD_BY_FAMILY.items()),
+        "weight_books": devig.WEIGHT_BOOKS,
+        "book_weights": sorted(devig.BOOK_WEIGHTS.items()) if devig.WEIGHT_BOOKS else None,
+    }
+    return hashlib.sha1(json.dumps(config).encode()).hexdigest()
+
+
+def file_digest(path: str) -> str | None:
+    """Return the SHA-1 of the file at ``path`` or ``None`` if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def odds_digest(game_odds) -> str | None:
+    """Return a digest of one game's odds entry.
+
+    Pickling is several times faster than JSON here; the odds file keeps its
+    key order between refreshes, and a reordering only costs a re-price.
+    """
+    if game_odds is None:
+        return None
+    return hashlib.sha1(pickle.dumps(game_odds, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+def _stat(path: str) -> list | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+class SnapshotBuildCache:
+    """Per-game priced entries from the previous build, keyed by date and sim file.
+
+    Call :meth:`plan` before building a date, pass the returned ``priced``
+    mapping to :func:`core.snapshot_core.build_snapshot_rows`, then
+    :meth:`commit` it and :meth:`save` once all dates are built.
+    """
+
+    def __init__(self, path: str | None = SNAPSHOT_BUILD_CACHE_PATH):
+        self.path = path
+        self.dates: dict = {}
+        self.config: str | None = None
+        self._pending: dict = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == _CACHE_VERSION:
+                    self.dates = data.get("dates", {})
+                    self.config = data.get("config")
+            except Exception as e:
+                logger.warning("⚠️ Ignoring unreadable snapshot build cache %s: %s", path, e)
+
+    def plan(self, date_str: str, sim_paths: dict, odds: dict, delta=None) -> tuple[set, dict]:
+        """Return ``(dirty, priced)`` for the sims of ``date_str``.
+
+        ``sim_paths`` maps sim game IDs to files and ``odds`` maps canonical
+        game IDs to their odds. ``dirty`` holds the sim game IDs that must be
+        loaded and re-priced; ``priced`` maps canonical game IDs of the clean
+        games to their cached entries. Must be called before the odds are
+        handed to the pricer, which annotates them in place.
+
+        ``delta`` is the odds delta of the refresh ``odds`` came from. It is
+        only trusted for games last cached against the refresh it was diffed
+        from; their odds count as unchanged unless the delta lists the game.
+        """
+        config = config_fingerprint()
+        if config != self.config:
+            if self.dates:
+                logger.info("♻️ Devig settings changed — discarding the snapshot build cache")
+            self.dates, self.config = {}, config
+        previous = self.dates.get(date_str, {})
+        pending = self._pending[date_str] = {}
+        dirty, priced = set(), {}
+        moved = delta.games if delta is not None and not delta.full and delta.since else None
+        for gid, path in sim_paths.items():
+            canon = canonical_game_id(gid)
+            prev = previous.get(gid) or {}
+            stat = _stat(path)
+            prev_sim = prev.get("sim") or [None, None, None]
+            if stat is not None and stat == prev_sim[:2]:
+                digest = prev_sim[2]
+            else:
+                digest = file_digest(path)
+            if (
+                moved is not None
+                and prev.get("odds_refresh") == delta.since
+                and prev.get("odds") is not None
+                and canon in odds
+                and canon not in moved
+            ):
+                game_odds = prev["odds"]
+            else:
+                game_odds = odds_digest(odds.get(canon))
+            sig = {
+                "canon": canon,
+                "sim": [*(stat or [None, None]), digest],
+                "odds": game_odds,
+                "odds_refresh": delta.refresh if delta is not None else None,
+            }
+            pending[gid] = sig
+            entries = prev.get("entries")
+            if (
+                entries is not None
+                and digest is not None
+                and digest == prev_sim[2]
+                and sig["odds"] is not None
+                and sig["odds"] == prev.get("odds")
+            ):
+                priced[canon] = entries
+            else:
+                dirty.add(gid)
+        logger.info(
+            "♻️ Incremental build for %s: %d of %d games changed",
+            date_str,
+            len(dirty),
+            len(sim_paths),
+        )
+        return dirty, priced
+
+    def commit(self, date_str: str, priced: dict) -> None:
+        """Record the entries priced for ``date_str`` by the last build."""
+        entries = {}
+        for gid, sig in self._pending.pop(date_str, {}).items():
+            game_entries = priced.get(sig["canon"])
+            if game_entries is not None:
+                entries[gid] = {**sig, "entries": game_entries}
+        self.dates[date_str] = entries
+
+    def save(self, dates=None) -> None:
+        """Persist the cache, keeping only ``dates`` when given."""
+        if dates is not None:
+            self.dates = {d: v for d, v in self.dates.items() if d in set(dates)}
+        if not self.path:
+            return
+        try:
+            folder = os.path.dirname(self.path) or "."
+            os.makedirs(folder, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=folder, delete=False, suffix=".tmp") as tmpf:
+                json.dump(
+                    {"version": _CACHE_VERSION, "config": self.config, "dates": self.dates},
+                    tmpf,
+                    default=str,
+                )
+                temp_path = tmpf.name
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            logger.warning("⚠️ Failed to persist snapshot build cache: %s", e)
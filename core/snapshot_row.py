@@ -0,0 +1,272 @@
+"""Slotted representation of one snapshot row.
+
+The snapshot build passes rows around as dicts of sixty-odd keys, and
+:func:`core.snapshot_core.expand_snapshot_rows_with_kelly` copies each of
+them once per book. :class:`SnapshotRow` keeps the fields every row carries
+in ``__slots__`` and only the rest in a small dict. It behaves as a mutable
+mapping, so the code that reads and writes rows by key works unchanged.
+
+The ``*_display`` strings are not stored. Once :meth:`SnapshotRow.defer_displays`
+is called, they are rendered from the row's current fields whenever they are
+read (when the row is sanitized for JSON or turned into a DataFrame). A
+display value assigned explicitly overrides the rendered one. The per-book
+price map is held by reference: every book's row shares its base row's
+``_raw_sportsbook``/``consensus_books`` dict.
+
+Rows are converted back to plain dicts by
+:func:`core.unified_snapshot_generator.sanitize_json_row` before they are
+written, so the snapshot JSON and database are unchanged.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+from collections.abc import MutableMapping
+
+__all__ = ["DISPLAY_FIELDS", "ROW_FIELDS", "SnapshotRow", "render_display"]
+
+# Keys stored in slots; any other key goes to the row's extra dict
+ROW_FIELDS = (
+    "game_id",
+    "market",
+    "side",
+    "market_class",
+    "segment",
+    "book",
+    "best_book",
+    "books_used",
+    "_raw_sportsbook",
+    "consensus_books",
+    "sim_prob",
+    "market_prob",
+    "blended_prob",
+    "blended_fv",
+    "consensus_prob",
+    "baseline_consensus_prob",
+    "market_odds",
+    "ev_percent",
+    "stake",
+    "raw_kelly",
+    "snapshot_stake",
+    "hours_to_game",
+    "logged",
+    "is_prospective",
+    "skip_reason",
+    "prev_sim_prob",
+    "prev_blended_fv",
+    "prev_market_odds",
+    "is_new",
+    "ev_movement",
+    "mkt_movement",
+    "fv_movement",
+    "odds_movement",
+    "stake_movement",
+    "sim_movement",
+    "snapshot_role",
+    "snapshot_roles",
+    "fv_tier",
+    "visible_in_snapshot",
+    "consensus_move",
+    "required_move",
+    "movement_confirmed",
+)
+
+_FIELD_SET = frozenset(ROW_FIELDS)
+_UNSET = object()
+
+
+def _fmt_odds(val) -> str:
+    if val is None:
+        return "N/A"
+    try:
+        return f"{val:+}" if isinstance(val, (int, float)) else str(val)
+    except Exception:
+        return str(val)
+
+
+def _fmt_percent(val) -> str:
+    if val is None:
+        return "N/A"
+    try:
+        return f"{val:+.1f}%"
+    except Exception:
+        return str(val)
+
+
+def _fmt_prob(val) -> str:
+    if val is None:
+        return "N/A"
+    try:
+        return f"{val * 100:.1f}%"
+    except Exception:
+        return str(val)
+
+
+def _fmt_fv(val) -> str:
+    if val is None:
+        return "N/A"
+    try:
+        return f"{round(val)}"
+    except Exception:
+        return str(val)
+
+
+# display key → (value field, prior value field, movement field, formatter)
+DISPLAY_FIELDS = {
+    "odds_display": ("market_odds", "prev_market_odds", "odds_movement", _fmt_odds),
+    "ev_display": ("ev_percent", None, None, _fmt_percent),
+    "mkt_prob_display": ("market_prob", "baseline_consensus_prob", "mkt_movement", _fmt_prob),
+    "sim_prob_display": ("sim_prob", "prev_sim_prob", "sim_movement", _fmt_prob),
+    "fv_display": ("blended_fv", "prev_blended_fv", "fv_movement", _fmt_fv),
+}
+
+
+def render_display(row, key: str, prior=None) -> str:
+    """Return the ``key`` display string for ``row``.
+
+    Shows ``prior → current`` when the row's movement field says the value
+    moved, otherwise just the current value. ``sim_prob`` and ``blended_fv``
+    fall back to ``prior`` (a tracker entry) when the row has no
+    ``prev_*`` value.
+    """
+    field, prior_field, movement_field, fmt = DISPLAY_FIELDS[key]
+    curr = row.get(field)
+    if prior_field is None:
+        return fmt(curr)
+    prior_val = row.get(prior_field)
+    if field in ("sim_prob", "blended_fv"):
+        prior_val = prior_val or (prior.get(field) if prior else None)
+    if prior_val is not None and row.get(movement_field, "same") != "same":
+        return f"{fmt(prior_val)} → {fmt(curr)}"
+    return fmt(curr)
+
+
+class SnapshotRow(MutableMapping):
+    """Mutable mapping over one snapshot row with slotted common fields."""
+
+    __slots__ = ROW_FIELDS + ("_extra", "_deferred")
+
+    def __init__(self, data=None, **fields):
+        self._extra: dict = {}
+        self._deferred = False
+        if data is not None:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+    @classmethod
+    def from_dict(cls, row) -> "SnapshotRow":
+        """Return ``row`` as a :class:`SnapshotRow` (a copy if it already is one)."""
+        if isinstance(row, SnapshotRow):
+            return row.copy()
+        return cls(row)
+
+    def defer_displays(self) -> None:
+        """Render the ``*_display`` fields from the row's fields when read.
+
+        Display values stored earlier are dropped, as re-annotating a dict
+        row overwrites them.
+        """
+        self._deferred = True
+        for key in DISPLAY_FIELDS:
+            self._extra.pop(key, None)
+
+    def render_displays(self) -> None:
+        """Store the deferred ``*_display`` fields as plain values."""
+        if self._deferred:
+            self._deferred = False
+            for key in DISPLAY_FIELDS:
+                if key not in self._extra:
+                    self._extra[key] = render_display(self, key)
+
+    def _lazy(self, key) -> bool:
+        return self._deferred and key in DISPLAY_FIELDS and key not in self._extra
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        try:
+            return self._extra[key]
+        except KeyError:
+            if self._lazy(key):
+                return render_display(self, key)
+            raise
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if key in self._extra:
+            return self._extra[key]
+        if self._lazy(key):
+            return render_display(self, key)
+        return default
+
+    def __setitem__(self, key, value) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if self._lazy(key):
+            self.render_displays()
+        del self._extra[key]
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return getattr(self, key, _UNSET) is not _UNSET
+        return key in self._extra or self._lazy(key)
+
+    def __iter__(self):
+        for key in ROW_FIELDS:
+            if getattr(self, key, _UNSET) is not _UNSET:
+                yield key
+        yield from self._extra
+        if self._deferred:
+            for key in DISPLAY_FIELDS:
+                if key not in self._extra:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> "SnapshotRow":
+        """Shallow copy; nested values such as the per-book prices are shared."""
+        new = SnapshotRow.__new__(SnapshotRow)
+        for key in ROW_FIELDS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                setattr(new, key, value)
+        new._extra = self._extra.copy()
+        new._deferred = self._deferred
+        return new
+
+    def to_dict(self) -> dict:
+        """Return the row as a plain dict with the display fields rendered."""
+        out = {}
+        for key in ROW_FIELDS:
+            value = getattr(self, key, _UNSET)
+            if value is not _UNSET:
+                out[key] = value
+        out.update(self._extra)
+        if self._deferred:
+            for key in DISPLAY_FIELDS:
+                if key not in out:
+                    out[key] = render_display(self, key)
+        return out
+
+    def items(self):
+        return self.to_dict().items()
+
+    def values(self):
+        return self.to_dict().values()
+
+    def __repr__(self) -> str:
+        return f"SnapshotRow({self.to_dict()!r})"
@@ -0,0 +1,188 @@
+"""Process-wide cache of the latest market snapshot.
+
+The snapshot generator, the bet logger and the movement tracker all start
+from the newest market snapshot, and each used to parse the multi-MB file
+on its own (once at import time, then again per run). :class:`SnapshotStore`
+parses it on first use, reloads only when a newer file appears, and builds
+every key index in the same pass. Consumers receive :class:`TrackerView`
+objects: writes land in a private overlay, so two views over the same index
+never see each other's updates and nothing is deep-copied.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import os
+import threading
+from collections.abc import MutableMapping
+from types import MappingProxyType
+
+from core.logger import get_logger
+from core.odds_normalizer import canonical_game_id
+from core.snapshot_db import get_snapshot_db
+from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.utils import safe_load_json
+
+logger = get_logger(__name__)
+
+__all__ = ["SnapshotStore", "TrackerView", "build_key", "get_snapshot_store"]
+
+_MISSING = object()
+
+
+def build_key(game_id: str, market: str, side: str) -> str:
+    """Return ``game_id:market:side`` without additional normalization."""
+    return f"{game_id}:{market}:{side}"
+
+
+class TrackerView(MutableMapping):
+    """Copy-on-write mapping layered over a shared, read-only index.
+
+    Reads fall through to ``base`` unless the key was written or deleted on
+    this view. ``base`` may be a callable, in which case it is resolved on
+    first access. Rows coming from the base are shared and must be replaced,
+    not mutated in place; :func:`core.market_movement_tracker.track_and_update_market_movement`
+    already writes whole new entries.
+    """
+
+    __slots__ = ("_base", "_loader", "_overlay", "_deleted")
+
+    def __init__(self, base=None):
+        self._loader = base if callable(base) else None
+        self._base = None if callable(base) else (base if base is not None else {})
+        self._overlay: dict = {}
+        self._deleted: set = set()
+
+    @property
+    def base(self):
+        if self._base is None:
+            self._base = self._loader()
+        return self._base
+
+    def rebase(self, base) -> None:
+        """Point the view at ``base`` and drop all local writes."""
+        self._loader = base if callable(base) else None
+        self._base = None if callable(base) else base
+        self._overlay.clear()
+        self._deleted.clear()
+
+    def __getitem__(self, key):
+        value = self._overlay.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        if key in self._deleted:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key, value) -> None:
+        self._overlay[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self.base:
+            self._deleted.add(key)
+
+    def __contains__(self, key) -> bool:
+        if key in self._overlay:
+            return True
+        return key not in self._deleted and key in self.base
+
+    def __iter__(self):
+        yield from self._overlay
+        for key in self.base:
+            if key not in self._overlay and key not in self._deleted:
+                yield key
+
+    def __len__(self) -> int:
+        base = self.base
+        shadowed = sum(1 for key in self._overlay if key in base)
+        return len(base) + len(self._overlay) - shadowed - len(self._deleted)
+
+    def clear(self) -> None:
+        self.rebase({})
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"TrackerView({len(self)} rows, {len(self._overlay)} local)"
+
+
+class SnapshotStore:
+    """Latest market snapshot for ``directory`` with prebuilt key indexes.
+
+    ``by_side`` maps ``canonical_game_id:market:side`` to the row,
+    ``by_raw_side`` does the same with the game ID exactly as stored, and
+    ``by_book`` maps ``(canonical_game_id, market, side, book)`` to the row.
+    All three are read-only proxies over the same row objects.
+    """
+
+    def __init__(self, directory: str = "backtest"):
+        self.directory = directory
+        self.path: str | None = None
+        self.rows: tuple = ()
+        self.by_side = MappingProxyType({})
+        self.by_raw_side = MappingProxyType({})
+        self.by_book = MappingProxyType({})
+        self._signature = _MISSING
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> "SnapshotStore":
+        """Reload only when a newer snapshot exists (or ``force``).
+
+        The snapshot database is preferred; without one the newest
+        ``market_snapshot_*.json`` in ``directory`` is used.
+        """
+        db = get_snapshot_db(self.directory, create=False)
+        latest = db.latest_snapshot() if db is not None else None
+        if latest is not None:
+            path = f"{db.path}@{latest[0]}"
+            signature = ("db", *latest)
+            load = lambda: db.load_snapshot(latest[0])
+        else:
+            path = find_latest_market_snapshot_path(self.directory)
+            try:
+                signature = (path, os.path.getmtime(path)) if path else None
+            except OSError:
+                path, signature = None, None
+            load = lambda: safe_load_json(path) if path else []
+        with self._lock:
+            if force or signature != self._signature:
+                self._load(load(), path)
+                self._signature = signature
+        return self
+
+    def _load(self, data, path: str | None) -> None:
+        rows = data if isinstance(data, list) else list(data.values()) if isinstance(data, dict) else []
+        by_side, by_raw_side, by_book = {}, {}, {}
+        for row in rows:
+            gid = row.get("game_id")
+            canon = canonical_game_id(str(gid))
+            market, side = row.get("market"), row.get("side")
+            by_side[build_key(canon, market, side)] = row
+            by_raw_side[build_key(gid, market, side)] = row
+            by_book[(canon, market, side, row.get("book") or row.get("best_book"))] = row
+        self.path = path
+        self.rows = tuple(rows)
+        self.by_side = MappingProxyType(by_side)
+        self.by_raw_side = MappingProxyType(by_raw_side)
+        self.by_book = MappingProxyType(by_book)
+        if path and (VERBOSE_MODE or DEBUG_MODE):
+            logger.info("📦 Snapshot store loaded %d rows from %s", len(rows), path)
+
+    def tracker(self, raw_keys: bool = False) -> TrackerView:
+        """Return a fresh copy-on-write view keyed by side."""
+        self.refresh()
+        return TrackerView(self.by_raw_side if raw_keys else self.by_side)
+
+
+_STORES: dict[str, SnapshotStore] = {}
+
+
+def get_snapshot_store(directory: str = "backtest") -> SnapshotStore:
+    """Return the process-wide :class:`SnapshotStore` for ``directory``."""
+    store = _STORES.get(directory)
+    if store is None:
+        store = _STORES[directory] = SnapshotStore(directory)
+    return store
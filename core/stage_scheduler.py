@@ -0,0 +1,262 @@
+"""Event-driven scheduler for a small graph of pipeline stages.
+
+A :class:`Stage` is a callable plus the stages it reads from. Source stages
+(no dependencies) fire on an ``interval``; every other stage fires as soon
+as one of its inputs publishes a new version, i.e. its callable returned a
+truthy value. The scheduler thread sleeps until the next source is due, a
+deadline passes or a stage finishes, so downstream stages react immediately
+instead of on the next polling tick.
+
+Each stage runs at most once at a time. Triggers that arrive while it is
+running are coalesced into a single follow-up run with the newest inputs,
+and an interval that elapses while a source is still running is skipped, so
+slow stages never overlap or pile up. A stage also waits while any stage
+that consumes its output is still running, so it never replaces data that is
+being worked on. Stages that overrun ``timeout`` are reported and their
+``cancel`` hook is called; the scheduler cannot interrupt a Python thread,
+so the stage stays busy until it returns.
+"""
+
+from core.config import DEBUG_MODE, VERBOSE_MODE
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+__all__ = ["Stage", "StageScheduler"]
+
+# Upper bound on how long the scheduler sleeps without re-checking
+MAX_IDLE = 60.0
+
+
+class Stage:
+    """One node of the pipeline graph and its run metrics."""
+
+    __slots__ = (
+        "name",
+        "func",
+        "deps",
+        "interval",
+        "timeout",
+        "cancel",
+        "version",
+        "seen",
+        "running",
+        "started",
+        "next_due",
+        "overdue",
+        "runs",
+        "failures",
+        "timeouts",
+        "skipped",
+        "last_duration",
+        "total_duration",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        func,
+        deps: tuple = (),
+        interval: float | None = None,
+        timeout: float | None = None,
+        cancel=None,
+    ):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.interval = interval
+        self.timeout = timeout
+        self.cancel = cancel
+        # Bumped whenever a run publishes new output
+        self.version = 0
+        # Versions of each dependency consumed by the latest run
+        self.seen = dict.fromkeys(self.deps, 0)
+        self.running = False
+        self.started: float | None = None
+        self.next_due = 0.0
+        self.overdue = False
+        self.runs = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_duration: float | None = None
+        self.total_duration = 0.0
+
+    def metrics(self) -> dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "version": self.version,
+            "running": self.running,
+            "last_duration": self.last_duration,
+            "avg_duration": self.total_duration / self.runs if self.runs else None,
+        }
+
+
+class StageScheduler:
+    """Run :class:`Stage` objects in dependency order as their inputs change."""
+
+    def __init__(self, stages, clock=time.monotonic):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage {stage.name!r}")
+            self.stages[stage.name] = stage
+        self.order = self._topological_order()
+        self.dependents = {name: [] for name in self.stages}
+        for stage in self.order:
+            for dep in stage.deps:
+                self.dependents[dep].append(stage)
+        self.clock = clock
+        self._cond = threading.Condition()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.stages)), thread_name_prefix="stage")
+
+    def _topological_order(self) -> list:
+        order, state = [], {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage cycle: {' → '.join(path + [name])}")
+            if name not in self.stages:
+                raise ValueError(f"Stage {path[-1]!r} depends on unknown stage {name!r}")
+            state[name] = "visiting"
+            for dep in self.stages[name].deps:
+                visit(dep, path + [name])
+            state[name] = "done"
+            order.append(self.stages[name])
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def _inputs_changed(self, stage: Stage) -> bool:
+        return any(self.stages[d].version > stage.seen[d] for d in stage.deps)
+
+    def _finish(self, stage: Stage, future) -> None:
+        elapsed = self.clock() - stage.started
+        try:
+            published = bool(future.result())
+            failed = False
+        except Exception:
+            logger.exception("❌ Stage %s failed", stage.name)
+            published, failed = False, True
+        with self._cond:
+            stage.running = False
+            stage.runs += 1
+            stage.failures += failed
+            stage.last_duration = elapsed
+            stage.total_duration += elapsed
+            if published:
+                stage.version += 1
+                for other in self.stages.values():
+                    # Downstream stages that are busy will pick this up next
+                    if other.running and stage.name in other.deps:
+                        other.skipped += 1
+            self._dirty = True
+            self._cond.notify_all()
+        logger.info(
+            "⏱ Stage %s %s in %.1fs%s",
+            stage.name,
+            "failed" if failed else "finished",
+            elapsed,
+            " (new output)" if published else "",
+        )
+
+    def _start(self, stage: Stage, now: float) -> None:
+        stage.seen = {d: self.stages[d].version for d in stage.deps}
+        stage.running = True
+        stage.overdue = False
+        stage.started = now
+        if stage.interval is not None:
+            stage.next_due = now + stage.interval
+        future = self._pool.submit(stage.func)
+        future.add_done_callback(lambda f, s=stage: self._finish(s, f))
+
+    def poll(self, now: float | None = None) -> list:
+        """Start every stage that is due and flag overdue ones.
+
+        Returns the names of the stages started.
+        """
+        now = self.clock() if now is None else now
+        started = []
+        with self._cond:
+            # Consumers first, so pending output is picked up before its
+            # producer is allowed to replace it
+            for stage in reversed(self.order):
+                if stage.running:
+                    if stage.timeout is not None and not stage.overdue and now - stage.started > stage.timeout:
+                        stage.overdue = True
+                        stage.timeouts += 1
+                        logger.error(
+                            "💀 Stage %s still running after %.0fs (timeout %.0fs)",
+                            stage.name,
+                            now - stage.started,
+                            stage.timeout,
+                        )
+                        if stage.cancel is not None:
+                            try:
+                                stage.cancel()
+                            except Exception:
+                                logger.exception("❌ Failed to cancel stage %s", stage.name)
+                    if stage.interval is not None and now >= stage.next_due:
+                        stage.skipped += 1
+                        stage.next_due = now + stage.interval
+                        logger.info("🟡 Skipping %s – previous run still in progress", stage.name)
+                    continue
+                due = self._inputs_changed(stage) or (stage.interval is not None and now >= stage.next_due)
+                if due and not any(d.running for d in self.dependents[stage.name]):
+                    self._start(stage, now)
+                    started.append(stage.name)
+        return started
+
+    def _next_wakeup(self, now: float) -> float:
+        wake = now + MAX_IDLE
+        for stage in self.stages.values():
+            if stage.interval is not None:
+                wake = min(wake, stage.next_due)
+            if stage.running and stage.timeout is not None and not stage.overdue:
+                wake = min(wake, stage.started + stage.timeout)
+        return max(0.0, wake - now)
+
+    def run(self) -> None:
+        """Schedule stages until :meth:`stop` is called."""
+        self._stop.clear()
+        while not self._stop.is_set():
+            now = self.clock()
+            self.poll(now)
+            with self._cond:
+                if not self._dirty:
+                    self._cond.wait(self._next_wakeup(now))
+                self._dirty = False
+
+    def start(self) -> threading.Thread:
+        """Run the scheduler on a daemon thread."""
+        thread = threading.Thread(target=self.run, name="stage-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Stop scheduling; stages already running are left to finish."""
+        self._stop.set()
+        self.wake()
+
+    def wake(self) -> None:
+        """Make the scheduler re-check its stages now."""
+        with self._cond:
+            self._dirty = True
+            self._cond.notify_all()
+
+    def metrics(self) -> dict:
+        """Return ``{stage: metrics}`` in dependency order."""
+        with self._cond:
+            return {stage.name: stage.metrics() for stage in self.order}
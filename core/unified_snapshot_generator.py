@@ -10,7 +10,9 @@ Snapshot data flow after the snapshot-first refactor:
 
 - Simulation rows from ``load_simulations()``
 - Market odds from ``fetch_market_odds_from_api()`` or cached fallback data
-- Row enrichment via ``_enrich_snapshot_row()``
+- Row enrichment via ``core.snapshot_frame.enrich_snapshot_rows()``
+- With ``--incremental``, games whose sim file and odds are unchanged reuse
+  their priced entries from ``core.snapshot_incremental``
 - Persistent fields merged from the prior snapshot using
   ``_merge_persistent_fields()``
 """
@@ -28,22 +30,27 @@ from datetime import timedelta
 from core.bootstrap import *  # noqa
 
 
-from core.utils import now_eastern, safe_load_json, lookup_fallback_odds, parse_game_id
+from core.utils import now_eastern, parse_game_id, label_cache_stats
+from core.game_id_utils import GameIdResolver
 from core.odds_normalizer import canonical_game_id
 from core.logger import get_logger
 from core.odds_fetcher import fetch_market_odds_from_api
+from core.odds_reader import latest_odds_file, load_market_odds
 from core.book_whitelist import ALLOWED_BOOKS
 from core.snapshot_core import (
+    list_simulations,
     load_simulations,
     build_snapshot_rows as _core_build_snapshot_rows,
     MARKET_EVAL_TRACKER,
     MARKET_EVAL_TRACKER_BEFORE_UPDATE,
-    load_snapshot_tracker,
     expand_snapshot_rows_with_kelly,
     _assign_snapshot_role,
     ensure_baseline_consensus_prob,
 )
-from core.snapshot_tracker_loader import find_latest_market_snapshot_path
+from core.snapshot_store import get_snapshot_store
+from core.snapshot_db import prune_snapshot_files, record_snapshot, row_key
+from core.snapshot_frame import enrich_snapshot_rows
+from core.snapshot_incremental import SnapshotBuildCache
 from core.book_helpers import ensure_consensus_books
 from core.market_pricer import kelly_fraction
 from core.confirmation_utils import required_market_move
@@ -58,23 +65,6 @@ DEBUG_MOVEMENT = False
 _movement_debug_count = 0
 MOVEMENT_DEBUG_LIMIT = 5
 
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-
-def latest_odds_file(folder="data/market_odds") -> str | None:
-    files = sorted(
-        [
-            f
-            for f in os.listdir(folder)
-            if f.startswith("market_odds_") and f.endswith(".json")
-        ],
-        reverse=True,
-    )
-    return os.path.join(folder, files[0]) if files else None
-
-
 # ---------------------------------------------------------------------------
 # Snapshot role helpers
 # ---------------------------------------------------------------------------
@@ -102,7 +92,7 @@ def is_personal_book_row(row: dict) -> bool:
 # ---------------------------------------------------------------------------
 
 
-def build_snapshot_rows(sim_data: dict, odds_json: dict, min_ev: float = 0.01):
+def build_snapshot_rows(sim_data: dict, odds_json: dict, min_ev: float = 0.01, priced=None):
     """Wrapper around snapshot_core.build_snapshot_rows with debug logging."""
     if VERBOSE or DEBUG:
         for game_id in sim_data:
@@ -128,13 +118,34 @@ def build_snapshot_rows(sim_data: dict, odds_json: dict, min_ev: float = 0.01):
                     else:
                         print(f"\u2705 {market} \u2192 {side_key}: consensus_prob = {cp}")
 
-    return _core_build_snapshot_rows(sim_data, odds_json, min_ev=min_ev)
+    return _core_build_snapshot_rows(sim_data, odds_json, min_ev=min_ev, priced=priced)
+
+
 
 
+def _log_movement_debug(row: dict) -> None:
+    global _movement_debug_count
+    if _movement_debug_count < MOVEMENT_DEBUG_LIMIT:
+        delta = (row.get("market_prob") or 0) - (row.get("baseline_consensus_prob") or 0)
+        if VERBOSE or DEBUG:
+            print(
+                f"Movement Debug → game_id: {row.get('game_id')} | Baseline: {row.get('baseline_consensus_prob')}"
+                f" | Market: {row.get('market_prob')} | Δ = {delta*100:+.1f}% | confirmed: {row.get('movement_confirmed')}"
+            )
+        _movement_debug_count += 1
+    elif _movement_debug_count == MOVEMENT_DEBUG_LIMIT:
+        if VERBOSE or DEBUG:
+            print("Movement Debug output truncated...")
+        _movement_debug_count += 1
 
 
 def _enrich_snapshot_row(row: dict, *, debug_movement: bool = False) -> None:
-    """Populate enrichment fields on a snapshot row."""
+    """Populate enrichment fields on a single snapshot row.
+
+    The snapshot build enriches all rows at once with
+    :func:`core.snapshot_frame.enrich_snapshot_rows`; this scalar version is
+    the reference it is checked against.
+    """
     baseline = row.get("baseline_consensus_prob")
 
     curr = row.get("market_prob") or row.get("consensus_prob")
@@ -253,19 +264,7 @@ def _enrich_snapshot_row(row: dict, *, debug_movement: bool = False) -> None:
         row.setdefault("movement_confirmed", False)
 
     if debug_movement:
-        global _movement_debug_count
-        if _movement_debug_count < MOVEMENT_DEBUG_LIMIT:
-            delta = (row.get("market_prob") or 0) - (row.get("baseline_consensus_prob") or 0)
-            if VERBOSE or DEBUG:
-                print(
-                    f"Movement Debug → game_id: {row.get('game_id')} | Baseline: {row.get('baseline_consensus_prob')}"
-                    f" | Market: {row.get('market_prob')} | Δ = {delta*100:+.1f}% | confirmed: {row.get('movement_confirmed')}"
-                )
-            _movement_debug_count += 1
-        elif _movement_debug_count == MOVEMENT_DEBUG_LIMIT:
-            if VERBOSE or DEBUG:
-                print("Movement Debug output truncated...")
-            _movement_debug_count += 1
+        _log_movement_debug(row)
 
     # 🧩 Enrich: early/low-EV gating
     ev = row.get("ev_percent", 0.0) or 0.0
@@ -281,24 +280,8 @@ def _enrich_snapshot_row(row: dict, *, debug_movement: bool = False) -> None:
 
 
 def _load_prior_snapshot_map(directory: str = "backtest") -> dict:
-    """Return map of snapshot key to prior row."""
-    path = find_latest_market_snapshot_path(directory)
-    if not path or not os.path.exists(path):
-        return {}
-    data = safe_load_json(path)
-    if not isinstance(data, list):
-        return {}
-    mapping = {}
-    for r in data:
-        canon_gid = canonical_game_id(r.get("game_id", ""))
-        key = (
-            canon_gid,
-            r.get("market"),
-            r.get("side"),
-            r.get("book") or r.get("best_book"),
-        )
-        mapping[key] = r
-    return mapping
+    """Return map of ``(game_id, market, side, book)`` to prior snapshot row."""
+    return get_snapshot_store(directory).refresh().by_book
 
 
 def _merge_persistent_fields(rows: list, prior_map: dict) -> None:
@@ -382,6 +365,9 @@ def _merge_persistent_fields(rows: list, prior_map: dict) -> None:
 
     rows[:] = filtered
 
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+
 def sanitize_json_row(row: dict) -> dict:
     """Return a sanitized copy of ``row`` ready for JSON serialization."""
     TRIM_FIELDS = {
@@ -395,6 +381,10 @@ def sanitize_json_row(row: dict) -> dict:
     for k, v in row.items():
         if k in TRIM_FIELDS:
             continue
+        # Scalars always serialize; only containers need the trial dump
+        if type(v) in _JSON_SCALARS:
+            sanitized[k] = v
+            continue
         try:
             json.dumps(v)
             sanitized[k] = v
@@ -408,12 +398,24 @@ def build_snapshot_for_date(
     odds_data: dict | None,
     ev_range: tuple[float, float] = (5.0, 20.0),
     prior_map: dict | None = None,
+    build_cache: SnapshotBuildCache | None = None,
+    odds_delta=None,
 ) -> list:
-    """Return expanded snapshot rows for a single date."""
+    """Return expanded snapshot rows for a single date.
+
+    With ``build_cache`` only the sims of changed games are loaded and
+    priced; the rest reuse the entries cached by the previous build.
+    ``odds_delta`` is the :class:`core.odds_delta.OddsDelta` of the refresh
+    ``odds_data`` came from, if known.
+    """
     if prior_map is None:
         prior_map = {}
     sim_dir = os.path.join("backtest", "sims", date_str)
-    sims = load_simulations(sim_dir)
+    if build_cache is None:
+        sims = load_simulations(sim_dir)
+    else:
+        sim_paths = list_simulations(sim_dir)
+        sims = dict.fromkeys(sim_paths)
     if not sims:
         logger.warning("❌ No simulation files found for %s", date_str)
         return []
@@ -430,9 +432,10 @@ def build_snapshot_for_date(
         odds = {}
         if VERBOSE or DEBUG:
             print("🔍 Odds Matching Debug:")
+        resolver = GameIdResolver(odds_data)
         for gid in sims.keys():
             canon = canonical_game_id(gid)
-            matched, matched_key = lookup_fallback_odds(canon, odds_data)
+            matched, matched_key = resolver.lookup(canon)
             if VERBOSE or DEBUG:
                 print(f"  {gid} → {canon} → Match: {matched_key or '❌ No match'}")
             if matched:
@@ -447,20 +450,36 @@ def build_snapshot_for_date(
             )
 
     # Build base rows and expand per-book variants
-    raw_rows = build_snapshot_rows(sims, odds, min_ev=0.01)
+    if build_cache is None:
+        raw_rows = build_snapshot_rows(sims, odds, min_ev=0.01)
+    else:
+        dirty, priced = build_cache.plan(date_str, sim_paths, odds, delta=odds_delta)
+        loaded = load_simulations(sim_dir, only=dirty)
+        sims = {
+            gid: loaded.get(gid)
+            for gid in sim_paths
+            if gid in loaded or canonical_game_id(gid) in priced
+        }
+        raw_rows = build_snapshot_rows(sims, odds, min_ev=0.01, priced=priced)
+        build_cache.commit(date_str, priced)
     logger.info("\U0001F9EA Raw bets from build_snapshot_rows(): %d", len(raw_rows))
 
+    # Resolved once per game; rows of the same game share the memoized lookup
+    odds_resolver = GameIdResolver(odds)
+
+    def _inherited_consensus(canon_gid: str, market: str, label: str):
+        game_odds = odds_resolver.lookup(canon_gid)[0]
+        try:
+            return game_odds[market][label].get("consensus_prob") if game_odds else None
+        except Exception:
+            return None
+
     for r in raw_rows:
         mkt = r.get("market")
         label = r.get("side")
         if not mkt or not label:
             continue
-        canon_gid = canonical_game_id(r.get("game_id", ""))
-        game_odds, _ = lookup_fallback_odds(canon_gid, odds)
-        try:
-            cp = game_odds[mkt][label].get("consensus_prob") if game_odds else None
-        except Exception:
-            cp = None
+        cp = _inherited_consensus(canonical_game_id(r.get("game_id", "")), mkt, label)
         if cp is not None:
             r["consensus_prob"] = cp
 
@@ -476,28 +495,19 @@ def build_snapshot_for_date(
         len(rows),
     )
 
-    # 📦 Assign snapshot roles and enrich rows
-    snapshot_rows = []
-    best_book_tracker: dict[tuple[str, str, str], dict] = {}
-
+    # 📦 Resolve consensus and baselines per row
+    canon_gids = []
     for row in rows:
         row_market = row.get("market")
         row_label = row.get("side")
+        canon_gid = canonical_game_id(row.get("game_id", ""))
         if row_market and row_label:
-            canonical_gid = canonical_game_id(row["game_id"])
-            game_odds, _ = lookup_fallback_odds(canonical_gid, odds)
-
-            try:
-                cp = game_odds[row_market][row_label].get("consensus_prob") if game_odds else None
-            except Exception:
-                cp = None
-
+            cp = _inherited_consensus(canon_gid, row_market, row_label)
             if cp is not None:
                 row["consensus_prob"] = cp
                 if VERBOSE or DEBUG:
                     print(f"[Consensus] Using inherited value: {row['consensus_prob']}")
 
-        canon_gid = canonical_game_id(row.get("game_id", ""))
         snap_key = (
             canon_gid,
             row_market,
@@ -508,7 +518,6 @@ def build_snapshot_for_date(
             prior_map.get(snap_key, {}).get("baseline_consensus_prob") if prior_map else None
         )
 
-        canon_gid = canonical_game_id(row.get("game_id", ""))
         side_key = f"{canon_gid}:{row_market}:{row_label}"
 
         if prior_baseline is not None:
@@ -524,10 +533,20 @@ def build_snapshot_for_date(
 
         # Always recompute snapshot roles fresh for this build
         row.pop("snapshot_roles", None)
-        _enrich_snapshot_row(row, debug_movement=DEBUG_MOVEMENT)
+        canon_gids.append(canon_gid)
+
+    # 🧩 Enrich movement, stake, FV tier, confirmation and roles column-wise
+    enrich_snapshot_rows(rows, POPULAR_BOOKS)
+
+    # 🏷️ Tag the best-priced popular book per market side
+    snapshot_rows = []
+    best_book_tracker: dict[tuple[str, str, str], dict] = {}
+
+    for row, canon_gid in zip(rows, canon_gids):
+        if DEBUG_MOVEMENT:
+            _log_movement_debug(row)
 
         if is_best_book_row(row):
-            canon_gid = canonical_game_id(row.get("game_id", ""))
             key = (canon_gid, row.get("market"), row.get("side"))
             best_row = best_book_tracker.get(key)
             if not best_row:
@@ -562,6 +581,125 @@ def build_snapshot_for_date(
     return final_rows
 
 
+def generate_snapshot(
+    date_list: list,
+    odds_cache: dict | None,
+    ev_range: tuple[float, float] = (5.0, 20.0),
+    build_cache: SnapshotBuildCache | None = None,
+    timestamp: str | None = None,
+    odds_delta=None,
+) -> tuple[list, str | None]:
+    """Build, write and record the unified snapshot for ``date_list``.
+
+    Returns ``(rows, path)`` with the sanitized rows as written. ``rows`` is
+    empty when no bets qualified and ``path`` is ``None`` when the snapshot
+    file could not be written. ``odds_delta`` is passed on to
+    :meth:`SnapshotBuildCache.plan`.
+    """
+    # Refresh tracker baseline before snapshot generation
+    store = get_snapshot_store("backtest").refresh()
+    MARKET_EVAL_TRACKER.rebase(store.by_side)
+    MARKET_EVAL_TRACKER_BEFORE_UPDATE.rebase(store.by_side)
+
+    all_rows: list = []
+    prior_map = _load_prior_snapshot_map("backtest")
+    for date_str in date_list:
+        rows_for_date = build_snapshot_for_date(
+            date_str,
+            odds_cache,
+            ev_range,
+            prior_map=prior_map,
+            build_cache=build_cache,
+            odds_delta=odds_delta,
+        )
+        for row in rows_for_date:
+            row["snapshot_for_date"] = date_str
+        all_rows.extend(rows_for_date)
+    if build_cache is not None:
+        build_cache.save(dates=date_list)
+
+    if len(all_rows) == 0:
+        logger.error(
+            "❌ Failed to generate snapshot – no qualifying bets found."
+        )
+        return [], None
+
+    # Snapshot tracker state is not persisted separately
+
+    timestamp = timestamp or now_eastern().strftime("%Y%m%dT%H%M")
+    out_dir = "backtest"
+    final_path = os.path.join(out_dir, f"market_snapshot_{timestamp}.json")
+    tmp_path = os.path.join(out_dir, f"market_snapshot_{timestamp}.tmp")
+
+    # 🔁 Merge persistent fields from prior snapshot
+    _merge_persistent_fields(all_rows, prior_map)
+
+    # 🧩 Enrich: baseline
+    ensure_baseline_consensus_prob(all_rows, MARKET_EVAL_TRACKER_BEFORE_UPDATE)
+
+    # 🗒️ Final deduplication pass
+    before_dedup = len(all_rows)
+    seen_keys: set[tuple] = set()
+    deduped_rows: list = []
+    for r in all_rows:
+        # Same key the snapshot database stores rows under
+        key = row_key(r)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        deduped_rows.append(r)
+    dropped = before_dedup - len(deduped_rows)
+    if dropped:
+        logger.debug("🗒️ Deduplicated %d rows from final snapshot", dropped)
+    all_rows = deduped_rows
+
+    os.makedirs(out_dir, exist_ok=True)
+    sanitized_rows = [sanitize_json_row(r) for r in all_rows]
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(sanitized_rows, f, indent=2)
+
+    # Validate written JSON before renaming
+    try:
+        with open(tmp_path) as f:
+            json.load(f)
+    except Exception:
+        logger.exception("❌ Snapshot JSON validation failed for %s", tmp_path)
+        bad_path = final_path + ".bad.json"
+        try:
+            shutil.move(tmp_path, bad_path)
+            logger.error("🚨 Corrupted snapshot moved to %s", bad_path)
+        except Exception as mv_err:
+            logger.error("❌ Failed to move corrupt snapshot: %s", mv_err)
+        return sanitized_rows, None
+
+    try:
+        if os.path.exists(final_path):
+            os.remove(final_path)  # 🔐 Ensure overwrite is possible
+        os.rename(tmp_path, final_path)
+    except Exception:
+        logger.exception(
+            "❌ Failed to finalize snapshot rename from %s to %s",
+            tmp_path,
+            final_path,
+        )
+        return sanitized_rows, None
+
+    logger.info("✅ Snapshot written: %s with %d rows", final_path, len(all_rows))
+    record_snapshot(sanitized_rows, final_path)
+    prune_snapshot_files(out_dir)
+    if VERBOSE or DEBUG:
+        for fn, stats in label_cache_stats().items():
+            logger.info(
+                "🏷️ %s cache: %.1f%% hit rate (%d hits / %d misses, %d cached)",
+                fn,
+                stats["hit_rate"] * 100,
+                stats["hits"],
+                stats["misses"],
+                stats["size"],
+            )
+    return sanitized_rows, final_path
+
+
 def main() -> None:
     try:
         parser = argparse.ArgumentParser(description="Generate unified market snapshot")
@@ -577,6 +715,11 @@ def main() -> None:
             action="store_true",
             help="Print market movement confirmation debug logs",
         )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            help="Only re-price games whose sim file or odds changed since the last build",
+        )
         parser.add_argument("--debug", action="store_true", help="Enable debug logging")
         parser.add_argument("--verbose", action="store_true", help="Enable verbose mode")
         args = parser.parse_args()
@@ -625,8 +768,8 @@ def main() -> None:
 
         if odds_file_path:
             try:
-                with open(odds_file_path, "r", encoding="utf-8") as f:
-                    odds_cache = json.load(f)
+                # Only materialize the games on the dates being snapshotted
+                odds_cache = load_market_odds(odds_file_path, dates=date_list)
                 if isinstance(odds_cache, dict) and odds_cache:
                     logger.info("📥 Loaded odds from %s", odds_file_path)
                     if VERBOSE or DEBUG:
@@ -642,96 +785,20 @@ def main() -> None:
                 logger.exception("❌ Failed to load odds from %s", odds_file_path)
                 sys.exit(1)
     
-        # Refresh tracker baseline before snapshot generation
-        MARKET_EVAL_TRACKER.clear()
-        MARKET_EVAL_TRACKER.update(load_snapshot_tracker())
-        MARKET_EVAL_TRACKER_BEFORE_UPDATE.clear()
-        MARKET_EVAL_TRACKER_BEFORE_UPDATE.update(MARKET_EVAL_TRACKER)
-
-        all_rows: list = []
-        prior_map = _load_prior_snapshot_map("backtest")
-        for date_str in date_list:
-            rows_for_date = build_snapshot_for_date(
-                date_str,
-                odds_cache,
-                (min_ev, max_ev),
-                prior_map=prior_map,
-            )
-            for row in rows_for_date:
-                row["snapshot_for_date"] = date_str
-            all_rows.extend(rows_for_date)
-
-        if len(all_rows) == 0:
-            logger.error(
-                "❌ Failed to generate snapshot – no qualifying bets found."
-            )
-            sys.exit(1)
-
-        # Snapshot tracker state is not persisted separately
-    
+        build_cache = SnapshotBuildCache() if args.incremental else None
         timestamp = now_eastern().strftime("%Y%m%dT%H%M")
         out_dir = "backtest"
-        final_path = os.path.join(out_dir, f"market_snapshot_{timestamp}.json")
-        tmp_path = os.path.join(out_dir, f"market_snapshot_{timestamp}.tmp")
-
-        # 🔁 Merge persistent fields from prior snapshot
-        _merge_persistent_fields(all_rows, prior_map)
-
-        # 🧩 Enrich: baseline
-        ensure_baseline_consensus_prob(all_rows, MARKET_EVAL_TRACKER_BEFORE_UPDATE)
-
-        # 🗒️ Final deduplication pass
-        before_dedup = len(all_rows)
-        seen_keys: set[tuple] = set()
-        deduped_rows: list = []
-        for r in all_rows:
-            key = (
-                r.get("game_id"),
-                r.get("market"),
-                r.get("side"),
-                r.get("book"),
-            )
-            if key in seen_keys:
-                continue
-            seen_keys.add(key)
-            deduped_rows.append(r)
-        dropped = before_dedup - len(deduped_rows)
-        if dropped:
-            logger.debug("🗒️ Deduplicated %d rows from final snapshot", dropped)
-        all_rows = deduped_rows
-
-        os.makedirs(out_dir, exist_ok=True)
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            json.dump([sanitize_json_row(r) for r in all_rows], f, indent=2)
-
-        # Validate written JSON before renaming
-        try:
-            with open(tmp_path) as f:
-                json.load(f)
-        except Exception:
-            logger.exception("❌ Snapshot JSON validation failed for %s", tmp_path)
-            bad_path = final_path + ".bad.json"
-            try:
-                shutil.move(tmp_path, bad_path)
-                logger.error("🚨 Corrupted snapshot moved to %s", bad_path)
-            except Exception as mv_err:
-                logger.error("❌ Failed to move corrupt snapshot: %s", mv_err)
-            return
-
-        try:
-            if os.path.exists(final_path):
-                os.remove(final_path)  # 🔐 Ensure overwrite is possible
-            os.rename(tmp_path, final_path)
-        except Exception:
-            logger.exception(
-                "❌ Failed to finalize snapshot rename from %s to %s",
-                tmp_path,
-                final_path,
-            )
+        all_rows, final_path = generate_snapshot(
+            date_list,
+            odds_cache,
+            (min_ev, max_ev),
+            build_cache=build_cache,
+            timestamp=timestamp,
+        )
+        if not all_rows:
+            sys.exit(1)
+        if final_path is None:
             return
-
-        logger.info("✅ Snapshot written: %s with %d rows", final_path, len(all_rows))
-
         # -------------------------------------------------------------------
         # Write summary CSV for log-ready bets if verbose mode enabled
         # -------------------------------------------------------------------
@@ -1,6 +1,7 @@
 """Utility helpers for core modules."""
 
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import json
@@ -8,6 +9,10 @@ try:
     import ijson  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
     ijson = None
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
 import os
 
 from core.game_id_utils import (
@@ -16,6 +21,16 @@ from core.game_id_utils import (
     fuzzy_match_game_id,
 )
 
+from core.label_normalizer import (
+    build_full_label,
+    build_point_str,
+    label_cache_stats,
+    normalize_label,
+    normalize_label_for_odds,
+    normalize_line_label,
+    normalize_name,
+    normalize_to_abbreviation,
+)
 from core import config
 
 UNMATCHED_MARKET_LOOKUPS = defaultdict(list)
@@ -68,6 +83,24 @@ def logging_allowed_now(
     return not (quiet_hours_start <= hour < quiet_hours_end)
 
 
+@contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on ``<path>.lock`` across processes.
+
+    Used around read-merge-write updates of JSON state files shared by
+    several processes. Without ``fcntl`` (Windows) no lock is taken.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(path + ".lock", "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
 def safe_load_json(path: str) -> list:
     """Return rows from ``path`` using streaming JSON parsing."""
     from core.logger import get_logger
@@ -422,123 +455,6 @@ def format_segment_header(segment_label: str) -> str:
 
 
 
-def normalize_to_abbreviation(label: str) -> str:
-    """
-    Normalize full team name label to abbreviation.
-    - 'Washington Nationals -1.5' → 'WSH -1.5'
-    - Leaves 'Over 8.5' or 'Under 4.5' untouched
-    """
-    label = label.strip().replace("+", " +").replace("-", " -").replace("  ", " ")
-
-    if label.startswith(("Over", "Under")):
-        return label
-
-    for abbr, full_name in TEAM_ABBR_TO_NAME.items():
-        if label.startswith(full_name + " ") or label == full_name:
-            rest = label[len(full_name):].strip()
-            return f"{abbr} {rest}".strip() if rest else abbr
-
-    return label  # fallback
-
-
-def normalize_line_label(label: str):
-    """Extract prefix and numeric line value from a label string."""
-    if not isinstance(label, str):
-        return None, None
-
-    cleaned = label.strip().replace("+", " +").replace("-", " -")
-    parts = cleaned.split()
-    if not parts:
-        return None, None
-
-    if parts[0].lower() in {"over", "under"}:
-        prefix = parts[0].capitalize()
-        try:
-            value = float(parts[1])
-        except (IndexError, ValueError):
-            value = None
-        return prefix, value
-
-    prefix = normalize_to_abbreviation(parts[0])
-    try:
-        value = float(parts[-1])
-    except (ValueError, IndexError):
-        value = None
-    return prefix.upper(), value
-
-
-
-def build_point_str(point, market_key=None):
-    """Return formatted point string for a given market."""
-    try:
-        value = float(point)
-    except (TypeError, ValueError):
-        return ""
-
-    if market_key and "spreads" in market_key:
-        return f"{value:+.1f}".replace("+0.0", "0.0").replace("-0.0", "0.0")
-
-    return f"{value:.1f}"
-
-
-def build_full_label(normalized_label, market_key, point):
-    """Construct a standardized betting label."""
-    mkey = market_key.lower()
-    point_str = build_point_str(point, mkey)
-
-    if point_str:
-        if "team_totals" in mkey:
-            parts = normalized_label.split()
-            if len(parts) >= 2:
-                team, side = parts[0], parts[1]
-                return f"{team} {side} {point_str}"
-            return f"{normalized_label} {point_str}".strip()
-        if "totals" in mkey:
-            side = normalized_label.split()[0]
-            return f"{side} {point_str}"
-        if "spreads" in mkey:
-            base = normalized_label.split()[0].strip()
-            return f"{base} {point_str}"
-
-    return normalized_label.strip()
-
-
-def normalize_label_for_odds(label: str, market_key: str, point=None) -> str:
-    """Return standardized label for odds lookups.
-
-    Parameters
-    ----------
-    label : str
-        Raw label string (may include team name or Over/Under).
-    market_key : str
-        Canonical market key such as ``spreads`` or ``totals_1st_5_innings``.
-    point : float | None, optional
-        Explicit numeric line value. If ``None``, the value will be extracted
-        from ``label`` when possible.
-
-    Returns
-    -------
-    str
-        Normalized label with consistent spacing, team abbreviations and
-        decimal precision.
-    """
-
-    if label is None:
-        return ""
-
-    base = normalize_label(label)
-
-    if point is None:
-        _, inferred = normalize_line_label(base)
-        point = inferred
-
-    mkey = market_key.lower()
-    if mkey.startswith("spreads") or mkey.startswith("h2h"):
-        base = normalize_to_abbreviation(base)
-
-    return build_full_label(base, mkey, point)
-
-
 def normalize_market_key(market_key: str) -> str:
     """Return canonical form of ``market_key``.
 
@@ -612,8 +528,6 @@ def print_market_debug(market_key, label, price, books):
 
 
 
-import unicodedata
-
 def clean_book_prices(book_dict):
     """
     Sanitize a dict of {book: odds}, ensuring all odds are float-compatible.
@@ -673,79 +587,8 @@ def normalize_lookup_side(side):
     return side.strip()
 
 
-def normalize_name(name):
-    """
-    Normalize a player name by:
-    - Lowercasing, stripping whitespace, removing punctuation and accents.
-    - Converts "Last, First" → "first last".
-    """
-    if not isinstance(name, str):
-        return ""
-
-    name = name.strip().lower()
-
-    # ✅ Remove accents with Unicode normalization
-    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("utf-8")
-
-    for orig, repl in [(".", ""), ("’", ""), ("‘", ""), ("-", " "), ("_", " ")]:
-        name = name.replace(orig, repl)
-
-    if "," in name:
-        parts = name.split(",", 1)
-        name = f"{parts[1].strip()} {parts[0].strip()}"
-
-    tokens = name.split()
-    suffixes = {"jr", "ii", "iii"}
-    if tokens and tokens[-1] in suffixes:
-        tokens = tokens[:-1]
-
-    particles = {"de", "del", "la", "van", "von", "da", "du"}
-    if len(tokens) > 2 and tokens[1] in particles:
-        return tokens[0] + " " + " ".join(tokens[1:])
-    elif len(tokens) >= 2:
-        return tokens[0] + " " + tokens[-1]
-    else:
-        return name
-
-
 import re
 
-def normalize_label(label):
-    if not isinstance(label, str):
-        return label
-
-    import re
-    label = re.sub(r'\s+', ' ', label.strip().replace("−", "-"))  # collapse whitespace
-
-    # Handle totals: "Over 8.5", "Under9", "Over8.0"
-    if label.lower().startswith("over") or label.lower().startswith("under"):
-        tokens = label.split()
-        if len(tokens) == 2:
-            side, val = tokens
-            try:
-                return f"{side.title()} {float(val):.1f}"
-            except:
-                return label
-        m = re.match(r"^(Over|Under)([0-9\.]+)$", label, re.IGNORECASE)
-        if m:
-            return f"{m.group(1).title()} {float(m.group(2)):.1f}"
-        return label.title()
-
-    # Normalize spreads: "Milwaukee Brewers +1.5" → "MIL +1.5"
-    for team_name, abbr in TEAM_ABBR.items():
-        if label.startswith(team_name):
-            suffix = label[len(team_name):].strip()
-            return f"{abbr.upper()} {suffix}"
-
-    # Catch fallback: if already abbreviated form, standardize case
-    parts = label.split()
-    if len(parts) == 2 and parts[0].upper() in TEAM_ABBR.values():
-        return f"{parts[0].upper()} {parts[1]}"
-
-    return label
-
-
-
 def standardize_derivative_label(label):
     """
     Normalize label for derivative markets (like 'Over 0.5' or 'PIT +0.5')
@@ -0,0 +1,181 @@
+"""Sim-vs-sim regression benchmark for the game simulation engine.
+
+Runs ``core.game_simulator.simulate_game`` on the sample lineups/pitchers with
+fixed seeds and compares throughput, peak memory and the run distribution
+against ``baseline.json`` in this folder.
+
+Refresh the baseline after an intentional engine change::
+
+    python tests/benchmarks/test_sim_engine_benchmark.py --update-baseline
+
+Environment overrides:
+
+* ``BENCH_SIMS`` – games per run (default 500)
+* ``BENCH_THROUGHPUT_TOLERANCE`` – allowed fractional slowdown (default 0.5)
+* ``BENCH_MEMORY_TOLERANCE`` – allowed fractional peak memory growth (default 0.5)
+* ``BENCH_SKIP_THROUGHPUT=1`` – skip the timing check on slow/shared machines
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import json
+import random
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from core.game_simulator import (
+    build_sample_lineup,
+    build_sample_pitcher,
+    count_plate_appearances,
+    simulate_game,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+SEED = 20240601
+N_SIMS = int(os.getenv("BENCH_SIMS", "500"))
+THROUGHPUT_TOLERANCE = float(os.getenv("BENCH_THROUGHPUT_TOLERANCE", "0.5"))
+MEMORY_TOLERANCE = float(os.getenv("BENCH_MEMORY_TOLERANCE", "0.5"))
+# Distribution stats may drift by this many standard errors before failing
+Z_TOLERANCE = 4.0
+
+ENV = {
+    "park_hr_mult": 1.00,
+    "single_mult": 1.00,
+    "weather_hr_mult": 1.00,
+    "adi_mult": 1.00,
+    "umpire": {"K": 1.0, "BB": 1.0},
+}
+
+
+def _seed(seed: int) -> None:
+    # The engine draws from both global generators
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _run_games(n_sims: int, seed: int) -> tuple[np.ndarray, np.ndarray, int]:
+    """Return ``(totals, f5_totals, plate_appearances)`` for ``n_sims`` games."""
+    _seed(seed)
+    totals = np.empty(n_sims)
+    f5_totals = np.empty(n_sims)
+    pa_count = 0
+    for i in range(n_sims):
+        result = simulate_game(
+            home_lineup=build_sample_lineup(),
+            away_lineup=build_sample_lineup(),
+            home_pitcher=build_sample_pitcher(),
+            away_pitcher=build_sample_pitcher(),
+            env=ENV,
+            home_bullpen=[build_sample_pitcher() for _ in range(3)],
+            away_bullpen=[build_sample_pitcher() for _ in range(3)],
+            return_inning_scores=True,
+        )
+        totals[i] = result["home_score"] + result["away_score"]
+        f5_totals[i] = sum(
+            s["home"] + s["away"] for inn, s in result["inning_scores"].items() if inn <= 5
+        )
+        pa_count += count_plate_appearances(result)
+    return totals, f5_totals, pa_count
+
+
+def run_benchmark(n_sims: int = N_SIMS, seed: int = SEED) -> dict:
+    """Return throughput, memory and distribution metrics for one run."""
+    start = time.perf_counter()
+    totals, f5_totals, pa_count = _run_games(n_sims, seed)
+    elapsed = time.perf_counter() - start
+
+    # Separate pass so tracemalloc overhead does not skew the timings
+    tracemalloc.start()
+    _run_games(max(n_sims // 10, 10), seed)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "n_sims": n_sims,
+        "seed": seed,
+        "sims_per_sec": round(n_sims / elapsed, 2),
+        "pas_per_sec": round(pa_count / elapsed, 2),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "mean_total": round(float(totals.mean()), 4),
+        "sd_total": round(float(totals.std()), 4),
+        "mean_f5_total": round(float(f5_totals.mean()), 4),
+        "sd_f5_total": round(float(f5_totals.std()), 4),
+        "p_over_8_5": round(float(np.mean(totals > 8.5)), 4),
+    }
+
+
+def load_baseline(path: str = BASELINE_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def bench():
+    return run_benchmark()
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    if not os.path.exists(BASELINE_PATH):
+        pytest.skip("No benchmark baseline recorded")
+    return load_baseline()
+
+
+def _stderr(sd: float, n: int, base_sd: float, base_n: int) -> float:
+    return float(np.sqrt(sd**2 / n + base_sd**2 / base_n))
+
+
+def test_distribution_matches_baseline(bench, baseline):
+    n, base_n = bench["n_sims"], baseline["n_sims"]
+    checks = [
+        ("mean_total", bench["sd_total"], baseline["sd_total"]),
+        ("mean_f5_total", bench["sd_f5_total"], baseline["sd_f5_total"]),
+    ]
+    for key, sd, base_sd in checks:
+        tol = Z_TOLERANCE * _stderr(sd, n, base_sd, base_n)
+        assert abs(bench[key] - baseline[key]) <= tol, f"{key} {bench[key]} vs {baseline[key]} (±{tol:.3f})"
+
+    # SD of a sample SD ≈ sd / sqrt(2n)
+    sd_tol = Z_TOLERANCE * float(
+        np.sqrt(bench["sd_total"] ** 2 / (2 * n) + baseline["sd_total"] ** 2 / (2 * base_n))
+    )
+    assert abs(bench["sd_total"] - baseline["sd_total"]) <= sd_tol
+
+    p, base_p = bench["p_over_8_5"], baseline["p_over_8_5"]
+    p_tol = Z_TOLERANCE * float(np.sqrt(p * (1 - p) / n + base_p * (1 - base_p) / base_n))
+    assert abs(p - base_p) <= p_tol
+
+
+def test_throughput_not_regressed(bench, baseline):
+    if os.getenv("BENCH_SKIP_THROUGHPUT"):
+        pytest.skip("Throughput check disabled via BENCH_SKIP_THROUGHPUT")
+    floor = 1 - THROUGHPUT_TOLERANCE
+    assert bench["sims_per_sec"] >= baseline["sims_per_sec"] * floor
+    assert bench["pas_per_sec"] >= baseline["pas_per_sec"] * floor
+
+
+def test_peak_memory_not_regressed(bench, baseline):
+    assert bench["peak_memory_kb"] <= baseline["peak_memory_kb"] * (1 + MEMORY_TOLERANCE)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the sim engine benchmark")
+    parser.add_argument("--sims", type=int, default=N_SIMS)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    metrics = run_benchmark(args.sims)
+    print(json.dumps(metrics, indent=2))
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(metrics, f, indent=2)
+            f.write("\n")
+        print(f"💾 Baseline written → {BASELINE_PATH}")
@@ -0,0 +1,182 @@
+"""Startup import-time benchmark for the entry points the auto loop launches.
+
+Each entry point is imported in a fresh ``python -X importtime`` process and
+its cumulative import time is compared against ``startup_budgets.json`` in
+this folder. A separate check asserts that dependencies which are only needed
+on specific code paths (scipy, dataframe_image/nbconvert, matplotlib) are not
+pulled in at import time; that check does not depend on machine speed.
+
+``cli.full_slate_runner`` and ``cli.run_distribution_simulator`` use Python
+3.12 f-string syntax, so they are only checked under Python 3.12+. Any other
+import failure fails the benchmark.
+
+Refresh the budgets after an intentional change::
+
+    python tests/benchmarks/test_startup_benchmark.py --update-baseline
+
+Environment overrides:
+
+* ``BENCH_STARTUP_RUNS`` – imports per entry point, fastest wins (default 3)
+* ``BENCH_STARTUP_TOLERANCE`` – allowed fractional slowdown (default 0.5)
+* ``BENCH_SKIP_STARTUP=1`` – skip the timing check on slow/shared machines
+"""
+
+import json
+import math
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+BUDGETS_PATH = os.path.join(os.path.dirname(__file__), "startup_budgets.json")
+RUNS = int(os.getenv("BENCH_STARTUP_RUNS", "3"))
+TOLERANCE = float(os.getenv("BENCH_STARTUP_TOLERANCE", "0.5"))
+BUDGET_STEP_MS = 50
+
+# Entry points using f-string syntax older interpreters cannot parse
+PY312_ENTRY_POINTS = (
+    "cli.full_slate_runner",
+    "cli.run_distribution_simulator",
+)
+
+ENTRY_POINTS = PY312_ENTRY_POINTS + (
+    "cli.log_betting_evals",
+    "cli.closing_odds_monitor",
+    "core.unified_snapshot_generator",
+    "core.dispatch_orchestrator",
+    "core.dispatch_live_snapshot",
+    "core.dispatch_fv_drop_snapshot",
+    "core.dispatch_best_book_snapshot",
+    "core.dispatch_personal_snapshot",
+    "core.dispatch_sim_only_snapshot",
+    "core.dispatch_clv_snapshot",
+    "scripts.reconcile_theme_exposure",
+)
+
+# Only needed when pricing, rendering or plotting, never just to start up
+DEFERRED_MODULES = (
+    "scipy.stats",
+    "scipy.special",
+    "dataframe_image",
+    "nbconvert",
+    "matplotlib.pyplot",
+)
+
+
+_needs_py312 = pytest.mark.skipif(
+    sys.version_info < (3, 12), reason="uses Python 3.12 f-string syntax"
+)
+PARAMS = [
+    pytest.param(m, marks=_needs_py312) if m in PY312_ENTRY_POINTS else m for m in ENTRY_POINTS
+]
+
+
+def import_profile(module: str) -> tuple[float, set] | None:
+    """Return ``(cumulative_ms, imported_modules)`` for importing ``module``.
+
+    Returns ``None`` when a Python 3.12-only entry point hits a
+    ``SyntaxError`` under an older interpreter; any other import failure
+    raises ``RuntimeError``.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        if (
+            module in PY312_ENTRY_POINTS
+            and sys.version_info < (3, 12)
+            and "SyntaxError" in proc.stderr
+        ):
+            return None
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total_us, imported = None, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        imported.add(name.strip())
+        if name.strip() == module and not name[1:].startswith(" "):
+            total_us = int(cumulative)
+    if total_us is None:
+        raise RuntimeError(f"no import time reported for {module}")
+    return total_us / 1000, imported
+
+
+def run_benchmark(modules=ENTRY_POINTS, runs: int = RUNS) -> dict:
+    """Return ``{module: {"ms": fastest_ms, "imported": [...]}}``.
+
+    Python 3.12-only entry points are left out under older interpreters.
+    """
+    results = {}
+    for module in modules:
+        profiles = [import_profile(module) for _ in range(max(1, runs))]
+        if any(p is None for p in profiles):
+            continue
+        results[module] = {
+            "ms": round(min(p[0] for p in profiles), 1),
+            "imported": sorted(profiles[0][1]),
+        }
+    return results
+
+
+def load_budgets(path: str = BUDGETS_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def bench():
+    return run_benchmark()
+
+
+@pytest.fixture(scope="module")
+def budgets():
+    if not os.path.exists(BUDGETS_PATH):
+        pytest.skip("No startup budgets recorded")
+    return load_budgets()
+
+
+@pytest.mark.parametrize("module", PARAMS)
+def test_heavy_modules_deferred(bench, module):
+    eager = [m for m in DEFERRED_MODULES if m in bench[module]["imported"]]
+    assert not eager, f"{module} imports {eager} at startup"
+
+
+@pytest.mark.parametrize("module", PARAMS)
+def test_startup_within_budget(bench, budgets, module):
+    if os.getenv("BENCH_SKIP_STARTUP"):
+        pytest.skip("Startup timing check disabled via BENCH_SKIP_STARTUP")
+    assert module in budgets, f"No startup budget recorded for {module}"
+    limit = budgets[module] * (1 + TOLERANCE)
+    assert bench[module]["ms"] <= limit, f"{module} took {bench[module]['ms']}ms (budget {limit:.0f}ms)"
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the startup import-time benchmark")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_benchmark(runs=args.runs)
+    timings = {module: r["ms"] for module, r in results.items()}
+    print(json.dumps(timings, indent=2))
+    if args.update_baseline:
+        # Keep budgets for entry points this interpreter could not import
+        merged = load_budgets() if os.path.exists(BUDGETS_PATH) else {}
+        # Round up to the next 50ms so small entry points aren't at the noise floor
+        merged.update({m: BUDGET_STEP_MS * math.ceil(ms / BUDGET_STEP_MS) for m, ms in timings.items()})
+        with open(BUDGETS_PATH, "w", encoding="utf-8") as f:
+            json.dump(merged, f, indent=2)
+            f.write("\n")
+        print(f"💾 Budgets written → {BUDGETS_PATH}")
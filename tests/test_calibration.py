@@ -0,0 +1,91 @@
+import csv
+import json
+
+import numpy as np
+
+from core.calibration import (
+    fit_calibration,
+    load_game_outcomes,
+    load_sim_arrays,
+    save_calibration,
+)
+from core.pricing_engine import MLBPricingEngine
+
+
+def _synthetic_games(n_games=300, n_sims=2000, seed=7):
+    """Sims biased low by 10% against outcomes drawn from the true model."""
+    rng = np.random.default_rng(seed)
+    sims, outcomes = {}, {}
+    for i in range(n_games):
+        gid = f"2025-06-{1 + i % 28:02d}-NYY@BOS-T{1900 + i:04d}"
+        home_mu, away_mu = rng.uniform(3.5, 5.5, size=2)
+        home = rng.poisson(home_mu * 0.9, n_sims)
+        away = rng.poisson(away_mu * 0.9, n_sims)
+        sims[gid] = {"totals": (home + away).astype(float), "diffs": (home - away).astype(float)}
+        outcomes[gid] = {"home": float(rng.poisson(home_mu)), "away": float(rng.poisson(away_mu))}
+    return sims, outcomes
+
+
+def test_fit_recovers_run_scaling_and_bumps_version():
+    sims, outcomes = _synthetic_games()
+    cal = fit_calibration(sims, outcomes, prior={"version": 3, "segment_scaling": {"f5": {"run_mean": 4.5}}})
+
+    assert cal["version"] == 4
+    assert cal["n_games"] == 300
+    assert abs(cal["run_scaling_factor"] - 1 / 0.9) < 0.05
+    assert cal["segment_scaling"]["f5"] == {"run_mean": 4.5}
+    assert set(cal["logit_win_pct_calibration"]) == {"a", "b"}
+    assert MLBPricingEngine(cal).calibration_version == 4
+
+
+def test_team_scaling_reproduces_outcome_means():
+    rng = np.random.default_rng(11)
+    sims, outcomes = {}, {}
+    for i in range(300):
+        gid = f"2025-06-{1 + i % 28:02d}-NYY@BOS-T{1900 + i:04d}"
+        # Home teams outscore away teams; the benchmark split is even
+        home_mu, away_mu = rng.uniform(4.2, 5.8), rng.uniform(3.4, 4.6)
+        home = rng.poisson(home_mu * 0.9, 2000)
+        away = rng.poisson(away_mu * 0.9, 2000)
+        sims[gid] = {"totals": (home + away).astype(float), "diffs": (home - away).astype(float)}
+        outcomes[gid] = {"home": float(rng.poisson(home_mu)), "away": float(rng.poisson(away_mu))}
+
+    engine = MLBPricingEngine(fit_calibration(sims, outcomes))
+    home_means, away_means = [], []
+    for s in sims.values():
+        _, _, home, away = engine.scale_full_game((s["totals"] + s["diffs"]) / 2, (s["totals"] - s["diffs"]) / 2)
+        home_means.append(np.mean(home))
+        away_means.append(np.mean(away))
+
+    assert abs(np.mean(home_means) - np.mean([o["home"] for o in outcomes.values()])) < 0.05
+    assert abs(np.mean(away_means) - np.mean([o["away"] for o in outcomes.values()])) < 0.05
+
+
+def test_fit_from_files_round_trip(tmp_path):
+    gid = "2025-06-01-NYY@BOS-T1905"
+    sim_dir = tmp_path / "sims" / "2025-06-01"
+    sim_dir.mkdir(parents=True)
+    raw = {
+        "totals": {"values": [7, 9, 11, 8]},
+        "run_diffs": {"values": [1, -3, 5, 2]},
+        "totals_1st_5_innings": {"values": [4, 5, 6, 3]},
+        "run_diffs_1st_5_innings": {"values": [0, -1, 2, 1]},
+    }
+    (sim_dir / f"{gid}.json").write_text(json.dumps({"raw_distributions": raw}))
+
+    outcomes_path = tmp_path / "outcomes.csv"
+    with open(outcomes_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["game_id", "home_score", "away_score", "home_f5", "away_f5"])
+        writer.writerow([gid, 5, 3, 3, 2])
+
+    cal = fit_calibration(
+        load_sim_arrays(str(tmp_path / "sims")), load_game_outcomes(str(outcomes_path))
+    )
+    assert cal["segment_scaling"]["f5"]["run_mean"] == 5.0
+
+    out = tmp_path / "calibration_offset.json"
+    save_calibration(cal, str(out), archive_dir=str(tmp_path / "archive"))
+    engine = MLBPricingEngine.from_file(str(out))
+    assert engine.calibration_version == 1
+    assert (tmp_path / "archive" / "calibration_v1.json").exists()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import core.consensus_pricer as consensus_pricer
+from core.consensus_pricer import ConsensusIndex, calculate_consensus_prob
+from core.devig import devig
+from core.market_pricer import implied_prob
+
+GAME_ID = "2025-06-01-NYY@BOS-T1305"
+
+
+def _game():
+    return {
+        "h2h": {
+            "NYY": {"price": -130, "per_book": {"pinnacle": -135, "fanduel": -130}},
+            "BOS": {"price": 120, "per_book": {"pinnacle": 125, "fanduel": 110}},
+        },
+        "totals": {
+            "Over 8.5": {"price": -105, "per_book": {"pinnacle": -110, "draftkings": -105}},
+            "Under 8.5": {"price": -110, "per_book": {"pinnacle": -110, "draftkings": -115}},
+        },
+        "spreads": {
+            "NYY -1.5": {"price": 140, "per_book": {"fanduel": 140}},
+            "BOS +1.5": {"price": -160, "per_book": {"fanduel": -160}},
+        },
+    }
+
+
+def test_devig_methods_remove_the_overround():
+    probs = np.array([[implied_prob(-110), implied_prob(-110)], [implied_prob(-250), implied_prob(200)]])
+    for method in ("multiplicative", "power", "shin"):
+        fair = devig(probs, method)
+        assert fair.shape == probs.shape
+        assert np.allclose(fair.sum(axis=1), 1)
+        assert fair[0] == pytest.approx([0.5, 0.5])
+    # Power and Shin shade the longshot harder than proportional scaling
+    assert devig(probs, "power")[1, 1] < devig(probs, "multiplicative")[1, 1]
+    assert devig(probs, "shin")[1, 1] < devig(probs, "multiplicative")[1, 1]
+    with pytest.raises(ValueError):
+        devig(probs, "nope")
+
+
+def test_index_matches_direct_calls_and_caches(monkeypatch):
+    game = _game()
+    index = ConsensusIndex(GAME_ID, game)
+    expected = calculate_consensus_prob(GAME_ID, {GAME_ID: game}, "totals", "Over 8.5")
+
+    assert index.consensus("totals", "Over 8.5") == expected
+    result, method = index.consensus("h2h", "NYY")
+    assert method == "devig"
+    assert sorted(result["books_used"]) == ["fanduel", "pinnacle"]
+    p1, p2 = implied_prob(-135), implied_prob(125)
+    assert result["bookwise_probs"]["pinnacle"] == round(p1 / (p1 + p2), 6)
+
+    # Repeat lookups are served from the index without re-pricing
+    def boom(*args, **kwargs):
+        raise AssertionError("recomputed")
+
+    monkeypatch.setattr(consensus_pricer, "_calculate_consensus_prob", boom)
+    assert index.consensus("h2h", "NYY") == (result, method)
+    assert calculate_consensus_prob(GAME_ID, {GAME_ID: game}, "h2h", "NYY", index=index) == (result, method)
+
+
+def test_index_key_lookup_and_pairs():
+    game = _game()
+    game["totals"]["over 8.5"] = {"per_book": {}}
+    index = ConsensusIndex(GAME_ID, game)
+
+    assert index.key("totals", "Over 8.5") == "Over 8.5"
+    assert index.key("totals", "Over 9.5") is None
+    assert index.key("missing", "Over 8.5") is None
+    assert index.opponent("New York Yankees") == "BOS"
+    assert index.paired_label("NYY", "h2h") == "BOS"
+    result, method = index.consensus("spreads", "NYY -1.5", method="shin")
+    assert method == "devig_1book"
+    assert 0 < result["consensus_prob"] < 0.5
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import core.devig as devig_mod
+from core.consensus_pricer import calculate_consensus_prob
+from core.devig import DEVIG_METHODS, devig, devig_market, market_family, weighted_consensus
+from core.market_pricer import implied_prob
+from core.normalize_odds import normalize_odds
+
+
+def test_every_method_returns_normalized_rows():
+    probs = np.array([[implied_prob(-110), implied_prob(-110)], [implied_prob(-300), implied_prob(240)]])
+    for method in ("multiplicative", "additive", "power", "shin", "logit"):
+        fair = devig(probs, method)
+        assert np.allclose(fair.sum(axis=1), 1), method
+        assert fair[0] == pytest.approx([0.5, 0.5]), method
+        # The favorite stays the favorite
+        assert fair[1, 0] > fair[1, 1], method
+    # Additive takes the same amount from each side; multiplicative scales it
+    mult, add = devig(probs, "multiplicative")[1], devig(probs, "additive")[1]
+    assert add[1] < mult[1]
+
+
+def test_devig_market_batches_pairs_with_weights_and_dispersion():
+    prices = {
+        "Over 8.5": {"pinnacle": -110, "fanduel": -120, "draftkings": 100},
+        "Under 8.5": {"pinnacle": -110, "fanduel": 100, "draftkings": -120},
+        "Over 9.5": {"pinnacle": 130},
+        "Under 9.5": {"pinnacle": -150},
+    }
+    pairs = [("Over 8.5", "Under 8.5"), ("Over 9.5", "Under 9.5")]
+
+    equal = devig_market(prices, pairs)
+    assert set(equal) == set(prices)
+    assert equal["Over 8.5"]["consensus_prob"] == pytest.approx(0.5, abs=1e-6)
+    assert equal["Over 8.5"]["dispersion"] > 0
+    assert equal["Over 9.5"]["dispersion"] == 0
+    assert equal["Over 9.5"]["consensus_prob"] + equal["Under 9.5"]["consensus_prob"] == pytest.approx(1)
+
+    sharp = devig_market(prices, pairs, weights={"fanduel": 10})
+    assert sharp["Over 8.5"]["consensus_prob"] > equal["Over 8.5"]["consensus_prob"]
+    assert devig_market(prices, pairs, books=["pinnacle"])["Over 8.5"]["bookwise_probs"] == {"pinnacle": 0.5}
+
+    mean, spread = weighted_consensus([0.4, 0.6], [3, 1])
+    assert mean == pytest.approx(0.45)
+    assert spread == pytest.approx(np.sqrt(0.75 * 0.05**2 + 0.25 * 0.15**2))
+
+
+def test_method_is_selected_per_market_family(monkeypatch):
+    assert market_family("alternate_spreads_1st_5_innings") == "spreads"
+    assert market_family("alternate_team_totals") == "team_totals"
+    monkeypatch.setitem(devig_mod.METHOD_BY_FAMILY, "h2h", "shin")
+    calls = []
+    monkeypatch.setitem(DEVIG_METHODS, "shin", lambda p: calls.append(p.shape) or devig_mod.devig_shin(p))
+
+    game = {
+        "h2h": {
+            "NYY": {"per_book": {"pinnacle": -250, "fanduel": -240}},
+            "BOS": {"per_book": {"pinnacle": 200, "fanduel": 190}},
+        }
+    }
+    gid = "2025-06-01-NYY@BOS-T1305"
+    result, _ = calculate_consensus_prob(gid, {gid: game}, "h2h", "NYY")
+    assert calls == [(2, 2)]
+    assert result["devig_method"] == "shin"
+    assert result["dispersion"] >= 0
+
+    weighted, _ = calculate_consensus_prob(gid, {gid: game}, "h2h", "NYY", book_weights={"pinnacle": 5})
+    bookwise = weighted["bookwise_probs"]
+    assert weighted["consensus_prob"] == pytest.approx(
+        (5 * bookwise["pinnacle"] + bookwise["fanduel"]) / 6, abs=1e-6
+    )
+
+
+def test_normalize_odds_devigs_totals_in_batch():
+    offers = {
+        "totals": {
+            book: {"Over 8.5": {"price": over}, "Under 8.5": {"price": under}}
+            for book, over, under in (("pinnacle", -115, -105), ("fanduel", -110, -110))
+        }
+    }
+    result = normalize_odds("2025-06-01-NYY@BOS-T1305", offers)
+    over = result["totals"]["Over 8.5"]
+    assert over["pricing_method"] == "devig"
+    assert len(over["raw_devig_probs"]) == 2
+    assert over["consensus_prob"] == pytest.approx(np.mean(over["raw_devig_probs"]), abs=1e-6)
+    assert over["dispersion"] > 0
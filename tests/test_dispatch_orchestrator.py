@@ -0,0 +1,76 @@
+import sys
+import threading
+import types
+
+from core import dispatch_orchestrator
+
+
+def _module(monkeypatch, name, main):
+    module = types.ModuleType(name)
+    module.main = main
+    monkeypatch.setitem(sys.modules, name, module)
+    return name
+
+
+def test_dispatchers_share_one_snapshot_load(monkeypatch):
+    loads, seen = [], {}
+    snapshot = [{"game_id": "G1", "snapshot_roles": ["live"]}]
+    monkeypatch.setattr(
+        dispatch_orchestrator,
+        "latest_snapshot_rows",
+        lambda directory: loads.append(directory) or (snapshot, "snap.json"),
+    )
+
+    def record(tag):
+        def main(argv, rows=None):
+            rows[0]["book"] = tag
+            seen[tag] = (argv, rows)
+        return main
+
+    def explode(argv, rows=None):
+        raise RuntimeError("boom")
+
+    def bail(argv):
+        sys.exit(1)
+
+    names = [
+        _module(monkeypatch, "fake_dispatch_a", record("a")),
+        _module(monkeypatch, "fake_dispatch_b", record("b")),
+        _module(monkeypatch, "fake_dispatch_bad", explode),
+    ]
+    monkeypatch.setattr(dispatch_orchestrator, "CLV_DISPATCHER", _module(monkeypatch, "fake_clv", bail))
+
+    results = dispatch_orchestrator.dispatch_snapshots(["--output-discord"], dispatchers=names)
+
+    assert loads == ["backtest"]
+    assert results == {
+        "fake_dispatch_a": "ok",
+        "fake_dispatch_b": "ok",
+        "fake_dispatch_bad": "error",
+        "fake_clv": "exit 1",
+    }
+    assert seen["a"][0] == ["--output-discord"]
+    # Each dispatcher mutates its own copies, never the shared rows
+    assert seen["a"][1][0]["book"] == "a" and seen["b"][1][0]["book"] == "b"
+    assert "book" not in snapshot[0]
+
+
+def test_queued_dispatchers_cancelled_on_timeout(monkeypatch):
+    release = threading.Event()
+
+    def slow(argv, rows=None):
+        release.wait(5)
+
+    names = [_module(monkeypatch, f"fake_dispatch_{i}", slow) for i in range(3)]
+    try:
+        results = dispatch_orchestrator.dispatch_snapshots(
+            [], dispatchers=names, include_clv=False, workers=1, timeout=0.1, rows=[]
+        )
+    finally:
+        release.set()
+
+    assert results == {
+        "fake_dispatch_0": "timeout",
+        "fake_dispatch_1": "cancelled",
+        "fake_dispatch_2": "cancelled",
+    }
@@ -0,0 +1,96 @@
+import json
+from datetime import timedelta, timezone
+
+from core.events_index import EventsIndex
+from core.utils import now_eastern
+
+
+def _events():
+    return [
+        {"id": "a", "away_team": "New York Yankees", "home_team": "Boston Red Sox", "commence_time": "2025-06-01T17:05:00Z"},
+        {"id": "b", "away_team": "New York Yankees", "home_team": "Boston Red Sox", "commence_time": "2025-06-01T23:10:00Z"},
+        {"id": "c", "away_team": "Chicago Cubs", "home_team": "St. Louis Cardinals", "commence_time": "2025-06-01T18:15:00Z"},
+    ]
+
+
+def test_index_caches_persists_and_matches(tmp_path):
+    calls = []
+
+    def fetch(days):
+        calls.append(days)
+        return _events()
+
+    path = str(tmp_path / "events.json")
+    index = EventsIndex(fetch_fn=fetch, ttl=600, cache_path=path)
+
+    entries = index.entries(2)
+    assert entries["2025-06-01-NYY@BOS-T1305"]["event_id"] == "a"
+    # Cached for equal or shorter lookahead
+    index.entries(1)
+    assert calls == [2]
+
+    # Doubleheader: exact time or a start within the window resolves uniquely
+    assert index.candidates("2025-06-01-NYY@BOS-T1903") == ["2025-06-01-NYY@BOS-T1910"]
+    assert len(index.candidates("2025-06-01-NYY@BOS")) == 2
+    assert index.lookup("2025-06-01-NYY@BOS") == (None, None)
+    assert index.lookup("2025-06-01-CHC@STL")[1]["event_id"] == "c"
+
+    # A second process reuses the persisted list within the TTL
+    other = EventsIndex(fetch_fn=fetch, ttl=600, cache_path=path)
+    assert other.entries(2)["2025-06-01-CHC@STL-T1415"]["event_id"] == "c"
+    assert calls == [2]
+
+    expired = EventsIndex(fetch_fn=fetch, ttl=0, cache_path=path)
+    expired.entries(2)
+    assert calls == [2, 2]
+
+
+def test_index_rereads_file_refreshed_by_another_process(tmp_path):
+    calls = []
+
+    def fetch(days):
+        calls.append(days)
+        return _events()
+
+    path = str(tmp_path / "events.json")
+    stale = EventsIndex(fetch_fn=fetch, ttl=600, cache_path=path)
+    assert stale.entries(2) is not None
+    stale._cache[2] = (0, *stale._cache[2][1:])
+
+    # Another process refreshes the list; the expired index picks it up from disk
+    EventsIndex(fetch_fn=fetch, ttl=600, cache_path=path).entries(2, force=True)
+    assert calls == [2, 2]
+    assert "2025-06-01-CHC@STL-T1415" in stale.entries(2)
+    assert calls == [2, 2]
+
+
+def test_save_keeps_lists_persisted_by_another_process(tmp_path):
+    path = str(tmp_path / "events.json")
+    first = EventsIndex(fetch_fn=lambda days: _events(), ttl=600, cache_path=path)
+
+    def slow_fetch(days):
+        # The other process saves its list while this fetch is in flight
+        first.entries(2)
+        return _events()[:1]
+
+    EventsIndex(fetch_fn=slow_fetch, ttl=600, cache_path=path).entries(7)
+
+    with open(path, "r", encoding="utf-8") as f:
+        stored = json.load(f)
+    assert set(stored) == {"2", "7"}
+    assert len(stored["2"]["events"]) == 3
+
+
+def test_wider_lookahead_is_narrowed_for_shorter_callers(tmp_path):
+    today = now_eastern().replace(hour=12, minute=0, second=0, microsecond=0)
+    events = [
+        {"id": f"e{i}", "away_team": "New York Yankees", "home_team": "Boston Red Sox",
+         "commence_time": (today + timedelta(days=i)).astimezone(timezone.utc).isoformat()}
+        for i in range(3)
+    ]
+    index = EventsIndex(fetch_fn=lambda days: events, ttl=600, cache_path=None)
+    assert len(index.entries(3)) == 3
+    narrow = index.entries(1)
+    assert [e["event_id"] for e in narrow.values()] == ["e0"]
+    assert [e["id"] for e in index.events(2)] == ["e0", "e1"]
+    assert index.candidates("2025-06-01-NYY@BOS") == []
@@ -0,0 +1,47 @@
+from core.label_normalizer import (
+    TeamTrie,
+    clear_label_caches,
+    label_cache_stats,
+    normalize_label,
+    normalize_label_for_odds,
+    normalize_name,
+    normalize_to_abbreviation,
+)
+
+
+def test_labels_are_normalized():
+    assert normalize_label(" Over   8.5 ") == "Over 8.5"
+    assert normalize_label("under9") == "Under 9.0"
+    assert normalize_label("Milwaukee Brewers +1.5") == "MIL +1.5"
+    assert normalize_label("nyy -1.5") == "NYY -1.5"
+    assert normalize_label(None) is None
+    assert normalize_to_abbreviation("Washington Nationals -1.5") == "WSH -1.5"
+    assert normalize_to_abbreviation("Washington Nationals") == "WSH"
+    assert normalize_to_abbreviation("Washington NationalsX") == "Washington NationalsX"
+    assert normalize_label_for_odds("St. Louis Cardinals", "spreads", 1.5) == "STL +1.5"
+    assert normalize_label_for_odds("Over", "totals_1st_5_innings", 4.5) == "Over 4.5"
+    assert normalize_label_for_odds("NYY Over", "team_totals", 4.5) == "NYY Over 4.5"
+    assert normalize_name("Ramírez, José") == "jose ramirez"
+    assert normalize_name("Vladimir Guerrero Jr.") == "vladimir guerrero"
+    assert normalize_name(None) == ""
+
+
+def test_team_trie_matches_longest_prefix():
+    trie = TeamTrie({"New York": "NY", "New York Mets": "NYM"})
+    assert trie.match("New York Mets +1.5") == ("New York Mets", "NYM")
+    assert trie.match("New York Yankees") == ("New York", "NY")
+    assert trie.match("Boston") is None
+
+
+def test_cache_stats_track_hits():
+    clear_label_caches()
+    for _ in range(4):
+        normalize_label_for_odds("Boston Red Sox", "h2h")
+    # Unhashable points bypass the cache rather than failing
+    assert normalize_label_for_odds("Over", "totals", [8.5]) == "Over"
+
+    stats = label_cache_stats()["normalize_label_for_odds"]
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.75
+    assert stats["size"] == 1
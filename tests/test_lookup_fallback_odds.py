@@ -1,4 +1,5 @@
 import logging
+from core.game_id_utils import GameIdResolver, fuzzy_match_game_id
 from core.utils import lookup_fallback_odds
 
 
@@ -58,3 +59,31 @@ def test_lookup_fallback_odds_unique_exceeds_delta(caplog):
     assert row == {"val": 99}
     assert key == "2025-07-07-TOR@CWS-T2200"
     assert any("only match" in rec.message for rec in caplog.records)
+
+
+def test_game_id_resolver_matches_linear_lookups():
+    odds = {
+        "2025-07-07-TOR@CWS-T1941": {"val": 1},
+        "2025-07-07-TOR@CWS-T1943": {"val": 2},
+        "2025-07-07-TOR@CWS-T2200-DH2": {"val": 3},
+        "2025-07-07-NYY@BOS": {"val": 4},
+        "2025-07-08-TOR@CWS-T1310": {"val": 5},
+    }
+    resolver = GameIdResolver(odds)
+    queries = [
+        "2025-07-07-TOR@CWS-T1941",
+        "2025-07-07-TOR@CWS-T1942",
+        "2025-07-07-TOR@CWS-T2155",
+        "2025-07-07-TOR@CWS-T2050",
+        "2025-07-07-TOR@CWS",
+        "2025-07-07-NYY@BOS-T1305",
+        "2025-07-08-TOR@CWS-T1900",
+        "2025-07-09-TOR@CWS-T1310",
+    ]
+    for gid in queries:
+        for max_delta in (10, None):
+            assert resolver.lookup(gid, max_delta) == lookup_fallback_odds(gid, odds, max_delta=max_delta)
+        for window in (3, 300):
+            assert resolver.fuzzy_match(gid, window) == fuzzy_match_game_id(gid, list(odds), window)
+
+    assert resolver.match("2025-07-07-TOR@CWS-T1940") is resolver.match("2025-07-07-TOR@CWS-T1940")
@@ -0,0 +1,79 @@
+import sys
+import types
+
+from core import loop_daemon
+
+DATES = ["2025-06-01", "2025-06-02"]
+
+
+def _module(monkeypatch, name, **attrs):
+    module = types.ModuleType(name)
+    for key, value in attrs.items():
+        setattr(module, key, value)
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+def _stub_odds(monkeypatch, odds):
+    saved = []
+    monkeypatch.setattr(loop_daemon, "fetch_all_market_odds", lambda **kw: odds)
+    monkeypatch.setattr(
+        loop_daemon, "save_market_odds_to_file", lambda o, tag: saved.append(o) or f"{tag}.json"
+    )
+    tracker = types.SimpleNamespace(update=lambda o: None, record=lambda o: None, last="delta")
+    monkeypatch.setattr(loop_daemon, "get_odds_delta_tracker", lambda: tracker)
+    monkeypatch.setattr(loop_daemon, "get_odds_history", lambda: tracker)
+    return saved
+
+
+def test_cycle_hands_state_between_stages_in_memory(monkeypatch):
+    odds = {
+        "2025-06-01-NYY@BOS-T1305": {"h2h": {"NYY": {"price": -110}}},
+        "2025-06-03-TOR@CWS-T1910": {"h2h": {"TOR": {"price": 120}}},
+    }
+    _stub_odds(monkeypatch, odds)
+    calls = {}
+    rows = [{"game_id": "2025-06-01-NYY@BOS-T1305", "queued": True}]
+
+    def generate_snapshot(dates, odds_cache, build_cache=None, odds_delta=None):
+        # Pricing annotates its odds; that must not leak into the shared state
+        odds_cache["2025-06-01-NYY@BOS-T1305"]["h2h"]["NYY"]["annotated"] = True
+        calls["snapshot"] = (dates, sorted(odds_cache), build_cache, odds_delta)
+        return rows, "backtest/market_snapshot_x.json"
+
+    def dispatch_snapshots(argv, rows=None):
+        # Dispatch runs after logging so posts carry this cycle's flags
+        calls["dispatch"] = [dict(r) for r in rows]
+        return {"core.dispatch_live_snapshot": "ok"}
+
+    def run_batch_logging(**kwargs):
+        calls["log"] = kwargs
+        kwargs["snapshot_rows"][0]["logged"] = True
+
+    _module(monkeypatch, "core.unified_snapshot_generator", generate_snapshot=generate_snapshot)
+    _module(monkeypatch, "core.dispatch_orchestrator", dispatch_snapshots=dispatch_snapshots)
+    _module(monkeypatch, "cli.log_betting_evals", run_batch_logging=run_batch_logging)
+    _module(monkeypatch, "scripts.reconcile_theme_exposure", reconcile=lambda: calls.setdefault("reconcile", True))
+
+    cache = object()
+    state = loop_daemon.LoopState(build_cache=cache)
+    timings = loop_daemon.run_cycle(state, DATES)
+
+    assert list(timings) == ["odds", "snapshot", "log", "reconcile", "dispatch"]
+    assert calls["snapshot"] == (DATES, ["2025-06-01-NYY@BOS-T1305"], cache, "delta")
+    assert "annotated" not in state.odds["2025-06-01-NYY@BOS-T1305"]["h2h"]["NYY"]
+    assert calls["dispatch"] == [{**rows[0], "logged": True}]
+    assert calls["log"]["snapshot_rows"] is rows
+    assert calls["log"]["snapshot_path"] == "backtest/market_snapshot_x.json"
+    # The logger's flags are visible to the next cycle without a re-read
+    assert state.rows[0]["logged"] is True
+    assert calls["reconcile"] is True
+
+
+def test_cycle_stops_when_odds_fetch_fails(monkeypatch):
+    _stub_odds(monkeypatch, {})
+    _module(monkeypatch, "core.unified_snapshot_generator", generate_snapshot=None)
+    _module(monkeypatch, "core.dispatch_orchestrator", dispatch_snapshots=None)
+    _module(monkeypatch, "cli.log_betting_evals", run_batch_logging=None)
+    _module(monkeypatch, "scripts.reconcile_theme_exposure", reconcile=None)
+
+    assert list(loop_daemon.run_cycle(loop_daemon.LoopState(), DATES)) == ["odds"]
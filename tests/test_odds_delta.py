@@ -0,0 +1,104 @@
+import copy
+from datetime import datetime
+
+import core.consensus_pricer as consensus_pricer
+import core.odds_fetcher as odds_fetcher
+from core.odds_delta import OddsDeltaTracker, diff_tables, reusable_markets
+from core.odds_table import OddsTable
+
+GAME_ID = "2025-06-01-NYY@BOS-T1305"
+
+
+def _payload(h2h_price=-130, total_price=-110):
+    def market(key, outcomes):
+        return {"key": key, "outcomes": outcomes}
+
+    return {
+        "bookmakers": [
+            {
+                "key": book,
+                "markets": [
+                    market(
+                        "h2h",
+                        [
+                            {"name": "New York Yankees", "price": h2h_price},
+                            {"name": "Boston Red Sox", "price": 110},
+                        ],
+                    ),
+                    market(
+                        "totals",
+                        [
+                            {"name": "Over", "price": total_price, "point": 8.5},
+                            {"name": "Under", "price": -110, "point": 8.5},
+                        ],
+                    ),
+                    market(
+                        "spreads",
+                        [
+                            {"name": "New York Yankees", "price": 140, "point": -1.5},
+                            {"name": "Boston Red Sox", "price": -160, "point": 1.5},
+                        ],
+                    ),
+                ],
+            }
+            for book in ("pinnacle", "fanduel")
+        ]
+    }
+
+
+def test_diff_tables_reports_changed_added_and_removed_cells():
+    before = OddsTable()
+    before.add(GAME_ID, "h2h", "NYY", "pinnacle", -130)
+    before.add(GAME_ID, "h2h", "BOS", "pinnacle", 110)
+    after = OddsTable()
+    after.add(GAME_ID, "h2h", "NYY", "pinnacle", -140)
+    after.add(GAME_ID, "h2h", "NYY", "fanduel", -135)
+
+    assert diff_tables(None, after).full
+    delta = diff_tables(before, after)
+    assert delta.changed == {
+        (GAME_ID, "h2h", "NYY", "pinnacle"): (-130, -140),
+        (GAME_ID, "h2h", "NYY", "fanduel"): (None, -135),
+        (GAME_ID, "h2h", "BOS", "pinnacle"): (110, None),
+    }
+    assert delta.markets == {(GAME_ID, "h2h")}
+    assert not diff_tables(after, after)
+
+
+def test_tracker_chains_refreshes():
+    tracker = OddsDeltaTracker()
+    game = {"h2h": {"NYY": {"price": -130, "per_book": {"pinnacle": -130}}}}
+    first = tracker.update({GAME_ID: game})
+    assert first.full and first.since is None
+    moved = copy.deepcopy(game)
+    moved["h2h"]["NYY"]["per_book"]["pinnacle"] = -150
+    delta = tracker.update({GAME_ID: moved, "2025-06-01-NYM@PHI-T1910": game})
+
+    assert tracker.last is delta and delta.since == first.refresh
+    assert delta.games == {GAME_ID, "2025-06-01-NYM@PHI-T1910"}
+    assert not delta.full
+
+
+def test_unchanged_markets_reuse_previous_consensus(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    start = datetime(2025, 6, 1, 13, 5)
+    first = odds_fetcher._process_event_odds(GAME_ID, _payload(), start)
+
+    calls = []
+    real = consensus_pricer.calculate_consensus_prob
+    monkeypatch.setattr(
+        consensus_pricer,
+        "calculate_consensus_prob",
+        lambda **kw: calls.append(kw["market_key"]) or real(**kw),
+    )
+    # Only the totals price moved
+    second = odds_fetcher._process_event_odds(GAME_ID, _payload(total_price=-120), start, previous=first)
+
+    assert {m for m in reusable_markets(second, first) if second[m]} == {"h2h", "spreads"}
+    assert set(calls) == {"totals"}
+    assert second["h2h"] == first["h2h"]
+    assert second["totals"]["Over 8.5"]["consensus_prob"] != first["totals"]["Over 8.5"]["consensus_prob"]
+
+    # A moneyline move invalidates spreads too (pick'em spreads price off h2h)
+    third = odds_fetcher._process_event_odds(GAME_ID, _payload(h2h_price=-150, total_price=-120), start, previous=second)
+    assert {m for m in reusable_markets(third, second) if third[m]} == {"totals"}
@@ -0,0 +1,112 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import core.events_index as events_index
+import core.odds_fetcher as odds_fetcher
+
+DELAY = 0.3
+TEAMS = [
+    ("New York Yankees", "Boston Red Sox"),
+    ("Chicago Cubs", "St. Louis Cardinals"),
+    ("Houston Astros", "Texas Rangers"),
+    ("Seattle Mariners", "Oakland Athletics"),
+    ("Miami Marlins", "Atlanta Braves"),
+    ("San Diego Padres", "Los Angeles Dodgers"),
+]
+
+
+def _events():
+    return [
+        {
+            "id": f"evt{i}",
+            "away_team": away,
+            "home_team": home,
+            "commence_time": f"2025-06-01T{17 + i:02d}:05:00Z",
+        }
+        for i, (away, home) in enumerate(TEAMS)
+    ]
+
+
+def _event_odds(event):
+    outcomes = [
+        {"name": event["away_team"], "price": 120},
+        {"name": event["home_team"], "price": -140},
+    ]
+    return {
+        "id": event["id"],
+        "bookmakers": [
+            {"key": book, "markets": [{"key": "h2h", "outcomes": outcomes}]}
+            for book in ("fanduel", "draftkings")
+        ],
+    }
+
+
+@pytest.fixture
+def mock_api(tmp_path, monkeypatch):
+    events = {e["id"]: e for e in _events()}
+    hits = {"flaky": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path.endswith("/events"):
+                return self._send(200, list(events.values()))
+            event_id = path.split("/")[-2]
+            if event_id == "evt0" and hits["flaky"] == 0:
+                hits["flaky"] += 1
+                return self._send(503, {"message": "busy"})
+            time.sleep(DELAY)
+            self._send(200, _event_odds(events[event_id]))
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/v4/sports/baseball_mlb"
+    monkeypatch.setattr(odds_fetcher, "EVENTS_URL", f"{base}/events")
+    monkeypatch.setattr(odds_fetcher, "EVENT_ODDS_URL", f"{base}/events/{{event_id}}/odds")
+    monkeypatch.setattr(odds_fetcher, "RETRY_BACKOFF", 0)
+    monkeypatch.setattr(odds_fetcher, "_SESSION", None)
+    monkeypatch.setattr(events_index, "_INDEX", None)
+    monkeypatch.chdir(tmp_path)
+    yield hits
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_all_market_odds_runs_events_concurrently(mock_api):
+    start = time.perf_counter()
+    odds = odds_fetcher.fetch_all_market_odds()
+    elapsed = time.perf_counter() - start
+
+    assert len(odds) == len(TEAMS)
+    assert all(data and data["h2h"] for data in odds.values())
+    # Serial fetching would take len(TEAMS) * DELAY
+    assert elapsed < DELAY * len(TEAMS) / 2
+    # The 503 for evt0 was retried on the shared session
+    assert mock_api["flaky"] == 1
+
+
+def test_fetch_market_odds_from_api_returns_requested_games(mock_api):
+    all_odds = odds_fetcher.fetch_all_market_odds()
+    wanted = sorted(all_odds)[:2]
+
+    odds = odds_fetcher.fetch_market_odds_from_api(wanted)
+    assert sorted(odds) == wanted
+    assert "per_book" in next(iter(odds[wanted[0]]["h2h"].values()))
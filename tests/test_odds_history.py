@@ -0,0 +1,49 @@
+import json
+
+from core.odds_fetcher import save_market_odds_to_file
+from core.odds_history import OddsHistory
+
+GAME_ID = "2025-06-01-NYY@BOS-T1305"
+
+
+def _odds(nyy_fd, nyy_pin=-130, with_bos=True):
+    h2h = {"NYY": {"price": nyy_fd, "per_book": {"fanduel": nyy_fd, "pinnacle": nyy_pin}}}
+    if with_bos:
+        h2h["BOS"] = {"price": 110, "per_book": {"fanduel": 110}}
+    return {GAME_ID: {"h2h": h2h, "start_time": "2025-06-01T13:05:00-04:00"}}
+
+
+def test_only_changed_cells_are_appended_and_queryable(tmp_path):
+    history = OddsHistory(str(tmp_path / "ticks.sqlite"))
+    assert history.record(_odds(-130), ts="2025-06-01T09:00:00") == 3
+    assert history.record(_odds(-130), ts="2025-06-01T09:05:00") == 0
+    assert history.record(_odds(-140), ts="2025-06-01T09:10:00") == 1
+    # BOS pulled at fanduel
+    assert history.record(_odds(-150, with_bos=False), ts="2025-06-01T09:15:00") == 2
+
+    path = history.price_path(GAME_ID, "h2h", "NYY", book="fanduel")
+    assert [(t["ts"][-8:], t["price"]) for t in path] == [
+        ("09:00:00", -130),
+        ("09:10:00", -140),
+        ("09:15:00", -150),
+    ]
+    assert len(history.price_path(GAME_ID, "h2h", "NYY", since="2025-06-01T09:10:00")) == 2
+    assert history.opening(GAME_ID, "h2h", "NYY") == {"fanduel": -130, "pinnacle": -130}
+    assert history.movement(GAME_ID, "h2h", "NYY") == {"fanduel": (-130, -150), "pinnacle": (-130, -130)}
+    assert history.latest(GAME_ID) == {("h2h", "NYY", "fanduel"): -150, ("h2h", "NYY", "pinnacle"): -130}
+    assert history.latest(GAME_ID, as_of="2025-06-01T09:12:00")[("h2h", "BOS", "fanduel")] == 110
+    history.close()
+
+    # A reopened store resumes from the last stored prices
+    reopened = OddsHistory(str(tmp_path / "ticks.sqlite"))
+    assert reopened.record(_odds(-150, with_bos=False), ts="2025-06-01T09:20:00") == 0
+
+
+def test_save_market_odds_writes_compact_json_atomically(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = save_market_odds_to_file(_odds(-130), "market_odds_test")
+    with open(path) as f:
+        text = f.read()
+    assert json.loads(text) == _odds(-130)
+    assert "\n" not in text
+    assert not list((tmp_path / "data" / "market_odds").glob("*.tmp"))
@@ -0,0 +1,106 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+from core.odds_quota import MARKET_GROUPS, QuotaTracker, RequestPlanner, merge_previous_odds
+from core.utils import now_eastern
+
+
+def _resp(remaining, used, last):
+    return SimpleNamespace(
+        headers={"x-requests-remaining": str(remaining), "x-requests-used": str(used), "x-requests-last": str(last)}
+    )
+
+
+def test_tracker_records_headers_and_persists(tmp_path):
+    path = str(tmp_path / "quota.json")
+    tracker = QuotaTracker(path=path, daily_budget=100)
+    tracker.record(_resp(5000, 40, 30))
+    tracker.record(_resp(4990, 50, 10))
+    tracker.record(SimpleNamespace(headers={}))
+
+    reloaded = QuotaTracker(path=path, daily_budget=100)
+    assert reloaded.used_today() == 40
+    assert reloaded.state["remaining"] == 4990
+    assert reloaded.budget_left() == 60
+
+
+def test_trackers_sharing_a_file_merge_state(tmp_path):
+    path = str(tmp_path / "quota.json")
+    now = now_eastern()
+    first = QuotaTracker(path=path, daily_budget=100)
+    second = QuotaTracker(path=path, daily_budget=100)
+    first.record(_resp(5000, 40, 30))
+    first.mark_refreshed("g1", "mainlines", now)
+    first.save()
+    second.mark_refreshed("g2", "mainlines", now)
+    second.record(_resp(4990, 50, 10))
+    assert second.used_today() == 40
+    first.forget(["g1"])
+    first.save()
+
+    reloaded = QuotaTracker(path=path, daily_budget=100)
+    assert reloaded.used_today() == 40
+    assert reloaded.state["remaining"] == 4990 and reloaded.state["used"] == 50
+    assert set(reloaded.state["last_refreshed"]) == {"g2"}
+
+
+def test_planner_tiers_by_time_to_game_and_budget(tmp_path):
+    now = now_eastern()
+    events = {
+        "near": {"start": now + timedelta(hours=1)},
+        "mid": {"start": now + timedelta(hours=6)},
+        "far": {"start": now + timedelta(hours=20)},
+        "live": {"start": now - timedelta(minutes=5)},
+    }
+    tracker = QuotaTracker(path=str(tmp_path / "q.json"), daily_budget=1000)
+    plan = RequestPlanner(tracker).plan(events, now=now)
+    # Planning alone does not count as a refresh
+    assert RequestPlanner(tracker).plan(events, now=now + timedelta(minutes=10)) == plan
+    RequestPlanner(tracker).mark_fetched({gid: plan[gid] for gid in ("near", "mid")}, now=now)
+
+    assert set(plan) == {"near", "mid", "far"}
+    assert plan["far"] == MARKET_GROUPS["mainlines"]
+    assert "totals_1st_5_innings" in plan["near"]
+    assert "totals_1st_5_innings" not in plan["mid"]
+
+    # Ten minutes later the near game is due again, as is the far one whose fetch failed
+    again = RequestPlanner(tracker).plan(events, now=now + timedelta(minutes=10))
+    assert set(again) == {"near", "far"}
+
+    # A tight budget serves the nearest game and degrades the next to mainlines
+    tight = QuotaTracker(path=str(tmp_path / "tight.json"), daily_budget=len(plan["near"]) + 3)
+    limited = RequestPlanner(tight).plan(events, now=now)
+    assert limited == {"near": plan["near"], "mid": MARKET_GROUPS["mainlines"]}
+
+
+def test_merge_previous_odds_fills_skipped_markets():
+    now = now_eastern()
+    later = {"start": now + timedelta(hours=2)}
+    events = {"g1": later, "g2": later, "g3": later, "live": {"start": now - timedelta(minutes=5)}}
+    previous = {
+        "g1": {
+            "h2h": {"NYY": {}},
+            "totals_1st_5_innings": {"Over 4.5": {}},
+            "spreads": {"NYY -1.5": {"price": 150}},
+            "spreads_source": {"NYY -1.5": {"fanduel": 150}},
+        },
+        "g2": {"h2h": {"BOS": {}}},
+        "g3": {"h2h": {"TOR": {}}},
+        "live": {"h2h": {"SEA": {}}},
+        "gone": {"h2h": {"TEX": {}}},
+    }
+    current = {
+        "g1": {"h2h": {"NYY": {"price": 110}}, "totals_1st_5_innings": {}, "spreads": {}},
+        "g3": None,
+    }
+    requested = {"g1": MARKET_GROUPS["mainlines"]}
+    merged = merge_previous_odds(current, previous, events, requested=requested, now=now)
+    assert merged["g1"]["h2h"]["NYY"]["price"] == 110
+    # Skipped this cycle: carried forward
+    assert merged["g1"]["totals_1st_5_innings"] == {"Over 4.5": {}}
+    # Requested but pulled by the books: stays empty
+    assert merged["g1"]["spreads"] == {} and "spreads_source" not in merged["g1"]
+    assert merged["g2"] == previous["g2"]
+    # Failed this cycle, started, or no longer listed: not carried forward
+    assert merged["g3"] is None
+    assert "live" not in merged and "gone" not in merged
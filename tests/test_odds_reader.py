@@ -0,0 +1,59 @@
+import json
+
+from core import odds_reader
+from core.odds_reader import iter_market_odds, latest_odds_file, load_market_odds
+
+ODDS = {
+    "2025-06-01-NYY@BOS-T1305": {
+        "h2h": {"NYY": {"price": -130, "per_book": {"fanduel": -130, "pinnacle": -128.5}}},
+        "start_time": "2025-06-01T13:05:00-04:00",
+    },
+    "2025-06-01-LAD@SF-T1615": {"h2h": {}, "alternate_totals": {"Over 8.5": {"price": 100}}},
+    "2025-06-02-NYY@BOS-T1905": {"h2h": {"BOS": {"price": 105, "per_book": None}}},
+    "2025-06-02-CHC@STL-T2015": [],
+}
+
+
+def _write(tmp_path, data=ODDS, name="market_odds_2025-06-01T0900.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+def test_filters_by_game_and_date(tmp_path):
+    path = _write(tmp_path)
+    assert load_market_odds(path) == ODDS
+
+    only = load_market_odds(path, games={"2025-06-01-NYY@BOS-T1305"})
+    assert only == {"2025-06-01-NYY@BOS-T1305": ODDS["2025-06-01-NYY@BOS-T1305"]}
+
+    by_date = load_market_odds(path, dates=["2025-06-02"])
+    assert list(by_date) == ["2025-06-02-NYY@BOS-T1905", "2025-06-02-CHC@STL-T2015"]
+    assert by_date["2025-06-02-NYY@BOS-T1905"] == ODDS["2025-06-02-NYY@BOS-T1905"]
+
+    both = load_market_odds(path, games={"2025-06-01-LAD@SF-T1615"}, dates=["2025-06-02"])
+    assert set(both) == {"2025-06-01-LAD@SF-T1615", "2025-06-02-NYY@BOS-T1905", "2025-06-02-CHC@STL-T2015"}
+    assert load_market_odds(path, games=set()) == {}
+
+
+def test_fallback_without_ijson_matches_stream(tmp_path, monkeypatch):
+    path = _write(tmp_path)
+    streamed = list(iter_market_odds(path, dates=["2025-06-01"]))
+    monkeypatch.setattr(odds_reader, "ijson", None)
+    assert list(iter_market_odds(path, dates=["2025-06-01"])) == streamed
+
+
+def test_bad_or_missing_files_yield_nothing(tmp_path):
+    assert load_market_odds(str(tmp_path / "missing.json")) == {}
+    assert load_market_odds(_write(tmp_path, data=[1, 2], name="list.json")) == {}
+    broken = tmp_path / "broken.json"
+    broken.write_text('{"2025-06-01-NYY@BOS-T1305": {"h2h": ')
+    assert load_market_odds(str(broken)) == {}
+
+
+def test_latest_odds_file(tmp_path):
+    assert latest_odds_file(str(tmp_path / "nope")) is None
+    _write(tmp_path, name="market_odds_2025-06-01T0900.json")
+    newest = _write(tmp_path, name="market_odds_2025-06-01T0905.json")
+    _write(tmp_path, name="2025-06-01.json")
+    assert latest_odds_file(str(tmp_path)) == newest
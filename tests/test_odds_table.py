@@ -0,0 +1,94 @@
+from core.odds_fetcher import extract_per_book_odds, normalize_odds
+from core.odds_table import OddsTable, parse_bookmakers
+from core.utils import TEAM_NAME_TO_ABBR, normalize_label_for_odds
+
+GAME_ID = "2025-06-01-NYY@BOS-T1305"
+
+
+def _bookmakers():
+    def market(key, outcomes):
+        return {"key": key, "outcomes": outcomes}
+
+    books = []
+    for book, shade in (("fanduel", 0), ("draftkings", 5), ("betmgm", -5)):
+        books.append(
+            {
+                "key": book,
+                "markets": [
+                    market(
+                        "h2h",
+                        [
+                            {"name": "New York Yankees", "price": -130 + shade},
+                            {"name": "Boston Red Sox", "price": 110 - shade},
+                        ],
+                    ),
+                    market(
+                        "spreads",
+                        [
+                            {"name": "New York Yankees", "price": 140 + shade, "point": -1.5},
+                            {"name": "Boston Red Sox", "price": -160 - shade, "point": 1.5},
+                        ],
+                    ),
+                    market(
+                        "totals",
+                        [
+                            {"name": "Over", "price": -110 + shade, "point": 8.5},
+                            {"name": "Under", "price": -110 - shade, "point": 8.5},
+                        ],
+                    ),
+                    market(
+                        "team_totals",
+                        [
+                            {"name": "Over", "description": "New York Yankees", "price": -115, "point": 4.5},
+                            {"name": "Under", "description": "New York Yankees", "price": -105, "point": 4.5},
+                        ],
+                    ),
+                ],
+            }
+        )
+    return books
+
+
+def _legacy(bookmakers):
+    offers = {}
+    for bm in bookmakers:
+        for market in bm["markets"]:
+            for outcome in market["outcomes"]:
+                label = outcome["name"]
+                team = outcome.get("description")
+                if "team_totals" in market["key"] and team:
+                    label = f"{TEAM_NAME_TO_ABBR.get(team, team)} {label}"
+                full = normalize_label_for_odds(label, market["key"], outcome.get("point"))
+                offers.setdefault(market["key"], {}).setdefault(bm["key"], {})[full] = {
+                    "price": outcome["price"],
+                    "point": outcome.get("point"),
+                }
+    normalized = normalize_odds(GAME_ID, offers)
+    for mkt, labels in extract_per_book_odds(bookmakers).items():
+        for label, prices in labels.items():
+            if label in normalized.get(mkt, {}):
+                normalized[mkt][label]["per_book"] = prices
+    return normalized
+
+
+def test_nested_view_matches_legacy_normalization():
+    bookmakers = _bookmakers()
+    table = parse_bookmakers(GAME_ID, bookmakers)
+
+    assert len(table) == 3 * 8
+    assert table.nested_view(GAME_ID) == _legacy(bookmakers)
+
+
+def test_table_round_trips_and_dedupes():
+    table = parse_bookmakers(GAME_ID, _bookmakers())
+    table.add(GAME_ID, "h2h", table.label[0], "fanduel", -200)
+    assert len(table) == 24
+    assert table.nested_view(GAME_ID)["h2h"][table.label[0]]["per_book"]["fanduel"] == -200
+
+    rebuilt = OddsTable.from_nested({GAME_ID: table.nested_view(GAME_ID)})
+    assert sorted(rebuilt.rows(), key=str) == sorted(
+        ((g, m, l, b, p, None) for g, m, l, b, p, _ in table.rows()), key=str
+    )
+    frame = table.to_frame()
+    assert list(frame.columns) == ["game_id", "market", "label", "book", "price", "point"]
+    assert frame["game_id"].unique().tolist() == [GAME_ID]
@@ -0,0 +1,60 @@
+import numpy as np
+
+from core.parametric_pricer import (
+    extra_segment_entries,
+    fit_segment_model,
+    joint_pmf,
+    price_spread,
+    price_total,
+)
+
+
+def _samples(n=200_000, seed=11):
+    rng = np.random.default_rng(seed)
+    shared = rng.poisson(0.3, n)
+    home = rng.negative_binomial(4, 4 / (4 + 2.2), n) + shared
+    away = rng.poisson(2.0, n) + shared
+    return home, away
+
+
+def test_model_matches_empirical_probabilities():
+    home, away = _samples()
+    joint = joint_pmf(fit_segment_model(home, away))
+    total, diff = home + away, home - away
+
+    assert abs(price_total(joint, 4.5, "Over") - np.mean(total > 4.5)) < 0.01
+    assert abs(price_spread(joint, -1.5, is_home=True) - np.mean(diff > 1.5)) < 0.01
+    # Whole-number line: pushes are removed from both sides
+    over = price_total(joint, 5.0, "Over")
+    under = price_total(joint, 5.0, "Under")
+    assert abs(over + under - 1.0) < 1e-9
+    assert abs(over - np.mean(total > 5) / np.mean(total != 5)) < 0.01
+
+
+def test_target_moments_are_applied():
+    home, away = _samples(n=20_000)
+    model = fit_segment_model(home, away, target_mean=5.0, target_sd=3.0, target_diff_sd=2.8)
+    joint = joint_pmf(model)
+    h, a = np.indices(joint.shape)
+    mean = float((joint * (h + a)).sum())
+    sd = float(np.sqrt((joint * (h + a) ** 2).sum() - mean**2))
+    assert abs(mean - 5.0) < 0.01
+    assert abs(sd - 3.0) < 0.05
+
+
+def test_extra_entries_price_lines_missing_from_sim():
+    home, away = _samples(n=20_000)
+    sim = {
+        "markets": [{"market": "totals_1st_5_innings", "side": "Over 4.5", "sim_prob": 0.5}],
+        "segment_models": {"1st_5_innings": fit_segment_model(home, away)},
+    }
+    odds = {
+        "alternate_totals_1st_5_innings": {"Over 4.5": {"price": -110}, "Over 6.5": {"price": 180}},
+        "spreads_1st_5_innings": {"NYY +0.5": {"price": -150}},
+        "totals": {"Over 8.5": {"price": -110}},
+    }
+    entries = extra_segment_entries("2025-06-01-NYY@BOS-T1905", sim, odds)
+    sides = {(e["market"], e["side"]) for e in entries}
+
+    assert sides == {("totals_1st_5_innings", "Over 6.5"), ("spreads_1st_5_innings", "NYY +0.5")}
+    assert all(e["source"] == "parametric" for e in entries)
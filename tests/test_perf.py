@@ -0,0 +1,24 @@
+import json
+import time
+
+from core.perf import PerfRecorder, append_perf_log
+
+
+def test_phases_accumulate_and_log(tmp_path):
+    perf = PerfRecorder("unit", game_id="2025-06-01-NYY@BOS-T1905")
+    for _ in range(2):
+        with perf.phase("work"):
+            time.sleep(0.01)
+    perf.count("sims", 50)
+    perf.stop("never_started")
+
+    record = perf.as_dict()
+    assert record["phases_sec"]["work"] >= 0.02
+    assert "never_started" not in record["phases_sec"]
+    assert 0 < perf.rate("sims", "work") <= 2500
+
+    path = append_perf_log(record, log_dir=str(tmp_path))
+    append_perf_log(record, log_dir=str(tmp_path))
+    lines = open(path).read().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["game_id"] == "2025-06-01-NYY@BOS-T1905"
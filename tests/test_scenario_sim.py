@@ -0,0 +1,149 @@
+import json
+import random
+
+import numpy as np
+
+from core.game_simulator import OPENER_INNINGS, build_sample_lineup, build_sample_pitcher, simulate_game
+from core.pricing_engine import MLBPricingEngine
+from core.scenario_sim import (
+    build_scenarios,
+    load_scenario_prices,
+    run_scenarios,
+    save_scenarios,
+    serve_scenario,
+    simulate_scenario,
+)
+
+GAME_ID = "2025-06-01-NYY@BOS-T1905"
+
+
+def _assets():
+    home = [{**b, "name": f"home_{i}"} for i, b in enumerate(build_sample_lineup())]
+    away = [{**b, "name": f"away_{i}"} for i, b in enumerate(build_sample_lineup())]
+    home[3]["woba"] = 0.400
+    reliever = {**build_sample_pitcher(), "name": "Closer"}
+    return {
+        "lineups": {"home": home, "away": away},
+        "pitchers": {
+            "home": {**build_sample_pitcher(), "name": "Home SP"},
+            "away": {**build_sample_pitcher(), "name": "Away SP"},
+        },
+        "bullpens": {"home": [reliever], "away": []},
+    }
+
+
+def test_scenarios_priced_and_served_by_lineup(tmp_path):
+    random.seed(3)
+    np.random.seed(3)
+    assets = _assets()
+    bench = {"home": [{**build_sample_lineup()[0], "name": "home_bench"}]}
+    scenarios = build_scenarios(assets, bench=bench)
+
+    ids = [s["id"] for s in scenarios]
+    assert ids == ["base", "rest_home", "rest_away", "opener_home"]
+    assert len({s["key"] for s in scenarios}) == len(scenarios)
+
+    results = run_scenarios(GAME_ID, assets, {}, scenarios[:2], n_simulations=150)
+    save_scenarios(GAME_ID, results, root=str(tmp_path))
+
+    confirmed_home = list(assets["lineups"]["home"])
+    confirmed_home[3] = {"name": "home_bench"}
+    served = load_scenario_prices(
+        GAME_ID,
+        list(reversed(confirmed_home)),
+        assets["lineups"]["away"],
+        assets["pitchers"]["home"],
+        assets["pitchers"]["away"],
+        root=str(tmp_path),
+    )
+    assert served["id"] == "rest_home"
+    h2h = {e["side"]: e["sim_prob"] for e in served["markets"] if e["market"] == "h2h"}
+    assert abs(h2h["BOS"] + h2h["NYY"] - 1) < 1e-3
+    assert any(e["market"] == "totals_1st_5_innings" for e in served["markets"])
+
+    unknown = load_scenario_prices(
+        GAME_ID, [], [], assets["pitchers"]["home"], assets["pitchers"]["away"], root=str(tmp_path)
+    )
+    assert unknown is None
+
+
+def test_opener_hands_over_to_listed_starter():
+    random.seed(5)
+    np.random.seed(5)
+    assets = _assets()
+    opener_scenario = build_scenarios(assets)[-1]
+    assert opener_scenario["id"] == "opener_home"
+    assert opener_scenario["pitchers"]["home"]["name"] == "Home SP"
+    assert opener_scenario["bullpens"]["home"] == []
+
+    result = simulate_game(
+        home_lineup=assets["lineups"]["home"],
+        away_lineup=assets["lineups"]["away"],
+        home_pitcher=assets["pitchers"]["home"],
+        away_pitcher=assets["pitchers"]["away"],
+        env={},
+        home_bullpen=opener_scenario["bullpens"]["home"],
+        home_opener=opener_scenario["openers"]["home"],
+    )
+    by_inning = {
+        inn["inning"]: {e["pitcher"] for e in inn["top_half_events"]} for inn in result["innings"]
+    }
+    assert by_inning[1] == {"Closer"}
+    assert by_inning[OPENER_INNINGS + 1] == {"Home SP"}
+    assert all("Closer" not in names for inning, names in by_inning.items() if inning > OPENER_INNINGS)
+
+
+def test_scenario_scaled_like_simulator():
+    random.seed(7)
+    np.random.seed(7)
+    assets = _assets()
+    engine = MLBPricingEngine({"team_total_scaling": {"home_mean_factor": 1.1}})
+    base = build_scenarios(assets)[0]
+    plain = simulate_scenario(GAME_ID, base, {}, assets["bullpens"], 200, MLBPricingEngine({}))
+    random.seed(7)
+    np.random.seed(7)
+    boosted = simulate_scenario(GAME_ID, base, {}, assets["bullpens"], 200, engine)
+    assert boosted["segment_models"]["full_game"]["home_mean"] > plain["segment_models"]["full_game"]["home_mean"]
+    assert boosted["segment_models"]["1st_5_innings"] == plain["segment_models"]["1st_5_innings"]
+
+
+def test_serve_scenario_writes_sim_file(tmp_path):
+    random.seed(3)
+    np.random.seed(3)
+    assets = _assets()
+    results = run_scenarios(GAME_ID, assets, {}, build_scenarios(assets)[:1], n_simulations=100)
+    save_scenarios(GAME_ID, results, root=str(tmp_path))
+
+    target = tmp_path / "sims" / f"{GAME_ID}.json"
+    served = serve_scenario(
+        GAME_ID, assets["lineups"], assets["pitchers"], str(target), "2025-06-01T19:05", root=str(tmp_path)
+    )
+    assert served == str(target)
+    sim = json.loads(target.read_text())
+    assert sim["scenario"]["id"] == "base" and sim["start_time_iso"] == "2025-06-01T19:05"
+    assert set(sim["segment_models"]) == {
+        "full_game", "1st_1_innings", "1st_3_innings", "1st_5_innings", "1st_7_innings"
+    }
+    assert len(sim["raw_distributions"]["totals_1st_7_innings"]["values"]) == 100
+    priced = {(e["market"], e["side"]) for e in sim["markets"]}
+    for market, side in [
+        ("h2h", "BOS"),
+        ("totals", "Over 12.5"),
+        ("spreads", "NYY +0.5"),
+        ("team_totals", "BOS Over 6.5"),
+        ("totals_1st_1_innings", "Over 0.5"),
+        ("spreads_1st_3_innings", "BOS -2.5"),
+        ("team_totals_1st_7_innings", "NYY Under 2.5"),
+    ]:
+        assert (market, side) in priced
+
+    # A stored scenario missing a segment is not served
+    stored = tmp_path / "2025-06-01" / f"{GAME_ID}.json"
+    payload = json.loads(stored.read_text())
+    for scenario in payload["scenarios"].values():
+        del scenario["segment_models"]["1st_3_innings"]
+    stored.write_text(json.dumps(payload))
+    assert serve_scenario(GAME_ID, assets["lineups"], assets["pitchers"], str(target), root=str(tmp_path)) is None
+
+    other = {**assets["lineups"], "home": assets["lineups"]["home"][:-1]}
+    assert serve_scenario(GAME_ID, other, assets["pitchers"], str(tmp_path / "x.json"), root=str(tmp_path)) is None
@@ -0,0 +1,81 @@
+import json
+
+from core.snapshot_db import (
+    SnapshotDB,
+    latest_snapshot_rows,
+    prune_snapshot_files,
+    record_snapshot,
+    snapshot_db_path,
+)
+from core.snapshot_store import SnapshotStore
+from core.utils import now_eastern
+
+GAME_ID = "2025-06-01-NYY@BOS-T1305"
+
+
+def _row(side, book, ev):
+    return {"game_id": GAME_ID, "market": "h2h", "side": side, "best_book": book, "ev_percent": ev}
+
+
+def test_latest_and_prior_rows_per_key(tmp_path):
+    db = SnapshotDB(str(tmp_path / "snap.sqlite"))
+    db.write_snapshot([_row("NYY", "fanduel", 1.0), _row("BOS", "fanduel", 2.0)], "20250601T0900")
+    db.write_snapshot([_row("NYY", "fanduel", 3.0)], "20250601T0905")
+
+    assert [r["ev_percent"] for r in db.load_snapshot()] == [3.0]
+    assert db.latest_snapshot()[0] == "20250601T0905"
+
+    latest = db.latest_rows(game_id=GAME_ID)
+    assert latest[(GAME_ID, "h2h", "NYY", "fanduel")]["ev_percent"] == 3.0
+    # BOS only appeared in the earlier snapshot
+    assert latest[(GAME_ID, "h2h", "BOS", "fanduel")]["ev_percent"] == 2.0
+
+    prior = db.prior_rows()
+    assert prior[(GAME_ID, "h2h", "NYY", "fanduel")]["ev_percent"] == 1.0
+
+    # Rewriting a snapshot replaces it rather than appending
+    db.write_snapshot([_row("NYY", "fanduel", 4.0)], "20250601T0905")
+    assert [r["ev_percent"] for r in db.load_snapshot("20250601T0905")] == [4.0]
+
+
+def test_prune_keeps_newest_snapshot(tmp_path):
+    db = SnapshotDB(str(tmp_path / "snap.sqlite"))
+    recent = now_eastern().strftime("%Y%m%dT%H%M")
+    for ts in ("20200101T0000", "20200101T0005", recent):
+        db.write_snapshot([_row("NYY", "fanduel", 1.0)], ts)
+    assert db.prune(max_age_hours=48) == 2
+    assert db.snapshot_timestamps() == [recent]
+    assert db.prune(max_age_hours=0) == 0
+
+
+def test_readers_prefer_database_over_files(tmp_path):
+    path = tmp_path / "market_snapshot_20250601T0900.json"
+    path.write_text(json.dumps([_row("NYY", "fanduel", 1.0)]))
+    rows, source = latest_snapshot_rows(str(tmp_path))
+    assert source == str(path) and rows[0]["ev_percent"] == 1.0
+    assert not (tmp_path / "market_snapshots.sqlite").exists()
+
+    record_snapshot([_row("NYY", "fanduel", 5.0)], str(path))
+    rows, source = latest_snapshot_rows(str(tmp_path))
+    assert source == f"{snapshot_db_path(str(tmp_path))}@20250601T0900"
+    assert rows[0]["ev_percent"] == 5.0
+
+    store = SnapshotStore(str(tmp_path)).refresh()
+    assert store.by_side[f"{GAME_ID}:h2h:NYY"]["ev_percent"] == 5.0
+
+
+def test_prune_snapshot_files(tmp_path):
+    for i in range(4):
+        (tmp_path / f"market_snapshot_2025060{i}T0900.json").write_text("[]")
+    assert prune_snapshot_files(str(tmp_path), keep=2) == 2
+    assert len(list(tmp_path.glob("market_snapshot_*.json"))) == 2
+
+
+def test_rows_without_book_keyed_by_best_book(tmp_path):
+    db = SnapshotDB(str(tmp_path / "snap.sqlite"))
+    rows = [_row("NYY", "fanduel", 1.0), {**_row("NYY", "pinnacle", 2.0), "book": "draftkings"}]
+    assert db.write_snapshot(rows, "20250601T0900") == 2
+    assert set(db.latest_rows()) == {
+        (GAME_ID, "h2h", "NYY", "fanduel"),
+        (GAME_ID, "h2h", "NYY", "draftkings"),
+    }
@@ -0,0 +1,68 @@
+import copy
+
+import core.unified_snapshot_generator as usg
+from core.confirmation_utils import required_market_move
+from core.market_pricer import kelly_fraction
+from core.snapshot_frame import enrich_snapshot_rows, kelly_stakes, required_market_moves
+
+ROWS = [
+    {
+        "game_id": "GAME1",
+        "market": "totals",
+        "side": "Over 8.5",
+        "market_prob": 0.55,
+        "baseline_consensus_prob": 0.50,
+        "ev_percent": 6.0,
+        "stake": 1.0,
+        "hours_to_game": 5,
+        "market_odds": -110,
+        "blended_prob": 0.6,
+        "market_class": "main",
+        "book": "fanduel",
+        "books_used": ["fanduel", "draftkings"],
+    },
+    {
+        "game_id": "GAME1",
+        "market": "alternate_totals",
+        "side": "Under 9.5",
+        "consensus_prob": 0.48,
+        "ev_percent": 2.5,
+        "hours_to_game": 20,
+        "market_odds": 135,
+        "sim_prob": 0.47,
+        "market_class": "alternate",
+        "book": "betmgm",
+    },
+    {
+        "game_id": "GAME2",
+        "market": "h2h",
+        "side": "NYY",
+        "market_prob": 0.40,
+        "baseline_consensus_prob": 0.42,
+        "ev_percent": 0.5,
+        "hours_to_game": 1.5,
+        "market_odds": "+150",
+        "blended_prob": 0.41,
+        "book": "pinnacle",
+    },
+]
+
+
+def test_vectorized_enrichment_matches_scalar_rows():
+    expected = copy.deepcopy(ROWS)
+    for row in expected:
+        usg._enrich_snapshot_row(row)
+    rows = copy.deepcopy(ROWS)
+    enrich_snapshot_rows(rows, usg.POPULAR_BOOKS)
+    assert rows == expected
+
+
+def test_vector_helpers_match_scalar_helpers():
+    probs, odds = [0.55, 0.3, 0.0, 0.62], [-110, 250, 100, 120]
+    assert kelly_stakes(probs, odds).tolist() == [kelly_fraction(p, o) for p, o in zip(probs, odds)]
+
+    hours, counts = [1.0, 8.0, 30.0], [1, 3, 6]
+    markets, evs = ["h2h", "totals_1st_5_innings", "spreads"], [1.0, 6.5, 12.0]
+    assert required_market_moves(hours, counts, markets, evs).tolist() == [
+        required_market_move(*args) for args in zip(hours, counts, markets, evs)
+    ]
@@ -0,0 +1,133 @@
+import copy
+import json
+import os
+
+from core.odds_delta import OddsDeltaTracker
+from core.snapshot_incremental import SnapshotBuildCache
+
+DATE = "2025-06-01"
+GID_A = "2025-06-01-NYY@BOS-T1305"
+GID_B = "2025-06-01-TOR@CWS-T1910"
+
+
+def _sim(folder, gid, prob):
+    path = folder / f"{gid}.json"
+    path.write_text(json.dumps({"markets": [{"market": "h2h", "side": "NYY", "sim_prob": prob}]}))
+    return str(path)
+
+
+def test_only_changed_games_are_repriced(tmp_path):
+    paths = {GID_A: _sim(tmp_path, GID_A, 0.5), GID_B: _sim(tmp_path, GID_B, 0.4)}
+    odds = {GID_A: {"h2h": {"NYY": {"price": -110}}}, GID_B: {"h2h": {"TOR": {"price": 120}}}}
+    cache_path = str(tmp_path / "cache.json")
+
+    cache = SnapshotBuildCache(cache_path)
+    dirty, priced = cache.plan(DATE, paths, odds)
+    assert dirty == {GID_A, GID_B} and priced == {}
+    priced.update({GID_A: [{"side": "NYY"}], GID_B: [{"side": "TOR"}]})
+    cache.commit(DATE, priced)
+    cache.save(dates=[DATE])
+
+    # Touching a sim without changing it keeps the game clean
+    os.utime(paths[GID_A], ns=(1, 1))
+    cache = SnapshotBuildCache(cache_path)
+    dirty, priced = cache.plan(DATE, paths, odds)
+    assert dirty == set() and priced[GID_A] == [{"side": "NYY"}]
+
+    _sim(tmp_path, GID_A, 0.55)
+    odds[GID_B]["h2h"]["TOR"]["price"] = 125
+    dirty, priced = cache.plan(DATE, paths, odds)
+    assert dirty == {GID_A, GID_B} and priced == {}
+
+    # Games that were not priced (e.g. no odds) are not cached
+    cache.commit(DATE, {GID_A: [{"side": "NYY"}]})
+    assert list(cache.dates[DATE]) == [GID_A]
+
+
+def test_odds_delta_skips_hashing_unmoved_games(tmp_path, monkeypatch):
+    import core.snapshot_incremental as snapshot_incremental
+
+    paths = {GID_A: _sim(tmp_path, GID_A, 0.5), GID_B: _sim(tmp_path, GID_B, 0.4)}
+    odds = {
+        GID_A: {"h2h": {"NYY": {"price": -110, "per_book": {"fanduel": -110}}}},
+        GID_B: {"h2h": {"TOR": {"price": 120, "per_book": {"fanduel": 120}}}},
+    }
+    tracker = OddsDeltaTracker()
+    cache = SnapshotBuildCache(None)
+    dirty, priced = cache.plan(DATE, paths, odds, delta=tracker.update(odds))
+    cache.commit(DATE, {GID_A: [{"side": "NYY"}], GID_B: [{"side": "TOR"}]})
+
+    hashed = []
+    real = snapshot_incremental.odds_digest
+    monkeypatch.setattr(snapshot_incremental, "odds_digest", lambda g: hashed.append(g) or real(g))
+    odds[GID_B]["h2h"]["TOR"]["per_book"]["fanduel"] = 125
+    dirty, priced = cache.plan(DATE, paths, odds, delta=tracker.update(odds))
+    assert dirty == {GID_B} and priced == {GID_A: [{"side": "NYY"}]}
+    assert hashed == [odds[GID_B]]
+
+    # A delta not diffed from the cached refresh is ignored
+    cache.commit(DATE, priced)
+    hashed.clear()
+    dirty, priced = cache.plan(DATE, paths, odds, delta=OddsDeltaTracker().update(odds))
+    assert len(hashed) == 2
+
+
+def test_devig_settings_change_discards_cache(tmp_path, monkeypatch):
+    import core.devig as devig
+
+    paths = {GID_A: _sim(tmp_path, GID_A, 0.5)}
+    odds = {GID_A: {"h2h": {"NYY": {"price": -110}}}}
+    cache_path = str(tmp_path / "cache.json")
+    cache = SnapshotBuildCache(cache_path)
+    cache.plan(DATE, paths, odds)
+    cache.commit(DATE, {GID_A: [{"side": "NYY"}]})
+    cache.save(dates=[DATE])
+
+    monkeypatch.setattr(devig, "DEFAULT_DEVIG_METHOD", "power")
+    dirty, priced = SnapshotBuildCache(cache_path).plan(DATE, paths, odds)
+    assert dirty == {GID_A} and priced == {}
+
+
+def test_incremental_rebuild_matches_full_build(tmp_path, monkeypatch):
+    import random
+
+    import core.snapshot_core as snapshot_core
+    import core.unified_snapshot_generator as usg
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "data", "market_odds", "market_odds_20250623T2044.json")) as f:
+        all_odds = json.load(f)
+    date = "2025-06-23"
+    odds = {gid: all_odds[gid] for gid in list(all_odds)[:3]}
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(snapshot_core, "compute_hours_to_game", lambda dt: 6.5)
+    sim_dir = tmp_path / "backtest" / "sims" / date
+    sim_dir.mkdir(parents=True)
+
+    def write_sim(gid, seed):
+        rnd = random.Random(seed)
+        markets = [
+            {"market": m, "side": label, "sim_prob": rnd.random()}
+            for m in ("h2h", "spreads", "totals")
+            for label in odds[gid].get(m) or {}
+        ]
+        (sim_dir / f"{gid}.json").write_text(json.dumps({"markets": markets}))
+
+    def build(cache=None):
+        rows = usg.build_snapshot_for_date(
+            date, copy.deepcopy(odds), (0.0, 20.0), prior_map={}, build_cache=cache
+        )
+        out = []
+        for row in rows:
+            row = usg.sanitize_json_row(row)
+            row.pop("date_simulated", None)  # stamped with the build time
+            out.append(json.dumps(row, sort_keys=True, default=str))
+        return sorted(out)
+
+    for i, gid in enumerate(odds):
+        write_sim(gid, i)
+    cache = SnapshotBuildCache(None)
+    build(cache)
+    write_sim(next(iter(odds)), 99)
+
+    incremental = build(cache)
+    assert incremental and incremental == build()
@@ -0,0 +1,91 @@
+import json
+import pickle
+
+import pandas as pd
+
+import core.unified_snapshot_generator as usg
+from core.snapshot_core import annotate_display_deltas
+from core.snapshot_row import DISPLAY_FIELDS, SnapshotRow
+
+PER_BOOK = {"fanduel": -110, "draftkings": -105}
+
+ROW = {
+    "game_id": "2025-06-01-NYY@BOS-T1305",
+    "market": "totals",
+    "side": "Over 8.5",
+    "book": "fanduel",
+    "market_odds": -105,
+    "prev_market_odds": -110,
+    "odds_movement": "better",
+    "ev_percent": 6.04,
+    "market_prob": 0.55,
+    "baseline_consensus_prob": 0.5,
+    "mkt_movement": "up",
+    "sim_prob": 0.58,
+    "prev_sim_prob": None,
+    "sim_movement": "up",
+    "blended_fv": 1.72,
+    "prev_blended_fv": 1.8,
+    "fv_movement": "same",
+    "_raw_sportsbook": PER_BOOK,
+    "consensus_books": PER_BOOK,
+    "_tracker_entry": {"sim_prob": 0.5},
+    "theme_key": "Over",
+}
+
+
+def test_behaves_like_the_dict_it_was_built_from():
+    row = SnapshotRow.from_dict(ROW)
+    assert row == ROW and len(row) == len(ROW)
+    assert row["market"] == "totals" and row.get("queued") is None
+    assert "skip_reason" not in row
+    row["skip_reason"] = "low_ev"
+    row.setdefault("snapshot_roles", []).append("totals")
+    row.update({"queued": True})
+    assert row.pop("skip_reason") == "low_ev" and "skip_reason" not in row
+    assert row["snapshot_roles"] == ["totals"] and row["queued"] is True
+    # Slotted and extra keys alike
+    assert set(row) == set(ROW) | {"snapshot_roles", "queued"}
+
+
+def test_displays_render_lazily_like_annotated_dicts():
+    prior = {"sim_prob": 0.52}
+    expected = dict(ROW)
+    annotate_display_deltas(expected, prior)
+    row = SnapshotRow.from_dict({**ROW, "prev_sim_prob": 0.52, "odds_display": "stale"})
+    annotate_display_deltas(row, prior)
+    assert "odds_display" not in row._extra
+    assert row.to_dict() == {**expected, "prev_sim_prob": 0.52}
+    # Rendered from the fields as they are when read
+    row["ev_percent"] = 7.0
+    assert row["ev_display"] == "+7.0%"
+    # An explicit value wins
+    row["mkt_prob_display"] = "50.0% → 55.0%*"
+    assert row["mkt_prob_display"] == "50.0% → 55.0%*"
+    del row["fv_display"]
+    assert "fv_display" not in row and set(DISPLAY_FIELDS) - set(row) == {"fv_display"}
+
+
+def test_copies_share_per_book_prices():
+    base = SnapshotRow.from_dict(ROW)
+    copies = [base.copy() for _ in PER_BOOK]
+    for row, book in zip(copies, PER_BOOK):
+        row["book"] = book
+        row["queued"] = True
+    assert all(r["_raw_sportsbook"] is PER_BOOK and r["consensus_books"] is PER_BOOK for r in copies)
+    assert [r["book"] for r in copies] == list(PER_BOOK)
+    assert base["book"] == "fanduel" and "queued" not in base
+
+
+def test_serializes_to_the_same_json_as_a_dict():
+    row = SnapshotRow.from_dict(ROW)
+    annotate_display_deltas(row, None)
+    expected = dict(ROW)
+    annotate_display_deltas(expected, None)
+    sanitized = usg.sanitize_json_row(row)
+    assert type(sanitized) is dict and sanitized == usg.sanitize_json_row(expected)
+    assert "_raw_sportsbook" not in sanitized
+    json.dumps(sanitized)
+    assert pickle.loads(pickle.dumps(row)) == row
+    frame = pd.DataFrame.from_records([row, expected], columns=["book", "odds_display"])
+    assert frame["odds_display"].tolist() == ["-110 → -105"] * 2
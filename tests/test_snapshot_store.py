@@ -0,0 +1,58 @@
+import json
+import os
+
+from core import snapshot_store
+from core.snapshot_store import SnapshotStore, TrackerView
+
+ROW = {"game_id": "2025-06-01-NYY@BOS-T1305", "market": "h2h", "side": "NYY", "best_book": "fanduel"}
+
+
+def _write(folder, name, rows, mtime):
+    path = folder / name
+    path.write_text(json.dumps(rows))
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def test_store_parses_once_and_reloads_newer_files(tmp_path, monkeypatch):
+    calls = []
+    real_load = snapshot_store.safe_load_json
+    monkeypatch.setattr(snapshot_store, "safe_load_json", lambda p: calls.append(p) or real_load(p))
+
+    first = _write(tmp_path, "market_snapshot_20250601T0900.json", [ROW], 1_000)
+    store = SnapshotStore(str(tmp_path))
+    store.refresh()
+    store.refresh()
+    store.tracker()
+    assert calls == [first]
+    assert store.by_side["2025-06-01-NYY@BOS-T1305:h2h:NYY"] is store.rows[0]
+    assert store.by_book[("2025-06-01-NYY@BOS-T1305", "h2h", "NYY", "fanduel")] is store.rows[0]
+
+    second = _write(tmp_path, "market_snapshot_20250601T0905.json", [dict(ROW, side="BOS")], 2_000)
+    store.refresh()
+    assert calls == [first, second]
+    assert list(store.by_side) == ["2025-06-01-NYY@BOS-T1305:h2h:BOS"]
+
+
+def test_tracker_views_are_copy_on_write():
+    base = {"a": {"v": 1}, "b": {"v": 2}}
+    tracker, before = TrackerView(base), TrackerView(base)
+
+    tracker["a"] = {"v": 10}
+    tracker["c"] = {"v": 3}
+    del tracker["b"]
+    assert dict(tracker) == {"a": {"v": 10}, "c": {"v": 3}}
+    assert len(tracker) == 2 and "b" not in tracker
+    assert before["a"] == {"v": 1} and len(before) == 2
+    assert base == {"a": {"v": 1}, "b": {"v": 2}}
+
+    tracker.rebase(base)
+    assert tracker.get("a") == {"v": 1} and tracker.get("c") is None
+
+
+def test_lazy_view_resolves_base_on_first_access():
+    loads = []
+    view = TrackerView(lambda: loads.append(1) or {"k": 1})
+    assert loads == []
+    assert view["k"] == 1 and view.get("k") == 1
+    assert loads == [1]
@@ -0,0 +1,145 @@
+import threading
+import time
+
+import pytest
+
+from core.stage_scheduler import Stage, StageScheduler
+
+
+def _settle(scheduler, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while any(s.running for s in scheduler.stages.values()):
+        assert time.monotonic() < deadline, "stages did not finish"
+        time.sleep(0.005)
+
+
+def _fake_clock():
+    now = [0.0]
+    return now, lambda: now[0]
+
+
+def test_stages_fire_on_new_inputs_and_wait_for_consumers():
+    now, clock = _fake_clock()
+    calls = []
+    gate = threading.Event()
+
+    def consume():
+        calls.append("snapshot")
+        gate.wait(5)
+        return True
+
+    scheduler = StageScheduler(
+        [
+            Stage("snapshot", consume, deps=("odds",)),
+            Stage("odds", lambda: calls.append("odds") or True, interval=10),
+        ],
+        clock=clock,
+    )
+    assert [s.name for s in scheduler.order] == ["odds", "snapshot"]
+
+    assert scheduler.poll() == ["odds"]
+    _settle(scheduler)
+    assert scheduler.poll() == ["snapshot"]  # reacts without waiting for a tick
+
+    # Odds are due again but the snapshot is still reading the last batch
+    now[0] = 11
+    assert scheduler.poll() == []
+    gate.set()
+    _settle(scheduler)
+    assert scheduler.poll() == ["odds"]
+    _settle(scheduler)
+    assert scheduler.poll() == ["snapshot"]
+    _settle(scheduler)
+    assert calls == ["odds", "snapshot", "odds", "snapshot"]
+    assert scheduler.poll() == []  # nothing new, nothing due
+
+
+def test_inputs_are_coalesced_and_busy_sources_skip_their_interval():
+    now, clock = _fake_clock()
+    odds_gate, sims_gate = threading.Event(), threading.Event()
+    runs = []
+    scheduler = StageScheduler(
+        [
+            Stage("odds", lambda: odds_gate.wait(5), interval=100),
+            Stage("sims", lambda: sims_gate.wait(5), interval=10),
+            Stage("log", lambda: runs.append("log") or True, deps=("odds", "sims")),
+        ],
+        clock=clock,
+    )
+    assert sorted(scheduler.poll()) == ["odds", "sims"]
+    now[0] = 25
+    assert scheduler.poll() == []  # sims overran its interval; don't queue another
+    odds_gate.set()
+    sims_gate.set()
+    _settle(scheduler)
+
+    # Both inputs changed while log was idle: one run picks up both
+    assert scheduler.poll() == ["log"]
+    _settle(scheduler)
+    assert scheduler.poll() == []
+    now[0] = 35
+    assert scheduler.poll() == ["sims"]
+    _settle(scheduler)
+    assert scheduler.poll() == ["log"]
+    _settle(scheduler)
+
+    metrics = scheduler.metrics()
+    assert runs == ["log", "log"]
+    assert metrics["sims"]["skipped"] == 1 and metrics["sims"]["runs"] == 2
+    assert metrics["odds"]["runs"] == 1 and metrics["log"]["version"] == 2
+
+
+def test_overdue_stage_is_reported_and_cancelled():
+    now, clock = _fake_clock()
+    gate = threading.Event()
+    cancelled = []
+    scheduler = StageScheduler(
+        [Stage("sims", lambda: gate.wait(5), interval=100, timeout=5, cancel=lambda: cancelled.append(True))],
+        clock=clock,
+    )
+    scheduler.poll()
+    now[0] = 4
+    scheduler.poll()
+    assert cancelled == []
+    now[0] = 6
+    scheduler.poll()
+    scheduler.poll()
+    assert cancelled == [True]
+    gate.set()
+    _settle(scheduler)
+    metrics = scheduler.metrics()["sims"]
+    assert metrics["timeouts"] == 1 and metrics["runs"] == 1 and metrics["failures"] == 0
+
+
+def test_failed_stage_publishes_nothing():
+    def boom():
+        raise RuntimeError("boom")
+
+    scheduler = StageScheduler([Stage("odds", boom, interval=60), Stage("snapshot", lambda: True, deps=("odds",))])
+    scheduler.poll()
+    _settle(scheduler)
+    assert scheduler.poll() == []
+    assert scheduler.metrics()["odds"]["failures"] == 1
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        StageScheduler([Stage("a", None, deps=("b",)), Stage("b", None, deps=("a",))])
+    with pytest.raises(ValueError, match="unknown"):
+        StageScheduler([Stage("a", None, deps=("missing",))])
+
+
+def test_run_reacts_to_completions_without_polling_delay():
+    done = threading.Event()
+    scheduler = StageScheduler(
+        [
+            Stage("odds", lambda: True, interval=3600),
+            Stage("snapshot", lambda: True, deps=("odds",)),
+            Stage("dispatch", done.set, deps=("snapshot",)),
+        ]
+    )
+    scheduler.start()
+    try:
+        assert done.wait(2)
+    finally:
+        scheduler.stop()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Fit every MLBPricingEngine calibration factor from stored sims and results.
+
+Example::
+
+    python tools/fit_calibration.py --outcomes logs/game_outcomes.csv
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import argparse
+import json
+
+from core.calibration import (
+    CALIBRATION_PATH,
+    fit_calibration,
+    load_calibration,
+    load_game_outcomes,
+    load_sim_arrays,
+    save_calibration,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fit pricing calibration factors")
+    parser.add_argument("--outcomes", required=True, help="CSV of final game scores")
+    parser.add_argument("--sim-root", default=os.path.join("backtest", "sims"))
+    parser.add_argument("--dates", default=None, help="Comma-separated sim dates to use")
+    parser.add_argument("--output", default=CALIBRATION_PATH)
+    parser.add_argument("--dry-run", action="store_true", help="Print without writing")
+    args = parser.parse_args()
+
+    dates = [d.strip() for d in args.dates.split(",")] if args.dates else None
+    sim_arrays = load_sim_arrays(args.sim_root, dates)
+    outcomes = load_game_outcomes(args.outcomes)
+    print(f"📦 Loaded {len(sim_arrays)} sims and {len(outcomes)} outcomes")
+
+    try:
+        calibration = fit_calibration(sim_arrays, outcomes, prior=load_calibration(args.output))
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(json.dumps(calibration, indent=2))
+    if not args.dry_run:
+        path = save_calibration(calibration, args.output)
+        print(f"💾 Saved calibration v{calibration['version']} → {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())